@@ -141,6 +141,30 @@ class ReportPagination(StandardResultsSetPagination):
         return Response(response)
 
 
+class ReportQueryPagination(ReportPagination):
+    """A paginator for report data the query handler restricted to a page."""
+
+    def __init__(self, count=0):
+        """Initialize the paginator with the number of entries of the whole report."""
+        self.count = count
+
+    def get_page(self, request):
+        """Return the offset and limit of the page requested."""
+        return self.get_offset(request), self.get_limit(request)
+
+    def get_count(self, queryset):
+        """Determine a report data's count."""
+        return self.count
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Override queryset pagination."""
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+
+        return queryset
+
+
 class ReportRankedPagination(ReportPagination):
     """A specialty paginator for ranked report data."""
 
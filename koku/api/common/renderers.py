@@ -0,0 +1,51 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""API renderer for JSON output."""
+import logging
+
+import ujson
+from rest_framework.renderers import JSONRenderer
+
+LOG = logging.getLogger(__name__)
+
+
+class UJSONRenderer(JSONRenderer):
+    """
+    A JSON Renderer encoding with ujson.
+
+    Responses holding types ujson does not encode, such as dates or UUIDs,
+    and indented responses are rendered by the standard JSON renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data as JSON bytes."""
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = ujson.dumps(data, ensure_ascii=self.ensure_ascii, escape_forward_slashes=False)
+        except (TypeError, OverflowError) as error:
+            LOG.debug("Rendering with the standard JSON renderer: %s", error)
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # As the standard renderer, escape the separators invalid in JavaScript strings
+        ret = ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+        return ret.encode()
@@ -24,6 +24,7 @@ from rest_framework.response import Response
 
 from .pagination import PATH_INFO
 from .pagination import ReportPagination
+from .pagination import ReportQueryPagination
 from .pagination import ReportRankedPagination
 from .pagination import StandardResultsSetPagination
 
@@ -151,6 +152,30 @@ class ReportPaginationTest(TestCase):
         self.assertIn("last", links)
 
 
+class ReportQueryPaginationTest(TestCase):
+    """Tests for the pagination of report data paginated by the query."""
+
+    def setUp(self):
+        """Set up each test case."""
+        self.paginator = ReportQueryPagination(count=30)
+        self.request = Mock
+        self.request.META = {}
+        self.request.query_params = {"limit": "2", "offset": "10"}
+
+        self.data = {"total": {}, "data": [{"usage": 1, "cost": 2}, {"usage": 2, "cost": 4}]}
+
+    def test_get_page(self):
+        """Test that the offset and limit of the request are returned."""
+        self.assertEqual(self.paginator.get_page(self.request), (10, 2))
+
+    def test_paginate_queryset(self):
+        """Test that the page is unaltered and the count kept."""
+        data = self.paginator.paginate_queryset(self.data, self.request)
+        self.assertEqual(data.get("data", []), self.data.get("data", []))
+        self.assertEqual(self.paginator.get_count(data), 30)
+        self.assertEqual((self.paginator.offset, self.paginator.limit), (10, 2))
+
+
 class ReportRankedPaginationTest(TestCase):
     """Tests for ranked report API pagination."""
 
@@ -0,0 +1,54 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the API renderers."""
+import datetime
+import json
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from .renderers import UJSONRenderer
+
+
+class UJSONRendererTest(TestCase):
+    """Tests for the ujson renderer."""
+
+    def setUp(self):
+        """Set up each test case."""
+        self.renderer = UJSONRenderer()
+        self.data = {
+            "meta": {"count": 2, "total": {"cost": {"value": Decimal("12.5"), "units": "USD"}}},
+            "links": {"next": "/api/cost-management/v1/reports/aws/costs/?limit=1&offset=1"},
+            "data": [{"date": "2020-04-01", "services": [{"service": "AmazonEC2\u2028", "values": []}]}],
+        }
+
+    def test_render_matches_standard_renderer(self):
+        """Test that the rendered JSON decodes as the standard renderer's."""
+        result = self.renderer.render(self.data)
+        expected = JSONRenderer().render(self.data)
+        self.assertEqual(json.loads(result), json.loads(expected))
+        self.assertIn(b'"next":"/api/cost-management/v1/', result)
+
+    def test_render_unsupported_types(self):
+        """Test that data ujson does not encode is rendered by the standard renderer."""
+        data = {"date": datetime.date(2020, 4, 1)}
+        self.assertEqual(self.renderer.render(data), JSONRenderer().render(data))
+
+    def test_render_none(self):
+        """Test that no data renders empty."""
+        self.assertEqual(self.renderer.render(None), b"")
@@ -39,8 +39,8 @@ from api.provider.provider_manager import ProviderManagerError
 from api.utils import DateHelper
 from cost_models.cost_model_manager import CostModelManager
 from cost_models.models import CostModelMap
-from reporting.models import AWS_MATERIALIZED_VIEWS
-from reporting.models import OCP_MATERIALIZED_VIEWS
+from reporting.models import AWS_UI_SUMMARY_TABLES
+from reporting.models import OCP_UI_SUMMARY_TABLES
 
 
 class MockResponse:
@@ -193,7 +193,7 @@ class ProviderManagerTest(IamTestCase):
             with tenant_context(provider.customer):
                 manager = ProviderManager(provider.uuid)
                 manager.remove(self._create_delete_request(self.user, {"Sources-Client": "False"}))
-        for view in OCP_MATERIALIZED_VIEWS:
+        for view in OCP_UI_SUMMARY_TABLES:
             with tenant_context(customer):
                 self.assertFalse(view.objects.count())
 
@@ -207,7 +207,7 @@ class ProviderManagerTest(IamTestCase):
             with tenant_context(provider.customer):
                 manager = ProviderManager(provider.uuid)
                 manager.remove(self._create_delete_request(self.user, {"Sources-Client": "False"}))
-        for view in AWS_MATERIALIZED_VIEWS:
+        for view in AWS_UI_SUMMARY_TABLES:
             with tenant_context(customer):
                 self.assertFalse(view.objects.count())
 
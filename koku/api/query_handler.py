@@ -140,6 +140,20 @@ class QueryHandler:
         """Max rank setter."""
         self._max_rank = max_rank
 
+    def paginate_query(self, offset, limit):
+        """Restrict the query to a page of the response.
+
+        Args:
+            offset (int): The index of the first entry of the page
+            limit (int): The number of entries of the page
+
+        Returns:
+            (int): The number of entries of the whole response, None when the
+                query is not paginated
+
+        """
+        return None
+
     def get_resolution(self):
         """Extract resolution or provide default.
 
@@ -290,6 +304,9 @@ class QueryHandler:
         start_filter, end_filter = self._get_time_based_filters(delta)
         filters.add(query_filter=start_filter)
         filters.add(query_filter=end_filter)
+        # The summary tables are partitioned by usage_start, which never follows
+        # usage_end. Bounding it too lets the planner skip the later partitions.
+        filters.add(QueryFilter(field="usage_start", operation="lte", parameter=end_filter.parameter))
 
         return filters
 
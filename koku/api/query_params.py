@@ -30,10 +30,14 @@ from api.models import Tenant
 from api.models import User
 from api.provider.models import Provider
 from api.report.queries import ReportQueryHandler
+from api.tags.cache import get_tag_key_catalog
 from reporting.models import OCPAllCostLineItemDailySummary
 
 LOG = logging.getLogger(__name__)
 
+# The prefixes of the filter, group by and order by parameters of a tag key
+TAG_PREFIXES = ("tag:", "and:tag:", "or:tag:")
+
 
 class QueryParameters:
     """Query parameter container object.
@@ -74,10 +78,10 @@ class QueryParameters:
         self.query_handler = caller.query_handler
         self.tag_handler = caller.tag_handler
 
-        self.tag_keys = []
+        self.tag_keys = set()
         if self.report_type != "tags":
             for tag_model in self.tag_handler:
-                self.tag_keys.extend(self._get_tag_keys(tag_model))
+                self.tag_keys.update(self._get_tag_keys(tag_model))
 
         self._validate()  # sets self.parameters
 
@@ -107,26 +111,34 @@ class QueryParameters:
         return pformat(self.__repr__())
 
     def _get_tag_keys(self, model):
-        """Get a list of tag keys to validate filters."""
-        with tenant_context(self.tenant):
-            tags = model.objects.values("key")
-            tag_list = [":".join(["tag", tag.get("key")]) for tag in tags]
-            tag_list.extend([":".join(["and:tag", tag.get("key")]) for tag in tags])
-            tag_list.extend([":".join(["or:tag", tag.get("key")]) for tag in tags])
-        return tag_list
+        """Get the set of tag keys of a tag summary model to validate filters."""
+
+        def load_keys():
+            with tenant_context(self.tenant):
+                return [tag.get("key") for tag in model.objects.values("key")]
+
+        return get_tag_key_catalog(self.tenant.schema_name, model._meta.db_table, load_keys)
+
+    def _is_tag_param(self, param):
+        """Return whether a query parameter names a known tag key."""
+        if not isinstance(param, str):
+            return False
+        for prefix in TAG_PREFIXES:
+            if param.startswith(prefix) and param.replace(prefix, "", 1) in self.tag_keys:
+                return True
+        return False
 
     def _process_tag_query_params(self, query_params):
         """Reduce the set of tag keys based on those being queried."""
-        tag_key_set = set(self.tag_keys)
         param_tag_keys = set()
         for key, value in query_params.items():
             if isinstance(value, (dict, list)):
                 for inner_key in value:
-                    if inner_key in tag_key_set:
+                    if self._is_tag_param(inner_key):
                         param_tag_keys.add(inner_key)
-            elif value in tag_key_set:
+            elif self._is_tag_param(value):
                 param_tag_keys.add(value)
-            if key in tag_key_set:
+            if self._is_tag_param(key):
                 param_tag_keys.add(key)
         return param_tag_keys
 
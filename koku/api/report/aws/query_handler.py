@@ -363,7 +363,7 @@ select coalesce(raa.account_alias, t.usage_account_id)::text as "account",
             query_table = self.query_table
             tag_results = None
             query = query_table.objects.filter(self.query_filter)
-            query_data = query.annotate(**self.annotations)
+            query_data = self._get_page_query(query).annotate(**self.annotations)
             query_group_by = ["date"] + self._get_group_by()
             query_order_by = ["-date"]
             query_order_by.extend([self.order])
@@ -417,10 +417,7 @@ select coalesce(raa.account_alias, t.usage_account_id)::text as "account",
                 else:
                     data = query_results
             else:
-                groups = copy.deepcopy(query_group_by)
-                groups.remove("date")
-                data = self._apply_group_by(query_results, groups)
-                data = self._transform_data(query_group_by, 0, data)
+                data = self._build_report_data(query_results, query_group_by)
 
         key_order = list(["units"] + list(annotations.keys()))
         ordered_total = {total_key: query_sum[total_key] for total_key in key_order if total_key in query_sum}
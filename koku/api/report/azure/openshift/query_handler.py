@@ -15,7 +15,6 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """OCP Query Handling for Reports."""
-import copy
 import logging
 
 from django.db.models import F
@@ -135,7 +134,7 @@ class OCPAzureReportQueryHandler(AzureReportQueryHandler):
 
         with tenant_context(self.tenant):
             query = self.query_table.objects.filter(self.query_filter)
-            query_data = query.annotate(**self.annotations)
+            query_data = self._get_page_query(query).annotate(**self.annotations)
             group_by_value = self._get_group_by()
             query_group_by = ["date"] + group_by_value
             query_order_by = ["-date"]
@@ -177,10 +176,7 @@ class OCPAzureReportQueryHandler(AzureReportQueryHandler):
                 else:
                     data = list(query_data)
             else:
-                groups = copy.deepcopy(query_group_by)
-                groups.remove("date")
-                data = self._apply_group_by(list(query_data), groups)
-                data = self._transform_data(query_group_by, 0, data)
+                data = self._build_report_data(list(query_data), query_group_by)
 
         init_order_keys = []
         query_sum["cost_units"] = cost_units_value
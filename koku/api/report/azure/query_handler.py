@@ -15,7 +15,6 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """Azure Query Handling for Reports."""
-import copy
 import logging
 
 from django.db.models import F
@@ -191,7 +190,7 @@ class AzureReportQueryHandler(ReportQueryHandler):
 
         with tenant_context(self.tenant):
             query = self.query_table.objects.filter(self.query_filter)
-            query_data = query.annotate(**self.annotations)
+            query_data = self._get_page_query(query).annotate(**self.annotations)
             query_group_by = ["date"] + self._get_group_by()
             query_order_by = ["-date"]
             query_order_by.extend([self.order])
@@ -220,10 +219,7 @@ class AzureReportQueryHandler(ReportQueryHandler):
                 else:
                     data = list(query_data)
             else:
-                groups = copy.deepcopy(query_group_by)
-                groups.remove("date")
-                data = self._apply_group_by(list(query_data), groups)
-                data = self._transform_data(query_group_by, 0, data)
+                data = self._build_report_data(list(query_data), query_group_by)
 
         key_order = list(["units"] + list(annotations.keys()))
         ordered_total = {total_key: query_sum[total_key] for total_key in key_order if total_key in query_sum}
@@ -0,0 +1,145 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Cache of report query results, invalidated by the data version of a tenant."""
+import hashlib
+import json
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from prometheus_client import Counter
+
+from api.utils import DateHelper
+
+LOG = logging.getLogger(__name__)
+
+REPORT_CACHE_HIT_COUNTER = Counter("report_cache_hits", "Number of report queries served from cache", ["endpoint"])
+REPORT_CACHE_MISS_COUNTER = Counter(
+    "report_cache_misses", "Number of report queries run on a cache miss", ["endpoint"]
+)
+
+# The data of each provider type the reports of a combined provider type are built from
+DATA_TYPES = {"ocp_aws": ("aws", "ocp"), "ocp_azure": ("azure", "ocp"), "ocp_all": ("aws", "azure", "ocp")}
+
+
+def get_data_types(provider_type):
+    """Return the provider types whose data a report of a provider type is built from."""
+    provider_type = provider_type.lower().replace("-local", "")
+    return DATA_TYPES.get(provider_type, (provider_type,))
+
+
+def _version_key(schema_name, data_type):
+    """Return the cache key of the data version of a schema and provider type."""
+    return f"report_data_version:{schema_name}:{data_type}"
+
+
+def get_data_version(schema_name, provider_type):
+    """Return the version of the report data of a schema and provider type.
+
+    A version lost from the cache is replaced by a new one, so results
+    cached under the lost version are not served.
+
+    Args:
+        schema_name (str): The tenant schema
+        provider_type (str): The provider type of the report
+
+    Returns:
+        (str): The version of each provider type the report is built from
+
+    """
+    cache = caches[settings.REPORT_CACHE_ALIAS]
+    keys = [_version_key(schema_name, data_type) for data_type in get_data_types(provider_type)]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    for key in missing:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+    if missing:
+        versions = cache.get_many(keys)
+    return ":".join(versions.get(key, "") for key in keys)
+
+
+def bump_data_version(schema_name, provider_type):
+    """Invalidate the cached reports built from the data of a schema and provider type.
+
+    Args:
+        schema_name (str): The tenant schema
+        provider_type (str): The provider type whose data changed
+
+    Returns:
+        (None)
+
+    """
+    cache = caches[settings.REPORT_CACHE_ALIAS]
+    for data_type in get_data_types(provider_type):
+        cache.set(_version_key(schema_name, data_type), uuid.uuid4().hex, timeout=None)
+    LOG.debug("Bumped the %s report data version of schema %s.", provider_type, schema_name)
+
+
+def _normalize(value):
+    """Sort the lists of a parameter structure, whose order does not change a report."""
+    if isinstance(value, dict):
+        return [(key, _normalize(item)) for key, item in value.items()]
+    if isinstance(value, (list, tuple, set)):
+        return sorted((_normalize(item) for item in value), key=repr)
+    return value
+
+
+def get_cache_key(view, params, page=None):
+    """Return the cache key of a report request.
+
+    The key covers the tenant, the endpoint, the validated query parameters,
+    including the filters RBAC access added, the access of the user, the
+    current date relative time scopes resolve against, the page the query
+    was restricted to, and the data version of the report's provider type.
+
+    Args:
+        view (ReportView): The view of the report
+        params (QueryParameters): The validated parameters of the request
+        page (tuple): The offset and limit of a page the query is restricted to
+
+    Returns:
+        (str): The cache key
+
+    """
+    schema_name = params.tenant.schema_name
+    key_data = {
+        "endpoint": params.request.path,
+        "parameters": _normalize(params.parameters),
+        "access": _normalize(params.access or {}),
+        "today": DateHelper().today.date().isoformat(),
+        "page": page,
+        "version": get_data_version(schema_name, view.provider),
+    }
+    digest = hashlib.sha256(json.dumps(key_data, default=str).encode("utf-8")).hexdigest()
+    return f"report:{schema_name}:{digest}"
+
+
+def get_cached_report(view, cache_key):
+    """Return the cached (output, max_rank, count) of a report, None on a miss."""
+    endpoint = type(view).__name__
+    result = caches[settings.REPORT_CACHE_ALIAS].get(cache_key)
+    if result is None:
+        REPORT_CACHE_MISS_COUNTER.labels(endpoint=endpoint).inc()
+    else:
+        REPORT_CACHE_HIT_COUNTER.labels(endpoint=endpoint).inc()
+    return result
+
+
+def set_cached_report(cache_key, output, max_rank, count=None):
+    """Cache the output, max rank and paginated entry count of a report query."""
+    caches[settings.REPORT_CACHE_ALIAS].set(cache_key, (output, max_rank, count), settings.REPORT_CACHE_TIMEOUT)
@@ -165,7 +165,7 @@ class OCPReportQueryHandler(ReportQueryHandler):
 
         with tenant_context(self.tenant):
             query = self.query_table.objects.filter(self.query_filter)
-            query_data = query.annotate(**self.annotations)
+            query_data = self._get_page_query(query).annotate(**self.annotations)
             group_by_value = self._get_group_by()
 
             query_group_by = ["date"] + group_by_value
@@ -203,12 +203,7 @@ class OCPReportQueryHandler(ReportQueryHandler):
                 else:
                     data = list(query_data)
             else:
-                # Pass in a copy of the group by without the added
-                # tag column name prefix
-                groups = copy.deepcopy(query_group_by)
-                groups.remove("date")
-                data = self._apply_group_by(list(query_data), groups)
-                data = self._transform_data(query_group_by, 0, data)
+                data = self._build_report_data(list(query_data), query_group_by)
 
         sum_init = {"cost_units": self._mapper.cost_units_key}
         if self._mapper.usage_units_key:
@@ -27,6 +27,7 @@ from decimal import InvalidOperation
 from itertools import groupby
 from urllib.parse import quote_plus
 
+from dateutil import relativedelta
 from django.db.models import Q
 from django.db.models.expressions import OrderBy
 from django.db.models.expressions import RawSQL
@@ -71,6 +72,46 @@ class ReportQueryHandler(QueryHandler):
         self.query_delta = {"value": None, "percent": None}
 
         self.query_filter = self._get_filter()
+        self._page_filter = None
+
+    def paginate_query(self, offset, limit):
+        """Restrict the report data to the date buckets of a page of the report.
+
+        The totals of the report still cover every date bucket.
+
+        Args:
+            offset (int): The index of the first date bucket of the page
+            limit (int): The number of date buckets of the page
+
+        Returns:
+            (int): The number of date buckets of the report, None when the
+                report is not paginated by date bucket
+
+        """
+        is_csv_output = self.parameters.accept_type and "text/csv" in self.parameters.accept_type
+        if self._limit or is_csv_output or not self.time_interval:
+            return None
+
+        count = len(self.time_interval)
+        self.time_interval = self.time_interval[offset : offset + limit]  # noqa
+        if not self.time_interval:
+            self._page_filter = Q(pk__in=[])
+            return count
+
+        if self.resolution == "monthly":
+            period = relativedelta.relativedelta(months=1)
+        else:
+            period = relativedelta.relativedelta(days=1)
+        page_start = self.time_interval[0].date()
+        page_end = (self.time_interval[-1] + period).date()
+        self._page_filter = Q(usage_start__gte=page_start) & Q(usage_start__lt=page_end)
+        return count
+
+    def _get_page_query(self, query):
+        """Restrict a query to the page set by paginate_query."""
+        if self._page_filter is None:
+            return query
+        return query.filter(self._page_filter)
 
     def initialize_totals(self):
         """Initialize the total response column values."""
@@ -426,6 +467,65 @@ class ReportQueryHandler(QueryHandler):
             bucket_by_date[date] = grouped
         return bucket_by_date
 
+    def _build_report_data(self, query_data, query_group_by):
+        """Build the date and group nested report data of the query rows in one pass.
+
+        The rows are placed in their date bucket and groups in the order they
+        arrive, as _apply_group_by and _transform_data place them. Reports
+        grouped by more than two groups keep using those methods, which
+        merge the repeated groups of a date in their own order.
+
+        Args:
+            query_data (List(Dict)): The queried rows, ordered
+            query_group_by (list): The date followed by the groups of the report
+
+        Returns:
+            (list): The nested report data
+
+        """
+        groups = query_group_by[1:]
+        if len(groups) > 2:
+            data = self._apply_group_by(query_data, list(groups))
+            return self._transform_data(query_group_by, 0, data)
+
+        tag_prefix = self._mapper.tag_column + "__"
+        pack = self._mapper.PACK_DEFINITIONS
+        titles = [
+            group.replace(tag_prefix, "", 1) if group.startswith(tag_prefix) else group for group in query_group_by
+        ]
+        labels = [f"{title}s" for title in titles[1:]] + ["values"]
+        null_labels = [(group, f"no-{title}") for group, title in zip(groups, titles[1:])]
+
+        data = []
+        buckets = {}
+        for item in self.time_interval:
+            date_string = self.date_to_string(item)
+            entry = {titles[0]: date_string, labels[0]: []}
+            data.append(entry)
+            buckets[date_string] = (entry[labels[0]], {})
+
+        for result in query_data:
+            if self._limit and result.get("rank"):
+                del result["rank"]
+            for group, null_label in null_labels:
+                if group in result and result[group] is None:
+                    result[group] = null_label
+            bucket = buckets.get(result.get("date"))
+            if bucket is None:
+                continue
+            entries, index = bucket
+            for level, group in enumerate(groups, start=1):
+                key = result.get(group)
+                child = index.get(key)
+                if child is None:
+                    label = key if key is not None else f"no-{titles[level]}"
+                    entry = {titles[level]: label, labels[level]: []}
+                    entries.append(entry)
+                    child = index[key] = (entry[labels[level]], {})
+                entries, index = child
+            entries.append(self._pack_data_object(result, **pack))
+        return data
+
     def _initialize_response_output(self, parameters):
         """Initialize output response object."""
         output = copy.deepcopy(parameters.parameters)
@@ -34,6 +34,8 @@ from tenant_schemas.utils import tenant_context
 
 from api.report.test import FakeAWSCostData
 from api.utils import DateHelper
+from masu.database import AWS_CUR_TABLE_MAP
+from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.processor.tasks import refresh_materialized_views
 from reporting.models import AWSAccountAlias
 from reporting.models import AWSCostEntry
@@ -152,6 +154,9 @@ class AWSReportDataGenerator:
             data_start = data.usage_start
             data_end = data.usage_end
             current = data_start
+            accessor = AWSReportDBAccessor(self.tenant.schema_name)
+            for table_name in (AWS_CUR_TABLE_MAP["line_item"], AWS_CUR_TABLE_MAP["line_item_daily_summary"]):
+                accessor.create_table_partitions(table_name, data_start, data_end)
 
             while current < data_end:
                 end_hour = current + DateHelper().one_hour
@@ -117,6 +117,17 @@ class AWSReportQueryTest(IamTestCase):
         out_data = handler._apply_group_null_label(data, groups)
         self.assertEqual(expected, out_data)
 
+    def test_get_filter_bounds_usage_start(self):
+        """Test that usage_start is bounded on both sides so summary partitions can be skipped."""
+        url = "?filter[time_scope_units]=month&filter[time_scope_value]=-2&filter[resolution]=monthly"
+        query_params = self.mocked_query_params(url, AWSCostView)
+        handler = AWSReportQueryHandler(query_params)
+        filters = handler._get_filter()
+        with tenant_context(self.tenant):
+            sql = str(AWSCostEntryLineItemDailySummary.objects.filter(filters).query)
+        self.assertIn(f'"usage_start" >= {handler.start_datetime.date()}', sql)
+        self.assertIn(f'"usage_start" <= {handler.end_datetime.date()}', sql)
+
     def test_transform_null_group(self):
         """Test transform data with null group value."""
         url = "?"
@@ -30,6 +30,8 @@ from tenant_schemas.utils import tenant_context
 
 from api.iam.serializers import _currency_symbols
 from api.utils import DateHelper
+from masu.database import AZURE_REPORT_TABLE_MAP
+from masu.database.azure_report_db_accessor import AzureReportDBAccessor
 from reporting.models import AzureCostEntryBill
 from reporting.models import AzureCostEntryLineItemDaily
 from reporting.models import AzureCostEntryLineItemDailySummary
@@ -529,6 +531,9 @@ class AzureReportDataGenerator:
     def _cost_entry_line_item_daily_summary(self, report_date=None):
         """Populate AzureCostEntryLineItemDailySummary."""
         line_item = self._cost_entry_line_item_daily(report_date)
+        AzureReportDBAccessor(self.tenant.schema_name).create_table_partitions(
+            AZURE_REPORT_TABLE_MAP["line_item_daily_summary"], line_item.usage_date, line_item.usage_date
+        )
         obj = AzureCostEntryLineItemDailySummary(
             cost_entry_bill=line_item.cost_entry_bill,
             meter=line_item.meter,
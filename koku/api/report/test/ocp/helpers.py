@@ -38,6 +38,8 @@ from jinjasql import JinjaSql
 from tenant_schemas.utils import tenant_context
 
 from api.utils import DateHelper
+from masu.database import OCP_REPORT_TABLE_MAP
+from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
 from reporting.models import CostSummary
 from reporting.models import OCPNodeLabelLineItem
 from reporting.models import OCPNodeLabelLineItemDaily
@@ -217,6 +219,9 @@ class OCPReportDataGenerator:
         }
         report_period, _ = OCPUsageReportPeriod.objects.get_or_create(**data)
         # report_period.save()
+        accessor = OCPReportDBAccessor(self.tenant.schema_name)
+        for table_name in (OCP_REPORT_TABLE_MAP["line_item"], OCP_REPORT_TABLE_MAP["line_item_daily_summary"]):
+            accessor.create_table_partitions(table_name, period[0], period[1])
         return report_period
 
     def create_ocp_report(self, period, interval_start):
@@ -299,6 +304,7 @@ class OCPReportDataGenerator:
             data = {
                 "report_period": report_period,
                 "report": report,
+                "usage_start": report.interval_start,
                 "namespace": row.get("namespace"),
                 "pod": row.get("pod"),
                 "node": row.get("node"),
@@ -36,6 +36,8 @@ from api.provider.models import ProviderInfrastructureMap
 from api.report.test import FakeAWSCostData
 from api.report.test.ocp.helpers import OCPReportDataGenerator
 from api.utils import DateHelper
+from masu.database import AWS_CUR_TABLE_MAP
+from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from reporting.models import AWSAccountAlias
 from reporting.models import AWSCostEntry
 from reporting.models import AWSCostEntryBill
@@ -148,6 +150,9 @@ class OCPAWSReportDataGenerator(OCPReportDataGenerator):
             data_start = self.aws_info.usage_start
             data_end = self.aws_info.usage_end
             current = data_start
+            accessor = AWSReportDBAccessor(self.tenant.schema_name)
+            for table_name in (AWS_CUR_TABLE_MAP["line_item"], AWS_CUR_TABLE_MAP["line_item_daily_summary"]):
+                accessor.create_table_partitions(table_name, data_start, data_end)
 
             while current < data_end:
                 end_hour = current + DateHelper().one_hour
@@ -0,0 +1,107 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the report query result cache."""
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.iam.test.iam_test_case import IamTestCase
+from api.provider.models import Provider
+from api.report.aws.query_handler import AWSReportQueryHandler
+from api.report.cache import bump_data_version
+from api.report.cache import get_data_types
+from api.report.cache import get_data_version
+
+
+@override_settings(REPORT_CACHE=True)
+class ReportCacheTest(IamTestCase):
+    """Tests of the report query result cache."""
+
+    def setUp(self):
+        """Set up the cache tests."""
+        super().setUp()
+        caches["default"].clear()
+        self.client = APIClient()
+
+    def test_get_data_types(self):
+        """Test that combined provider types depend on the data of each of their types."""
+        self.assertEqual(get_data_types(Provider.PROVIDER_AWS_LOCAL), ("aws",))
+        self.assertEqual(get_data_types("ocp"), ("ocp",))
+        self.assertEqual(get_data_types(Provider.OCP_AZURE), ("azure", "ocp"))
+        self.assertEqual(get_data_types(Provider.OCP_ALL), ("aws", "azure", "ocp"))
+
+    def test_bump_data_version(self):
+        """Test that a bump changes the versions of the reports built from the data."""
+        aws_version = get_data_version(self.schema_name, Provider.PROVIDER_AWS)
+        ocp_version = get_data_version(self.schema_name, Provider.PROVIDER_OCP)
+        ocp_aws_version = get_data_version(self.schema_name, Provider.OCP_AWS)
+        self.assertEqual(aws_version, get_data_version(self.schema_name, Provider.PROVIDER_AWS))
+
+        bump_data_version(self.schema_name, Provider.PROVIDER_OCP)
+
+        self.assertEqual(aws_version, get_data_version(self.schema_name, Provider.PROVIDER_AWS))
+        self.assertNotEqual(ocp_version, get_data_version(self.schema_name, Provider.PROVIDER_OCP))
+        self.assertNotEqual(ocp_aws_version, get_data_version(self.schema_name, Provider.OCP_AWS))
+
+    def test_cache_hit_skips_query(self):
+        """Test that a repeated request is served without running its query."""
+        url = reverse("reports-aws-costs") + "?filter[time_scope_units]=month&filter[resolution]=monthly"
+        with patch.object(AWSReportQueryHandler, "execute_query", autospec=True) as mock_execute:
+            mock_execute.return_value = {"data": [{"date": "2020-04"}]}
+            first = self.client.get(url, **self.headers)
+            second = self.client.get(url, **self.headers)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.json(), second.json())
+        mock_execute.assert_called_once()
+
+    def test_cache_invalidated_by_data_version(self):
+        """Test that a request is queried again after the data of its provider type changed."""
+        url = reverse("reports-aws-costs")
+        with patch.object(AWSReportQueryHandler, "execute_query", autospec=True) as mock_execute:
+            mock_execute.return_value = {"data": []}
+            self.client.get(url, **self.headers)
+            bump_data_version(self.schema_name, Provider.PROVIDER_AZURE)
+            self.client.get(url, **self.headers)
+            self.assertEqual(mock_execute.call_count, 1)
+
+            bump_data_version(self.schema_name, Provider.PROVIDER_AWS)
+            self.client.get(url, **self.headers)
+            self.assertEqual(mock_execute.call_count, 2)
+
+    def test_cache_key_varies_with_parameters(self):
+        """Test that requests with different parameters are queried separately."""
+        url = reverse("reports-aws-costs")
+        with patch.object(AWSReportQueryHandler, "execute_query", autospec=True) as mock_execute:
+            mock_execute.return_value = {"data": []}
+            self.client.get(url + "?group_by[service]=*", **self.headers)
+            self.client.get(url + "?group_by[account]=*", **self.headers)
+        self.assertEqual(mock_execute.call_count, 2)
+
+    @override_settings(REPORT_CACHE=False)
+    def test_cache_disabled(self):
+        """Test that each request is queried when the cache is disabled."""
+        url = reverse("reports-aws-costs")
+        with patch.object(AWSReportQueryHandler, "execute_query", autospec=True) as mock_execute:
+            mock_execute.return_value = {"data": []}
+            self.client.get(url, **self.headers)
+            self.client.get(url, **self.headers)
+        self.assertEqual(mock_execute.call_count, 2)
@@ -15,6 +15,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """Test the Report Queries."""
+import copy
+import random
 from unittest.mock import Mock
 
 from django.test import TestCase
@@ -24,6 +26,7 @@ from api.iam.test.iam_test_case import IamTestCase
 from api.query_filter import QueryFilter
 from api.query_filter import QueryFilterCollection
 from api.report.aws.query_handler import AWSReportQueryHandler
+from api.report.aws.view import AWSCostView
 from api.report.azure.openshift.query_handler import OCPAzureReportQueryHandler
 from api.report.azure.query_handler import AzureReportQueryHandler
 from api.report.ocp.query_handler import OCPReportQueryHandler
@@ -347,6 +350,55 @@ class ReportQueryHandlerTest(IamTestCase):
         self.assertIsInstance(output, QueryFilterCollection)
         assertSameQ(output.compose(), expected.compose())
 
+    def test_build_report_data(self):
+        """Test that the report data built in one pass matches the grouped and transformed rows."""
+        rng = random.Random(0)
+        group_bys = (
+            [],
+            ["account"],
+            ["account", "service"],
+            ["account", "region", "service"],
+            ["tags__app"],
+            ["account", "tags__app"],
+        )
+        for group_by in group_bys:
+            with self.subTest(group_by=group_by):
+                url = "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=daily"
+                url += "".join(f"&group_by[{group}]=*" for group in group_by if not group.startswith("tags__"))
+                params = self.mocked_query_params(url, AWSCostView)
+                handler = AWSReportQueryHandler(params)
+                query_group_by = ["date"] + group_by
+                dates = [handler.date_to_string(item) for item in handler.time_interval]
+                rows = []
+                for date in dates:
+                    for values in {tuple(rng.choice([None, "a", "b", "c"]) for _ in group_by) for _ in range(8)}:
+                        row = {"date": date, "cost": rng.random(), "cost_units": "USD"}
+                        row.update(zip(group_by, values))
+                        rows.append(row)
+                rng.shuffle(rows)
+
+                groups = query_group_by[1:]
+                expected = handler._transform_data(
+                    query_group_by, 0, handler._apply_group_by(copy.deepcopy(rows), groups)
+                )
+                self.assertEqual(handler._build_report_data(copy.deepcopy(rows), query_group_by), expected)
+
+    def test_build_report_data_tag_group_by(self):
+        """Test that tag groups are titled and labelled without the tag column prefix."""
+        url = "?filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=daily"
+        params = self.mocked_query_params(url, AWSCostView)
+        handler = AWSReportQueryHandler(params)
+        date = handler.date_to_string(handler.time_interval[0])
+        rows = [
+            {"date": date, "tags__app": "web", "cost": 1.0, "cost_units": "USD"},
+            {"date": date, "tags__app": None, "cost": 2.0, "cost_units": "USD"},
+        ]
+
+        data = handler._build_report_data(rows, ["date", "tags__app"])
+
+        self.assertEqual([entry["app"] for entry in data[0]["apps"]], ["web", "no-app"])
+        self.assertEqual(len(data[0]["apps"][1]["values"]), 1)
+
     # FIXME: need test for _apply_group_by
     # FIXME: need test for _apply_group_null_label
     # FIXME: need test for _build_custom_filter_list  }
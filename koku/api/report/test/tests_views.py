@@ -16,6 +16,7 @@
 #
 """Test the Report views."""
 from django.test import RequestFactory
+from django.test.utils import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -24,9 +25,10 @@ from rest_framework_csv.renderers import CSVRenderer
 from api.common.pagination import ReportPagination
 from api.common.pagination import ReportRankedPagination
 from api.iam.test.iam_test_case import IamTestCase
-from api.report.view import _fill_in_missing_units
+from api.report.view import _convert_units
 from api.report.view import _find_unit
 from api.report.view import get_paginator
+from api.utils import UnitConverter
 
 
 class ReportViewTest(IamTestCase):
@@ -134,42 +136,46 @@ class ReportViewTest(IamTestCase):
         result_unit = _find_unit()(data)
         self.assertIsNone(result_unit)
 
-    def test_fill_in_missing_units_dict(self):
-        """Test that missing units are filled in for a dictionary."""
-        expected_unit = "Hrs"
-        data = {"date": "2018-07-22", "units": "", "instance_type": "t2.micro", "total": 30.0, "count": 0}
-        result = _fill_in_missing_units(expected_unit)(data)
-        self.assertEqual(result.get("units"), expected_unit)
-
-    def test_fill_in_missing_units_list(self):
-        """Test that missing units are filled in."""
-        expected_unit = "Hrs"
-        data = [
-            # AWS
-            {"date": "2018-07-22", "units": "", "instance_type": "t2.micro", "total": 30.0, "count": 0},
-            {"date": "2018-07-22", "units": expected_unit, "instance_type": "t2.small", "total": 17.0, "count": 0},
-            {"date": "2018-07-22", "units": expected_unit, "instance_type": "t2.micro", "total": 1.0, "count": 0},
-            # Azure
-            {"date": "2018-07-22", "units": "", "instance_type": "Standard_A1_v2", "total": 30.0, "count": 0},
-            {
-                "date": "2018-07-22",
-                "units": expected_unit,
-                "instance_type": "Standard_A2m_v2",
-                "total": 17.0,
-                "count": 0,
-            },  # noqa: E501
-            {
-                "date": "2018-07-22",
-                "units": expected_unit,
-                "instance_type": "Standard_A1_v2",
-                "total": 1.0,
-                "count": 0,
-            },
+    def test_convert_units_fills_in_missing_units(self):
+        """Test that totals with empty units convert from the report unit, keeping the -Mo suffix."""
+        data = {
+            "total": {"value": 2.0, "units": "GB-Mo"},
+            "data": [{"values": [{"total": 1.5, "units": ""}, {"total": 3.0, "units": "GB-Mo"}]}],
+        }
+        converter = UnitConverter()
+        result = _convert_units(converter, data, "TB", missing_unit="GB-Mo")
+
+        def expected(value):
+            return converter.convert_quantity(value, "GB", "TB").magnitude
+
+        self.assertEqual(result["total"], {"value": expected(2.0), "units": "TB-Mo"})
+        values = result["data"][0]["values"]
+        self.assertEqual(values[0], {"total": expected(1.5), "units": "TB-Mo"})
+        self.assertEqual(values[1], {"total": expected(3.0), "units": "TB-Mo"})
+
+    def test_query_pagination_matches_response_pagination(self):
+        """Test that reports paginated in their query have the data, count and links sliced from the whole report."""
+        queries = [
+            "filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=daily&limit=5&offset=3",
+            "filter[time_scope_units]=day&filter[time_scope_value]=-30&filter[resolution]=daily&limit=7&offset=28",
+            "filter[time_scope_units]=day&filter[time_scope_value]=-10&filter[resolution]=daily&offset=20",
+            "filter[time_scope_units]=month&filter[time_scope_value]=-1&filter[resolution]=monthly&group_by[{}]=*",
         ]
-        unit = _find_unit()(data)
-        result = _fill_in_missing_units(unit)(data)
-        for entry in result:
-            self.assertEqual(entry.get("units"), expected_unit)
+        group_bys = {
+            "reports-aws-costs": "service",
+            "reports-openshift-cpu": "project",
+            "reports-openshift-aws-costs": "project",
+        }
+        for endpoint, group_by in group_bys.items():
+            for query in queries:
+                query = query.format(group_by)
+                with self.subTest(endpoint=endpoint, query=query):
+                    url = reverse(endpoint) + "?" + query
+                    expected = self.client.get(url, **self.headers)
+                    with override_settings(REPORT_QUERY_PAGINATION=True):
+                        response = self.client.get(url, **self.headers)
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    self.assertEqual(response.json(), expected.json())
 
     def test_get_paginator_default(self):
         """Test that the standard report paginator is returned."""
@@ -17,6 +17,7 @@
 """View for Reports."""
 import logging
 
+from django.conf import settings
 from django.utils.translation import ugettext as _
 from django.views.decorators.vary import vary_on_headers
 from pint.errors import DimensionalityError
@@ -28,8 +29,12 @@ from rest_framework.views import APIView
 
 from api.common import RH_IDENTITY_HEADER
 from api.common.pagination import ReportPagination
+from api.common.pagination import ReportQueryPagination
 from api.common.pagination import ReportRankedPagination
 from api.query_params import QueryParameters
+from api.report.cache import get_cache_key
+from api.report.cache import get_cached_report
+from api.report.cache import set_cached_report
 from api.utils import UnitConverter
 
 LOG = logging.getLogger(__name__)
@@ -65,64 +70,59 @@ def _find_unit():
     return __unit_finder
 
 
-def _fill_in_missing_units(unit):
-    """Fill in missing unit information."""
+def _convert_total(converter, value, from_unit, to_unit):
+    """Convert the magnitude of a total, keeping the -Mo suffix of its unit.
 
-    def __unit_filler(data):
-        if isinstance(data, list):
-            for entry in data:
-                __unit_filler(entry)
-        elif isinstance(data, dict):
-            for key in data:
-                if key == "units":
-                    if not data[key]:
-                        data[key] = unit
-                else:
-                    __unit_filler(data[key])
-        return data
+    Args:
+        converter (api.utils.UnitConverter) Object doing unit conversion
+        value (Any numeric type): The magnitude of the total
+        from_unit (str): The unit of the total
+        to_unit (str): The unit type to convert to
 
-    return __unit_filler
+    Returns:
+        (tuple) The converted magnitude and its unit
+
+    """
+    suffix = None
+    if "-Mo" in from_unit:
+        from_unit, suffix = from_unit.split("-")
+    new_value = converter.convert_magnitude(value, from_unit, to_unit)
+    return new_value, to_unit + "-" + suffix if suffix else to_unit
 
 
-def _convert_units(converter, data, to_unit):
+def _convert_units(converter, data, to_unit, missing_unit=None):
     """Convert the units in a JSON structured report.
 
+    Each total is multiplied by the factor of its units, computed once per
+    pair of units, in a single walk of the report.
+
     Args:
         converter (api.utils.UnitConverter) Object doing unit conversion
         data (list,dict): The current block of the report being converted
         to_unit (str): The unit type to convert to
+        missing_unit (str): The unit filled in where a block has empty units
 
     Returns:
         (dict) The final return will be the unit converted report
 
     """
-    suffix = None
     if isinstance(data, list):
         for entry in data:
-            _convert_units(converter, entry, to_unit)
+            _convert_units(converter, entry, to_unit, missing_unit)
     elif isinstance(data, dict):
-        for key in data:
-            if key == "total" and isinstance(data[key], dict):
-                total = data[key]
-                value = total.get("value")
-                from_unit = total.get("units", "")
-                if "-Mo" in from_unit:
-                    from_unit, suffix = from_unit.split("-")
-                new_value = converter.convert_quantity(value, from_unit, to_unit)
-                total["value"] = new_value.magnitude
-                new_unit = to_unit + "-" + suffix if suffix else to_unit
-                total["units"] = new_unit
-            elif key == "total" and not isinstance(data[key], dict):
-                total = data[key]
-                from_unit = data.get("units", "")
-                if "-Mo" in from_unit:
-                    from_unit, suffix = from_unit.split("-")
-                new_value = converter.convert_quantity(total, from_unit, to_unit)
-                data["total"] = new_value.magnitude
-                new_unit = to_unit + "-" + suffix if suffix else to_unit
-                data["units"] = new_unit
+        if missing_unit and "units" in data and not data["units"]:
+            data["units"] = missing_unit
+        for key, value in list(data.items()):
+            if key == "total" and isinstance(value, dict):
+                if missing_unit and "units" in value and not value["units"]:
+                    value["units"] = missing_unit
+                value["value"], value["units"] = _convert_total(
+                    converter, value.get("value"), value.get("units", ""), to_unit
+                )
+            elif key == "total":
+                data["total"], data["units"] = _convert_total(converter, value, data.get("units", ""), to_unit)
             else:
-                _convert_units(converter, data[key], to_unit)
+                _convert_units(converter, value, to_unit, missing_unit)
 
     return data
 
@@ -135,6 +135,38 @@ class ReportView(APIView):
     It providers one GET endpoint for the reports.
     """
 
+    def _execute_query(self, request, params):
+        """Run the report query, or read its result from the report cache.
+
+        With REPORT_QUERY_PAGINATION, the query is restricted to the page
+        requested, and the count of the whole report is returned for the
+        pagination of the response.
+
+        Args:
+            request (Request): The HTTP request object
+            params (QueryParameters): The validated parameters of the request
+
+        Returns:
+            (tuple): The report output, its max rank and its paginated entry count
+
+        """
+        page = None
+        if settings.REPORT_QUERY_PAGINATION and "offset" not in params.parameters.get("filter", {}):
+            page = ReportQueryPagination().get_page(request)
+
+        cache_key = get_cache_key(self, params, page) if settings.REPORT_CACHE else None
+        cached = get_cached_report(self, cache_key) if cache_key else None
+        if cached:
+            return cached
+
+        handler = self.query_handler(params)
+        count = handler.paginate_query(*page) if page else None
+        output = handler.execute_query()
+        max_rank = handler.max_rank
+        if cache_key:
+            set_cached_report(cache_key, output, max_rank, count)
+        return output, max_rank, count
+
     @vary_on_headers(RH_IDENTITY_HEADER)
     def get(self, request):
         """Get Report Data.
@@ -154,9 +186,7 @@ class ReportView(APIView):
             params = QueryParameters(request=request, caller=self)
         except ValidationError as exc:
             return Response(data=exc.detail, status=status.HTTP_400_BAD_REQUEST)
-        handler = self.query_handler(params)
-        output = handler.execute_query()
-        max_rank = handler.max_rank
+        output, max_rank, count = self._execute_query(request, params)
 
         if "units" in params.parameters:
             from_unit = _find_unit()(output["data"])
@@ -164,13 +194,15 @@ class ReportView(APIView):
                 try:
                     to_unit = params.parameters.get("units")
                     unit_converter = UnitConverter()
-                    output = _fill_in_missing_units(from_unit)(output)
-                    output = _convert_units(unit_converter, output, to_unit)
+                    output = _convert_units(unit_converter, output, to_unit, missing_unit=from_unit)
                 except (DimensionalityError, UndefinedUnitError):
                     error = {"details": _("Unit conversion failed.")}
                     raise ValidationError(error)
 
-        paginator = get_paginator(params.parameters.get("filter", {}), max_rank)
+        if count is None:
+            paginator = get_paginator(params.parameters.get("filter", {}), max_rank)
+        else:
+            paginator = ReportQueryPagination(count)
         paginated_result = paginator.paginate_queryset(output, request)
         LOG.debug(f"DATA: {output}")
         return paginator.get_paginated_response(paginated_result)
@@ -20,7 +20,9 @@ from django.utils.translation import ugettext as _
 from rest_framework.serializers import ValidationError
 from tenant_schemas.utils import schema_context
 
+from api.provider.models import Provider
 from api.query_params import QueryParameters
+from api.report.cache import bump_data_version
 from api.settings.utils import create_dual_list_select
 from api.settings.utils import create_plain_text
 from api.settings.utils import create_subform
@@ -28,6 +30,7 @@ from api.settings.utils import create_tab_item
 from api.settings.utils import OPENSHIFT_TAG_MGMT_SETTINGS_PREFIX
 from api.tags.ocp.queries import OCPTagQueryHandler
 from api.tags.ocp.view import OCPTagView
+from masu.processor.tasks import update_enabled_pod_labels
 from reporting.models import OCPEnabledTagKeys
 
 
@@ -157,6 +160,12 @@ class OpenShiftSettings:
                 OCPEnabledTagKeys.objects.create(key=new_tag)
                 updated = True
 
+        if updated:
+            # Only the daily line items labelled with a changed key are projected again
+            changed_keys = enabled_tags + [rm_tag.key for rm_tag in remove_tags]
+            update_enabled_pod_labels.delay(self.schema, changed_keys)
+            bump_data_version(self.schema, Provider.PROVIDER_OCP)
+
         return updated
 
     def handle_settings(self, settings):
@@ -15,6 +15,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """Test the Settings views."""
+from unittest.mock import patch
+
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -86,7 +88,8 @@ class SettingsViewTest(IamTestCase):
         tag = query_output.get("data")[0]
         self.assertIn(tag, all_key_values)
 
-    def test_post_settings_ocp_tag_enabled(self):
+    @patch("api.settings.ocp.update_enabled_pod_labels")
+    def test_post_settings_ocp_tag_enabled(self, mock_update):
         """Test setting OCP tags as enabled."""
         url = (
             "?filter[time_scope_units]=month&filter[time_scope_value]=-1"
@@ -106,6 +109,8 @@ class SettingsViewTest(IamTestCase):
         duallist = self.get_duallist_from_response(response)
         enabled = duallist.get("initialValue")
         self.assertIn(tag, enabled)
+        mock_update.delay.assert_called()
+        self.assertIn(tag, mock_update.delay.call_args[0][1])
 
     def test_post_settings_ocp_tag_enabled_invalid_tag(self):
         """Test setting OCP tags as enabled with invalid tag key."""
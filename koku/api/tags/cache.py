@@ -0,0 +1,86 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Cache of the tag keys of the tag summary tables of a tenant."""
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+LOG = logging.getLogger(__name__)
+
+# The catalogs read by this process, keyed by (schema, table), with their version
+_LOCAL_CATALOGS = {}
+
+
+def _version_key(schema_name, table_name):
+    """Return the cache key of the catalog version of a tag summary table."""
+    return f"tag_key_version:{schema_name}:{table_name}"
+
+
+def get_tag_key_catalog(schema_name, table_name, load_keys):
+    """Return the tag keys of a tag summary table of a schema.
+
+    The keys are cached in the shared cache, and in the process as long as
+    the version of the catalog in the shared cache does not change.
+
+    Args:
+        schema_name (str): The tenant schema
+        table_name (str): The tag summary table
+        load_keys (callable): Returns the tag keys of the table from the database
+
+    Returns:
+        (frozenset): The tag keys of the table
+
+    """
+    if not settings.TAG_KEY_CACHE:
+        return frozenset(load_keys())
+
+    cache = caches[settings.TAG_KEY_CACHE_ALIAS]
+    version_key = _version_key(schema_name, table_name)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(version_key)
+
+    local = _LOCAL_CATALOGS.get((schema_name, table_name))
+    if local and version is not None and local[0] == version:
+        return local[1]
+
+    catalog_key = f"tag_key_catalog:{schema_name}:{table_name}:{version}"
+    keys = cache.get(catalog_key)
+    if keys is None:
+        keys = list(set(load_keys()))
+        cache.set(catalog_key, keys, settings.TAG_KEY_CACHE_TIMEOUT)
+    keys = frozenset(keys)
+    _LOCAL_CATALOGS[(schema_name, table_name)] = (version, keys)
+    return keys
+
+
+def invalidate_tag_key_catalog(schema_name, table_name):
+    """Have the tag keys of a tag summary table read again from the database.
+
+    Args:
+        schema_name (str): The tenant schema
+        table_name (str): The tag summary table
+
+    Returns:
+        (None)
+
+    """
+    caches[settings.TAG_KEY_CACHE_ALIAS].set(_version_key(schema_name, table_name), uuid.uuid4().hex, timeout=None)
+    LOG.debug("Invalidated the tag key catalog of %s in schema %s.", table_name, schema_name)
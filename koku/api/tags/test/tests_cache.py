@@ -0,0 +1,79 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the tag key catalog cache."""
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from api.tags import cache as tag_cache
+from api.tags.cache import get_tag_key_catalog
+from api.tags.cache import invalidate_tag_key_catalog
+
+
+@override_settings(TAG_KEY_CACHE=True)
+class TagKeyCatalogTest(TestCase):
+    """Tests of the tag key catalog cache."""
+
+    def setUp(self):
+        """Clear the shared and local catalogs."""
+        caches["default"].clear()
+        patcher = patch.dict(tag_cache._LOCAL_CATALOGS, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_catalog_loaded_once(self):
+        """Test that the tag keys are loaded once and returned as a set."""
+        load_keys = Mock(return_value=["app", "environment", "app"])
+        for _ in range(3):
+            keys = get_tag_key_catalog("acct10001", "reporting_awstags_summary", load_keys)
+        self.assertEqual(keys, frozenset({"app", "environment"}))
+        load_keys.assert_called_once()
+
+    def test_catalog_shared_between_processes(self):
+        """Test that a process without a local catalog reads the shared one."""
+        get_tag_key_catalog("acct10001", "reporting_awstags_summary", Mock(return_value=["app"]))
+        tag_cache._LOCAL_CATALOGS.clear()
+
+        load_keys = Mock(return_value=["other"])
+        keys = get_tag_key_catalog("acct10001", "reporting_awstags_summary", load_keys)
+        self.assertEqual(keys, frozenset({"app"}))
+        load_keys.assert_not_called()
+
+    def test_invalidate_catalog(self):
+        """Test that the tag keys of a table are loaded again once it is invalidated."""
+        get_tag_key_catalog("acct10001", "reporting_awstags_summary", Mock(return_value=["app"]))
+        get_tag_key_catalog("acct10001", "reporting_azuretags_summary", Mock(return_value=["app"]))
+
+        invalidate_tag_key_catalog("acct10001", "reporting_awstags_summary")
+
+        keys = get_tag_key_catalog("acct10001", "reporting_awstags_summary", Mock(return_value=["app", "new"]))
+        self.assertEqual(keys, frozenset({"app", "new"}))
+        load_keys = Mock(return_value=["new"])
+        keys = get_tag_key_catalog("acct10001", "reporting_azuretags_summary", load_keys)
+        self.assertEqual(keys, frozenset({"app"}))
+        load_keys.assert_not_called()
+
+    @override_settings(TAG_KEY_CACHE=False)
+    def test_cache_disabled(self):
+        """Test that the tag keys are loaded on each call when the cache is disabled."""
+        load_keys = Mock(return_value=["app"])
+        get_tag_key_catalog("acct10001", "reporting_awstags_summary", load_keys)
+        get_tag_key_catalog("acct10001", "reporting_awstags_summary", load_keys)
+        self.assertEqual(load_keys.call_count, 2)
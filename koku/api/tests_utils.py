@@ -18,6 +18,7 @@
 import datetime
 import random
 import unittest
+from decimal import Decimal
 
 import pint
 from dateutil.relativedelta import relativedelta
@@ -221,3 +222,20 @@ class APIUtilsUnitConverterTest(TestCase):
 
         self.assertEqual(result.units, to_unit)
         self.assertEqual(result.magnitude, expected_value)
+
+    def test_registry_shared(self):
+        """Test that converters share the unit registry of the process."""
+        self.assertIs(UnitConverter().unit_registry, self.converter.unit_registry)
+
+    def test_convert_magnitude(self):
+        """Test that magnitudes convert as quantities do."""
+        for value in (random.randint(1, 9), random.random() * 100):
+            with self.subTest(value=value):
+                expected = self.converter.convert_quantity(value, "GB", "TB").magnitude
+                self.assertEqual(self.converter.convert_magnitude(value, "GB", "TB"), expected)
+
+        result = self.converter.convert_magnitude(Decimal("1.5"), "gigabyte", "byte")
+        self.assertEqual(result, Decimal("1500000000"))
+
+        with self.assertRaises(UndefinedUnitError):
+            self.converter.convert_magnitude(1, "Gigglebots", "byte")
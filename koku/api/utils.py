@@ -17,12 +17,17 @@
 """Unit conversion util functions."""
 import calendar
 import datetime
+from decimal import Decimal
+from functools import lru_cache
 
 import pint
 import pytz
 from django.utils import timezone
 from pint.errors import UndefinedUnitError
 
+# Loading the unit definitions is slow, the registry is shared by the process
+UNIT_REGISTRY = pint.UnitRegistry()
+
 
 def merge_dicts(*list_of_dicts):
     """Merge a list of dictionaries and combine common keys into a list of values.
@@ -244,7 +249,7 @@ class UnitConverter:
 
     def __init__(self):
         """Initialize the UnitConverter."""
-        self.unit_registry = pint.UnitRegistry()
+        self.unit_registry = UNIT_REGISTRY
         self.Quantity = self.unit_registry.Quantity
 
     def validate_unit(self, unit):
@@ -294,3 +299,43 @@ class UnitConverter:
         from_unit = self.validate_unit(from_unit)
         to_unit = self.validate_unit(to_unit)
         return self.Quantity(value, from_unit).to(to_unit)
+
+    def get_conversion_factor(self, from_unit, to_unit):
+        """Return the factor converting magnitudes between comparable units.
+
+        The factor of each pair of units is computed once per process.
+
+        Args:
+            from_unit (str): The starting unit to convert from
+            to_unit (str): The ending unit to convert to
+
+        Returns:
+            (float): The factor to multiply magnitudes in from_unit by
+
+        """
+        return _conversion_factor(from_unit, to_unit)
+
+    def convert_magnitude(self, value, from_unit, to_unit):
+        """Convert a magnitude between comparable units with their cached factor.
+
+        Args:
+            value (Any numeric type): The magnitude of the quantity
+            from_unit (str): The starting unit to convert from
+            to_unit (str): The ending unit to convert to
+
+        Returns:
+            (Any numeric type): The magnitude in to_unit
+
+        """
+        factor = self.get_conversion_factor(from_unit, to_unit)
+        if isinstance(value, Decimal):
+            return value * Decimal(repr(factor))
+        return value * factor
+
+
+# Bounded, the units come from the request and the report data
+@lru_cache(maxsize=256)
+def _conversion_factor(from_unit, to_unit):
+    """Return the factor converting magnitudes from one unit to another."""
+    converter = UnitConverter()
+    return converter.convert_quantity(1, from_unit, to_unit).magnitude
@@ -141,6 +141,18 @@ MIDDLEWARE.extend(
 CACHE_MIDDLEWARE_ALIAS = "default"
 CACHE_MIDDLEWARE_SECONDS = ENVIRONMENT.get_value("CACHE_TIMEOUT", default=3600)
 
+# Report query results, invalidated when the report data of a tenant changes
+REPORT_CACHE = ENVIRONMENT.bool("REPORT_CACHE", default=False)
+REPORT_CACHE_ALIAS = "default"
+REPORT_CACHE_TIMEOUT = ENVIRONMENT.int("REPORT_CACHE_TIMEOUT", default=86400)
+# Query only the date buckets of the requested page of a report
+REPORT_QUERY_PAGINATION = ENVIRONMENT.bool("REPORT_QUERY_PAGINATION", default=False)
+
+# Tag keys of the tag summary tables, read again when the tables are populated
+TAG_KEY_CACHE = ENVIRONMENT.bool("TAG_KEY_CACHE", default=False)
+TAG_KEY_CACHE_ALIAS = "default"
+TAG_KEY_CACHE_TIMEOUT = ENVIRONMENT.int("TAG_KEY_CACHE_TIMEOUT", default=86400)
+
 DEVELOPMENT = ENVIRONMENT.bool("DEVELOPMENT", default=False)
 if DEVELOPMENT:
     MIDDLEWARE.insert(5, "koku.dev_middleware.DevelopmentIdentityHeaderMiddleware")
@@ -256,6 +268,10 @@ INTERNAL_IPS = ["127.0.0.1"]
 DEFAULT_PAGINATION_CLASS = "api.common.pagination.StandardResultsSetPagination"
 DEFAULT_EXCEPTION_HANDLER = "api.common.exception_handler.custom_exception_handler"
 
+# Render JSON responses with ujson
+FAST_JSON_RENDERER = ENVIRONMENT.bool("FAST_JSON_RENDERER", default=False)
+JSON_RENDERER = "api.common.renderers.UJSONRenderer" if FAST_JSON_RENDERER else "rest_framework.renderers.JSONRenderer"
+
 # django rest_framework settings
 REST_FRAMEWORK = {
     # Use Django's standard `django.contrib.auth` permissions,
@@ -263,7 +279,7 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly"],
     "DEFAULT_PAGINATION_CLASS": DEFAULT_PAGINATION_CLASS,
     "DEFAULT_RENDERER_CLASSES": (
-        "rest_framework.renderers.JSONRenderer",
+        JSON_RENDERER,
         "api.common.csv.PaginatedCSVRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ),
@@ -97,6 +97,54 @@ class Config:
 
     REPORT_PROCESSING_BATCH_SIZE = 100000
 
+    # Number of worker processes used to process the files of a download concurrently
+    REPORT_PROCESSING_WORKERS = int(os.getenv("REPORT_PROCESSING_WORKERS", "1"))
+
+    # Number of parsed line item batches queued for a writer thread while the next
+    # batch is parsed. 0 writes each batch before parsing continues.
+    REPORT_PROCESSING_PIPELINE_DEPTH = int(os.getenv("REPORT_PROCESSING_PIPELINE_DEPTH", "0"))
+
+    # Maximum number of keys held by each report processor dimension cache
+    DIMENSION_CACHE_MAX_SIZE = int(os.getenv("DIMENSION_CACHE_MAX_SIZE", "500000"))
+
+    # Stream AWS CUR files from S3 into the processor instead of downloading them first
+    AWS_STREAMING_INGEST = False if os.getenv("AWS_STREAMING_INGEST", "False") == "False" else True
+    S3_STREAM_CHUNK_SIZE = int(os.getenv("S3_STREAM_CHUNK_SIZE", str(1024 * 1024)))
+    S3_STREAM_READ_AHEAD_CHUNKS = int(os.getenv("S3_STREAM_READ_AHEAD_CHUNKS", "16"))
+    S3_STREAM_MAX_RETRIES = int(os.getenv("S3_STREAM_MAX_RETRIES", "5"))
+
+    # Load line items with the binary COPY format instead of CSV
+    BINARY_COPY_PROCESSING = False if os.getenv("BINARY_COPY_PROCESSING", "False") == "False" else True
+
+    # Merge OCP line items once per file from a staging table instead of once per batch
+    OCP_SINGLE_MERGE_PROCESSING = False if os.getenv("OCP_SINGLE_MERGE_PROCESSING", "False") == "False" else True
+
+    # Parse AWS CUR files a batch of rows at a time instead of one row dict at a time
+    AWS_COLUMNAR_PROCESSING = False if os.getenv("AWS_COLUMNAR_PROCESSING", "False") == "False" else True
+
+    # Number of date windows of a summary step run at once for a schema, and per schema
+    # overrides in the form "schema:workers,schema:workers"
+    SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", "1"))
+    SUMMARY_TENANT_WORKERS = os.getenv("SUMMARY_TENANT_WORKERS", "")
+    # Number of summary date windows run at once on the database by all workers. 0 for no limit
+    SUMMARY_DATABASE_WORKERS = int(os.getenv("SUMMARY_DATABASE_WORKERS", "4"))
+
+    # Share of a month partition's rows below which swap_table_partitions replaces the rows of
+    # the month in place with DELETE and INSERT instead of rebuilding and swapping the partition
+    PARTITION_SWAP_MIN_SHARE = float(os.getenv("PARTITION_SWAP_MIN_SHARE", "0.2"))
+
+    # Seconds without new refresh requests a schema waits for before its summary tables
+    # are refreshed, coalescing the requests. 0 refreshes as soon as requested
+    REFRESH_QUIET_WINDOW = int(os.getenv("REFRESH_QUIET_WINDOW", "0"))
+    # Seconds a refresh waits for before retrying when its schema is already refreshing
+    REFRESH_RETRY_DELAY = int(os.getenv("REFRESH_RETRY_DELAY", "30"))
+    # Number of independent views or summary tables of a schema refreshed at once
+    REFRESH_WORKERS = int(os.getenv("REFRESH_WORKERS", "1"))
+
+    # Run single statement SQL templates as server side prepared statements. Leave unset
+    # behind a connection pooler that does not keep sessions, such as pgbouncer transaction pooling
+    SQL_PREPARED_STATEMENTS = False if os.getenv("SQL_PREPARED_STATEMENTS", "False") == "False" else True
+
     AWS_DATETIME_STR_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
     OCP_DATETIME_STR_FORMAT = "%Y-%m-%d %H:%M:%S +0000 UTC"
     AZURE_DATETIME_STR_FORMAT = "%Y-%m-%d"
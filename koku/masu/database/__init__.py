@@ -22,6 +22,7 @@ AWS_CUR_TABLE_MAP = {
     "line_item": "reporting_awscostentrylineitem",
     "line_item_daily": "reporting_awscostentrylineitem_daily",
     "line_item_daily_summary": "reporting_awscostentrylineitem_daily_summary",
+    "tag_index": "reporting_awstag_index",
     "product": "reporting_awscostentryproduct",
     "pricing": "reporting_awscostentrypricing",
     "reservation": "reporting_awscostentryreservation",
@@ -42,6 +43,8 @@ OCP_REPORT_TABLE_MAP = {
     "pod_label_summary": "reporting_ocpusagepodlabel_summary",
     "storage_line_item": "reporting_ocpstoragelineitem",
     "storage_line_item_daily": "reporting_ocpstoragelineitem_daily",
+    "pod_label_index": "reporting_ocpusagepodlabel_index",
+    "volume_label_index": "reporting_ocpstoragevolumelabel_index",
     "volume_label_summary": "reporting_ocpstoragevolumelabel_summary",
     "cost_summary": "reporting_ocpcosts_summary",
     "node_label_line_item": "reporting_ocpnodelabellineitem",
@@ -54,6 +57,7 @@ AZURE_REPORT_TABLE_MAP = {
     "meter": "reporting_azuremeter",
     "line_item": "reporting_azurecostentrylineitem_daily",
     "line_item_daily_summary": "reporting_azurecostentrylineitem_daily_summary",
+    "tag_index": "reporting_azuretag_index",
     "tags_summary": "reporting_azuretags_summary",
     "ocp_on_azure_daily_summary": "reporting_ocpazurecostlineitem_daily_summary",
     "ocp_on_azure_project_daily_summary": "reporting_ocpazurecostlineitem_project_daily_summary",
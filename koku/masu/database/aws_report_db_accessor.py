@@ -16,14 +16,13 @@
 #
 """Database accessor for report data."""
 import logging
-import pkgutil
 import uuid
 
 from dateutil.parser import parse
 from django.db.models import F
-from jinjasql import JinjaSql
 from tenant_schemas.utils import schema_context
 
+from api.tags.cache import invalidate_tag_key_catalog
 from masu.config import Config
 from masu.database import AWS_CUR_TABLE_MAP
 from masu.database.report_db_accessor_base import ReportDBAccessorBase
@@ -55,7 +54,6 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
         super().__init__(schema)
         self._datetime_format = Config.AWS_DATETIME_STR_FORMAT
         self.date_accessor = DateAccessor()
-        self.jinja_sql = JinjaSql()
 
     def get_cost_entry_bills(self):
         """Get all cost entry bill objects."""
@@ -150,13 +148,45 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
             line_item_query = base_query.filter(bill_id=bill_id)
             return line_item_query
 
-    def get_cost_entries(self):
-        """Make a mapping of cost entries by start time."""
+    def get_cost_entries(self, bill_ids=None):
+        """Make a mapping of cost entries by start time.
+
+        Args:
+            bill_ids (list): Only map the cost entries of these bills
+
+        """
         table_name = AWSCostEntry
         with schema_context(self.schema):
-            cost_entries = self._get_db_obj_query(table_name).all()
+            cost_entries = self._get_db_obj_query(table_name)
+            if bill_ids is not None:
+                cost_entries = cost_entries.filter(bill_id__in=bill_ids)
+            cost_entries = cost_entries.values_list("id", "bill_id", "interval_start")
+
+            return {
+                (bill_id, interval_start.strftime(self._datetime_format)): ce_id
+                for ce_id, bill_id, interval_start in cost_entries
+            }
 
-            return {(ce.bill_id, ce.interval_start.strftime(self._datetime_format)): ce.id for ce in cost_entries}
+    def get_cost_entry_ids(self, keys):
+        """Return the ids of the cost entries with the given keys.
+
+        Args:
+            keys (list): (bill id, interval start string) tuples
+
+        Returns:
+            (dict): The keys found in the database mapped to their ids
+
+        """
+        table_name = AWSCostEntry
+        bill_ids = {bill_id for bill_id, _ in keys}
+        starts = {start for _, start in keys}
+        with schema_context(self.schema):
+            cost_entries = self._get_db_obj_query(table_name).filter(bill_id__in=bill_ids, interval_start__in=starts)
+            found = {
+                (bill_id, interval_start.strftime(self._datetime_format)): ce_id
+                for ce_id, bill_id, interval_start in cost_entries.values_list("id", "bill_id", "interval_start")
+            }
+        return {key: found[key] for key in keys if key in found}
 
     def get_products(self):
         """Make a mapping of product sku to product objects."""
@@ -169,6 +199,24 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
                 (product["sku"], product["product_name"], product["region"]): product["id"] for product in products
             }
 
+    def get_product_ids(self, keys):
+        """Return the ids of the products with the given keys.
+
+        Args:
+            keys (list): (sku, product name, region) tuples
+
+        Returns:
+            (dict): The keys found in the database mapped to their ids
+
+        """
+        table_name = AWSCostEntryProduct
+        found = {}
+        with schema_context(self.schema):
+            products = self._get_db_obj_query(table_name).filter(sku__in={sku for sku, _, _ in keys})
+            for product_id, *key in products.values_list("id", "sku", "product_name", "region"):
+                found[self._normalize_key(key)] = product_id
+        return {key: found[self._normalize_key(key)] for key in keys if self._normalize_key(key) in found}
+
     def get_pricing(self):
         """Make a mapping of pricing values string to pricing objects."""
         table_name = AWSCostEntryPricing
@@ -186,6 +234,21 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
 
             return {res["reservation_arn"]: res["id"] for res in reservs}
 
+    def get_reservation_ids(self, keys):
+        """Return the ids of the reservations with the given ARNs.
+
+        Args:
+            keys (list): Reservation ARNs
+
+        Returns:
+            (dict): The ARNs found in the database mapped to their ids
+
+        """
+        table_name = AWSCostEntryReservation
+        with schema_context(self.schema):
+            reservations = self._get_db_obj_query(table_name).filter(reservation_arn__in=keys)
+            return dict(reservations.values_list("reservation_arn", "id"))
+
     def populate_line_item_daily_table(self, start_date, end_date, bill_ids):
         """Populate the daily aggregate of line items table.
 
@@ -200,8 +263,6 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
         """
         table_name = AWS_CUR_TABLE_MAP["line_item_daily"]
 
-        daily_sql = pkgutil.get_data("masu.database", "sql/reporting_awscostentrylineitem_daily.sql")
-        daily_sql = daily_sql.decode("utf-8")
         daily_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -209,8 +270,31 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
             "bill_ids": bill_ids,
             "schema": self.schema,
         }
-        daily_sql, daily_sql_params = self.jinja_sql.prepare_query(daily_sql, daily_sql_params)
-        self._execute_raw_sql_query(table_name, daily_sql, start_date, end_date, bind_params=list(daily_sql_params))
+        self._execute_sql_template(
+            table_name, "reporting_awscostentrylineitem_daily", daily_sql_params, start_date, end_date
+        )
+
+    def populate_tag_index(self, start_date, end_date, bill_ids):
+        """Rebuild the tag index of the daily line items.
+
+        Args:
+            start_date (datetime.date) The date to start populating the table.
+            end_date (datetime.date) The date to end on.
+            bill_ids (list)
+
+        Returns
+            (None)
+
+        """
+        table_name = AWS_CUR_TABLE_MAP["tag_index"]
+
+        index_sql_params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "bill_ids": bill_ids,
+            "schema": self.schema,
+        }
+        self._execute_sql_template(table_name, "reporting_awstag_index", index_sql_params, start_date, end_date)
 
     # pylint: disable=invalid-name
     def populate_line_item_daily_summary_table(self, start_date, end_date, bill_ids):
@@ -225,19 +309,21 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
 
         """
         table_name = AWS_CUR_TABLE_MAP["line_item_daily_summary"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_awscostentrylineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        sql_uuid = str(uuid.uuid4()).replace("-", "_")
+        staging_table_name = f"summary_staging_{sql_uuid}"
         summary_sql_params = {
-            "uuid": str(uuid.uuid4()).replace("-", "_"),
+            "uuid": sql_uuid,
             "start_date": start_date,
             "end_date": end_date,
             "bill_ids": bill_ids,
             "schema": self.schema,
+            "staging_table": staging_table_name,
         }
-        summary_sql, summary_sql_params = self.jinja_sql.prepare_query(summary_sql, summary_sql_params)
-        self._execute_raw_sql_query(
-            table_name, summary_sql, start_date, end_date, bind_params=list(summary_sql_params)
+        self._execute_sql_template(
+            table_name, "reporting_awscostentrylineitem_daily_summary", summary_sql_params, start_date, end_date
         )
+        filters = {"cost_entry_bill_id": bill_ids} if bill_ids else None
+        self.swap_table_partitions(table_name, staging_table_name, start_date, end_date, filters)
 
     def mark_bill_as_finalized(self, bill_id):
         """Mark a bill in the database as finalized."""
@@ -253,11 +339,9 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
         """Populate the line item aggregated totals data table."""
         table_name = AWS_CUR_TABLE_MAP["tags_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", f"sql/reporting_awstags_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
         agg_sql_params = {"schema": self.schema}
-        agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
-        self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
+        self._execute_sql_template(table_name, "reporting_awstags_summary", agg_sql_params)
+        invalidate_tag_key_catalog(self.schema, table_name)
 
     def populate_ocp_on_aws_cost_daily_summary(self, start_date, end_date, cluster_id, bill_ids):
         """Populate the daily cost aggregated summary for OCP on AWS.
@@ -271,8 +355,6 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
 
         """
         table_name = AWS_CUR_TABLE_MAP["ocp_on_aws_daily_summary"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpawscostlineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
         summary_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -281,21 +363,17 @@ class AWSReportDBAccessor(ReportDBAccessorBase):
             "cluster_id": cluster_id,
             "schema": self.schema,
         }
-        summary_sql, summary_sql_params = self.jinja_sql.prepare_query(summary_sql, summary_sql_params)
-
-        self._execute_raw_sql_query(
-            table_name, summary_sql, start_date, end_date, bind_params=list(summary_sql_params)
+        self._execute_sql_template(
+            table_name, "reporting_ocpawscostlineitem_daily_summary", summary_sql_params, start_date, end_date
         )
 
     def populate_ocp_on_aws_tags_summary_table(self):
         """Populate the line item aggregated totals data table."""
         table_name = AWS_CUR_TABLE_MAP["ocp_on_aws_tags_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", f"sql/reporting_ocpawstags_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
         agg_sql_params = {"schema": self.schema}
-        agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
-        self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
+        self._execute_sql_template(table_name, "reporting_ocpawstags_summary", agg_sql_params)
+        invalidate_tag_key_catalog(self.schema, table_name)
 
     def populate_markup_cost(self, markup, bill_ids=None):
         """Set markup costs in the database."""
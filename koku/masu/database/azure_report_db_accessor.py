@@ -16,15 +16,14 @@
 #
 """Database accessor for Azure report data."""
 import logging
-import pkgutil
 import uuid
 from datetime import datetime
 
 from dateutil.parser import parse
 from django.db.models import F
-from jinjasql import JinjaSql
 from tenant_schemas.utils import schema_context
 
+from api.tags.cache import invalidate_tag_key_catalog
 from masu.config import Config
 from masu.database import AZURE_REPORT_TABLE_MAP
 from masu.database.report_db_accessor_base import ReportDBAccessorBase
@@ -53,7 +52,6 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
         super().__init__(schema)
         self._datetime_format = Config.AZURE_DATETIME_STR_FORMAT
         self.date_accessor = DateAccessor()
-        self.jinja_sql = JinjaSql()
 
     def get_cost_entry_bills(self):
         """Get all cost entry bill objects."""
@@ -80,6 +78,25 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
                 for product in products
             }
 
+    def get_product_ids(self, keys):
+        """Return the ids of the products with the given keys.
+
+        Args:
+            keys (list): (instance id, instance type, service tier, service name) tuples
+
+        Returns:
+            (dict): The keys found in the database mapped to their ids
+
+        """
+        table_name = AzureCostEntryProductService
+        found = {}
+        with schema_context(self.schema):
+            products = self._get_db_obj_query(table_name).filter(instance_id__in={key[0] for key in keys})
+            columns = ["id", "instance_id", "instance_type", "service_tier", "service_name"]
+            for product_id, *key in products.values_list(*columns):
+                found[self._normalize_key(key)] = product_id
+        return {key: found[self._normalize_key(key)] for key in keys if self._normalize_key(key) in found}
+
     def get_meters(self):
         """Make a mapping of meter objects."""
         table_name = AzureMeter
@@ -106,6 +123,28 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
             bills = bills.filter(billing_period_start=bill_date)
         return bills
 
+    def populate_tag_index(self, start_date, end_date, bill_ids):
+        """Rebuild the tag index of the daily line items.
+
+        Args:
+            start_date (datetime.date) The date to start populating the table.
+            end_date (datetime.date) The date to end on.
+            bill_ids (list)
+
+        Returns
+            (None)
+
+        """
+        table_name = AZURE_REPORT_TABLE_MAP["tag_index"]
+
+        index_sql_params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "bill_ids": bill_ids,
+            "schema": self.schema,
+        }
+        self._execute_sql_template(table_name, "reporting_azuretag_index", index_sql_params, start_date, end_date)
+
     def populate_line_item_daily_summary_table(self, start_date, end_date, bill_ids):
         """Populate the daily aggregated summary of line items table.
 
@@ -122,29 +161,30 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
         _end_date = end_date.date() if isinstance(end_date, datetime) else end_date
 
         table_name = AZURE_REPORT_TABLE_MAP["line_item_daily_summary"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_azurecostentrylineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        sql_uuid = str(uuid.uuid4()).replace("-", "_")
+        staging_table_name = f"summary_staging_{sql_uuid}"
         summary_sql_params = {
-            "uuid": str(uuid.uuid4()).replace("-", "_"),
+            "uuid": sql_uuid,
             "start_date": _start_date,
             "end_date": _end_date,
             "bill_ids": bill_ids,
             "schema": self.schema,
+            "staging_table": staging_table_name,
         }
-        summary_sql, summary_sql_params = self.jinja_sql.prepare_query(summary_sql, summary_sql_params)
-        self._execute_raw_sql_query(
-            table_name, summary_sql, start_date, end_date, bind_params=list(summary_sql_params)
+        self._execute_sql_template(
+            table_name, "reporting_azurecostentrylineitem_daily_summary", summary_sql_params, start_date, end_date
+        )
+        self.swap_table_partitions(
+            table_name, staging_table_name, _start_date, _end_date, {"cost_entry_bill_id": bill_ids}
         )
 
     def populate_tags_summary_table(self):
         """Populate the line item aggregated totals data table."""
         table_name = AZURE_REPORT_TABLE_MAP["tags_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", f"sql/reporting_azuretags_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
         agg_sql_params = {"schema": self.schema}
-        agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
-        self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
+        self._execute_sql_template(table_name, "reporting_azuretags_summary", agg_sql_params)
+        invalidate_tag_key_catalog(self.schema, table_name)
 
     def get_cost_entry_bills_by_date(self, start_date):
         """Return a cost entry bill for the specified start date."""
@@ -202,8 +242,6 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
 
         """
         table_name = AZURE_REPORT_TABLE_MAP["ocp_on_azure_daily_summary"]
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpazurecostlineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
         summary_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -212,21 +250,17 @@ class AzureReportDBAccessor(ReportDBAccessorBase):
             "cluster_id": cluster_id,
             "schema": self.schema,
         }
-        summary_sql, summary_sql_params = self.jinja_sql.prepare_query(summary_sql, summary_sql_params)
-
-        self._execute_raw_sql_query(
-            table_name, summary_sql, start_date, end_date, bind_params=list(summary_sql_params)
+        self._execute_sql_template(
+            table_name, "reporting_ocpazurecostlineitem_daily_summary", summary_sql_params, start_date, end_date
         )
 
     def populate_ocp_on_azure_tags_summary_table(self):
         """Populate the line item aggregated totals data table."""
         table_name = AZURE_REPORT_TABLE_MAP["ocp_on_azure_tags_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", f"sql/reporting_ocpazuretags_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
         agg_sql_params = {"schema": self.schema}
-        agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
-        self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
+        self._execute_sql_template(table_name, "reporting_ocpazuretags_summary", agg_sql_params)
+        invalidate_tag_key_catalog(self.schema, table_name)
 
     def populate_ocp_on_azure_markup_cost(self, markup, bill_ids=None):
         """Set markup costs in the database."""
@@ -0,0 +1,72 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Accessor for the ledger of usage days waiting to be summarized."""
+import logging
+
+from django.db import connection
+from tenant_schemas.utils import schema_context
+
+from masu.database.koku_database_access import KokuDBAccess
+from reporting_common.models import DirtyUsageDay
+
+LOG = logging.getLogger(__name__)
+
+
+class DirtyUsageDayDBAccessor(KokuDBAccess):
+    """Record the usage days report processing wrote and hand them to summarization."""
+
+    def __init__(self):
+        """Access the dirty usage day table."""
+        self._schema = "public"
+        super().__init__(self._schema)
+        self._table = DirtyUsageDay
+
+    def record_days(self, provider_uuid, days):
+        """Record days of a provider as changed, ignoring days already recorded.
+
+        Args:
+            provider_uuid (str): The provider the days were written for
+            days (iterable): The datetime.date days
+
+        Returns:
+            (None)
+
+        """
+        entries = [self._table(provider_id=provider_uuid, usage_date=day) for day in days]
+        if not entries:
+            return
+        with schema_context(self._schema):
+            self._table.objects.bulk_create(entries, ignore_conflicts=True)
+        LOG.info("Recorded %d changed usage days for provider %s.", len(entries), provider_uuid)
+
+    def claim_days(self, provider_uuid):
+        """Remove the recorded days of a provider from the ledger and return them.
+
+        Args:
+            provider_uuid (str): The provider to summarize
+
+        Returns:
+            (list): The datetime.date days, in order
+
+        """
+        with schema_context(self._schema):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {self._table._meta.db_table} WHERE provider_id = %s RETURNING usage_date",
+                    [provider_uuid],
+                )
+                return sorted(row[0] for row in cursor.fetchall())
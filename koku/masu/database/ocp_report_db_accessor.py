@@ -17,7 +17,6 @@
 """Database accessor for OCP report data."""
 import datetime
 import logging
-import pkgutil
 import uuid
 
 import pytz
@@ -29,15 +28,16 @@ from django.db.models import DecimalField
 from django.db.models import F
 from django.db.models import Value
 from django.db.models.functions import Coalesce
-from jinjasql import JinjaSql
 from tenant_schemas.utils import schema_context
 
 from api.metrics import constants as metric_constants
+from api.tags.cache import invalidate_tag_key_catalog
 from koku.database import JSONBBuildObject
 from masu.config import Config
 from masu.database import AWS_CUR_TABLE_MAP
 from masu.database import OCP_REPORT_TABLE_MAP
 from masu.database.report_db_accessor_base import ReportDBAccessorBase
+from masu.database.sql_templates import SQL_TEMPLATES
 from masu.util.common import month_date_range_tuple
 from reporting.provider.ocp.models import OCPUsageLineItemDailySummary
 from reporting.provider.ocp.models import OCPUsageReport
@@ -70,7 +70,6 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         """
         super().__init__(schema)
         self._datetime_format = Config.OCP_DATETIME_STR_FORMAT
-        self.jinja_sql = JinjaSql()
 
     def get_current_usage_report(self):
         """Get the most recent usage report object."""
@@ -328,8 +327,6 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
 
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily"]
 
-        daily_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpusagelineitem_daily.sql")
-        daily_sql = daily_sql.decode("utf-8")
         daily_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -337,8 +334,47 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             "cluster_id": cluster_id,
             "schema": self.schema,
         }
-        daily_sql, daily_sql_params = self.jinja_sql.prepare_query(daily_sql, daily_sql_params)
-        self._execute_raw_sql_query(table_name, daily_sql, start_date, end_date, bind_params=list(daily_sql_params))
+        self._execute_sql_template(
+            table_name, "reporting_ocpusagelineitem_daily", daily_sql_params, start_date, end_date
+        )
+
+    def populate_pod_label_index(self, start_date, end_date, cluster_id):
+        """Rebuild the pod label index of the daily usage line items.
+
+        Args:
+            start_date (datetime.date) The date to start populating the table.
+            end_date (datetime.date) The date to end on.
+            cluster_id (String) Cluster Identifier
+
+        Returns
+            (None)
+
+        """
+        self._populate_label_index(OCP_REPORT_TABLE_MAP["pod_label_index"], start_date, end_date, cluster_id)
+
+    def populate_volume_label_index(self, start_date, end_date, cluster_id):
+        """Rebuild the volume label index of the daily storage line items.
+
+        Args:
+            start_date (datetime.date) The date to start populating the table.
+            end_date (datetime.date) The date to end on.
+            cluster_id (String) Cluster Identifier
+
+        Returns
+            (None)
+
+        """
+        self._populate_label_index(OCP_REPORT_TABLE_MAP["volume_label_index"], start_date, end_date, cluster_id)
+
+    def _populate_label_index(self, table_name, start_date, end_date, cluster_id):
+        """Rebuild a label index from the template named after it."""
+        index_sql_params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "cluster_id": cluster_id,
+            "schema": self.schema,
+        }
+        self._execute_sql_template(table_name, table_name, index_sql_params, start_date, end_date)
 
     def get_ocp_infrastructure_map(self, start_date, end_date, **kwargs):
         """Get the OCP on infrastructure map.
@@ -361,8 +397,6 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         if isinstance(start_date, str):
             start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
             end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
-        infra_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpinfrastructure_provider_map.sql")
-        infra_sql = infra_sql.decode("utf-8")
         infra_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -372,10 +406,9 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             "ocp_provider_uuid": ocp_provider_uuid,
             "azure_provider_uuid": azure_provider_uuid,
         }
-        infra_sql, infra_sql_params = self.jinja_sql.prepare_query(infra_sql, infra_sql_params)
         with connection.cursor() as cursor:
             cursor.db.set_schema(self.schema)
-            cursor.execute(infra_sql, list(infra_sql_params))
+            SQL_TEMPLATES.execute(cursor, "reporting_ocpinfrastructure_provider_map", infra_sql_params)
             results = cursor.fetchall()
 
         db_results = {}
@@ -408,8 +441,6 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             end_date = end_date.date()
         table_name = OCP_REPORT_TABLE_MAP["storage_line_item_daily"]
 
-        daily_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpstoragelineitem_daily.sql")
-        daily_sql = daily_sql.decode("utf-8")
         daily_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -417,8 +448,9 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             "cluster_id": cluster_id,
             "schema": self.schema,
         }
-        daily_sql, daily_sql_params = self.jinja_sql.prepare_query(daily_sql, daily_sql_params)
-        self._execute_raw_sql_query(table_name, daily_sql, start_date, end_date, bind_params=list(daily_sql_params))
+        self._execute_sql_template(
+            table_name, "reporting_ocpstoragelineitem_daily", daily_sql_params, start_date, end_date
+        )
 
     def populate_pod_charge(self, cpu_temp_table, mem_temp_table):
         """Populate the memory and cpu charge on daily summary table.
@@ -433,11 +465,8 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         """
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
 
-        daily_charge_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpusagelineitem_daily_pod_charge.sql")
-        charge_line_sql = daily_charge_sql.decode("utf-8")
         charge_line_sql_params = {"cpu_temp": cpu_temp_table, "mem_temp": mem_temp_table, "schema": self.schema}
-        charge_line_sql, charge_line_sql_params = self.jinja_sql.prepare_query(charge_line_sql, charge_line_sql_params)
-        self._execute_raw_sql_query(table_name, charge_line_sql, bind_params=list(charge_line_sql_params))
+        self._execute_sql_template(table_name, "reporting_ocpusagelineitem_daily_pod_charge", charge_line_sql_params)
 
     def populate_storage_charge(self, temp_table_name):
         """Populate the storage charge into the daily summary table.
@@ -451,11 +480,8 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         """
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
 
-        daily_charge_sql = pkgutil.get_data("masu.database", "sql/reporting_ocp_storage_charge.sql")
-        charge_line_sql = daily_charge_sql.decode("utf-8")
         charge_line_sql_params = {"temp_table": temp_table_name, "schema": self.schema}
-        charge_line_sql, charge_line_sql_params = self.jinja_sql.prepare_query(charge_line_sql, charge_line_sql_params)
-        self._execute_raw_sql_query(table_name, charge_line_sql, bind_params=list(charge_line_sql_params))
+        self._execute_sql_template(table_name, "reporting_ocp_storage_charge", charge_line_sql_params)
 
     def populate_line_item_daily_summary_table(self, start_date, end_date, cluster_id):
         """Populate the daily aggregate of line items table.
@@ -478,19 +504,21 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             end_date = end_date.date()
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
 
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpusagelineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        sql_uuid = str(uuid.uuid4()).replace("-", "_")
+        staging_table_name = f"summary_staging_{sql_uuid}"
         summary_sql_params = {
-            "uuid": str(uuid.uuid4()).replace("-", "_"),
+            "uuid": sql_uuid,
             "start_date": start_date,
             "end_date": end_date,
             "cluster_id": cluster_id,
             "schema": self.schema,
+            "staging_table": staging_table_name,
         }
-        summary_sql, summary_sql_params = self.jinja_sql.prepare_query(summary_sql, summary_sql_params)
-        self._execute_raw_sql_query(
-            table_name, summary_sql, start_date, end_date, bind_params=list(summary_sql_params)
+        self._execute_sql_template(
+            table_name, "reporting_ocpusagelineitem_daily_summary", summary_sql_params, start_date, end_date
         )
+        filters = {"cluster_id": cluster_id, "data_source": "Pod"}
+        self.swap_table_partitions(table_name, staging_table_name, start_date, end_date, filters)
 
     def populate_storage_line_item_daily_summary_table(self, start_date, end_date, cluster_id):
         """Populate the daily aggregate of storage line items table.
@@ -512,17 +540,21 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             end_date = end_date.date()
         table_name = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
 
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpstoragelineitem_daily_summary.sql")
-        summary_sql = summary_sql.decode("utf-8")
+        sql_uuid = str(uuid.uuid4()).replace("-", "_")
+        staging_table_name = f"summary_staging_{sql_uuid}"
         summary_sql_params = {
-            "uuid": str(uuid.uuid4()).replace("-", "_"),
+            "uuid": sql_uuid,
             "start_date": start_date,
             "end_date": end_date,
             "cluster_id": cluster_id,
             "schema": self.schema,
+            "staging_table": staging_table_name,
         }
-        summary_sql, summary_sql_params = self.jinja_sql.prepare_query(summary_sql, summary_sql_params)
-        self._execute_raw_sql_query(table_name, summary_sql, start_date, end_date, list(summary_sql_params))
+        self._execute_sql_template(
+            table_name, "reporting_ocpstoragelineitem_daily_summary", summary_sql_params, start_date, end_date
+        )
+        filters = {"cluster_id": cluster_id, "data_source": "Storage"}
+        self.swap_table_partitions(table_name, staging_table_name, start_date, end_date, filters)
 
     def update_summary_infrastructure_cost(self, cluster_id, start_date, end_date):
         """Populate the infrastructure costs on the daily usage summary table.
@@ -550,9 +582,7 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             end_date_qry = self._get_db_obj_query(table_name).order_by("-usage_start").first()
             end_date = str(end_date_qry.usage_start) if end_date_qry else None
 
-        summary_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpcosts_summary.sql")
         if start_date and end_date:
-            summary_sql = summary_sql.decode("utf-8")
             summary_sql_params = {
                 "uuid": str(uuid.uuid4()).replace("-", "_"),
                 "start_date": start_date,
@@ -560,9 +590,8 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
                 "cluster_id": cluster_id,
                 "schema": self.schema,
             }
-            summary_sql, summary_sql_params = self.jinja_sql.prepare_query(summary_sql, summary_sql_params)
-            self._execute_raw_sql_query(
-                table_name, summary_sql, start_date, end_date, bind_params=list(summary_sql_params)
+            self._execute_sql_template(
+                table_name, "reporting_ocpcosts_summary", summary_sql_params, start_date, end_date
             )
 
     def get_cost_summary_for_clusterid(self, cluster_identifier):
@@ -572,27 +601,40 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         cost_summary_query = base_query.filter(cluster_id=cluster_identifier)
         return cost_summary_query
 
+    def update_enabled_pod_labels(self, keys):
+        """Project the enabled pod labels again on the daily line items labelled with any of the keys.
+
+        Args:
+            keys (list): The pod label keys that were enabled or disabled
+
+        Returns
+            (None)
+
+        """
+        if not keys:
+            return
+        table_name = OCP_REPORT_TABLE_MAP["line_item_daily"]
+
+        labels_sql_params = {"keys": list(keys), "schema": self.schema}
+        self._execute_sql_template(table_name, "reporting_ocpusagelineitem_daily_enabled_labels", labels_sql_params)
+
     # pylint: disable=invalid-name
     def populate_pod_label_summary_table(self):
         """Populate the line item aggregated totals data table."""
         table_name = OCP_REPORT_TABLE_MAP["pod_label_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", f"sql/reporting_ocpusagepodlabel_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
         agg_sql_params = {"schema": self.schema}
-        agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
-        self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
+        self._execute_sql_template(table_name, "reporting_ocpusagepodlabel_summary", agg_sql_params)
+        invalidate_tag_key_catalog(self.schema, table_name)
 
     # pylint: disable=invalid-name
     def populate_volume_label_summary_table(self):
         """Populate the OCP volume label summary table."""
         table_name = OCP_REPORT_TABLE_MAP["volume_label_summary"]
 
-        agg_sql = pkgutil.get_data("masu.database", f"sql/reporting_ocpstoragevolumelabel_summary.sql")
-        agg_sql = agg_sql.decode("utf-8")
         agg_sql_params = {"schema": self.schema}
-        agg_sql, agg_sql_params = self.jinja_sql.prepare_query(agg_sql, agg_sql_params)
-        self._execute_raw_sql_query(table_name, agg_sql, bind_params=list(agg_sql_params))
+        self._execute_sql_template(table_name, "reporting_ocpstoragevolumelabel_summary", agg_sql_params)
+        invalidate_tag_key_catalog(self.schema, table_name)
 
     def populate_markup_cost(self, markup, start_date, end_date, cluster_id):
         """Set markup cost for OCP including infrastructure cost markup."""
@@ -647,6 +689,10 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
         for curr_month in rrule(freq=MONTHLY, until=end_date, dtstart=first_month):
             first_curr_month, first_next_month = month_date_range_tuple(curr_month)
             LOG.info("Populating monthly cost from %s to %s.", first_curr_month, first_next_month)
+            if rate is not None:
+                self.create_table_partitions(
+                    OCP_REPORT_TABLE_MAP["line_item_daily_summary"], first_curr_month, first_next_month
+                )
             if cost_type == "Node":
                 if rate is None:
                     self.remove_monthly_cost(first_curr_month, first_next_month, cluster_id, cost_type)
@@ -777,8 +823,6 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             end_date = end_date.date()
         table_name = OCP_REPORT_TABLE_MAP["node_label_line_item_daily"]
 
-        daily_sql = pkgutil.get_data("masu.database", "sql/reporting_ocpnodelabellineitem_daily.sql")
-        daily_sql = daily_sql.decode("utf-8")
         daily_sql_params = {
             "uuid": str(uuid.uuid4()).replace("-", "_"),
             "start_date": start_date,
@@ -786,8 +830,9 @@ class OCPReportDBAccessor(ReportDBAccessorBase):
             "cluster_id": cluster_id,
             "schema": self.schema,
         }
-        daily_sql, daily_sql_params = self.jinja_sql.prepare_query(daily_sql, daily_sql_params)
-        self._execute_raw_sql_query(table_name, daily_sql, start_date, end_date, bind_params=list(daily_sql_params))
+        self._execute_sql_template(
+            table_name, "reporting_ocpnodelabellineitem_daily", daily_sql_params, start_date, end_date
+        )
 
     def populate_usage_costs(self, infrastructure_rates, supplementary_rates, start_date, end_date, cluster_id):
         """Update the reporting_ocpusagelineitem_daily_summary table with usage costs."""
@@ -0,0 +1,311 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Monthly range partitions of reporting tables."""
+import datetime
+
+from dateutil import parser
+from dateutil.relativedelta import relativedelta
+
+from masu.database import AWS_CUR_TABLE_MAP
+from masu.database import AZURE_REPORT_TABLE_MAP
+from masu.database import OCP_REPORT_TABLE_MAP
+
+# Tables partitioned by month, the column they are partitioned on, and the
+# keys and indexes each partition is created with, by name suffix. Postgres 10
+# can not declare keys or indexes on the partitioned table itself. Tables with
+# long names use a shorter prefix for their index names. The foreign keys of
+# the models are declared on each partition as Django declares them.
+PARTITIONED_TABLES = {
+    AWS_CUR_TABLE_MAP["line_item"]: {
+        "column": "usage_start",
+        "indexes": [
+            ("pkey", "ALTER TABLE {table} ADD CONSTRAINT {name} PRIMARY KEY (id)"),
+            ("bill_idx", "CREATE INDEX {name} ON {table} (cost_entry_bill_id)"),
+            ("entry_idx", "CREATE INDEX {name} ON {table} (cost_entry_id)"),
+            ("product_idx", "CREATE INDEX {name} ON {table} (cost_entry_product_id)"),
+            ("pricing_idx", "CREATE INDEX {name} ON {table} (cost_entry_pricing_id)"),
+            ("reservation_idx", "CREATE INDEX {name} ON {table} (cost_entry_reservation_id)"),
+            (
+                "bill_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (cost_entry_bill_id) "
+                "REFERENCES reporting_awscostentrybill (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+            (
+                "entry_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (cost_entry_id) "
+                "REFERENCES reporting_awscostentry (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+            (
+                "product_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (cost_entry_product_id) "
+                "REFERENCES reporting_awscostentryproduct (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+            (
+                "pricing_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (cost_entry_pricing_id) "
+                "REFERENCES reporting_awscostentrypricing (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+            (
+                "reservation_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (cost_entry_reservation_id) "
+                "REFERENCES reporting_awscostentryreservation (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+        ],
+    },
+    OCP_REPORT_TABLE_MAP["line_item"]: {
+        "column": "usage_start",
+        "indexes": [
+            ("pkey", "ALTER TABLE {table} ADD CONSTRAINT {name} PRIMARY KEY (id)"),
+            # A report is within one month, so the key is unique across partitions
+            ("report_key", "ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE (report_id, namespace, pod, node)"),
+            ("period_idx", "CREATE INDEX {name} ON {table} (report_period_id)"),
+            (
+                "period_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (report_period_id) "
+                "REFERENCES reporting_ocpusagereportperiod (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+            (
+                "report_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (report_id) "
+                "REFERENCES reporting_ocpusagereport (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+        ],
+    },
+    AWS_CUR_TABLE_MAP["line_item_daily_summary"]: {
+        "column": "usage_start",
+        "index_prefix": "aws_summary",
+        "indexes": [
+            ("pkey", "ALTER TABLE {table} ADD CONSTRAINT {name} PRIMARY KEY (id)"),
+            ("bill_idx", "CREATE INDEX {name} ON {table} (cost_entry_bill_id)"),
+            ("start_idx", "CREATE INDEX {name} ON {table} (usage_start)"),
+            ("pcode_idx", "CREATE INDEX {name} ON {table} (product_code)"),
+            ("account_idx", "CREATE INDEX {name} ON {table} (usage_account_id)"),
+            ("alias_idx", "CREATE INDEX {name} ON {table} (account_alias_id)"),
+            ("pfam_idx", "CREATE INDEX {name} ON {table} (product_family)"),
+            ("itype_idx", "CREATE INDEX {name} ON {table} (instance_type)"),
+            ("tags_idx", "CREATE INDEX {name} ON {table} USING GIN (tags)"),
+            ("pfam_ilike", "CREATE INDEX {name} ON {table} USING GIN (upper(product_family) gin_trgm_ops)"),
+            ("pcode_ilike", "CREATE INDEX {name} ON {table} USING GIN (upper(product_code) gin_trgm_ops)"),
+            (
+                "bill_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (cost_entry_bill_id) "
+                "REFERENCES reporting_awscostentrybill (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+            (
+                "alias_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (account_alias_id) "
+                "REFERENCES reporting_awsaccountalias (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+        ],
+    },
+    OCP_REPORT_TABLE_MAP["line_item_daily_summary"]: {
+        "column": "usage_start",
+        "index_prefix": "ocp_summary",
+        "indexes": [
+            ("pkey", "ALTER TABLE {table} ADD CONSTRAINT {name} PRIMARY KEY (id)"),
+            ("period_idx", "CREATE INDEX {name} ON {table} (report_period_id)"),
+            ("start_idx", "CREATE INDEX {name} ON {table} (usage_start)"),
+            ("namespace_idx", "CREATE INDEX {name} ON {table} (namespace varchar_pattern_ops)"),
+            ("node_idx", "CREATE INDEX {name} ON {table} (node varchar_pattern_ops)"),
+            ("source_idx", "CREATE INDEX {name} ON {table} (data_source)"),
+            ("labels_idx", "CREATE INDEX {name} ON {table} USING GIN (pod_labels)"),
+            (
+                "period_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (report_period_id) "
+                "REFERENCES reporting_ocpusagereportperiod (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+        ],
+    },
+    AZURE_REPORT_TABLE_MAP["line_item_daily_summary"]: {
+        "column": "usage_start",
+        "index_prefix": "azure_summary",
+        "indexes": [
+            ("pkey", "ALTER TABLE {table} ADD CONSTRAINT {name} PRIMARY KEY (id)"),
+            ("bill_idx", "CREATE INDEX {name} ON {table} (cost_entry_bill_id)"),
+            ("meter_idx", "CREATE INDEX {name} ON {table} (meter_id)"),
+            ("start_idx", "CREATE INDEX {name} ON {table} (usage_start)"),
+            ("service_ilike", "CREATE INDEX {name} ON {table} USING GIN (upper(service_name) gin_trgm_ops)"),
+            (
+                "bill_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (cost_entry_bill_id) "
+                "REFERENCES reporting_azurecostentrybill (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+            (
+                "meter_fk",
+                "ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (meter_id) "
+                "REFERENCES reporting_azuremeter (id) DEFERRABLE INITIALLY DEFERRED",
+            ),
+        ],
+    },
+}
+
+
+def is_partitioned(table_name):
+    """Return whether a table is partitioned by month."""
+    return table_name in PARTITIONED_TABLES
+
+
+def as_date(value):
+    """Return a date from a date, a datetime or an ISO 8601 string."""
+    if isinstance(value, str):
+        value = parser.parse(value)
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return value
+
+
+def month_start(value):
+    """Return the first day of the month of a date or datetime."""
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return value.replace(day=1)
+
+
+def partition_months(start_date, end_date):
+    """Return the first day of each month with days from start_date up to end_date.
+
+    Args:
+        start_date (datetime.date): The first date
+        end_date (datetime.date): The date after the last date. A date that
+            does not end after start_date still covers the month of start_date.
+
+    Returns:
+        (list): The first day of each month, in order
+
+    """
+    month = month_start(start_date)
+    months = [month]
+    if isinstance(end_date, datetime.datetime):
+        end_date = end_date.date()
+    month += relativedelta(months=1)
+    while month < end_date:
+        months.append(month)
+        month += relativedelta(months=1)
+    return months
+
+
+def partition_name(table_name, month):
+    """Return the name of the partition of a table holding a month."""
+    return f"{table_name}_{month:%Y_%m}"
+
+
+def partition_month(table_name, name):
+    """Return the month held by a partition of table_name, or None for another table."""
+    if not name.startswith(f"{table_name}_"):
+        return None
+    try:
+        return datetime.datetime.strptime(name[len(table_name) + 1 :], "%Y_%m").date()  # noqa: E203
+    except ValueError:
+        return None
+
+
+def partition_bounds(month):
+    """Return the inclusive lower and exclusive upper UTC bounds of a month partition."""
+    next_month = month + relativedelta(months=1)
+    return f"{month:%Y-%m-%d} 00:00:00+00", f"{next_month:%Y-%m-%d} 00:00:00+00"
+
+
+def partition_index_name(table_name, month, suffix):
+    """Return the name of a key or index of the partition of a month."""
+    prefix = PARTITIONED_TABLES[table_name].get("index_prefix", table_name)
+    return f"{prefix}_{month:%Y_%m}_{suffix}"
+
+
+def partition_index_sql(table_name, month, target=None, name_suffix=""):
+    """Return the statements that create the keys and indexes of the partition of a month.
+
+    Args:
+        table_name (str): A partitioned table
+        month (datetime.date): The first day of the month
+        target (str): The table to index, the partition itself by default
+        name_suffix (str): Appended to the key and index names
+
+    Returns:
+        (list): SQL statements to run in order, in the table's schema
+
+    """
+    target = target or partition_name(table_name, month)
+    return [
+        sql.format(table=target, name=partition_index_name(table_name, month, suffix) + name_suffix)
+        for suffix, sql in PARTITIONED_TABLES[table_name]["indexes"]
+    ]
+
+
+def create_partition_sql(table_name, month):
+    """Return the statements that create the partition of a month with its keys and indexes.
+
+    Args:
+        table_name (str): A partitioned table
+        month (datetime.date): The first day of the month
+
+    Returns:
+        (list): SQL statements to run in order, in the table's schema
+
+    """
+    partition = partition_name(table_name, month)
+    lower, upper = partition_bounds(month)
+    statements = [f"CREATE TABLE {partition} PARTITION OF {table_name} FOR VALUES FROM ('{lower}') TO ('{upper}')"]
+    statements.extend(partition_index_sql(table_name, month))
+    return statements
+
+
+def partition_range_check_sql(table_name, month, target):
+    """Return the statement that constrains a staging table to the month it will be attached as."""
+    lower, upper = partition_bounds(month)
+    column = PARTITIONED_TABLES[table_name]["column"]
+    name = partition_index_name(table_name, month, "range_new")
+    return f"ALTER TABLE {target} ADD CONSTRAINT {name} CHECK ({column} >= '{lower}' AND {column} < '{upper}')"
+
+
+def swap_partition_sql(table_name, month, staging_table_name, replace=True):
+    """Return the statements that swap a staging table in as the partition of a month.
+
+    The staging table must have been created like the partitioned table,
+    indexed by partition_index_sql with a name_suffix of "_new" and
+    constrained by partition_range_check_sql, which lets the attach skip
+    scanning the table.
+
+    Args:
+        table_name (str): A partitioned table
+        month (datetime.date): The first day of the month
+        staging_table_name (str): The table holding the new rows of the month
+        replace (bool): Whether there is a partition to detach and drop first
+
+    Returns:
+        (list): SQL statements to run in order in one transaction
+
+    """
+    partition = partition_name(table_name, month)
+    lower, upper = partition_bounds(month)
+    statements = []
+    if replace:
+        statements.extend([f"ALTER TABLE {table_name} DETACH PARTITION {partition}", f"DROP TABLE {partition}"])
+    statements.append(f"ALTER TABLE {staging_table_name} RENAME TO {partition}")
+    for suffix, sql in PARTITIONED_TABLES[table_name]["indexes"]:
+        name = partition_index_name(table_name, month, suffix)
+        if "FOREIGN KEY" in sql:
+            # Foreign keys have no index to rename
+            statements.append(f"ALTER TABLE {partition} RENAME CONSTRAINT {name}_new TO {name}")
+        else:
+            statements.append(f"ALTER INDEX {name}_new RENAME TO {name}")
+    statements.extend(
+        [
+            f"ALTER TABLE {table_name} ATTACH PARTITION {partition} FOR VALUES FROM ('{lower}') TO ('{upper}')",
+            f"ALTER TABLE {partition} DROP CONSTRAINT {partition_index_name(table_name, month, 'range_new')}",
+        ]
+    )
+    return statements
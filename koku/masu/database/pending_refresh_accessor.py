@@ -0,0 +1,124 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Accessor for the queue of reporting summary table refresh requests."""
+import logging
+
+from django.db import connection
+from django.db.models import Max
+from tenant_schemas.utils import schema_context
+
+from masu.database.koku_database_access import KokuDBAccess
+from masu.database.partitioning import as_date
+from reporting_common.models import PendingRefresh
+
+LOG = logging.getLogger(__name__)
+
+# The advisory lock class held by the refresh of a schema
+REFRESH_LOCK_NAME = "masu_refresh"
+
+
+class PendingRefreshDBAccessor(KokuDBAccess):
+    """Queue refresh requests and hand them to the refresh of their schema."""
+
+    def __init__(self):
+        """Access the pending refresh table."""
+        self._schema = "public"
+        super().__init__(self._schema)
+        self._table = PendingRefresh
+
+    def add(self, schema_name, provider_type, manifest_id=None, date_ranges=None):
+        """Queue a refresh request.
+
+        Args:
+            schema_name (str): The customer schema to refresh
+            provider_type (str): The provider type of the summary tables
+            manifest_id (int): The manifest completed by the refresh
+            date_ranges (list): The (start, end) date pairs to refresh, all kept days when None
+
+        Returns:
+            (None)
+
+        """
+        entries = [
+            self._table(
+                schema_name=schema_name,
+                provider_type=provider_type,
+                manifest_id=manifest_id,
+                start_date=as_date(start_date) if start_date else None,
+                end_date=as_date(end_date) if end_date else None,
+            )
+            for start_date, end_date in date_ranges or [(None, None)]
+        ]
+        with schema_context(self._schema):
+            self._table.objects.bulk_create(entries)
+
+    def get_last_requested(self, schema_name, provider_type):
+        """Return the time of the latest pending request of a schema and provider type, None without any."""
+        with schema_context(self._schema):
+            return self._table.objects.filter(schema_name=schema_name, provider_type=provider_type).aggregate(
+                last=Max("requested_datetime")
+            )["last"]
+
+    def claim(self, schema_name, provider_type):
+        """Remove the pending requests of a schema and provider type from the queue and return them.
+
+        Args:
+            schema_name (str): The customer schema to refresh
+            provider_type (str): The provider type of the summary tables
+
+        Returns:
+            (list): The (manifest_id, start_date, end_date) of each request
+
+        """
+        with schema_context(self._schema):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    DELETE FROM {self._table._meta.db_table}
+                    WHERE schema_name = %s AND provider_type = %s
+                    RETURNING manifest_id, start_date, end_date
+                    """,
+                    [schema_name, provider_type],
+                )
+                return cursor.fetchall()
+
+    def restore(self, schema_name, provider_type, requests):
+        """Queue claimed requests again after their refresh failed."""
+        entries = [
+            self._table(
+                schema_name=schema_name,
+                provider_type=provider_type,
+                manifest_id=manifest_id,
+                start_date=start_date,
+                end_date=end_date,
+            )
+            for manifest_id, start_date, end_date in requests
+        ]
+        with schema_context(self._schema):
+            self._table.objects.bulk_create(entries)
+        LOG.info("Restored %d refresh requests of schema %s.", len(entries), schema_name)
+
+    def try_lock_schema(self, schema_name):
+        """Take the refresh lock of a schema for this connection, returning whether it was free."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s), hashtext(%s))", [REFRESH_LOCK_NAME, schema_name])
+            return cursor.fetchone()[0]
+
+    def unlock_schema(self, schema_name):
+        """Release the refresh lock of a schema."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(hashtext(%s), hashtext(%s))", [REFRESH_LOCK_NAME, schema_name])
@@ -15,22 +15,68 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """Database accessor for report data."""
+import datetime
 import logging
 import uuid
 from decimal import Decimal
 from decimal import InvalidOperation
 
 import django.apps
+import pytz
+from django.db import IntegrityError
 from django.db import connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from psycopg2.extras import execute_values
 from tenant_schemas.utils import schema_context
 
 from masu.config import Config
+from masu.database.binary_copy import BinaryCopyWriter
 from masu.database.koku_database_access import KokuDBAccess
+from masu.database.partitioning import PARTITIONED_TABLES
+from masu.database.partitioning import as_date
+from masu.database.partitioning import create_partition_sql
+from masu.database.partitioning import is_partitioned
+from masu.database.partitioning import month_start
+from masu.database.partitioning import partition_bounds
+from masu.database.partitioning import partition_index_sql
+from masu.database.partitioning import partition_month
+from masu.database.partitioning import partition_months
+from masu.database.partitioning import partition_name
+from masu.database.partitioning import partition_range_check_sql
+from masu.database.partitioning import swap_partition_sql
+from masu.database.sql_templates import SQL_TEMPLATES
+from masu.external.date_accessor import DateAccessor
 from reporting_common import REPORT_COLUMN_MAP
 
 LOG = logging.getLogger(__name__)
 
 
+def clean_value(value):
+    """Return a report value as is, or None when it is empty.
+
+    Strings are passed to the database unconverted for the columns Postgres
+    casts them for on INSERT and COPY, like numeric and timestamp columns.
+    """
+    return None if value == "" else value
+
+
+def clean_int(value):
+    """Return a report value as an integer, or None when it is empty or not a number."""
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError as err:
+        LOG.warning(err)
+        return None
+
+
+# The converter of each column type that is not passed to the database as is
+COLUMN_CONVERTERS = {"BigIntegerField": clean_int}
+
+
 # pylint: disable=too-few-public-methods
 class ReportSchema:
     """A container for the reporting table objects."""
@@ -39,6 +85,8 @@ class ReportSchema:
         """Initialize the report schema."""
         self.column_types = {}
         self._set_reporting_tables(tables)
+        self._converters = {}
+        self._conversion_plans = {}
 
     def _set_reporting_tables(self, models):
         """Load table objects for reference and creation.
@@ -57,11 +105,80 @@ class ReportSchema:
             column_types.update({model._meta.db_table: types})
             self.column_types = column_types
 
+    def get_column_types(self, table_name, columns):
+        """Return the Django internal field type of each column of a table.
+
+        Columns that are not in the report column map, like foreign keys and
+        tags, are looked up on the table model. Foreign keys take the type
+        of the field they reference.
+
+        Args:
+            table_name (str): The name of a reporting table
+            columns (list): Column names of the table
+
+        Returns:
+            (list): The field type of each column, in order
+
+        """
+        known_types = self.column_types.get(table_name, {})
+        model = getattr(self, table_name)
+        types = []
+        for column in columns:
+            column_type = known_types.get(column)
+            if column_type is None:
+                field = model._meta.get_field(column)
+                if field.is_relation:
+                    field = field.target_field
+                column_type = field.get_internal_type()
+            types.append(column_type)
+        return types
+
+    def get_conversion_plan(self, table_name, columns):
+        """Return the converter of each column of a table.
+
+        Plans are built once per table and column order.
+
+        Args:
+            table_name (str): The name of a reporting table
+            columns (iterable): Column names of the table
+
+        Returns:
+            (tuple): The converter callable of each column, in order
+
+        """
+        columns = tuple(columns)
+        plan = self._conversion_plans.get((table_name, columns))
+        if plan is None:
+            converters = self._converters.get(table_name)
+            if converters is None:
+                converters = {
+                    column: COLUMN_CONVERTERS.get(column_type, clean_value)
+                    for column, column_type in self.column_types.get(table_name, {}).items()
+                }
+                self._converters[table_name] = converters
+            plan = tuple(converters.get(column, clean_value) for column in columns)
+            self._conversion_plans[(table_name, columns)] = plan
+        return plan
+
+
+_REPORT_SCHEMA = None
+
+
+def get_report_schema():
+    """Return the report schema of the process, built on first use."""
+    global _REPORT_SCHEMA
+    if _REPORT_SCHEMA is None:
+        _REPORT_SCHEMA = ReportSchema(django.apps.apps.get_models())
+    return _REPORT_SCHEMA
+
 
 # pylint: disable=too-many-public-methods
 class ReportDBAccessorBase(KokuDBAccess):
     """Class to interact with customer reporting tables."""
 
+    # The number of existing rows matched per query when resolving a batch insert
+    BATCH_LOOKUP_SIZE = 1000
+
     def __init__(self, schema):
         """Establish the database connection.
 
@@ -69,7 +186,9 @@ class ReportDBAccessorBase(KokuDBAccess):
             schema (str): The customer schema to associate with
         """
         super().__init__(schema)
-        self.report_schema = ReportSchema(django.apps.apps.get_models())
+        self.report_schema = get_report_schema()
+        # Temporary tables created by this accessor and the tables they copy
+        self._temp_table_sources = {}
 
     @property
     def decimal_precision(self):
@@ -84,6 +203,7 @@ class ReportDBAccessorBase(KokuDBAccess):
             cursor.execute(f"CREATE TEMPORARY TABLE {temp_table_name} (LIKE {table_name})")
             if drop_column:
                 cursor.execute(f"ALTER TABLE {temp_table_name} DROP COLUMN {drop_column}")
+        self._temp_table_sources[temp_table_name] = table_name
         return temp_table_name
 
     def create_new_temp_table(self, table_name, columns):
@@ -119,20 +239,102 @@ class ReportDBAccessorBase(KokuDBAccess):
         conflict_col_str = ",".join(conflict_columns)
 
         set_clause = ",".join([f"{column} = excluded.{column}" for column in columns])
-        upsert_sql = f"""
-            INSERT INTO {table_name} ({column_str})
-                SELECT {column_str}
-                FROM {temp_table_name}
-                ON CONFLICT ({conflict_col_str}) DO UPDATE
-                SET {set_clause}
-            """
         with connection.cursor() as cursor:
             cursor.db.set_schema(self.schema)
-            cursor.execute(upsert_sql)
+            for target_table, where_clause in self._get_merge_targets(cursor, table_name, temp_table_name):
+                upsert_sql = f"""
+                    INSERT INTO {target_table} ({column_str})
+                        SELECT {column_str}
+                        FROM {temp_table_name}
+                        {where_clause}
+                        ON CONFLICT ({conflict_col_str}) DO UPDATE
+                        SET {set_clause}
+                    """
+                cursor.execute(upsert_sql)
 
             delete_sql = f"DELETE FROM {temp_table_name}"
             cursor.execute(delete_sql)
 
+    # pylint: disable=too-many-arguments
+    def merge_staging_table(self, table_name, staging_table_name, columns, conflict_columns, insert_only=False):
+        """Merge every row staged for a file into the primary table in one statement.
+
+        Staged rows are deduplicated on the conflict columns first, keeping the
+        last staged row of each key, since one upsert can not update a row twice.
+
+        Args:
+            table_name (str): The main table to insert into
+            staging_table_name (str): The temp table the rows were appended to
+            columns (list): A list of columns to use in the insert logic
+            conflict_columns (list): The columns of the table's unique constraint
+            insert_only (bool): No row of the table can conflict with the staged
+                rows, so they are inserted without an upsert. Falls back to the
+                upsert if a conflict is found anyway.
+
+        Returns:
+            (None)
+
+        """
+        column_str = ",".join(columns)
+        conflict_col_str = ",".join(conflict_columns)
+        set_clause = ",".join([f"{column} = excluded.{column}" for column in columns])
+        with connection.cursor() as cursor:
+            cursor.db.set_schema(self.schema)
+            for target_table, where_clause in self._get_merge_targets(cursor, table_name, staging_table_name):
+                # Rows are only appended to the staging table, so its physical order is the load order
+                insert_sql = f"""
+                    INSERT INTO {target_table} ({column_str})
+                        SELECT DISTINCT ON ({conflict_col_str}) {column_str}
+                        FROM {staging_table_name}
+                        {where_clause}
+                        ORDER BY {conflict_col_str}, ctid DESC
+                    """
+                upsert_sql = f"""
+                    {insert_sql}
+                        ON CONFLICT ({conflict_col_str}) DO UPDATE
+                        SET {set_clause}
+                    """
+                merged = False
+                if insert_only:
+                    try:
+                        with transaction.atomic():
+                            cursor.execute(insert_sql)
+                        merged = True
+                    except IntegrityError:
+                        LOG.info("Staged rows conflict with rows in %s, merging with an upsert.", target_table)
+                if not merged:
+                    cursor.execute(upsert_sql)
+            cursor.execute(f"TRUNCATE {staging_table_name}")
+
+    @staticmethod
+    def _get_merge_targets(cursor, table_name, source_table_name):
+        """Return the tables that rows of a source table are merged into, with the filter of each.
+
+        Postgres 10 can not upsert into a partitioned table, so the rows of
+        each month are merged into the month's partition instead.
+
+        Args:
+            cursor (CursorWrapper): A cursor in the accessor's schema
+            table_name (str): The table to merge into
+            source_table_name (str): The temp table holding the rows
+
+        Returns:
+            (list): Tuples of a table name and the WHERE clause selecting its rows
+
+        """
+        if not is_partitioned(table_name):
+            return [(table_name, "")]
+        column = PARTITIONED_TABLES[table_name]["column"]
+        cursor.execute(
+            f"SELECT DISTINCT date_trunc('month', {column} AT TIME ZONE 'UTC')::date FROM {source_table_name}"
+        )
+        targets = []
+        for (month,) in cursor.fetchall():
+            lower, upper = partition_bounds(month)
+            where_clause = f"WHERE {column} >= '{lower}' AND {column} < '{upper}'"
+            targets.append((partition_name(table_name, month), where_clause))
+        return targets
+
     # pylint: disable=too-many-arguments
     def bulk_insert_rows(self, file_obj, table, columns, sep=","):
         """Insert many rows using Postgres copy functionality.
@@ -150,6 +352,391 @@ class ReportDBAccessorBase(KokuDBAccess):
             statement = f"COPY {table} ({columns}) FROM STDIN WITH CSV DELIMITER '{sep}'"
             cursor.copy_expert(statement, file_obj)
 
+    def bulk_insert_binary_rows(self, rows, table, columns):
+        """Insert many rows using the Postgres binary copy format.
+
+        Values are encoded by the type of their column, so numbers and
+        timestamps are not written and parsed as text.
+
+        Args:
+            rows (iterable): Sequences of values in the order of columns
+            table (str): The table name in the database to copy to, or a
+                temporary table created by create_temp_table
+            columns (list): A list of columns in the order of the row values
+
+        """
+        source_table = self._temp_table_sources.get(table, table)
+        writer = BinaryCopyWriter(self.report_schema.get_column_types(source_table, columns))
+        file_obj = writer.write(rows)
+        columns = ", ".join(columns)
+        with connection.cursor() as cursor:
+            cursor.db.set_schema(self.schema)
+            statement = f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT binary)"
+            cursor.copy_expert(statement, file_obj)
+
+    def get_table_partitions(self, table_name):
+        """Return the monthly partitions of a table.
+
+        Args:
+            table_name (str): A table partitioned by month
+
+        Returns:
+            (dict): The name of each partition, keyed by the first day of its month
+
+        """
+        sql = """
+            SELECT child.relname
+            FROM pg_inherits AS inh
+            JOIN pg_class AS parent
+                ON parent.oid = inh.inhparent
+            JOIN pg_class AS child
+                ON child.oid = inh.inhrelid
+            JOIN pg_namespace AS nsp
+                ON nsp.oid = parent.relnamespace
+            WHERE nsp.nspname = %s
+                AND parent.relname = %s
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.schema, table_name])
+            names = [row[0] for row in cursor.fetchall()]
+        partitions = {}
+        for name in names:
+            month = partition_month(table_name, name)
+            if month is not None:
+                partitions[month] = name
+        return partitions
+
+    def create_table_partitions(self, table_name, start_date, end_date):
+        """Create the missing monthly partitions of a table for the dates from start_date to end_date.
+
+        Args:
+            table_name (str): The table to partition
+            start_date (datetime.date): The first date rows will be written for
+            end_date (datetime.date): The date after the last date rows will be written for
+
+        Returns:
+            (list): The names of the created partitions
+
+        """
+        if not is_partitioned(table_name):
+            return []
+        months = partition_months(start_date, end_date)
+        existing = self.get_table_partitions(table_name)
+        if all(month in existing for month in months):
+            return []
+
+        created = []
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.db.set_schema(self.schema)
+                # Workers processing files of the same month wait for the first to create the partition
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [f"{self.schema}.{table_name}"])
+                existing = self.get_table_partitions(table_name)
+                for month in months:
+                    if month in existing:
+                        continue
+                    for statement in create_partition_sql(table_name, month):
+                        cursor.execute(statement)
+                    created.append(partition_name(table_name, month))
+        if created:
+            LOG.info("Created partitions %s of %s in schema %s.", ", ".join(created), table_name, self.schema)
+        return created
+
+    def drop_table_partitions(self, table_name, expired_date):
+        """Detach and drop the partitions of a table for months starting on or before a date.
+
+        Args:
+            table_name (str): A table partitioned by month
+            expired_date (datetime.date): The last expired month start
+
+        Returns:
+            (list): The names of the dropped partitions
+
+        """
+        if not is_partitioned(table_name):
+            return []
+        if isinstance(expired_date, datetime.datetime):
+            expired_date = expired_date.date()
+        partitions = self.get_table_partitions(table_name)
+        expired = [partitions[month] for month in sorted(partitions) if month <= expired_date]
+        if not expired:
+            return []
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.db.set_schema(self.schema)
+                for partition in expired:
+                    cursor.execute(f"ALTER TABLE {table_name} DETACH PARTITION {partition}")
+                    cursor.execute(f"DROP TABLE {partition}")
+        LOG.info("Dropped partitions %s of %s in schema %s.", ", ".join(expired), table_name, self.schema)
+        return expired
+
+    def truncate_table_partition(self, table_name, month):
+        """Remove every row of a month from a table by truncating its partition.
+
+        Args:
+            table_name (str): A table partitioned by month
+            month (datetime.date): A date in the month
+
+        Returns:
+            (bool): Whether the month was removed, False if the table is not partitioned
+
+        """
+        if not is_partitioned(table_name):
+            return False
+        partition = self.get_table_partitions(table_name).get(month_start(month))
+        if partition is None:
+            # Rows can not be written to a month without a partition
+            return True
+        with connection.cursor() as cursor:
+            cursor.db.set_schema(self.schema)
+            cursor.execute(f"TRUNCATE {partition}")
+        LOG.info("Truncated partition %s of %s in schema %s.", partition, table_name, self.schema)
+        return True
+
+    # pylint: disable=too-many-arguments,too-many-locals
+    def swap_table_partitions(self, table_name, source_table_name, start_date, end_date, filters=None):
+        """Replace the rows of a date range of a table with the rows of a source table.
+
+        Each month of the range is rebuilt as a new table holding the rows the
+        month keeps and the source rows of the month, indexed, and swapped in
+        for the month's partition. Readers see the old or the new month but
+        never a partially refreshed one, and replaced rows are dropped with the
+        old partition instead of being deleted and vacuumed.
+
+        Rebuilding copies the whole month, so when the source rows of a month
+        are less than Config.PARTITION_SWAP_MIN_SHARE of the partition's
+        estimated rows, the replaced rows are deleted and the source rows
+        inserted in the same transaction instead.
+
+        Args:
+            table_name (str): A table partitioned by month
+            source_table_name (str): A table created like table_name holding the new rows
+            start_date (datetime.date): The first date to replace
+            end_date (datetime.date): The last date to replace
+            filters (dict): Column values the replaced rows also match, a list matching any of its values
+
+        Returns:
+            (list): The names of the partitions whose rows were replaced
+
+        """
+        column = PARTITIONED_TABLES[table_name]["column"]
+        start_date, end_date = as_date(start_date), as_date(end_date)
+        conditions = [f"{column} >= %s", f"{column} <= %s"]
+        params = [start_date, end_date]
+        for key, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                conditions.append(f"{key} IN %s")
+                params.append(tuple(value))
+            else:
+                conditions.append(f"{key} = %s")
+                params.append(value)
+        replaced = " AND ".join(conditions)
+
+        swapped = []
+        replaced_in_place = []
+        for month in partition_months(start_date, end_date + datetime.timedelta(days=1)):
+            partition = partition_name(table_name, month)
+            staging_table_name = f"{partition}_new"
+            lower, upper = partition_bounds(month)
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.db.set_schema(self.schema)
+                    cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [f"{self.schema}.{table_name}"])
+                    # Writers wait for the swap so their changes are not lost with the old partition
+                    cursor.execute(f"LOCK TABLE {table_name} IN SHARE ROW EXCLUSIVE MODE")
+                    exists = month in self.get_table_partitions(table_name)
+                    if exists and self._replace_in_place(cursor, partition, source_table_name, column, month):
+                        cursor.execute(f"DELETE FROM {partition} WHERE {replaced}", params)
+                        cursor.execute(
+                            f"""
+                            INSERT INTO {partition}
+                            SELECT * FROM {source_table_name} WHERE {column} >= %s AND {column} < %s
+                            """,
+                            [lower, upper],
+                        )
+                        replaced_in_place.append(partition)
+                        continue
+                    cursor.execute(f"CREATE TABLE {staging_table_name} (LIKE {table_name} INCLUDING DEFAULTS)")
+                    if exists:
+                        cursor.execute(
+                            f"""
+                            INSERT INTO {staging_table_name}
+                            SELECT * FROM {partition} WHERE ({replaced}) IS NOT TRUE
+                            """,
+                            params,
+                        )
+                    cursor.execute(
+                        f"""
+                        INSERT INTO {staging_table_name}
+                        SELECT * FROM {source_table_name} WHERE {column} >= %s AND {column} < %s
+                        """,
+                        [lower, upper],
+                    )
+                    for statement in partition_index_sql(table_name, month, staging_table_name, "_new"):
+                        cursor.execute(statement)
+                    cursor.execute(partition_range_check_sql(table_name, month, staging_table_name))
+                    for statement in swap_partition_sql(table_name, month, staging_table_name, replace=exists):
+                        cursor.execute(statement)
+            swapped.append(partition)
+        if swapped:
+            LOG.info("Swapped partitions %s of %s in schema %s.", ", ".join(swapped), table_name, self.schema)
+        if replaced_in_place:
+            LOG.info(
+                "Replaced rows in place in partitions %s of %s in schema %s.",
+                ", ".join(replaced_in_place),
+                table_name,
+                self.schema,
+            )
+        return sorted(swapped + replaced_in_place)
+
+    @staticmethod
+    def _replace_in_place(cursor, partition, source_table_name, column, month):
+        """Return whether the source rows of a month are a small enough share of its partition to replace in place.
+
+        Args:
+            cursor (CursorWrapper): A cursor in the transaction of the swap
+            partition (str): The partition of the month
+            source_table_name (str): The table holding the new rows
+            column (str): The partitioning date column
+            month (datetime.date): The first day of the month
+
+        Returns:
+            (bool): Whether to delete and insert the rows of the month instead of swapping the partition
+
+        """
+        if Config.PARTITION_SWAP_MIN_SHARE <= 0:
+            return False
+        # The planner's estimate avoids counting the partition
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [partition])
+        estimated_rows = cursor.fetchone()[0]
+        if estimated_rows <= 0:
+            return False
+        lower, upper = partition_bounds(month)
+        cursor.execute(
+            f"SELECT count(*) FROM {source_table_name} WHERE {column} >= %s AND {column} < %s", [lower, upper]
+        )
+        return cursor.fetchone()[0] < Config.PARTITION_SWAP_MIN_SHARE * estimated_rows
+
+    def get_ui_summary_window(self, start_date=None, end_date=None):
+        """Return the dates of a range the UI summary tables keep.
+
+        The UI summary tables keep this month and last month.
+
+        Args:
+            start_date (datetime.date): The first date of the range, the window start when None
+            end_date (datetime.date): The last date of the range, the window end when None
+
+        Returns:
+            (tuple): The window start and the clamped first and last dates of the range
+
+        """
+        this_month = month_start(DateAccessor().today().date())
+        window_start = month_start(this_month - datetime.timedelta(days=1))
+        window_end = month_start(this_month + datetime.timedelta(days=32)) - datetime.timedelta(days=1)
+        start_date = max(as_date(start_date), window_start) if start_date else window_start
+        end_date = min(as_date(end_date), window_end) if end_date else window_end
+        return window_start, start_date, end_date
+
+    def populate_ui_summary_tables(self, table_names, start_date=None, end_date=None):
+        """Rebuild the rows of a date range of the UI summary tables from the daily summary tables.
+
+        Rows of the range are replaced in one transaction per table, so readers
+        see the old or the new rows of the range. Rows that aged out of the
+        window the tables keep are removed.
+
+        Args:
+            table_names (list): The UI summary tables to update
+            start_date (datetime.date): The first date to rebuild, the window start when None
+            end_date (datetime.date): The last date to rebuild, the window end when None
+
+        Returns:
+            (None)
+
+        """
+        window_start, start_date, end_date = self.get_ui_summary_window(start_date, end_date)
+        for table_name in table_names:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.db.set_schema(self.schema)
+                    cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [f"{self.schema}.{table_name}"])
+                    cursor.execute(
+                        f"""
+                        DELETE FROM {table_name}
+                        WHERE usage_start < %s
+                            OR (usage_start >= %s AND usage_start <= %s)
+                        """,
+                        [window_start, start_date, end_date],
+                    )
+                if start_date <= end_date:
+                    self._populate_ui_summary_table(table_name, f"{self.schema}.{table_name}", start_date, end_date)
+
+    def check_ui_summary_tables(self, table_names, start_date=None, end_date=None):
+        """Compare the rows of the UI summary tables with a full recomputation from the daily summary tables.
+
+        Args:
+            table_names (list): The UI summary tables to check
+            start_date (datetime.date): The first date to check, the window start when None
+            end_date (datetime.date): The last date to check, the window end when None
+
+        Returns:
+            (dict): The number of rows differing from the recomputation, keyed by table name
+
+        """
+        _, start_date, end_date = self.get_ui_summary_window(start_date, end_date)
+        differences = {}
+        for table_name in table_names:
+            check_table_name = f"{table_name}_check_{uuid.uuid4().hex}"
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.db.set_schema(self.schema)
+                    cursor.execute(
+                        f"CREATE TEMPORARY TABLE {check_table_name} ON COMMIT DROP AS "
+                        f"SELECT * FROM {table_name} WITH NO DATA"
+                    )
+                    self._populate_ui_summary_table(table_name, check_table_name, start_date, end_date)
+                    cursor.execute(f"SELECT * FROM {table_name} LIMIT 0")
+                    columns = ", ".join(column.name for column in cursor.description if column.name != "id")
+                    cursor.execute(
+                        f"""
+                        SELECT count(*)
+                        FROM (
+                            (
+                                SELECT {columns} FROM {check_table_name}
+                                EXCEPT ALL
+                                SELECT {columns} FROM {table_name} WHERE usage_start >= %s AND usage_start <= %s
+                            )
+                            UNION ALL
+                            (
+                                SELECT {columns} FROM {table_name} WHERE usage_start >= %s AND usage_start <= %s
+                                EXCEPT ALL
+                                SELECT {columns} FROM {check_table_name}
+                            )
+                        ) AS difference
+                        """,
+                        [start_date, end_date, start_date, end_date],
+                    )
+                    differences[table_name] = cursor.fetchone()[0]
+            if differences[table_name]:
+                LOG.warning(
+                    "%d rows of %s in schema %s differ from the daily summary for %s - %s.",
+                    differences[table_name],
+                    table_name,
+                    self.schema,
+                    start_date,
+                    end_date,
+                )
+        return differences
+
+    def _populate_ui_summary_table(self, table_name, target_table_name, start_date, end_date):
+        """Insert the rollup of a date range of a UI summary table into a target table."""
+        summary_sql_params = {
+            "schema": self.schema,
+            "table": target_table_name,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        self._execute_sql_template(table_name, table_name, summary_sql_params, start_date, end_date)
+
     # pylint: disable=arguments-differ
     def _get_db_obj_query(self, table, columns=None):
         """Return a query on a specific database table.
@@ -228,6 +815,71 @@ class ReportDBAccessorBase(KokuDBAccess):
 
         return self._get_primary_key(table, data)
 
+    def insert_on_conflict_do_nothing_batch(self, table, rows, conflict_columns=None):
+        """Write a single multi-row INSERT statement with an ON CONFLICT clause.
+
+        The set-based counterpart of insert_on_conflict_do_nothing. Rows that
+        are inserted have their ids returned by the statement; rows that
+        already existed are looked up with one query for all of them.
+
+        Args:
+            table (DjangoModel): The table to insert into
+            rows (list): A list of dictionaries of data to insert
+            conflict_columns (list): A list of columns to check conflict on
+
+        Returns:
+            (list): The id of each row, in the order of rows
+
+        """
+        if not rows:
+            return []
+        table_name = table._meta.db_table
+        rows = [self.clean_data(dict(row), table_name) for row in rows]
+        columns = list(rows[0].keys())
+        key_columns = conflict_columns if conflict_columns else columns
+        key_fields = [table._meta.get_field(column) for column in key_columns]
+
+        def make_key(values):
+            """Normalize key values so CSV strings match values read from the DB."""
+            key = []
+            for field, value in zip(key_fields, values):
+                value = field.to_python(value)
+                if isinstance(value, datetime.datetime) and timezone.is_naive(value):
+                    value = timezone.make_aware(value, pytz.UTC)
+                key.append(value)
+            return tuple(key)
+
+        keys = [make_key([row.get(column) for column in key_columns]) for row in rows]
+        unique_rows = {}
+        for key, row in zip(keys, rows):
+            unique_rows.setdefault(key, tuple(row.get(column) for column in columns))
+
+        columns_formatted = ", ".join(columns)
+        key_columns_formatted = ", ".join(key_columns)
+        conflict_clause = f"ON CONFLICT ({key_columns_formatted})" if conflict_columns else "ON CONFLICT"
+        insert_sql = f"""
+            INSERT INTO {self.schema}.{table_name}({columns_formatted}) VALUES %s
+            {conflict_clause} DO NOTHING
+            RETURNING id, {key_columns_formatted}
+            """
+        with connection.cursor() as cursor:
+            cursor.db.set_schema(self.schema)
+            inserted = execute_values(
+                cursor, insert_sql, list(unique_rows.values()), page_size=len(unique_rows), fetch=True
+            )
+        ids = {make_key(row[1:]): row[0] for row in inserted}
+
+        missing = [key for key in unique_rows if key not in ids]
+        for i in range(0, len(missing), self.BATCH_LOOKUP_SIZE):
+            lookup = Q()
+            for key in missing[i : i + self.BATCH_LOOKUP_SIZE]:  # noqa: E203
+                lookup |= Q(**dict(zip(key_columns, key)))
+            with schema_context(self.schema):
+                existing = table.objects.filter(lookup).values_list("id", *key_columns)
+                ids.update({make_key(row[1:]): row[0] for row in existing})
+
+        return [ids.get(key) for key in keys]
+
     def insert_on_conflict_do_update(self, table, data, conflict_columns, set_columns):
         """Write an INSERT statement with an ON CONFLICT clause.
 
@@ -267,6 +919,11 @@ class ReportDBAccessorBase(KokuDBAccess):
 
         return self._get_primary_key(table_name, data)
 
+    @staticmethod
+    def _normalize_key(key):
+        """Treat empty CSV strings and NULL database values in a key alike."""
+        return tuple(value if value is not None else "" for value in key)
+
     def _get_primary_key(self, table_name, data):
         """Return the row id for a specific object."""
         with schema_context(self.schema):
@@ -292,18 +949,9 @@ class ReportDBAccessorBase(KokuDBAccess):
             (dict): The data with values converted to required types
 
         """
-        column_types = self.report_schema.column_types[table_name]
-
-        for key, value in data.items():
-            if value is None or value == "":
-                data[key] = None
-                continue
-            if column_types.get(key) == int or column_types.get(key) == "BigIntegerField":
-                data[key] = self._convert_value(value, int)
-            elif column_types.get(key) == float:
-                data[key] = self._convert_value(value, float)
-            elif column_types.get(key) == Decimal:
-                data[key] = self._convert_value(value, Decimal)
+        plan = self.report_schema.get_conversion_plan(table_name, data)
+        for (key, value), convert in zip(data.items(), plan):
+            data[key] = convert(value)
 
         return data
 
@@ -342,3 +990,16 @@ class ReportDBAccessorBase(KokuDBAccess):
             cursor.db.set_schema(self.schema)
             cursor.execute(sql, params=bind_params)
         LOG.info("Finished updating %s.", table)
+
+    def _execute_sql_template(self, table, template_name, params, start=None, end=None):
+        """Run a registered SQL template via a cursor."""
+        if start and end:
+            LOG.info("Updating %s from %s to %s.", table, start, end)
+        else:
+            LOG.info("Updating %s", table)
+
+        with connection.cursor() as cursor:
+            cursor.db.set_schema(self.schema)
+            rowcount = SQL_TEMPLATES.execute(cursor, template_name, params)
+        LOG.info("Finished updating %s.", table)
+        return rowcount
@@ -56,6 +56,20 @@ class ReportManifestDBAccessor(KokuDBAccess):
             manifest.manifest_updated_datetime = self.date_accessor.today_with_timezone("UTC")
             manifest.save()
 
+    def increment_num_processed_files(self, manifest):
+        """Count a processed file of the manifest.
+
+        The count is incremented in the database rather than from the value
+        loaded on the manifest object, so files of one manifest processed
+        concurrently are all counted.
+        """
+        if manifest:
+            with schema_context(self._schema):
+                self._get_db_obj_query().filter(id=manifest.id).update(
+                    num_processed_files=F("num_processed_files") + 1
+                )
+                manifest.refresh_from_db(fields=["num_processed_files"])
+
     def mark_manifest_as_completed(self, manifest):
         """Update the updated timestamp."""
         if manifest:
@@ -0,0 +1,76 @@
+INSERT INTO {{table | sqlsafe}} (
+    usage_start,
+    usage_end,
+    usage_account_id,
+    account_alias_id,
+    instance_type,
+    resource_ids,
+    resource_count,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT c.usage_start,
+       c.usage_start AS usage_end,
+       c.usage_account_id,
+       c.account_alias_id,
+       c.instance_type,
+       r.resource_ids,
+       CARDINALITY(r.resource_ids) AS resource_count,
+       c.usage_amount,
+       c.unit,
+       c.unblended_cost,
+       c.markup_cost,
+       c.currency_code
+  FROM (
+         -- this group by gets the counts
+         SELECT usage_start,
+                usage_account_id,
+                account_alias_id,
+                instance_type,
+                SUM(usage_amount) AS usage_amount,
+                MAX(unit) AS unit,
+                SUM(unblended_cost) AS unblended_cost,
+                SUM(markup_cost) AS markup_cost,
+                MAX(currency_code) AS currency_code
+           FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+          WHERE usage_start >= {{start_date}}::date AND usage_start < {{end_date}}::date + 1
+            AND instance_type IS NOT NULL
+          GROUP
+             BY usage_start,
+                usage_account_id,
+                account_alias_id,
+                instance_type
+       ) AS c
+  JOIN (
+         -- this group by gets the distinct resources running by day
+         SELECT usage_start,
+                usage_account_id,
+                account_alias_id,
+                instance_type,
+                array_agg(distinct resource_id order by resource_id) as resource_ids
+           FROM (
+                  SELECT usage_start,
+                         usage_account_id,
+                         account_alias_id,
+                         instance_type,
+                         UNNEST(resource_ids) as resource_id
+                    FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+                   WHERE usage_start >= {{start_date}}::date AND usage_start < {{end_date}}::date + 1
+                     AND instance_type IS NOT NULL
+                ) AS x
+          GROUP
+             BY usage_start,
+               usage_account_id,
+               account_alias_id,
+               instance_type
+       ) AS r
+    ON c.usage_start = r.usage_start
+   AND c.instance_type = r.instance_type
+   AND (
+         (c.usage_account_id = r.usage_account_id) OR
+         (c.account_alias_id = r.account_alias_id)
+       )
+;
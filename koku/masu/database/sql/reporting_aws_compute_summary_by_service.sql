@@ -0,0 +1,74 @@
+INSERT INTO {{table | sqlsafe}} (
+    usage_start,
+    usage_end,
+    product_code,
+    product_family,
+    instance_type,
+    resource_ids,
+    resource_count,
+    usage_amount,
+    unit,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT c.usage_start,
+       c.usage_start as usage_end,
+       c.product_code,
+       c.product_family,
+       c.instance_type,
+       r.resource_ids,
+       CARDINALITY(r.resource_ids) AS resource_count,
+       c.usage_amount,
+       c.unit,
+       c.unblended_cost,
+       c.markup_cost,
+       c.currency_code
+  FROM (
+        -- this group by gets the counts
+         SELECT usage_start,
+                product_code,
+                product_family,
+                instance_type,
+                SUM(usage_amount) AS usage_amount,
+                MAX(unit) AS unit,
+                SUM(unblended_cost) AS unblended_cost,
+                SUM(markup_cost) AS markup_cost,
+                MAX(currency_code) AS currency_code
+           FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+          WHERE usage_start >= {{start_date}}::date AND usage_start < {{end_date}}::date + 1
+            AND instance_type IS NOT NULL
+          GROUP
+             BY usage_start,
+                product_code,
+                product_family,
+                instance_type
+       ) AS c
+  JOIN (
+        -- this group by gets the distinct resources running by day
+         SELECT usage_start,
+                product_code,
+                product_family,
+                instance_type,
+                ARRAY_AGG(DISTINCT resource_id ORDER BY resource_id) as resource_ids
+           from (
+                  SELECT usage_start,
+                         product_code,
+                         product_family,
+                         instance_type,
+                         UNNEST(resource_ids) AS resource_id
+                    FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+                   WHERE usage_start >= {{start_date}}::date AND usage_start < {{end_date}}::date + 1
+                     AND instance_type IS NOT NULL
+                ) AS x
+          GROUP
+             BY usage_start,
+                product_code,
+                product_family,
+                instance_type
+       ) AS r
+    ON c.usage_start = r.usage_start
+   AND c.product_code = r.product_code
+   AND c.product_family = r.product_family
+   AND c.instance_type = r.instance_type
+;
@@ -0,0 +1,21 @@
+INSERT INTO {{table | sqlsafe}} (
+    usage_start,
+    usage_end,
+    product_code,
+    product_family,
+    unblended_cost,
+    markup_cost,
+    currency_code
+)
+SELECT date(usage_start) as usage_start,
+    date(usage_start) as usage_end,
+    product_code,
+    product_family,
+    sum(unblended_cost) as unblended_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency_code) as currency_code
+FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary
+-- Get data for the summarized days
+WHERE usage_start >= {{start_date}}::date AND usage_start < {{end_date}}::date + 1
+GROUP BY date(usage_start), product_code, product_family
+;
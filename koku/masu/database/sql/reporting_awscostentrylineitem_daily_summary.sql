@@ -53,20 +53,14 @@ CREATE TEMPORARY TABLE reporting_awscostentrylineitem_daily_summary_{{uuid | sql
 )
 ;
 
--- -- Clear out old entries first
-DELETE FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary AS li
-WHERE li.usage_start >= {{start_date}}
-    AND li.usage_start <= {{end_date}}
-    {% if bill_ids %}
-    AND cost_entry_bill_id IN (
-        {%- for bill_id in bill_ids  -%}
-            {{bill_id}}{% if not loop.last %},{% endif %}
-        {%- endfor -%})
-    {% endif %}
+-- Stage the new rows, the accessor swaps them into the summary table a month at a time
+CREATE TEMPORARY TABLE {{staging_table | sqlsafe}} (
+    LIKE {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary INCLUDING DEFAULTS
+)
 ;
 
 -- Populate the daily aggregate line item data
-INSERT INTO {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily_summary (
+INSERT INTO {{staging_table | sqlsafe}} (
     cost_entry_bill_id,
     usage_start,
     usage_end,
@@ -0,0 +1,37 @@
+-- Rebuild the tag index of the daily line items, one row per lower-cased
+-- tag, read by the OpenShift on AWS tag matching
+DELETE FROM {{schema | sqlsafe}}.reporting_awstag_index
+WHERE usage_start >= {{start_date}}::date
+    AND usage_start <= {{end_date}}::date
+    {% if bill_ids %}
+    AND cost_entry_bill_id IN (
+        {%- for bill_id in bill_ids  -%}
+            {{bill_id}}{% if not loop.last %},{% endif %}
+        {%- endfor -%})
+    {% endif %}
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_awstag_index (
+    cost_entry_bill_id,
+    line_item_id,
+    usage_start,
+    key,
+    value
+)
+    SELECT aws.cost_entry_bill_id,
+        aws.id,
+        aws.usage_start,
+        LOWER(labels.key),
+        LOWER(labels.value)
+    FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily AS aws,
+        jsonb_each_text(aws.tags) AS labels
+    WHERE aws.usage_start >= {{start_date}}::date
+        AND aws.usage_start <= {{end_date}}::date
+        AND aws.cost_entry_bill_id IS NOT NULL
+        {% if bill_ids %}
+        AND aws.cost_entry_bill_id IN (
+            {%- for bill_id in bill_ids  -%}
+                {{bill_id}}{% if not loop.last %},{% endif %}
+            {%- endfor -%})
+        {% endif %}
+;
@@ -0,0 +1,19 @@
+INSERT INTO {{table | sqlsafe}} (
+    usage_start,
+    usage_end,
+    resource_location,
+    pretax_cost,
+    markup_cost,
+    currency
+)
+SELECT usage_start as usage_start,
+    usage_start as usage_end,
+    resource_location,
+    sum(pretax_cost) as pretax_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency) as currency
+FROM {{schema | sqlsafe}}.reporting_azurecostentrylineitem_daily_summary
+-- Get data for the summarized days
+WHERE usage_start >= {{start_date}}::date AND usage_start < {{end_date}}::date + 1
+GROUP BY usage_start, resource_location
+;
@@ -0,0 +1,24 @@
+INSERT INTO {{table | sqlsafe}} (
+    usage_start,
+    usage_end,
+    service_name,
+    usage_quantity,
+    unit_of_measure,
+    pretax_cost,
+    markup_cost,
+    currency
+)
+SELECT usage_start as usage_start,
+    usage_start as usage_end,
+    service_name,
+    sum(usage_quantity) as usage_quantity,
+    max(unit_of_measure) as unit_of_measure,
+    sum(pretax_cost) as pretax_cost,
+    sum(markup_cost) as markup_cost,
+    max(currency) as currency
+FROM {{schema | sqlsafe}}.reporting_azurecostentrylineitem_daily_summary
+-- Get data for the summarized days
+WHERE service_name LIKE '%%Storage%%'
+    AND usage_start >= {{start_date}}::date AND usage_start < {{end_date}}::date + 1
+GROUP BY usage_start, service_name
+;
@@ -46,19 +46,14 @@ CREATE TEMPORARY TABLE reporting_azurecostentrylineitem_daily_summary_{{uuid | s
 )
 ;
 
--- Clear out old entries first
-DELETE FROM {{schema | safe}}.reporting_azurecostentrylineitem_daily_summary
-WHERE usage_start >= {{start_date}}
-    AND usage_start <= {{end_date}}
-    AND cost_entry_bill_id IN (
-        {%- for bill_id in bill_ids  -%}
-        {{bill_id}}{% if not loop.last %},{% endif %}
-        {%- endfor -%}
-    )
+-- Stage the new rows, the accessor swaps them into the summary table a month at a time
+CREATE TEMPORARY TABLE {{staging_table | safe}} (
+    LIKE {{schema | safe}}.reporting_azurecostentrylineitem_daily_summary INCLUDING DEFAULTS
+)
 ;
 
 -- Populate the daily summary line item data
-INSERT INTO {{schema | safe}}.reporting_azurecostentrylineitem_daily_summary (
+INSERT INTO {{staging_table | safe}} (
     cost_entry_bill_id,
     subscription_guid,
     resource_location,
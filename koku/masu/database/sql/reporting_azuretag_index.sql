@@ -0,0 +1,36 @@
+-- Rebuild the tag index of the daily line items, one row per lower-cased
+-- tag, read by the OpenShift on Azure tag matching
+DELETE FROM {{schema | sqlsafe}}.reporting_azuretag_index
+WHERE usage_date >= {{start_date}}::date
+    AND usage_date <= {{end_date}}::date
+    {% if bill_ids %}
+    AND cost_entry_bill_id IN (
+        {%- for bill_id in bill_ids  -%}
+            {{bill_id}}{% if not loop.last %},{% endif %}
+        {%- endfor -%})
+    {% endif %}
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_azuretag_index (
+    cost_entry_bill_id,
+    line_item_id,
+    usage_date,
+    key,
+    value
+)
+    SELECT azure.cost_entry_bill_id,
+        azure.id,
+        azure.usage_date,
+        LOWER(labels.key),
+        LOWER(labels.value)
+    FROM {{schema | sqlsafe}}.reporting_azurecostentrylineitem_daily AS azure,
+        jsonb_each_text(azure.tags) AS labels
+    WHERE azure.usage_date >= {{start_date}}::date
+        AND azure.usage_date <= {{end_date}}::date
+        {% if bill_ids %}
+        AND azure.cost_entry_bill_id IN (
+            {%- for bill_id in bill_ids  -%}
+                {{bill_id}}{% if not loop.last %},{% endif %}
+            {%- endfor -%})
+        {% endif %}
+;
@@ -0,0 +1,31 @@
+INSERT INTO {{table | sqlsafe}} (
+    usage_start,
+    usage_end,
+    cluster_id,
+    cluster_alias,
+    supplementary_usage_cost,
+    infrastructure_usage_cost,
+    infrastructure_raw_cost,
+    infrastructure_markup_cost,
+    supplementary_monthly_cost,
+    infrastructure_monthly_cost
+)
+SELECT usage_start as usage_start,
+    usage_start as usage_end,
+    cluster_id,
+    cluster_alias,
+    jsonb_build_object('cpu', sum((supplementary_usage_cost->>'cpu')::decimal),
+                    'memory', sum((supplementary_usage_cost->>'memory')::decimal),
+                    'storage', sum((supplementary_usage_cost->>'storage')::decimal)) as supplementary_usage_cost,
+    jsonb_build_object('cpu', sum((infrastructure_usage_cost->>'cpu')::decimal),
+                    'memory', sum((infrastructure_usage_cost->>'memory')::decimal),
+                    'storage', sum((infrastructure_usage_cost->>'storage')::decimal)) as infrastructure_usage_cost,
+    sum(infrastructure_raw_cost) as infrastructure_raw_cost,
+    sum(infrastructure_markup_cost) as infrastructure_markup_cost,
+    sum(supplementary_monthly_cost) as supplementary_monthly_cost,
+    sum(infrastructure_monthly_cost) as infrastructure_monthly_cost
+FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary
+-- Get data for the summarized days
+WHERE usage_start >= {{start_date}}::date AND usage_start < {{end_date}}::date + 1
+GROUP BY usage_start, cluster_id, cluster_alias
+;
@@ -0,0 +1,54 @@
+INSERT INTO {{table | sqlsafe}} (
+    usage_start,
+    usage_end,
+    cluster_id,
+    cluster_alias,
+    data_source,
+    resource_ids,
+    resource_count,
+    supplementary_usage_cost,
+    infrastructure_usage_cost,
+    infrastructure_raw_cost,
+    infrastructure_markup_cost,
+    pod_usage_cpu_core_hours,
+    pod_request_cpu_core_hours,
+    pod_limit_cpu_core_hours,
+    cluster_capacity_cpu_core_hours,
+    total_capacity_cpu_core_hours,
+    pod_usage_memory_gigabyte_hours,
+    pod_request_memory_gigabyte_hours,
+    pod_limit_memory_gigabyte_hours,
+    total_capacity_memory_gigabyte_hours,
+    cluster_capacity_memory_gigabyte_hours
+)
+SELECT usage_start as usage_start,
+    usage_start as usage_end,
+    cluster_id,
+    cluster_alias,
+    max(data_source) as data_source,
+    array_agg(DISTINCT resource_id) as resource_ids,
+    count(DISTINCT resource_id) as resource_count,
+    jsonb_build_object('cpu', sum((supplementary_usage_cost->>'cpu')::decimal),
+                    'memory', sum((supplementary_usage_cost->>'memory')::decimal),
+                    'storage', sum((supplementary_usage_cost->>'storage')::decimal)) as supplementary_usage_cost,
+    jsonb_build_object('cpu', sum((infrastructure_usage_cost->>'cpu')::decimal),
+                    'memory', sum((infrastructure_usage_cost->>'memory')::decimal),
+                    'storage', sum((infrastructure_usage_cost->>'storage')::decimal)) as infrastructure_usage_cost,
+    sum(infrastructure_raw_cost) as infrastructure_raw_cost,
+    sum(infrastructure_markup_cost) as infrastructure_markup_cost,
+    sum(pod_usage_cpu_core_hours) as pod_usage_cpu_core_hours,
+    sum(pod_request_cpu_core_hours) as pod_request_cpu_core_hours,
+    sum(pod_limit_cpu_core_hours) as pod_limit_cpu_core_hours,
+    max(cluster_capacity_cpu_core_hours) as cluster_capacity_cpu_core_hours,
+    max(total_capacity_cpu_core_hours) as total_capacity_cpu_core_hours,
+    sum(pod_usage_memory_gigabyte_hours) as pod_usage_memory_gigabyte_hours,
+    sum(pod_request_memory_gigabyte_hours) as pod_request_memory_gigabyte_hours,
+    sum(pod_limit_memory_gigabyte_hours) as pod_limit_memory_gigabyte_hours,
+    max(total_capacity_memory_gigabyte_hours) as total_capacity_memory_gigabyte_hours,
+    max(cluster_capacity_memory_gigabyte_hours) as cluster_capacity_memory_gigabyte_hours
+
+FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary
+-- Get data for the summarized days
+WHERE usage_start >= {{start_date}}::date AND usage_start < {{end_date}}::date + 1 AND data_source = 'Pod'
+GROUP BY usage_start, cluster_id, cluster_alias
+;
@@ -0,0 +1,39 @@
+INSERT INTO {{table | sqlsafe}} (
+    usage_start,
+    usage_end,
+    cluster_id,
+    cluster_alias,
+    data_source,
+    resource_ids,
+    resource_count,
+    supplementary_usage_cost,
+    infrastructure_usage_cost,
+    infrastructure_raw_cost,
+    infrastructure_markup_cost,
+    persistentvolumeclaim_usage_gigabyte_months,
+    volume_request_storage_gigabyte_months,
+    persistentvolumeclaim_capacity_gigabyte_months
+)
+SELECT usage_start as usage_start,
+    usage_start as usage_end,
+    cluster_id,
+    cluster_alias,
+    max(data_source) as data_source,
+    array_agg(DISTINCT resource_id) as resource_ids,
+    count(DISTINCT resource_id) as resource_count,
+    jsonb_build_object('cpu', sum((supplementary_usage_cost->>'cpu')::decimal),
+                    'memory', sum((supplementary_usage_cost->>'memory')::decimal),
+                    'storage', sum((supplementary_usage_cost->>'storage')::decimal)) as supplementary_usage_cost,
+    jsonb_build_object('cpu', sum((infrastructure_usage_cost->>'cpu')::decimal),
+                    'memory', sum((infrastructure_usage_cost->>'memory')::decimal),
+                    'storage', sum((infrastructure_usage_cost->>'storage')::decimal)) as infrastructure_usage_cost,
+    sum(infrastructure_raw_cost) as infrastructure_raw_cost,
+    sum(infrastructure_markup_cost) as infrastructure_markup_cost,
+    sum(persistentvolumeclaim_usage_gigabyte_months) as persistentvolumeclaim_usage_gigabyte_months,
+    sum(volume_request_storage_gigabyte_months) as volume_request_storage_gigabyte_months,
+    sum(persistentvolumeclaim_capacity_gigabyte_months) as persistentvolumeclaim_capacity_gigabyte_months
+FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary
+-- Get data for the summarized days
+WHERE usage_start >= {{start_date}}::date AND usage_start < {{end_date}}::date + 1 AND data_source = 'Storage'
+GROUP BY usage_start, cluster_id, cluster_alias
+;
@@ -3,88 +3,95 @@
 -- Ex aws_where_clause: 'AND cost_entry_bill_id IN (1, 2, 3)'
 -- Ex ocp_where_clause: "AND cluster_id = 'abcd-1234`"
 
--- We use a LATERAL JOIN here to get the JSON tags split out into key, value
--- columns. We reference this split multiple times so we put it in a
--- TEMPORARY TABLE for re-use
+-- The tags of the line items come from the tag index rebuilt with the
+-- daily line items, so the JSON tags are not split out on every run.
+-- We reference the tags multiple times so we put them in a
+-- TEMPORARY TABLE for re-use, indexed for the tag matching joins
 CREATE TEMPORARY TABLE reporting_aws_tags_{{uuid | sqlsafe}} AS (
     SELECT aws.*,
-        LOWER(key) as key,
-        LOWER(value) as value
-        FROM {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily as aws,
-            jsonb_each_text(aws.tags) labels
-        WHERE aws.usage_start >= {{start_date}}::date
-            AND aws.usage_start <= {{end_date}}::date
-            --aws_where_clause
-            {% if bill_ids %}
-            AND cost_entry_bill_id IN (
-                {%- for bill_id in bill_ids -%}
-                {{bill_id}}{% if not loop.last %},{% endif %}
-                {%- endfor -%}
-            )
-            {% endif %}
+        tags.key,
+        tags.value
+    FROM {{schema | sqlsafe}}.reporting_awstag_index AS tags
+    JOIN {{schema | sqlsafe}}.reporting_awscostentrylineitem_daily AS aws
+        ON aws.id = tags.line_item_id
+    WHERE tags.usage_start >= {{start_date}}::date
+        AND tags.usage_start <= {{end_date}}::date
+        --aws_where_clause
+        {% if bill_ids %}
+        AND tags.cost_entry_bill_id IN (
+            {%- for bill_id in bill_ids -%}
+            {{bill_id}}{% if not loop.last %},{% endif %}
+            {%- endfor -%}
+        )
+        {% endif %}
 )
 ;
 
--- We use a LATERAL JOIN here to get the JSON tags split out into key, value
--- columns. We reference this split multiple times so we put it in a
--- TEMPORARY TABLE for re-use
-CREATE TEMPORARY TABLE reporting_ocp_storage_tags_{{uuid | sqlsafe}} AS (
-    SELECT ocp.*
-    FROM (
-        SELECT ocp.*,
-            LOWER(key) as key,
-            LOWER(value) as value
-        FROM {{schema | sqlsafe}}.reporting_ocpstoragelineitem_daily as ocp,
-            jsonb_each_text(ocp.persistentvolume_labels) labels
-        WHERE ocp.usage_start >= {{start_date}}::date
-            AND ocp.usage_start <= {{end_date}}::date
-            --ocp_where_clause
-            {% if cluster_id %}
-            AND cluster_id = {{cluster_id}}
-            {% endif %}
+CREATE INDEX ON reporting_aws_tags_{{uuid | sqlsafe}} (usage_start, key, value)
+;
 
-        UNION ALL
+ANALYZE reporting_aws_tags_{{uuid | sqlsafe}}
+;
 
-        SELECT ocp.*,
-            LOWER(key) as key,
-            LOWER(value) as value
-        FROM {{schema | sqlsafe}}.reporting_ocpstoragelineitem_daily as ocp,
-            jsonb_each_text(ocp.persistentvolumeclaim_labels) labels
-        WHERE ocp.usage_start >= {{start_date}}::date
-            AND ocp.usage_start <= {{end_date}}::date
-            --ocp_where_clause
-            {% if cluster_id %}
-            AND cluster_id = {{cluster_id}}
-            {% endif %}
-    ) AS ocp
+-- The volume and volume claim labels come from the label index rebuilt
+-- with the daily line items, so the JSON labels are not split out on every
+-- run. The index holds all labels, the enabled keys are applied here so
+-- that keys enabled later match without rebuilding it.
+-- We reference the labels multiple times so we put them in a
+-- TEMPORARY TABLE for re-use, indexed for the tag matching joins
+CREATE TEMPORARY TABLE reporting_ocp_storage_tags_{{uuid | sqlsafe}} AS (
+    SELECT ocp.*,
+        labels.key,
+        labels.value
+    FROM {{schema | sqlsafe}}.reporting_ocpstoragevolumelabel_index AS labels
+    JOIN {{schema | sqlsafe}}.reporting_ocpstoragelineitem_daily AS ocp
+        ON ocp.id = labels.line_item_id
     INNER JOIN {{schema | sqlsafe}}.reporting_ocpenabledtagkeys as enabled_tags
-        ON LOWER(enabled_tags.key) = ocp.key
+        ON LOWER(enabled_tags.key) = labels.key
+    WHERE labels.usage_start >= {{start_date}}::date
+        AND labels.usage_start <= {{end_date}}::date
+        --ocp_where_clause
+        {% if cluster_id %}
+        AND labels.cluster_id = {{cluster_id}}
+        {% endif %}
 )
 ;
 
--- We use a LATERAL JOIN here to get the JSON tags split out into key, value
--- columns. We reference this split multiple times so we put it in a
--- TEMPORARY TABLE for re-use
+CREATE INDEX ON reporting_ocp_storage_tags_{{uuid | sqlsafe}} (usage_start, key, value)
+;
+
+ANALYZE reporting_ocp_storage_tags_{{uuid | sqlsafe}}
+;
+
+-- The pod labels come from the label index rebuilt with the daily line
+-- items, so the JSON labels are not split out on every run. The index holds
+-- all labels, the enabled keys are applied here.
+-- We reference the labels multiple times so we put them in a
+-- TEMPORARY TABLE for re-use, indexed for the tag matching joins
 CREATE TEMPORARY TABLE reporting_ocp_pod_tags_{{uuid | sqlsafe}} AS (
-    SELECT ocp.*
-    FROM (
-        SELECT ocp.*,
-            LOWER(key) as key,
-            LOWER(value) as value
-        FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily as ocp,
-            jsonb_each_text(ocp.pod_labels) labels
-        WHERE ocp.usage_start >= {{start_date}}::date
-            AND ocp.usage_start <= {{end_date}}::date
-            --ocp_where_clause
-            {% if cluster_id %}
-            AND cluster_id = {{cluster_id}}
-            {% endif %}
-    ) AS ocp
+    SELECT ocp.*,
+        labels.key,
+        labels.value
+    FROM {{schema | sqlsafe}}.reporting_ocpusagepodlabel_index AS labels
+    JOIN {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily AS ocp
+        ON ocp.id = labels.line_item_id
     INNER JOIN {{schema | sqlsafe}}.reporting_ocpenabledtagkeys as enabled_tags
-        ON LOWER(enabled_tags.key) = ocp.key
+        ON LOWER(enabled_tags.key) = labels.key
+    WHERE labels.usage_start >= {{start_date}}::date
+        AND labels.usage_start <= {{end_date}}::date
+        --ocp_where_clause
+        {% if cluster_id %}
+        AND labels.cluster_id = {{cluster_id}}
+        {% endif %}
 )
 ;
 
+CREATE INDEX ON reporting_ocp_pod_tags_{{uuid | sqlsafe}} (usage_start, key, value)
+;
+
+ANALYZE reporting_ocp_pod_tags_{{uuid | sqlsafe}}
+;
+
 -- First we match OCP pod data to AWS data using a direct
 -- resource id match. This usually means OCP node -> AWS EC2 instance ID.
 CREATE TEMPORARY TABLE reporting_ocp_aws_resource_id_matched_{{uuid | sqlsafe}} AS (
@@ -71,16 +71,14 @@ CREATE TEMPORARY TABLE reporting_ocpstoragelineitem_daily_summary_{{uuid | sqlsa
 )
 ;
 
--- Clear out old entries first
-DELETE FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary
-WHERE usage_start >= {{start_date}}
-    AND usage_start <= {{end_date}}
-    AND cluster_id = {{cluster_id}}
-    AND data_source = 'Storage'
+-- Stage the new rows, the accessor swaps them into the summary table a month at a time
+CREATE TEMPORARY TABLE {{staging_table | sqlsafe}} (
+    LIKE {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary INCLUDING DEFAULTS
+)
 ;
 
 -- Populate the daily aggregate line item data
-INSERT INTO {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary (
+INSERT INTO {{staging_table | sqlsafe}} (
     report_period_id,
     cluster_id,
     cluster_alias,
@@ -151,6 +151,8 @@ INSERT INTO {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily (
     node,
     resource_id,
     pod_labels,
+    enabled_pod_labels,
+    enabled_pod_labels_hash,
     pod_usage_cpu_core_seconds,
     pod_request_cpu_core_seconds,
     pod_limit_cpu_core_seconds,
@@ -177,6 +179,8 @@ INSERT INTO {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily (
         node,
         resource_id,
         pod_labels,
+        epl.enabled_pod_labels,
+        md5(epl.enabled_pod_labels::text)::uuid,
         pod_usage_cpu_core_seconds,
         pod_request_cpu_core_seconds,
         pod_limit_cpu_core_seconds,
@@ -192,5 +196,12 @@ INSERT INTO {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily (
         total_capacity_cpu_core_seconds,
         total_capacity_memory_byte_seconds,
         total_seconds
-    FROM reporting_ocpusagelineitem_daily_{{uuid | sqlsafe}}
+    FROM reporting_ocpusagelineitem_daily_{{uuid | sqlsafe}} AS li,
+        -- Project the pod labels with enabled keys once here rather than in every summary
+        LATERAL (
+            SELECT coalesce(jsonb_object_agg(labels.key, labels.value), '{}'::jsonb) AS enabled_pod_labels
+            FROM jsonb_each_text(li.pod_labels) AS labels
+            JOIN {{schema | sqlsafe}}.reporting_ocpenabledtagkeys AS enabled_tags
+                ON enabled_tags.key = labels.key
+        ) AS epl
 ;
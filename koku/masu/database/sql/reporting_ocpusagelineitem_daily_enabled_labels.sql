@@ -0,0 +1,25 @@
+-- Project the pod labels with enabled keys again on the daily line items
+-- that have a label whose key was enabled or disabled
+UPDATE {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily AS li
+SET enabled_pod_labels = epl.enabled_pod_labels,
+    enabled_pod_labels_hash = md5(epl.enabled_pod_labels::text)::uuid
+FROM (
+    SELECT lid.id,
+        coalesce(
+            jsonb_object_agg(labels.key, labels.value) FILTER (WHERE enabled_tags.key IS NOT NULL),
+            '{}'::jsonb
+        ) AS enabled_pod_labels
+    FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily AS lid
+    JOIN LATERAL jsonb_each_text(lid.pod_labels) AS labels
+        ON true
+    LEFT JOIN {{schema | sqlsafe}}.reporting_ocpenabledtagkeys AS enabled_tags
+        ON enabled_tags.key = labels.key
+    WHERE lid.pod_labels ?| ARRAY[
+        {%- for key in keys -%}
+        {{key}}{% if not loop.last %},{% endif %}
+        {%- endfor -%}
+    ]::text[]
+    GROUP BY lid.id
+) AS epl
+WHERE li.id = epl.id
+;
@@ -1,78 +1,90 @@
 -- Place our query in a temporary table
+-- The daily line items carry their enabled pod labels, projected when they
+-- are built, so we group on the hash of those labels and look the labels
+-- up once per distinct hash
 CREATE TEMPORARY TABLE reporting_ocpusagelineitem_daily_summary_{{uuid | sqlsafe}} AS (
-    WITH cte_array_agg_keys AS (
-        SELECT array_agg(key) as key_array
-        FROM {{schema | sqlsafe}}.reporting_ocpenabledtagkeys
-    ),
-    cte_filtered_pod_labels AS (
-        SELECT id,
-            jsonb_object_agg(key,value) as pod_labels
-        FROM (
-            SELECT lid.id,
-                lid.pod_labels,
-                aak.key_array
-            FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily lid
-            JOIN cte_array_agg_keys aak
-                ON 1=1
-            WHERE lid.usage_start >= {{start_date}}
-                AND lid.usage_start <= {{end_date}}
-                AND lid.cluster_id = {{cluster_id}}
-                AND lid.pod_labels ?| aak.key_array
-        ) AS lid,
-        jsonb_each_text(lid.pod_labels) AS labels
-        WHERE key = ANY (key_array)
-        GROUP BY id
+    WITH cte_enabled_pod_labels AS (
+        SELECT DISTINCT ON (enabled_pod_labels_hash)
+            enabled_pod_labels_hash,
+            enabled_pod_labels
+        FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily
+        WHERE usage_start >= {{start_date}}
+            AND usage_start <= {{end_date}}
+            AND cluster_id = {{cluster_id}}
     )
     SELECT li.report_period_id,
         li.cluster_id,
         li.cluster_alias,
         li.namespace,
         li.node,
-        max(li.resource_id) as resource_id,
+        li.resource_id,
         li.usage_start,
         li.usage_end,
-        coalesce(fpl.pod_labels, '{}'::jsonb) as pod_labels,
-        sum(li.pod_usage_cpu_core_seconds) / 3600 as pod_usage_cpu_core_hours,
-        sum(li.pod_request_cpu_core_seconds) / 3600 as pod_request_cpu_core_hours,
-        sum(li.pod_limit_cpu_core_seconds) / 3600 as pod_limit_cpu_core_hours,
-        sum(li.pod_usage_memory_byte_seconds) / 3600 * POWER(2, -30) as pod_usage_memory_gigabyte_hours,
-        sum(li.pod_request_memory_byte_seconds) / 3600 * POWER(2, -30) as pod_request_memory_gigabyte_hours,
-        sum(li.pod_limit_memory_byte_seconds) / 3600 * POWER(2, -30) as pod_limit_memory_gigabyte_hours,
-        max(li.node_capacity_cpu_cores) as node_capacity_cpu_cores,
-        sum(li.node_capacity_cpu_core_seconds) / 3600 as node_capacity_cpu_core_hours,
-        max(li.node_capacity_memory_bytes) * POWER(2, -30) as node_capacity_memory_gigabytes,
-        sum(li.node_capacity_memory_byte_seconds) / 3600 * POWER(2, -30) as node_capacity_memory_gigabyte_hours,
-        max(li.cluster_capacity_cpu_core_seconds) / 3600 as cluster_capacity_cpu_core_hours,
-        max(li.cluster_capacity_memory_byte_seconds) / 3600 * POWER(2, -30) as cluster_capacity_memory_gigabyte_hours,
-        max(li.total_capacity_cpu_core_seconds) / 3600 as total_capacity_cpu_core_hours,
-        max(li.total_capacity_memory_byte_seconds) / 3600 * POWER(2, -30) as total_capacity_memory_gigabyte_hours
-    FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily AS li
-    LEFT JOIN cte_filtered_pod_labels AS fpl
-        ON li.id = fpl.id
-    WHERE usage_start >= {{start_date}}
-        AND usage_start <= {{end_date}}
-        AND cluster_id = {{cluster_id}}
-    GROUP BY report_period_id,
-        li.cluster_id,
-        li.cluster_alias,
-        li.usage_start,
-        li.usage_end,
-        li.namespace,
-        li.node,
-        fpl.pod_labels
+        coalesce(epl.enabled_pod_labels, '{}'::jsonb) as pod_labels,
+        li.pod_usage_cpu_core_hours,
+        li.pod_request_cpu_core_hours,
+        li.pod_limit_cpu_core_hours,
+        li.pod_usage_memory_gigabyte_hours,
+        li.pod_request_memory_gigabyte_hours,
+        li.pod_limit_memory_gigabyte_hours,
+        li.node_capacity_cpu_cores,
+        li.node_capacity_cpu_core_hours,
+        li.node_capacity_memory_gigabytes,
+        li.node_capacity_memory_gigabyte_hours,
+        li.cluster_capacity_cpu_core_hours,
+        li.cluster_capacity_memory_gigabyte_hours,
+        li.total_capacity_cpu_core_hours,
+        li.total_capacity_memory_gigabyte_hours
+    FROM (
+        SELECT li.report_period_id,
+            li.cluster_id,
+            li.cluster_alias,
+            li.namespace,
+            li.node,
+            max(li.resource_id) as resource_id,
+            li.usage_start,
+            li.usage_end,
+            li.enabled_pod_labels_hash,
+            sum(li.pod_usage_cpu_core_seconds) / 3600 as pod_usage_cpu_core_hours,
+            sum(li.pod_request_cpu_core_seconds) / 3600 as pod_request_cpu_core_hours,
+            sum(li.pod_limit_cpu_core_seconds) / 3600 as pod_limit_cpu_core_hours,
+            sum(li.pod_usage_memory_byte_seconds) / 3600 * POWER(2, -30) as pod_usage_memory_gigabyte_hours,
+            sum(li.pod_request_memory_byte_seconds) / 3600 * POWER(2, -30) as pod_request_memory_gigabyte_hours,
+            sum(li.pod_limit_memory_byte_seconds) / 3600 * POWER(2, -30) as pod_limit_memory_gigabyte_hours,
+            max(li.node_capacity_cpu_cores) as node_capacity_cpu_cores,
+            sum(li.node_capacity_cpu_core_seconds) / 3600 as node_capacity_cpu_core_hours,
+            max(li.node_capacity_memory_bytes) * POWER(2, -30) as node_capacity_memory_gigabytes,
+            sum(li.node_capacity_memory_byte_seconds) / 3600 * POWER(2, -30) as node_capacity_memory_gigabyte_hours,
+            max(li.cluster_capacity_cpu_core_seconds) / 3600 as cluster_capacity_cpu_core_hours,
+            max(li.cluster_capacity_memory_byte_seconds) / 3600 * POWER(2, -30) as cluster_capacity_memory_gigabyte_hours,
+            max(li.total_capacity_cpu_core_seconds) / 3600 as total_capacity_cpu_core_hours,
+            max(li.total_capacity_memory_byte_seconds) / 3600 * POWER(2, -30) as total_capacity_memory_gigabyte_hours
+        FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily AS li
+        WHERE li.usage_start >= {{start_date}}
+            AND li.usage_start <= {{end_date}}
+            AND li.cluster_id = {{cluster_id}}
+        GROUP BY li.report_period_id,
+            li.cluster_id,
+            li.cluster_alias,
+            li.usage_start,
+            li.usage_end,
+            li.namespace,
+            li.node,
+            li.enabled_pod_labels_hash
+    ) AS li
+    LEFT JOIN cte_enabled_pod_labels AS epl
+        ON li.enabled_pod_labels_hash = epl.enabled_pod_labels_hash
 )
 ;
 
--- Clear out old entries first
-DELETE FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary
-WHERE usage_start >= {{start_date}}
-    AND usage_start <= {{end_date}}
-    AND cluster_id = {{cluster_id}}
-    AND data_source = 'Pod'
+-- Stage the new rows, the accessor swaps them into the summary table a month at a time
+CREATE TEMPORARY TABLE {{staging_table | sqlsafe}} (
+    LIKE {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary INCLUDING DEFAULTS
+)
 ;
 
 -- Populate the daily aggregate line item data
-INSERT INTO {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary (
+INSERT INTO {{staging_table | sqlsafe}} (
     report_period_id,
     cluster_id,
     cluster_alias,
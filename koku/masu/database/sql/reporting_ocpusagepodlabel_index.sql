@@ -0,0 +1,30 @@
+-- Rebuild the label index of the daily usage line items, one row per
+-- lower-cased pod label, read by the OpenShift on cloud tag matching.
+-- All labels are indexed, the matching keeps those with an enabled key.
+DELETE FROM {{schema | sqlsafe}}.reporting_ocpusagepodlabel_index
+WHERE usage_start >= {{start_date}}::date
+    AND usage_start <= {{end_date}}::date
+    AND cluster_id = {{cluster_id}}
+;
+
+INSERT INTO {{schema | sqlsafe}}.reporting_ocpusagepodlabel_index (
+    report_period_id,
+    cluster_id,
+    line_item_id,
+    usage_start,
+    key,
+    value
+)
+    SELECT ocp.report_period_id,
+        ocp.cluster_id,
+        ocp.id,
+        ocp.usage_start,
+        LOWER(labels.key),
+        LOWER(labels.value)
+    FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily AS ocp
+    JOIN LATERAL jsonb_each_text(ocp.pod_labels) AS labels
+        ON true
+    WHERE ocp.usage_start >= {{start_date}}::date
+        AND ocp.usage_start <= {{end_date}}::date
+        AND ocp.cluster_id = {{cluster_id}}
+;
@@ -0,0 +1,212 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Registry of the compiled SQL templates of the report database accessors."""
+import hashlib
+import logging
+import os
+import pkgutil
+import re
+import time
+
+from django.db import DatabaseError
+from django.db import transaction
+from jinja2 import nodes
+from jinjasql import JinjaSql
+
+from masu.config import Config
+from masu.prometheus_stats import SQL_TEMPLATE_DURATION_HISTOGRAM
+from masu.prometheus_stats import SQL_TEMPLATE_ROWS_COUNTER
+
+LOG = logging.getLogger(__name__)
+
+SQL_PACKAGE = "masu.database"
+SQL_DIRECTORY = "sql"
+
+# The identifiers a static template may insert into its text. The text of a
+# static template is the same for each execution against a schema and table.
+STATIC_IDENTIFIERS = {"schema", "table"}
+STATIC_KEYWORDS = ("DELETE", "INSERT", "SELECT", "UPDATE", "WITH")
+
+PLACEHOLDER_RE = re.compile(r"%(s|%)")
+COMMENT_RE = re.compile(r"--[^\n]*")
+
+
+class SQLTemplate:
+    """A SQL template compiled once per process."""
+
+    def __init__(self, name, source, jinja_sql):
+        """Compile the template.
+
+        Args:
+            name (str): The template file name without its extension
+            source (str): The template text
+            jinja_sql (JinjaSql): The JinjaSql of the registry
+
+        """
+        self.name = name
+        self.source = source
+        self._jinja_sql = jinja_sql
+        self.template = jinja_sql.env.from_string(source)
+        self.static = self._is_static(jinja_sql.env.parse(source), source)
+
+    @staticmethod
+    def _is_static(ast, source):
+        """Return whether the template is a single statement that is the same for each schema and table."""
+        if any(True for _ in ast.find_all((nodes.For, nodes.If))):
+            return False
+        identifiers = {
+            node.node.name
+            for node in ast.find_all(nodes.Filter)
+            if node.name == "sqlsafe" and isinstance(node.node, nodes.Name)
+        }
+        if not identifiers <= STATIC_IDENTIFIERS:
+            return False
+        statements = [statement.strip() for statement in COMMENT_RE.sub("", source).split(";")]
+        statements = [statement for statement in statements if statement]
+        return len(statements) == 1 and statements[0].upper().startswith(STATIC_KEYWORDS)
+
+    def render(self, params):
+        """Render the template.
+
+        Args:
+            params (dict): The template parameters
+
+        Returns:
+            (str, list): The SQL and its bind parameters
+
+        """
+        # JinjaSql.prepare_query compiles its source on each call
+        sql, bind_params = self._jinja_sql._prepare_query(self.template, params)
+        return sql, list(bind_params)
+
+
+class SQLTemplateRegistry:
+    """The SQL templates of a directory, loaded and compiled when the registry is created."""
+
+    def __init__(self, package=SQL_PACKAGE, directory=SQL_DIRECTORY):
+        """Load and compile the templates.
+
+        Args:
+            package (str): The package holding the template directory
+            directory (str): The template directory
+
+        """
+        self._jinja_sql = JinjaSql()
+        self._templates = {}
+        package_path = os.path.dirname(pkgutil.get_loader(package).get_filename())
+        for file_name in sorted(os.listdir(os.path.join(package_path, directory))):
+            name, extension = os.path.splitext(file_name)
+            if extension != ".sql":
+                continue
+            source = pkgutil.get_data(package, f"{directory}/{file_name}").decode("utf-8")
+            self._templates[name] = SQLTemplate(name, source, self._jinja_sql)
+        LOG.debug("Loaded %d SQL templates from %s.%s.", len(self._templates), package, directory)
+
+    def __contains__(self, name):
+        """Return whether a template is registered."""
+        return name in self._templates
+
+    def get(self, name):
+        """Return a template by name.
+
+        Args:
+            name (str): The template file name without its extension
+
+        Returns:
+            (SQLTemplate): The compiled template
+
+        Raises:
+            (KeyError): No template has the name
+
+        """
+        return self._templates[name]
+
+    def prepare_query(self, name, params):
+        """Render a template to its SQL and bind parameters."""
+        return self.get(name).render(params)
+
+    def execute(self, cursor, name, params):
+        """Execute a template and record its row count and duration.
+
+        Static templates run as server side prepared statements, prepared
+        once per statement text and connection, when SQL_PREPARED_STATEMENTS
+        is set.
+
+        Args:
+            cursor (CursorWrapper): The cursor to execute on
+            name (str): The template file name without its extension
+            params (dict): The template parameters
+
+        Returns:
+            (int): The number of rows of the last statement, -1 when unknown
+
+        """
+        template = self.get(name)
+        sql, bind_params = template.render(params)
+        started = time.perf_counter()
+        if template.static and Config.SQL_PREPARED_STATEMENTS:
+            self._execute_prepared(cursor, template, sql, bind_params)
+        else:
+            cursor.execute(sql, bind_params)
+        SQL_TEMPLATE_DURATION_HISTOGRAM.labels(template=name).observe(time.perf_counter() - started)
+        rowcount = cursor.rowcount
+        if rowcount > 0:
+            SQL_TEMPLATE_ROWS_COUNTER.labels(template=name).inc(rowcount)
+        return rowcount
+
+    def _execute_prepared(self, cursor, template, sql, bind_params):
+        """Execute a static template as a prepared statement, preparing it on first use by the connection."""
+        db = cursor.db
+        prepared = getattr(db, "_sql_template_statements", None)
+        if prepared is None or prepared[0] is not db.connection:
+            # Prepared statements live as long as their database connection
+            prepared = (db.connection, set())
+            db._sql_template_statements = prepared
+
+        statement = f"sqlt_{hashlib.md5(sql.encode('utf-8')).hexdigest()}"
+        if statement not in prepared[1]:
+            try:
+                with transaction.atomic(using=db.alias):
+                    cursor.execute(f"PREPARE {statement} AS {numbered_placeholders(sql)}")
+            except DatabaseError as error:
+                LOG.warning("Running SQL template %s unprepared, it could not be prepared: %s", template.name, error)
+                template.static = False
+                cursor.execute(sql, bind_params)
+                return
+            prepared[1].add(statement)
+
+        if bind_params:
+            cursor.execute(f"EXECUTE {statement} ({', '.join(['%s'] * len(bind_params))})", bind_params)
+        else:
+            cursor.execute(f"EXECUTE {statement}")
+
+
+def numbered_placeholders(sql):
+    """Replace the %s placeholders of a statement by the $1, $2... placeholders of PREPARE."""
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        if match.group(1) == "%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return PLACEHOLDER_RE.sub(replace, sql)
+
+
+SQL_TEMPLATES = SQLTemplateRegistry()
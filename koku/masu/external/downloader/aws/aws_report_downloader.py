@@ -34,6 +34,7 @@ from masu.exceptions import MasuProviderError
 from masu.external.downloader.downloader_interface import DownloaderInterface
 from masu.external.downloader.report_downloader_base import ReportDownloaderBase
 from masu.util.aws import common as utils
+from masu.util.aws.stream import S3StreamSource
 
 DATA_DIR = Config.TMP_DIR
 LOG = logging.getLogger(__name__)
@@ -72,6 +73,7 @@ class AWSReportDownloader(ReportDownloaderBase, DownloaderInterface):
 
         """
         super().__init__(task, **kwargs)
+        self._auth_credential = auth_credential
 
         if customer_name[4:] in settings.DEMO_ACCOUNTS:
             demo_account = settings.DEMO_ACCOUNTS.get(customer_name[4:])
@@ -272,6 +274,41 @@ class AWSReportDownloader(ReportDownloaderBase, DownloaderInterface):
             self.s3_client.download_file(self.report.get("S3Bucket"), key, full_file_path)
         return full_file_path, s3_etag
 
+    def get_file_stream(self, key):
+        """
+        Locate an S3 object to be streamed into the processor.
+
+        Nothing is written to disk, so the download path size does not limit
+        the size of the report.
+
+        Args:
+            key (str): The S3 object key identified.
+
+        Returns:
+            (String, String, S3StreamSource): The local file name the report would
+                have been saved as, the object ETag and the source to stream
+
+        """
+        s3_filename = key.split("/")[-1]
+        directory_path = f"{DATA_DIR}/{self.customer_name}/aws/{self.bucket}"
+        full_file_path = f"{directory_path}/{utils.get_local_file_name(key)}"
+
+        try:
+            s3_file = self.s3_client.head_object(Bucket=self.report.get("S3Bucket"), Key=key)
+        except ClientError as ex:
+            if ex.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                log_msg = "Unable to find {} in S3 Bucket: {}".format(s3_filename, self.report.get("S3Bucket"))
+                LOG.info(log_msg)
+                raise AWSReportDownloaderNoFileError(log_msg)
+
+            LOG.error("Error locating file: Error: %s", str(ex))
+            raise AWSReportDownloaderError(str(ex))
+
+        s3_etag = s3_file.get("ETag")
+        LOG.info("Streaming %s from S3 for processing", key)
+        source = S3StreamSource(self.report.get("S3Bucket"), key, role_arn=self._auth_credential, etag=s3_etag)
+        return full_file_path, s3_etag, source
+
     def get_report_context_for_date(self, date_time):
         """
         Get the report context for a provided date.
@@ -30,6 +30,7 @@ from masu.config import Config
 from masu.external.downloader.downloader_interface import DownloaderInterface
 from masu.external.downloader.report_downloader_base import ReportDownloaderBase
 from masu.util.aws import common as utils
+from masu.util.aws.stream import LocalStreamSource
 
 DATA_DIR = Config.TMP_DIR
 LOG = logging.getLogger(__name__)
@@ -196,6 +197,32 @@ class AWSLocalReportDownloader(ReportDownloaderBase, DownloaderInterface):
             shutil.copy2(key, full_file_path)
         return full_file_path, s3_etag
 
+    def get_file_stream(self, key):
+        """
+        Locate a local report file to be streamed into the processor in place.
+
+        Args:
+            key (str): The S3 object key identified.
+
+        Returns:
+            (String, String, LocalStreamSource): The local file name the report would
+                have been saved as, the file ETag and the source to stream
+
+        """
+        local_s3_filename = utils.get_local_file_name(key)
+
+        directory_path = f"{DATA_DIR}/{self.customer_name}/aws-local/{self.bucket}"
+        full_file_path = f"{directory_path}/{local_s3_filename}"
+
+        if not os.path.isfile(key):
+            log_msg = f"Unable to locate {key} in {self.bucket_path}"
+            raise AWSReportDownloaderNoFileError(log_msg)
+
+        s3_etag_hasher = hashlib.new("ripemd160")
+        s3_etag_hasher.update(bytes(local_s3_filename, "utf-8"))
+        s3_etag = s3_etag_hasher.hexdigest()
+        return full_file_path, s3_etag, LocalStreamSource(key)
+
     def get_report_context_for_date(self, date_time):
         """
         Get the report context for a provided date.
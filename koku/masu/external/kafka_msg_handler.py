@@ -21,6 +21,7 @@ import json
 import logging
 import os
 import random
+import resource
 import shutil
 import tempfile
 import threading
@@ -50,6 +51,7 @@ HCCM_TOPIC = "platform.upload.hccm"
 VALIDATION_TOPIC = "platform.upload.validation"
 SUCCESS_CONFIRM_STATUS = "success"
 FAILURE_CONFIRM_STATUS = "failure"
+PAYLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 class KafkaMsgHandlerError(Exception):
@@ -63,8 +65,7 @@ def backoff(interval, maximum=64):  # pragma: no cover
     time.sleep(wait)
 
 
-# pylint: disable=too-many-locals
-def extract_payload(url):  # noqa: C901
+def extract_payload(url):
     """
     Extract OCP usage report payload into local directory structure.
 
@@ -79,8 +80,10 @@ def extract_payload(url):  # noqa: C901
     2. *.csv - Actual usage report for the cluster.  Format is:
         Format is: <uuid>_report_name.csv
 
-    On successful completion the report and manifest will be in a directory
-    structure that the OCPReportDownloader is expecting.
+    The payload is untarred while it is downloaded, so it is never held in
+    memory or written to disk as a whole. On successful completion the report
+    and manifest will be in a directory structure that the OCPReportDownloader
+    is expecting.
 
     Ex: /var/tmp/insights_local/my-ocp-cluster-1/20181001-20181101
 
@@ -102,63 +105,143 @@ def extract_payload(url):  # noqa: C901
     # the pod goes down.
     os.makedirs(Config.PVC_DIR, exist_ok=True)
     temp_dir = tempfile.mkdtemp(dir=Config.PVC_DIR)
+    start_time = time.perf_counter()
 
-    # Download file from quarantine bucket as tar.gz
+    # Stream the tar.gz file from the quarantine bucket and untar it as it arrives
     try:
-        download_response = requests.get(url)
-        download_response.raise_for_status()
+        with requests.get(url, stream=True) as download_response:
+            download_response.raise_for_status()
+            download_response.raw.decode_content = True
+            payload_stream = CountingReader(download_response.raw)
+            report_meta = _extract_payload_stream(payload_stream, temp_dir)
     except requests.exceptions.HTTPError as err:
-        shutil.rmtree(temp_dir)
         raise KafkaMsgHandlerError("Unable to download file. Error: ", str(err))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    elapsed = max(time.perf_counter() - start_time, 1e-6)
+    # ru_maxrss is the high-water mark of the whole process, in KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    LOG.info(
+        "Successfully extracted OCP for %s/%s: %d bytes in %.2fs (%.0f bytes/sec), peak RSS %d KiB",
+        report_meta.get("cluster_id"),
+        utils.month_date_range(report_meta.get("date")),
+        payload_stream.bytes_read,
+        elapsed,
+        payload_stream.bytes_read / elapsed,
+        peak_rss,
+    )
+    return report_meta
+
+
+class CountingReader:
+    """A file-like wrapper counting the bytes read from a stream."""
+
+    def __init__(self, stream):
+        """Initialize the reader.
+
+        Args:
+            stream (file): The binary stream to read from
 
-    temp_file = "{}/{}".format(temp_dir, "usage.tar.gz")
+        """
+        self._stream = stream
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        """Read from the stream, counting the bytes returned."""
+        data = self._stream.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _write_member(payload_tar, member, path):
+    """Write a tar member to a path without buffering the whole member."""
     try:
-        temp_file_hdl = open("{}/{}".format(temp_dir, "usage.tar.gz"), "wb")
-        temp_file_hdl.write(download_response.content)
-        temp_file_hdl.close()
+        with payload_tar.extractfile(member) as source, open(path, "wb") as destination:
+            shutil.copyfileobj(source, destination, PAYLOAD_CHUNK_SIZE)
     except (OSError, IOError) as error:
-        shutil.rmtree(temp_dir)
+        LOG.warning("Unable to write file. Reason: %s", str(error))
         raise KafkaMsgHandlerError("Unable to write file. Error: ", str(error))
 
-    # Extract tarball into temp directory
+
+def _move_member(source_path, destination_path):
+    """Move a staged payload member into the report directory."""
     try:
-        mytar = TarFile.open(temp_file)
-        mytar.extractall(path=temp_dir)
-        files = mytar.getnames()
-        manifest_path = [manifest for manifest in files if "manifest.json" in manifest]
+        shutil.move(source_path, destination_path)
+    except (OSError, IOError) as error:
+        LOG.warning("Unable to move file. Reason: %s", str(error))
+        raise KafkaMsgHandlerError("Unable to write file. Error: ", str(error))
+
+
+# pylint: disable=too-many-locals
+def _extract_payload_stream(payload_stream, temp_dir):  # noqa: C901
+    """
+    Untar an OCP payload from a stream into the local report directory.
+
+    The tarball is read sequentially. Once manifest.json has been read, the
+    report files it lists are written straight to the report directory.
+    Files that precede the manifest in the tarball are staged in temp_dir
+    and renamed into place when the manifest is found.
+
+    Args:
+        payload_stream (file): The binary payload stream
+        temp_dir (String): Staging directory on the same volume as the report directory
+
+    Returns:
+        (Dict): The report details from the manifest
+
+    """
+    report_meta = None
+    destination_dir = None
+    manifest_dir = None
+    report_files = set()
+    staged_files = {}
+    try:
+        with TarFile.open(fileobj=payload_stream, mode="r|*") as payload_tar:
+            for member in payload_tar:
+                if not member.isfile():
+                    continue
+                name = os.path.normpath(member.name).lstrip("/")
+                if os.path.basename(name) == "manifest.json" and report_meta is None:
+                    _write_member(payload_tar, member, f"{temp_dir}/manifest.json")
+                    report_meta = utils.get_report_details(temp_dir)
+                    if not report_meta:
+                        raise KafkaMsgHandlerError("Unable to read manifest in payload.")
+
+                    # Create directory tree for report.
+                    usage_month = utils.month_date_range(report_meta.get("date"))
+                    destination_dir = "{}/{}/{}".format(
+                        Config.INSIGHTS_LOCAL_REPORT_DIR, report_meta.get("cluster_id"), usage_month
+                    )
+                    os.makedirs(destination_dir, exist_ok=True)
+
+                    manifest_destination_path = f"{destination_dir}/manifest.json"
+                    _move_member(report_meta.get("manifest_path"), manifest_destination_path)
+                    report_meta["manifest_path"] = manifest_destination_path
+
+                    manifest_dir = os.path.dirname(name)
+                    report_files = {os.path.join(manifest_dir, report_file) for report_file in report_meta["files"]}
+                    for staged_name, staged_path in staged_files.items():
+                        if staged_name in report_files:
+                            _move_member(staged_path, f"{destination_dir}/{os.path.basename(staged_name)}")
+                            report_files.discard(staged_name)
+                    staged_files = {}
+                elif report_meta is None:
+                    staged_path = f"{temp_dir}/{len(staged_files)}.staged"
+                    _write_member(payload_tar, member, staged_path)
+                    staged_files[name] = staged_path
+                elif name in report_files:
+                    _write_member(payload_tar, member, f"{destination_dir}/{os.path.basename(name)}")
+                    report_files.discard(name)
     except (ReadError, EOFError, OSError) as error:
         LOG.warning("Unable to untar file. Reason: %s", str(error))
-        shutil.rmtree(temp_dir)
         raise KafkaMsgHandlerError("Extraction failure.")
 
-    if not manifest_path:
+    if report_meta is None:
         raise KafkaMsgHandlerError("No manifest found in payload.")
-    # Open manifest.json file and build the payload dictionary.
-    full_manifest_path = "{}/{}".format(temp_dir, manifest_path[0])
-    report_meta = utils.get_report_details(os.path.dirname(full_manifest_path))
-
-    # Create directory tree for report.
-    usage_month = utils.month_date_range(report_meta.get("date"))
-    destination_dir = "{}/{}/{}".format(Config.INSIGHTS_LOCAL_REPORT_DIR, report_meta.get("cluster_id"), usage_month)
-    os.makedirs(destination_dir, exist_ok=True)
-
-    # Copy manifest
-    manifest_destination_path = "{}/{}".format(destination_dir, os.path.basename(report_meta.get("manifest_path")))
-    shutil.copy(report_meta.get("manifest_path"), manifest_destination_path)
-
-    # Copy report payload
-    for report_file in report_meta.get("files"):
-        subdirectory = os.path.dirname(full_manifest_path)
-        payload_source_path = f"{subdirectory}/{report_file}"
-        payload_destination_path = f"{destination_dir}/{report_file}"
-        try:
-            shutil.copy(payload_source_path, payload_destination_path)
-        except FileNotFoundError as error:
-            LOG.error("Unable to find file in payload. %s", str(error))
-            raise KafkaMsgHandlerError("Missing file in payload")
-    LOG.info("Successfully extracted OCP for %s/%s", report_meta.get("cluster_id"), usage_month)
-    # Remove temporary directory and files
-    shutil.rmtree(temp_dir)
+    if report_files:
+        LOG.error("Unable to find files in payload: %s", ", ".join(sorted(report_files)))
+        raise KafkaMsgHandlerError("Missing file in payload")
     return report_meta
 
 
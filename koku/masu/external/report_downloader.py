@@ -20,6 +20,7 @@ import logging
 from dateutil.relativedelta import relativedelta
 
 from api.models import Provider
+from masu.config import Config
 from masu.database.report_stats_db_accessor import ReportStatsDBAccessor
 from masu.external.date_accessor import DateAccessor
 from masu.external.downloader.aws.aws_report_downloader import AWSReportDownloader
@@ -186,13 +187,20 @@ class ReportDownloader:
         report_context = self._downloader.get_report_context_for_date(date_time)
         manifest_id = report_context.get("manifest_id")
         reports = report_context.get("files", [])
+        stream = Config.AWS_STREAMING_INGEST and self.provider_type in (
+            Provider.PROVIDER_AWS,
+            Provider.PROVIDER_AWS_LOCAL,
+        )
         cur_reports = []
         for report in reports:
             report_dictionary = {}
             local_file_name = self._downloader.get_local_file_for_report(report)
             with ReportStatsDBAccessor(local_file_name, manifest_id) as stats_recorder:
-                stored_etag = stats_recorder.get_etag()
-                file_name, etag = self._downloader.download_file(report, stored_etag)
+                if stream:
+                    file_name, etag, report_dictionary["stream"] = self._downloader.get_file_stream(report)
+                else:
+                    stored_etag = stats_recorder.get_etag()
+                    file_name, etag = self._downloader.download_file(report, stored_etag)
                 stats_recorder.update(etag=etag)
 
             report_dictionary["file"] = file_name
@@ -18,7 +18,9 @@
 from os import path
 
 import psutil
+from billiard.pool import Pool
 from celery.utils.log import get_task_logger
+from django.db import connections
 from django.db import transaction
 
 from masu.database.provider_db_accessor import ProviderDBAccessor
@@ -30,7 +32,7 @@ LOG = get_task_logger(__name__)
 
 
 # pylint: disable=too-many-arguments,too-many-locals
-def _process_report_file(schema_name, provider, provider_uuid, report_dict):
+def _process_report_file(schema_name, provider, provider_uuid, report_dict, skip_line_item_delete=False):
     """
     Task to process a Report.
 
@@ -39,6 +41,7 @@ def _process_report_file(schema_name, provider, provider_uuid, report_dict):
         provider      (String) provider type
         provider_uuid (String) provider uuid
         report_dict   (dict) The report data dict from previous task
+        skip_line_item_delete (Boolean) Stale line items of the manifest were already deleted
 
     Returns:
         None
@@ -74,6 +77,8 @@ def _process_report_file(schema_name, provider, provider_uuid, report_dict):
         provider=provider,
         provider_uuid=provider_uuid,
         manifest_id=manifest_id,
+        skip_line_item_delete=skip_line_item_delete,
+        stream_source=report_dict.get("stream"),
     )
     processor.process()
 
@@ -84,8 +89,7 @@ def _process_report_file(schema_name, provider, provider_uuid, report_dict):
         with ReportManifestDBAccessor() as manifest_accesor:
             manifest = manifest_accesor.get_manifest_by_id(manifest_id)
             if manifest:
-                manifest.num_processed_files += 1
-                manifest.save()
+                manifest_accesor.increment_num_processed_files(manifest)
                 manifest_accesor.mark_manifest_as_updated(manifest)
             else:
                 LOG.error("Unable to find manifest for ID: %s, file %s", manifest_id, file_name)
@@ -95,3 +99,58 @@ def _process_report_file(schema_name, provider, provider_uuid, report_dict):
                 files = processor.remove_processed_files(path.dirname(report_path))
                 LOG.info("Temporary files removed: %s", str(files))
             provider_accessor.setup_complete()
+
+
+def _process_report_files_in_parallel(schema_name, provider, provider_uuid, report_dicts, max_workers):
+    """
+    Process the report files of a download in a pool of worker processes.
+
+    Stale line items are deleted once per manifest before any file is
+    processed, so that files processed concurrently do not delete each
+    other's rows. The call returns once every file has been processed.
+
+    Args:
+        schema_name   (String) db schema name
+        provider      (String) provider type
+        provider_uuid (String) provider uuid
+        report_dicts  (List) The report data dicts of the files to process
+        max_workers   (Integer) The maximum number of files processed at once
+
+    Returns:
+        None
+
+    """
+    cleaned_manifest_ids = set()
+    for report_dict in report_dicts:
+        manifest_id = report_dict.get("manifest_id")
+        if manifest_id in cleaned_manifest_ids:
+            continue
+        processor = ReportProcessor(
+            schema_name=schema_name,
+            report_path=report_dict.get("file"),
+            compression=report_dict.get("compression"),
+            provider=provider,
+            provider_uuid=report_dict.get("provider_uuid"),
+            manifest_id=manifest_id,
+            stream_source=report_dict.get("stream"),
+        )
+        processor.delete_stale_line_items()
+        cleaned_manifest_ids.add(manifest_id)
+
+    # Forked workers must open their own database connections
+    connections.close_all()
+    pool = Pool(processes=min(max_workers, len(report_dicts)))
+    try:
+        results = [
+            pool.apply_async(
+                _process_report_file,
+                (schema_name, provider, provider_uuid, report_dict),
+                {"skip_line_item_delete": True},
+            )
+            for report_dict in report_dicts
+        ]
+        for result in results:
+            result.get()
+    finally:
+        pool.terminate()
+        pool.join()
@@ -20,6 +20,7 @@ from datetime import datetime
 
 from tenant_schemas.utils import schema_context
 
+from masu.database import AWS_CUR_TABLE_MAP
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 
 LOG = logging.getLogger(__name__)
@@ -65,6 +66,10 @@ class AWSReportDBCleaner:
                 bill_objects = accessor.get_bill_query_before_date(expired_date, provider_uuid)
             else:
                 bill_objects = accessor.get_bill_query_before_date(expired_date)
+                if not simulate:
+                    # Line items never start before their billing period, so whole months
+                    # on or before the expired date only hold expired line items
+                    accessor.drop_table_partitions(AWS_CUR_TABLE_MAP["line_item"], expired_date)
             with schema_context(self._schema):
                 for bill in bill_objects.all():
                     bill_id = bill.id
@@ -113,6 +118,9 @@ class AWSReportDBCleaner:
 
             if expired_date is not None:
                 bill_objects = accessor.get_bill_query_before_date(expired_date)
+                if not simulate:
+                    for table_name in (AWS_CUR_TABLE_MAP["line_item"], AWS_CUR_TABLE_MAP["line_item_daily_summary"]):
+                        accessor.drop_table_partitions(table_name, expired_date)
             else:
                 bill_objects = accessor.get_cost_entry_bills_query_by_provider(provider_uuid)
             with schema_context(self._schema):
@@ -0,0 +1,157 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Columnar batch parser for AWS Cost Usage Reports."""
+import json
+import logging
+from itertools import islice
+from operator import itemgetter
+
+from masu.database import AWS_CUR_TABLE_MAP
+from masu.database.report_db_accessor_base import clean_value
+from reporting_common import REPORT_COLUMN_MAP
+
+LOG = logging.getLogger(__name__)
+
+
+def _clean_column(column):
+    """Convert empty strings in a column to None."""
+    return [value if value != "" else None for value in column]
+
+
+class AWSReportBatchParser:
+    """Parse CUR rows a batch at a time.
+
+    Rows are kept as the plain lists produced by csv.reader. Only the
+    columns mapped to the line item table are projected, by header index,
+    and type conversion is applied per column instead of per cell.
+    """
+
+    def __init__(self, header, report_db_accessor, tag_prefix="resourceTags"):
+        """Initialize the parser.
+
+        Args:
+            header (list): The header row of the CUR file
+            report_db_accessor (AWSReportDBAccessor): Accessor used for type conversion
+            tag_prefix (str): A specifier used to identify a column as a tag
+
+        """
+        self.header = header
+        self.width = len(header)
+        # Like csv.DictReader, a repeated header name keeps its last value
+        self.index = {name: idx for idx, name in enumerate(header)}
+
+        table_name = AWS_CUR_TABLE_MAP["line_item"]
+        column_map = REPORT_COLUMN_MAP[table_name]
+
+        self.line_item_columns = []
+        line_item_indexes = []
+        for name in dict.fromkeys(header):
+            if name in column_map:
+                self.line_item_columns.append(column_map[name])
+                line_item_indexes.append(self.index[name])
+        self._line_item_getter = self._make_getter(line_item_indexes)
+        plan = report_db_accessor.report_schema.get_conversion_plan(table_name, self.line_item_columns)
+        self._converters = [self._get_converter(convert) for convert in plan]
+
+        self._tag_columns = []
+        for name in dict.fromkeys(header):
+            key_value = name.split(":")
+            if tag_prefix in name and len(key_value) > 1:
+                self._tag_columns.append((self.index[name], key_value[-1]))
+
+    @staticmethod
+    def _make_getter(indexes):
+        """Return a callable that pulls a tuple of values out of a row list."""
+        if len(indexes) == 1:
+            idx = indexes[0]
+            return lambda row: (row[idx],)
+        if not indexes:
+            return lambda row: ()
+        return itemgetter(*indexes)
+
+    @staticmethod
+    def _get_converter(convert):
+        """Return a callable converting a whole column with the converter of its values."""
+        if convert is clean_value:
+            return _clean_column
+
+        def _convert_column(column):
+            return [convert(value) for value in column]
+
+        return _convert_column
+
+    def getter(self, *names):
+        """Return a callable that pulls the named columns out of a row as a tuple.
+
+        Columns missing from the file are returned as None, matching dict.get.
+        """
+        indexes = [self.index.get(name) for name in names]
+        if None not in indexes:
+            return self._make_getter(indexes)
+        return lambda row: tuple(row[idx] if idx is not None else None for idx in indexes)
+
+    def as_dict(self, row):
+        """Return the csv.DictReader representation of a row."""
+        return dict(zip(self.header, row))
+
+    def read_batch(self, reader, batch_size):
+        """Read up to batch_size non-empty rows, padding short rows.
+
+        Args:
+            reader (csv.reader): A reader positioned after the header row
+            batch_size (int): The maximum number of rows to read
+
+        Returns:
+            (list): A list of row lists, empty once the reader is exhausted
+
+        """
+        batch = []
+        while len(batch) < batch_size:
+            chunk = list(islice(reader, batch_size - len(batch)))
+            if not chunk:
+                break
+            for row in chunk:
+                if not row:
+                    # csv.DictReader skips blank lines
+                    continue
+                if len(row) < self.width:
+                    row.extend([""] * (self.width - len(row)))
+                batch.append(row)
+        return batch
+
+    def parse_line_items(self, batch):
+        """Project and convert the line item columns of a batch.
+
+        Args:
+            batch (list): A list of row lists
+
+        Returns:
+            (list): One list of converted values per line item column
+
+        """
+        if not batch:
+            return [[] for _ in self.line_item_columns]
+        projected = map(self._line_item_getter, batch)
+        columns = zip(*projected)
+        return [convert(column) for convert, column in zip(self._converters, columns)]
+
+    def parse_tags(self, batch):
+        """Return the JSON tag string for every row of a batch."""
+        if not self._tag_columns:
+            return ["{}"] * len(batch)
+        tag_columns = self._tag_columns
+        return [json.dumps({key: row[idx] for idx, key in tag_columns if row[idx]}) for row in batch]
@@ -18,14 +18,21 @@
 import csv
 import json
 import logging
+from functools import partial
+from itertools import chain
 from os import path
 from os import remove
 
+import ciso8601
 from django.conf import settings
+from tenant_schemas.utils import schema_context
 
 from masu.config import Config
 from masu.database import AWS_CUR_TABLE_MAP
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
+from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
+from masu.processor.aws.aws_report_parser import AWSReportBatchParser
+from masu.processor.dimension_cache import DimensionCache
 from masu.processor.report_processor_base import ReportProcessorBase
 from reporting.provider.aws.models import AWSCostEntry
 from reporting.provider.aws.models import AWSCostEntryBill
@@ -69,7 +76,16 @@ class AWSReportProcessor(ReportProcessorBase):
     """Cost Usage Report processor."""
 
     # pylint:disable=too-many-arguments
-    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
+    def __init__(
+        self,
+        schema_name,
+        report_path,
+        compression,
+        provider_uuid,
+        manifest_id=None,
+        skip_line_item_delete=False,
+        stream_source=None,
+    ):
         """Initialize the report processor.
 
         Args:
@@ -86,22 +102,29 @@ class AWSReportProcessor(ReportProcessorBase):
             provider_uuid=provider_uuid,
             manifest_id=manifest_id,
             processed_report=ProcessedReport(),
+            skip_line_item_delete=skip_line_item_delete,
+            stream_source=stream_source,
         )
 
         self.manifest_id = manifest_id
         self._report_name = path.basename(report_path)
         self._datetime_format = Config.AWS_DATETIME_STR_FORMAT
         self._batch_size = Config.REPORT_PROCESSING_BATCH_SIZE
+        self._columnar = Config.AWS_COLUMNAR_PROCESSING
 
         # Gather database accessors
 
         with AWSReportDBAccessor(self._schema) as report_db:
             self.report_schema = report_db.report_schema
             self.existing_bill_map = report_db.get_cost_entry_bills()
-            self.existing_cost_entry_map = report_db.get_cost_entries()
-            self.existing_product_map = report_db.get_products()
             self.existing_pricing_map = report_db.get_pricing()
-            self.existing_reservation_map = report_db.get_reservations()
+            # Cost entries, products and reservations grow without bound, so only
+            # the cost entries of this bill are preloaded and the rest are looked up
+            # in batches as they are first seen.
+            self.existing_cost_entry_map = DimensionCache("aws_cost_entry", loader=report_db.get_cost_entry_ids)
+            self.existing_cost_entry_map.update(report_db.get_cost_entries(bill_ids=self._get_manifest_bill_ids()))
+            self.existing_product_map = DimensionCache("aws_product", loader=report_db.get_product_ids)
+            self.existing_reservation_map = DimensionCache("aws_reservation", loader=report_db.get_reservation_ids)
 
         self.line_item_columns = None
 
@@ -113,6 +136,44 @@ class AWSReportProcessor(ReportProcessorBase):
         )
         LOG.info(stmt)
 
+    def _get_manifest_bill_ids(self):
+        """Return the ids of the bills for the billing period of the manifest.
+
+        Returns:
+            (list): The bill ids, empty if there is no manifest
+
+        """
+        if not self.manifest_id:
+            return []
+        with ReportManifestDBAccessor() as manifest_accessor:
+            manifest = manifest_accessor.get_manifest_by_id(self.manifest_id)
+            if not manifest:
+                return []
+            billing_period_start = manifest.billing_period_start_datetime
+        with AWSReportDBAccessor(self._schema) as report_db:
+            with schema_context(self._schema):
+                bills = report_db.bills_for_provider_uuid(self._provider_uuid, billing_period_start)
+                return list(bills.values_list("id", flat=True))
+
+    def delete_stale_line_items(self):
+        """Delete stale data for the manifest of the report, if necessary.
+
+        Returns:
+            (bool): Whether stale data was deleted
+
+        """
+        is_finalized_data = self._check_for_finalized_bill()
+        deleted = self._delete_line_items(AWSReportDBAccessor, is_finalized=is_finalized_data)
+        self._save_usage_days()
+        return deleted
+
+    def _truncate_line_items(self, report_db_accessor, bills, bill_date):
+        """Truncate the line item partition of the month if it only holds line items of these bills."""
+        bill_ids = [bill.id for bill in bills]
+        if report_db_accessor.get_cost_entry_bills_by_date(bill_date).exclude(id__in=bill_ids).exists():
+            return False
+        return report_db_accessor.truncate_table_partition(AWS_CUR_TABLE_MAP["line_item"], bill_date)
+
     def process(self):
         """Process CUR file.
 
@@ -120,10 +181,7 @@ class AWSReportProcessor(ReportProcessorBase):
             (None)
 
         """
-        row_count = 0
-        opener, mode = self._get_file_opener(self._compression)
-
-        if not path.exists(self._report_path):
+        if self._stream_source is None and not path.exists(self._report_path):
             LOG.info(
                 "Skip processing for file: %s and schema: %s as it was not found on disk.",
                 self._report_name,
@@ -131,56 +189,239 @@ class AWSReportProcessor(ReportProcessorBase):
             )
             return False
 
-        is_finalized_data = self._check_for_finalized_bill()
-        is_full_month = self._should_process_full_month()
-        self._delete_line_items(AWSReportDBAccessor, is_finalized=is_finalized_data)
-        opener, mode = self._get_file_opener(self._compression)
         # pylint: disable=invalid-name
-        with opener(self._report_path, mode) as f:
+        with self._open_report() as f:
+            # Finalization is read from the first row of this same pass, so
+            # the report is only read once.
+            is_finalized_data, report_lines = self._peek_finalized_bill(f)
+            is_full_month = self._should_process_full_month()
+            self._delete_line_items(AWSReportDBAccessor, is_finalized=is_finalized_data)
             with AWSReportDBAccessor(self._schema) as report_db:
                 LOG.info("File %s opened for processing", str(f))
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # If this isn't an initial load and it isn't finalized data
-                    # we should only process recent data.
-                    if not self._should_process_row(
-                        row, "lineItem/UsageStartDate", is_full_month, is_finalized=is_finalized_data
-                    ):
-                        continue
-                    bill_id = self.create_cost_entry_objects(row, report_db)
-                    if len(self.processed_report.line_items) >= self._batch_size:
-                        LOG.debug(
-                            "Saving report rows %d to %d for %s",
-                            row_count,
-                            row_count + len(self.processed_report.line_items),
-                            self._report_name,
-                        )
-                        self._save_to_db(AWS_CUR_TABLE_MAP["line_item"], report_db)
-
-                        row_count += len(self.processed_report.line_items)
-                        self._update_mappings()
-
-                if self.processed_report.line_items:
+                if self._columnar:
+                    bill_id = self._process_columnar(report_lines, report_db, is_full_month, is_finalized_data)
+                else:
+                    bill_id = self._process_rows(report_lines, report_db, is_full_month, is_finalized_data)
+
+                if is_finalized_data:
+                    report_db.mark_bill_as_finalized(bill_id)
+
+        self._save_usage_days()
+
+        for cache in (self.existing_cost_entry_map, self.existing_product_map, self.existing_reservation_map):
+            cache.report()
+
+        LOG.info("Completed report processing for file: %s and schema: %s", self._report_name, self._schema)
+
+        if not settings.DEVELOPMENT and self._stream_source is None:
+            LOG.info("Removing processed file: %s", self._report_path)
+            remove(self._report_path)
+
+        return is_finalized_data
+
+    def _process_rows(self, report_file, report_db, is_full_month, is_finalized_data):
+        """Process the CUR file one row dictionary at a time.
+
+        Returns:
+            (int): The id of the bill of the last processed row
+
+        """
+        row_count = 0
+        bill_id = None
+        reader = csv.DictReader(report_file)
+        open_writer = partial(self._open_line_item_writer, AWS_CUR_TABLE_MAP["line_item"])
+        with self._line_item_pipeline(report_db, open_writer) as pipeline:
+            for row in reader:
+                # If this isn't an initial load and it isn't finalized data
+                # we should only process recent data.
+                if not self._should_process_row(
+                    row, "lineItem/UsageStartDate", is_full_month, is_finalized=is_finalized_data
+                ):
+                    continue
+                self._usage_days.add(row["lineItem/UsageStartDate"][:10])
+                bill_id = self.create_cost_entry_objects(row, report_db)
+                if len(self.processed_report.line_items) >= self._batch_size:
                     LOG.debug(
                         "Saving report rows %d to %d for %s",
                         row_count,
                         row_count + len(self.processed_report.line_items),
                         self._report_name,
                     )
-                    self._save_to_db(AWS_CUR_TABLE_MAP["line_item"], report_db)
+                    pipeline.submit(self.processed_report.line_items)
 
                     row_count += len(self.processed_report.line_items)
+                    self._update_mappings()
 
-                if is_finalized_data:
-                    report_db.mark_bill_as_finalized(bill_id)
+            if self.processed_report.line_items:
+                LOG.debug(
+                    "Saving report rows %d to %d for %s",
+                    row_count,
+                    row_count + len(self.processed_report.line_items),
+                    self._report_name,
+                )
+                pipeline.submit(self.processed_report.line_items)
 
-        LOG.info("Completed report processing for file: %s and schema: %s", self._report_name, self._schema)
+                row_count += len(self.processed_report.line_items)
 
-        if not settings.DEVELOPMENT:
-            LOG.info("Removing processed file: %s", self._report_path)
-            remove(self._report_path)
+        return bill_id
 
-        return is_finalized_data
+    def _process_columnar(self, report_file, report_db, is_full_month, is_finalized_data):
+        """Process the CUR file a batch of rows at a time.
+
+        Produces the same line items as _process_rows, but rows stay plain
+        lists, only mapped columns are projected and values are converted
+        per column.
+
+        Returns:
+            (int): The id of the bill of the last processed row
+
+        """
+        row_count = 0
+        bill_id = None
+        reader = csv.reader(report_file)
+        header = next(reader, None)
+        if header is None:
+            return bill_id
+
+        parser = AWSReportBatchParser(header, report_db)
+        columns = parser.line_item_columns + [
+            "tags",
+            "cost_entry_id",
+            "cost_entry_bill_id",
+            "cost_entry_product_id",
+            "cost_entry_pricing_id",
+            "cost_entry_reservation_id",
+        ]
+        self.line_item_columns = columns
+
+        filter_rows = not (is_finalized_data or is_full_month)
+        cutoff_date = self.data_cutoff_date
+        usage_start_idx = parser.index.get("lineItem/UsageStartDate")
+
+        open_writer = partial(self._open_row_writer, AWS_CUR_TABLE_MAP["line_item"], columns)
+        with self._line_item_pipeline(report_db, open_writer) as pipeline:
+            while True:
+                batch = parser.read_batch(reader, self._batch_size)
+                if not batch:
+                    break
+                if filter_rows:
+                    # If this isn't an initial load and it isn't finalized data
+                    # we should only process recent data.
+                    batch = [
+                        row for row in batch if ciso8601.parse_datetime(row[usage_start_idx]).date() >= cutoff_date
+                    ]
+                    if not batch:
+                        continue
+
+                self._usage_days.update(row[usage_start_idx][:10] for row in batch)
+                id_columns = self._get_batch_dimension_ids(batch, parser, report_db)
+                bill_id = id_columns[1][-1]
+
+                line_item_values = parser.parse_line_items(batch)
+                line_item_values.append(parser.parse_tags(batch))
+                line_item_values.extend(id_columns)
+                rows = list(zip(*line_item_values))
+
+                LOG.debug("Saving report rows %d to %d for %s", row_count, row_count + len(rows), self._report_name)
+                pipeline.submit(rows)
+                row_count += len(rows)
+                self._update_mappings()
+
+        return bill_id
+
+    def _get_batch_dimension_ids(self, batch, parser, report_db):
+        """Resolve the bill, cost entry, product, pricing and reservation ids of a batch.
+
+        The distinct unseen keys of each dimension are written with one
+        statement per table before any line item of the batch is built.
+
+        Returns:
+            (list): The cost entry, bill, product, pricing and reservation id columns
+
+        """
+        report = self.processed_report
+
+        def row_data(get_data):
+            return lambda row: get_data(parser.as_dict(row))
+
+        get_bill_key = parser.getter("bill/BillType", "bill/PayerAccountId", "bill/BillingPeriodStartDate")
+        bill_keys = [key + (self._provider_uuid,) for key in map(get_bill_key, batch)]
+        bill_ids = self._resolve_dimension_batch(
+            AWSCostEntryBill,
+            bill_keys,
+            batch,
+            row_data(self._get_cost_entry_bill_data),
+            report.bills,
+            self.existing_bill_map,
+            report_db,
+            conflict_columns=["bill_type", "payer_account_id", "billing_period_start", "provider_id"],
+        )
+
+        get_period = parser.getter("bill/BillingPeriodStartDate", "bill/BillingPeriodEndDate")
+        for start_date, end_date in set(map(get_period, batch)):
+            self._create_line_item_partitions(AWS_CUR_TABLE_MAP["line_item"], start_date, end_date, report_db)
+
+        intervals = {}
+        cost_entries = []
+        for (interval,), bill_id in zip(map(parser.getter("identity/TimeInterval"), batch), bill_ids):
+            if interval not in intervals:
+                intervals[interval] = self._get_cost_entry_time_interval(interval)
+            start, end = intervals[interval]
+            cost_entries.append({"bill_id": bill_id, "interval_start": start, "interval_end": end})
+        cost_entry_ids = self._resolve_dimension_batch(
+            AWSCostEntry,
+            [(entry["bill_id"], entry["interval_start"]) for entry in cost_entries],
+            cost_entries,
+            dict,
+            report.cost_entries,
+            self.existing_cost_entry_map,
+            report_db,
+        )
+
+        product_ids = self._resolve_dimension_batch(
+            AWSCostEntryProduct,
+            list(map(parser.getter("product/sku", "product/ProductName", "product/region"), batch)),
+            batch,
+            row_data(self._get_cost_entry_product_data),
+            report.products,
+            self.existing_product_map,
+            report_db,
+            conflict_columns=["sku", "product_name", "region"],
+        )
+
+        pricing_ids = self._resolve_dimension_batch(
+            AWSCostEntryPricing,
+            [
+                f"{term if term else 'None'}-{unit if unit else 'None'}"
+                for term, unit in map(parser.getter("pricing/term", "pricing/unit"), batch)
+            ],
+            batch,
+            row_data(self._get_cost_entry_pricing_data),
+            report.pricing,
+            self.existing_pricing_map,
+            report_db,
+        )
+
+        reservation_keys = []
+        get_reservation_key = parser.getter("reservation/ReservationARN", "lineItem/LineItemType")
+        for row in batch:
+            arn, line_item_type = get_reservation_key(row)
+            if (line_item_type or "").lower() == "rifee":
+                # Special rows with additional reservation information update the reservation
+                self._create_cost_entry_reservation(parser.as_dict(row), report_db)
+            reservation_keys.append(arn)
+        reservation_ids = self._resolve_dimension_batch(
+            AWSCostEntryReservation,
+            reservation_keys,
+            batch,
+            row_data(self._get_cost_entry_reservation_data),
+            report.reservations,
+            self.existing_reservation_map,
+            report_db,
+            conflict_columns=["reservation_arn"],
+        )
+
+        return [cost_entry_ids, bill_ids, product_ids, pricing_ids, reservation_ids]
 
     def _check_for_finalized_bill(self):
         """Read one line of the report file to check for finalization.
@@ -189,14 +430,36 @@ class AWSReportProcessor(ReportProcessorBase):
             (Boolean): Whether the bill is finalized
 
         """
-        opener, mode = self._get_file_opener(self._compression)
         # pylint: disable=invalid-name
-        with opener(self._report_path, mode) as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                invoice_id = row.get("bill/InvoiceId")
-                return invoice_id is not None and invoice_id != ""
-            return False
+        with self._open_report() as f:
+            is_finalized_data, _ = self._peek_finalized_bill(f)
+            return is_finalized_data
+
+    @staticmethod
+    def _peek_finalized_bill(report_file):
+        """Read the first row of the report to check for finalization.
+
+        Args:
+            report_file (file): The open report file
+
+        Returns:
+            (Boolean, iterator): Whether the bill is finalized, and the lines
+                of the report including the lines already read
+
+        """
+        read_lines = []
+
+        def record_lines():
+            for line in report_file:
+                read_lines.append(line)
+                yield line
+
+        is_finalized_data = False
+        for row in csv.DictReader(record_lines()):
+            invoice_id = row.get("bill/InvoiceId")
+            is_finalized_data = invoice_id is not None and invoice_id != ""
+            break
+        return is_finalized_data, chain(read_lines, report_file)
 
     def _update_mappings(self):
         """Update cache of database objects for reference."""
@@ -287,12 +550,14 @@ class AWSReportProcessor(ReportProcessorBase):
         if key in self.processed_report.bills:
             return self.processed_report.bills[key]
 
+        self._create_line_item_partitions(
+            AWS_CUR_TABLE_MAP["line_item"], start_date, row.get("bill/BillingPeriodEndDate"), report_db_accessor
+        )
+
         if key in self.existing_bill_map:
             return self.existing_bill_map[key]
 
-        data = self._get_data_for_table(row, table_name._meta.db_table)
-
-        data["provider_id"] = self._provider_uuid
+        data = self._get_cost_entry_bill_data(row)
 
         bill_id = report_db_accessor.insert_on_conflict_do_nothing(
             table_name, data, conflict_columns=["bill_type", "payer_account_id", "billing_period_start", "provider_id"]
@@ -302,6 +567,12 @@ class AWSReportProcessor(ReportProcessorBase):
 
         return bill_id
 
+    def _get_cost_entry_bill_data(self, row):
+        """Return the cost entry bill data of a row."""
+        data = self._get_data_for_table(row, AWSCostEntryBill._meta.db_table)
+        data["provider_id"] = self._provider_uuid
+        return data
+
     def _create_cost_entry(self, row, bill_id, report_db_accessor):
         """Create a cost entry object.
 
@@ -321,8 +592,11 @@ class AWSReportProcessor(ReportProcessorBase):
         if key in self.processed_report.cost_entries:
             return self.processed_report.cost_entries[key]
 
-        if key in self.existing_cost_entry_map:
-            return self.existing_cost_entry_map[key]
+        # Cost entries have no unique constraint, so an existing entry must be
+        # found before inserting to avoid a duplicate.
+        cost_entry_id = self._get_existing_id(self.existing_cost_entry_map, key)
+        if cost_entry_id is not None:
+            return cost_entry_id
 
         data = {"bill_id": bill_id, "interval_start": start, "interval_end": end}
 
@@ -387,9 +661,8 @@ class AWSReportProcessor(ReportProcessorBase):
         if key in self.existing_pricing_map:
             return self.existing_pricing_map[key]
 
-        data = self._get_data_for_table(row, table_name._meta.db_table)
-        value_set = set(data.values())
-        if value_set == {""}:
+        data = self._get_cost_entry_pricing_data(row)
+        if data is None:
             return
 
         pricing_id = report_db_accessor.insert_on_conflict_do_nothing(table_name, data)
@@ -397,6 +670,13 @@ class AWSReportProcessor(ReportProcessorBase):
 
         return pricing_id
 
+    def _get_cost_entry_pricing_data(self, row):
+        """Return the pricing data of a row, or None if the row has no pricing."""
+        data = self._get_data_for_table(row, AWSCostEntryPricing._meta.db_table)
+        if set(data.values()) == {""}:
+            return None
+        return data
+
     def _create_cost_entry_product(self, row, report_db_accessor):
         """Create a cost entry product object.
 
@@ -416,12 +696,12 @@ class AWSReportProcessor(ReportProcessorBase):
         if key in self.processed_report.products:
             return self.processed_report.products[key]
 
-        if key in self.existing_product_map:
-            return self.existing_product_map[key]
+        product_id = self._get_existing_id(self.existing_product_map, key)
+        if product_id is not None:
+            return product_id
 
-        data = self._get_data_for_table(row, table_name._meta.db_table)
-        value_set = set(data.values())
-        if value_set == {""}:
+        data = self._get_cost_entry_product_data(row)
+        if data is None:
             return
         product_id = report_db_accessor.insert_on_conflict_do_nothing(
             table_name, data, conflict_columns=["sku", "product_name", "region"]
@@ -429,6 +709,13 @@ class AWSReportProcessor(ReportProcessorBase):
         self.processed_report.products[key] = product_id
         return product_id
 
+    def _get_cost_entry_product_data(self, row):
+        """Return the product data of a row, or None if the row has no product."""
+        data = self._get_data_for_table(row, AWSCostEntryProduct._meta.db_table)
+        if set(data.values()) == {""}:
+            return None
+        return data
+
     def _create_cost_entry_reservation(self, row, report_db_accessor):
         """Create a cost entry reservation object.
 
@@ -446,13 +733,12 @@ class AWSReportProcessor(ReportProcessorBase):
 
         if arn in self.processed_report.reservations:
             reservation_id = self.processed_report.reservations.get(arn)
-        elif arn in self.existing_reservation_map:
-            reservation_id = self.existing_reservation_map[arn]
+        elif arn:
+            reservation_id = self._get_existing_id(self.existing_reservation_map, arn)
 
         if reservation_id is None or line_item_type == "rifee":
-            data = self._get_data_for_table(row, table_name._meta.db_table)
-            value_set = set(data.values())
-            if value_set == {""}:
+            data = self._get_cost_entry_reservation_data(row)
+            if data is None:
                 return
         else:
             return reservation_id
@@ -470,6 +756,13 @@ class AWSReportProcessor(ReportProcessorBase):
 
         return reservation_id
 
+    def _get_cost_entry_reservation_data(self, row):
+        """Return the reservation data of a row, or None if the row has no reservation."""
+        data = self._get_data_for_table(row, AWSCostEntryReservation._meta.db_table)
+        if set(data.values()) == {""}:
+            return None
+        return data
+
     def create_cost_entry_objects(self, row, report_db_accesor):
         """Create the set of objects required for a row of data."""
         bill_id = self._create_cost_entry_bill(row, report_db_accesor)
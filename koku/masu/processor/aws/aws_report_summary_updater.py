@@ -23,8 +23,10 @@ from tenant_schemas.utils import schema_context
 
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.external.date_accessor import DateAccessor
+from masu.processor.summary_executor import SummaryExecutor
 from masu.util.aws.common import get_bills_from_provider
 from masu.util.common import date_range_pair
+from masu.util.common import month_range_pair
 
 LOG = logging.getLogger(__name__)
 
@@ -67,16 +69,20 @@ class AWSReportSummaryUpdater:
         with schema_context(self._schema):
             bill_ids = [str(bill.id) for bill in bills]
 
-        with AWSReportDBAccessor(self._schema) as accessor:
-            for start, end in date_range_pair(start_date, end_date):
-                LOG.info(
-                    "Updating AWS report daily tables for \n\tSchema: %s" "\n\tProvider: %s \n\tDates: %s - %s",
-                    self._schema,
-                    self._provider.uuid,
-                    start,
-                    end,
-                )
-                accessor.populate_line_item_daily_table(start, end, bill_ids)
+        def populate_daily_window(accessor, start, end):
+            LOG.info(
+                "Updating AWS report daily tables for \n\tSchema: %s" "\n\tProvider: %s \n\tDates: %s - %s",
+                self._schema,
+                self._provider.uuid,
+                start,
+                end,
+            )
+            accessor.populate_line_item_daily_table(start, end, bill_ids)
+            accessor.populate_tag_index(start, end, bill_ids)
+
+        SummaryExecutor(self._schema).run(
+            AWSReportDBAccessor, date_range_pair(start_date, end_date), populate_daily_window
+        )
 
         return start_date, end_date
 
@@ -102,18 +108,25 @@ class AWSReportSummaryUpdater:
         with schema_context(self._schema):
             bill_ids = [str(bill.id) for bill in bills]
 
+        def populate_summary_window(accessor, start, end):
+            LOG.info(
+                "Updating AWS report summary tables: \n\tSchema: %s" "\n\tProvider: %s \n\tDates: %s - %s",
+                self._schema,
+                self._provider.uuid,
+                start,
+                end,
+            )
+            accessor.populate_line_item_daily_summary_table(start, end, bill_ids)
+
+        # The summary tables are swapped in a month at a time
+        SummaryExecutor(self._schema).run(
+            AWSReportDBAccessor, month_range_pair(start_date, end_date), populate_summary_window
+        )
+
         with AWSReportDBAccessor(self._schema) as accessor:
             # Need these bills on the session to update dates after processing
             bills = accessor.bills_for_provider_uuid(self._provider.uuid, start_date)
-            for start, end in date_range_pair(start_date, end_date):
-                LOG.info(
-                    "Updating AWS report summary tables: \n\tSchema: %s" "\n\tProvider: %s \n\tDates: %s - %s",
-                    self._schema,
-                    self._provider.uuid,
-                    start,
-                    end,
-                )
-                accessor.populate_line_item_daily_summary_table(start, end, bill_ids)
+            # The tags summary is built from all of the summarized windows
             accessor.populate_tags_summary_table()
             for bill in bills:
                 if bill.summary_data_creation_datetime is None:
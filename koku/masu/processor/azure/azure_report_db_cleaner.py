@@ -19,6 +19,7 @@ import logging
 
 from tenant_schemas.utils import schema_context
 
+from masu.database import AZURE_REPORT_TABLE_MAP
 from masu.database.azure_report_db_accessor import AzureReportDBAccessor
 
 LOG = logging.getLogger(__name__)
@@ -65,6 +66,8 @@ class AzureReportDBCleaner:
 
             if expired_date is not None:
                 bill_objects = accessor.get_bill_query_before_date(expired_date)
+                if not simulate:
+                    accessor.drop_table_partitions(AZURE_REPORT_TABLE_MAP["line_item_daily_summary"], expired_date)
             else:
                 bill_objects = accessor.get_cost_entry_bills_query_by_provider(provider_uuid)
             with schema_context(self._schema):
@@ -18,6 +18,7 @@
 import csv
 import logging
 from datetime import datetime
+from functools import partial
 from os import remove
 
 import pytz
@@ -28,6 +29,7 @@ from django.conf import settings
 from masu.config import Config
 from masu.database import AZURE_REPORT_TABLE_MAP
 from masu.database.azure_report_db_accessor import AzureReportDBAccessor
+from masu.processor.dimension_cache import DimensionCache
 from masu.processor.report_processor_base import ReportProcessorBase
 from masu.util import common as utils
 from reporting.provider.azure.models import AzureCostEntryBill
@@ -65,7 +67,9 @@ class AzureReportProcessor(ReportProcessorBase):
     """Cost Usage Report processor."""
 
     # pylint:disable=too-many-arguments
-    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id=None):
+    def __init__(
+        self, schema_name, report_path, compression, provider_uuid, manifest_id=None, skip_line_item_delete=False
+    ):
         """Initialize the report processor.
 
         Args:
@@ -82,6 +86,7 @@ class AzureReportProcessor(ReportProcessorBase):
             provider_uuid=provider_uuid,
             manifest_id=manifest_id,
             processed_report=ProcessedAzureReport(),
+            skip_line_item_delete=skip_line_item_delete,
         )
         self.table_name = AzureCostEntryLineItemDaily()
 
@@ -95,7 +100,7 @@ class AzureReportProcessor(ReportProcessorBase):
         with AzureReportDBAccessor(self._schema) as report_db:
             self.report_schema = report_db.report_schema
             self.existing_bill_map = report_db.get_cost_entry_bills()
-            self.existing_product_map = report_db.get_products()
+            self.existing_product_map = DimensionCache("azure_product", loader=report_db.get_product_ids)
             self.existing_meter_map = report_db.get_meters()
 
         self.line_item_columns = None
@@ -108,6 +113,26 @@ class AzureReportProcessor(ReportProcessorBase):
         )
         LOG.info(stmt)
 
+    def _get_billing_period(self, row_date):
+        """Return the UTC start and end of the billing period containing a date."""
+        report_date_range = utils.month_date_range(parser.parse(row_date))
+        start_date, end_date = report_date_range.split("-")
+
+        start_date_utc = parser.parse(start_date).replace(hour=0, minute=0, tzinfo=pytz.UTC)
+        end_date_utc = parser.parse(end_date).replace(hour=0, minute=0, tzinfo=pytz.UTC)
+        return start_date_utc, end_date_utc
+
+    def _get_cost_entry_bill_data(self, row):
+        """Return the cost entry bill data of a row."""
+        start_date_utc, end_date_utc = self._get_billing_period(row.get("UsageDateTime"))
+
+        data = self._get_data_for_table(row, AzureCostEntryBill._meta.db_table)
+
+        data["provider_id"] = self._provider_uuid
+        data["billing_period_start"] = datetime.strftime(start_date_utc, "%Y-%m-%d %H:%M%z")
+        data["billing_period_end"] = datetime.strftime(end_date_utc, "%Y-%m-%d %H:%M%z")
+        return data
+
     def _create_cost_entry_bill(self, row, report_db_accessor):
         """Create a cost entry bill object.
 
@@ -119,13 +144,7 @@ class AzureReportProcessor(ReportProcessorBase):
 
         """
         table_name = AzureCostEntryBill
-        row_date = row.get("UsageDateTime")
-
-        report_date_range = utils.month_date_range(parser.parse(row_date))
-        start_date, end_date = report_date_range.split("-")
-
-        start_date_utc = parser.parse(start_date).replace(hour=0, minute=0, tzinfo=pytz.UTC)
-        end_date_utc = parser.parse(end_date).replace(hour=0, minute=0, tzinfo=pytz.UTC)
+        start_date_utc, _ = self._get_billing_period(row.get("UsageDateTime"))
 
         key = (start_date_utc, self._provider_uuid)
         if key in self.processed_report.bills:
@@ -134,11 +153,7 @@ class AzureReportProcessor(ReportProcessorBase):
         if key in self.existing_bill_map:
             return self.existing_bill_map[key]
 
-        data = self._get_data_for_table(row, table_name._meta.db_table)
-
-        data["provider_id"] = self._provider_uuid
-        data["billing_period_start"] = datetime.strftime(start_date_utc, "%Y-%m-%d %H:%M%z")
-        data["billing_period_end"] = datetime.strftime(end_date_utc, "%Y-%m-%d %H:%M%z")
+        data = self._get_cost_entry_bill_data(row)
 
         bill_id = report_db_accessor.insert_on_conflict_do_nothing(
             table_name, data, conflict_columns=["billing_period_start", "provider_id"]
@@ -148,6 +163,33 @@ class AzureReportProcessor(ReportProcessorBase):
 
         return bill_id
 
+    @staticmethod
+    def _get_instance_type(row):
+        """Return the instance type from the additional info of a row."""
+        additional_info = row.get("AdditionalInfo")
+        decoded_info = None
+        if additional_info:
+            decoded_info = json.loads(additional_info)
+        instance_type = None
+        if decoded_info:
+            instance_type = decoded_info.get("ServiceType", None)
+        return instance_type
+
+    def _get_cost_entry_product_key(self, row):
+        """Return the key identifying the product of a row."""
+        instance_type = self._get_instance_type(row)
+        return (row.get("InstanceId"), instance_type, row.get("ServiceTier"), row.get("ServiceName"))
+
+    def _get_cost_entry_product_data(self, row):
+        """Return the product data of a row, or None if the row has no product."""
+        data = self._get_data_for_table(row, AzureCostEntryProductService._meta.db_table)
+        value_set = set(data.values())
+        if value_set == {""}:
+            return None
+        data["instance_type"] = self._get_instance_type(row)
+        data["provider_id"] = self._provider_uuid
+        return data
+
     def _create_cost_entry_product(self, row, report_db_accessor):
         """Create a cost entry product object.
 
@@ -159,38 +201,33 @@ class AzureReportProcessor(ReportProcessorBase):
 
         """
         table_name = AzureCostEntryProductService
-        instance_id = row.get("InstanceId")
-        additional_info = row.get("AdditionalInfo")
-        service_name = row.get("ServiceName")
-        service_tier = row.get("ServiceTier")
-
-        decoded_info = None
-        if additional_info:
-            decoded_info = json.loads(additional_info)
-        instance_type = None
-        if decoded_info:
-            instance_type = decoded_info.get("ServiceType", None)
-
-        key = (instance_id, instance_type, service_tier, service_name)
+        key = self._get_cost_entry_product_key(row)
 
         if key in self.processed_report.products:
             return self.processed_report.products[key]
 
-        if key in self.existing_product_map:
-            return self.existing_product_map[key]
+        product_id = self._get_existing_id(self.existing_product_map, key)
+        if product_id is not None:
+            return product_id
 
-        data = self._get_data_for_table(row, table_name._meta.db_table)
-        value_set = set(data.values())
-        if value_set == {""}:
+        data = self._get_cost_entry_product_data(row)
+        if data is None:
             return
-        data["instance_type"] = instance_type
-        data["provider_id"] = self._provider_uuid
         product_id = report_db_accessor.insert_on_conflict_do_nothing(
             table_name, data, conflict_columns=["instance_id", "instance_type", "service_tier", "service_name"]
         )
         self.processed_report.products[key] = product_id
         return product_id
 
+    def _get_meter_data(self, row):
+        """Return the meter data of a row, or None if the row has no meter."""
+        data = self._get_data_for_table(row, AzureMeter._meta.db_table)
+        value_set = set(data.values())
+        if value_set == {""}:
+            return None
+        data["provider_id"] = self._provider_uuid
+        return data
+
     def _create_meter(self, row, report_db_accessor):
         """Create a cost entry product object.
 
@@ -212,11 +249,9 @@ class AzureReportProcessor(ReportProcessorBase):
         if key in self.existing_meter_map:
             return self.existing_meter_map[key]
 
-        data = self._get_data_for_table(row, table_name._meta.db_table)
-        value_set = set(data.values())
-        if value_set == {""}:
+        data = self._get_meter_data(row)
+        if data is None:
             return
-        data["provider_id"] = self._provider_uuid
         meter_id = report_db_accessor.insert_on_conflict_do_nothing(table_name, data, conflict_columns=["meter_id"])
         self.processed_report.meters[key] = meter_id
         return meter_id
@@ -263,6 +298,66 @@ class AzureReportProcessor(ReportProcessorBase):
 
         return bill_id
 
+    def create_cost_entry_objects_for_batch(self, rows, report_db_accessor):
+        """Create the set of objects required for a batch of rows.
+
+        The distinct unseen bills, products and meters of the batch are
+        written with one statement per table before any line item is built.
+        """
+        report = self.processed_report
+
+        billing_periods = {}
+        bill_keys = []
+        for row in rows:
+            row_date = row.get("UsageDateTime")
+            if row_date not in billing_periods:
+                billing_periods[row_date] = self._get_billing_period(row_date)[0]
+            bill_keys.append((billing_periods[row_date], self._provider_uuid))
+        bill_ids = self._resolve_dimension_batch(
+            AzureCostEntryBill,
+            bill_keys,
+            rows,
+            self._get_cost_entry_bill_data,
+            report.bills,
+            self.existing_bill_map,
+            report_db_accessor,
+            conflict_columns=["billing_period_start", "provider_id"],
+        )
+        product_ids = self._resolve_dimension_batch(
+            AzureCostEntryProductService,
+            [self._get_cost_entry_product_key(row) for row in rows],
+            rows,
+            self._get_cost_entry_product_data,
+            report.products,
+            self.existing_product_map,
+            report_db_accessor,
+            conflict_columns=["instance_id", "instance_type", "service_tier", "service_name"],
+        )
+        meter_ids = self._resolve_dimension_batch(
+            AzureMeter,
+            [(row.get("MeterId"),) for row in rows],
+            rows,
+            self._get_meter_data,
+            report.meters,
+            self.existing_meter_map,
+            report_db_accessor,
+            conflict_columns=["meter_id"],
+        )
+
+        for row, bill_id, product_id, meter_id in zip(rows, bill_ids, product_ids, meter_ids):
+            self._create_cost_entry_line_item(row, bill_id, product_id, meter_id, report_db_accessor)
+
+    def delete_stale_line_items(self):
+        """Delete stale data for the manifest of the report, if necessary.
+
+        Returns:
+            (bool): Whether stale data was deleted
+
+        """
+        deleted = self._delete_line_items(AzureReportDBAccessor)
+        self._save_usage_days()
+        return deleted
+
     def process(self):
         """Process cost/usage file.
 
@@ -279,32 +374,43 @@ class AzureReportProcessor(ReportProcessorBase):
             with AzureReportDBAccessor(self._schema) as report_db:
                 LOG.info("File %s opened for processing", str(f))
                 reader = csv.DictReader(f)
-                for row in reader:
-                    if not self._should_process_row(row, "UsageDateTime", is_full_month):
-                        continue
-                    self.create_cost_entry_objects(row, report_db)
-                    if len(self.processed_report.line_items) >= self._batch_size:
+                batch = []
+                open_writer = partial(self._open_line_item_writer, AZURE_REPORT_TABLE_MAP["line_item"])
+                with self._line_item_pipeline(report_db, open_writer) as pipeline:
+                    for row in reader:
+                        if not self._should_process_row(row, "UsageDateTime", is_full_month):
+                            continue
+                        self._usage_days.add(row["UsageDateTime"][:10])
+                        batch.append(row)
+                        if len(batch) >= self._batch_size:
+                            self.create_cost_entry_objects_for_batch(batch, report_db)
+                            batch = []
+                            LOG.info(
+                                "Saving report rows %d to %d for %s",
+                                row_count,
+                                row_count + len(self.processed_report.line_items),
+                                self._report_name,
+                            )
+                            pipeline.submit(self.processed_report.line_items)
+                            row_count += len(self.processed_report.line_items)
+                            self._update_mappings()
+
+                    if batch:
+                        self.create_cost_entry_objects_for_batch(batch, report_db)
+
+                    if self.processed_report.line_items:
                         LOG.info(
                             "Saving report rows %d to %d for %s",
                             row_count,
                             row_count + len(self.processed_report.line_items),
                             self._report_name,
                         )
-                        self._save_to_db(AZURE_REPORT_TABLE_MAP["line_item"], report_db)
+                        pipeline.submit(self.processed_report.line_items)
                         row_count += len(self.processed_report.line_items)
-                        self._update_mappings()
-
-                if self.processed_report.line_items:
-                    LOG.info(
-                        "Saving report rows %d to %d for %s",
-                        row_count,
-                        row_count + len(self.processed_report.line_items),
-                        self._report_name,
-                    )
-                    self._save_to_db(AZURE_REPORT_TABLE_MAP["line_item"], report_db)
-                    row_count += len(self.processed_report.line_items)
 
                 LOG.info("Completed report processing for file: %s and schema: %s", self._report_name, self._schema)
+                self.existing_product_map.report()
+            self._save_usage_days()
             if not settings.DEVELOPMENT:
                 LOG.info("Removing processed file: %s", self._report_path)
                 remove(self._report_path)
@@ -23,8 +23,10 @@ from tenant_schemas.utils import schema_context
 
 from masu.database.azure_report_db_accessor import AzureReportDBAccessor
 from masu.external.date_accessor import DateAccessor
+from masu.processor.summary_executor import SummaryExecutor
 from masu.util.azure.common import get_bills_from_provider
 from masu.util.common import date_range_pair
+from masu.util.common import month_range_pair
 
 LOG = logging.getLogger(__name__)
 
@@ -81,6 +83,28 @@ class AzureReportSummaryUpdater:
         """
         LOG.info("update_daily_tables for: %s-%s", str(start_date), str(end_date))
         start_date, end_date = self._get_sql_inputs(start_date, end_date)
+        bills = get_bills_from_provider(
+            self._provider.uuid,
+            self._schema,
+            datetime.datetime.strptime(start_date, "%Y-%m-%d"),
+            datetime.datetime.strptime(end_date, "%Y-%m-%d"),
+        )
+        with schema_context(self._schema):
+            bill_ids = [str(bill.id) for bill in bills]
+
+        def populate_daily_window(accessor, start, end):
+            LOG.info(
+                "Updating Azure tag index for \n\tSchema: %s" "\n\tProvider: %s \n\tDates: %s - %s",
+                self._schema,
+                self._provider.uuid,
+                start,
+                end,
+            )
+            accessor.populate_tag_index(start, end, bill_ids)
+
+        SummaryExecutor(self._schema).run(
+            AzureReportDBAccessor, date_range_pair(start_date, end_date), populate_daily_window
+        )
 
         return start_date, end_date
 
@@ -107,18 +131,25 @@ class AzureReportSummaryUpdater:
         with schema_context(self._schema):
             bill_ids = [str(bill.id) for bill in bills]
 
+        def populate_summary_window(accessor, start, end):
+            LOG.info(
+                "Updating Azure report summary tables: \n\tSchema: %s" "\n\tProvider: %s \n\tDates: %s - %s",
+                self._schema,
+                self._provider.uuid,
+                start,
+                end,
+            )
+            accessor.populate_line_item_daily_summary_table(start, end, bill_ids)
+
+        # The summary tables are swapped in a month at a time
+        SummaryExecutor(self._schema).run(
+            AzureReportDBAccessor, month_range_pair(start_date, end_date), populate_summary_window
+        )
+
         with AzureReportDBAccessor(self._schema) as accessor:
             # Need these bills on the session to update dates after processing
             bills = accessor.bills_for_provider_uuid(self._provider.uuid, start_date)
-            for start, end in date_range_pair(start_date, end_date):
-                LOG.info(
-                    "Updating Azure report summary tables: \n\tSchema: %s" "\n\tProvider: %s \n\tDates: %s - %s",
-                    self._schema,
-                    self._provider.uuid,
-                    start,
-                    end,
-                )
-                accessor.populate_line_item_daily_summary_table(start, end, bill_ids)
+            # The tags summary is built from all of the summarized windows
             accessor.populate_tags_summary_table()
             for bill in bills:
                 if bill.summary_data_creation_datetime is None:
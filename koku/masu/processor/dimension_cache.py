@@ -0,0 +1,142 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Bounded cache of report dimension ids."""
+import logging
+from collections import OrderedDict
+
+from masu.config import Config
+from masu.prometheus_stats import DIMENSION_CACHE_HITS_COUNTER
+from masu.prometheus_stats import DIMENSION_CACHE_LOOKUPS_COUNTER
+from masu.prometheus_stats import DIMENSION_CACHE_MISSES_COUNTER
+
+LOG = logging.getLogger(__name__)
+
+
+class DimensionCache:
+    """A bounded map of dimension keys to database ids.
+
+    Behaves like the dictionaries report processors used to preload, but
+    evicts the least recently used keys once max_size is reached. Keys
+    that are not cached can be looked up in the database in one batch
+    with prefetch, through the loader function.
+
+    """
+
+    def __init__(self, name, loader=None, max_size=None):
+        """Initialize the cache.
+
+        Args:
+            name (str): The name of the dimension, used in logs and metrics
+            loader (function): Takes a list of keys and returns a dict of the
+                keys found in the database to their ids
+            max_size (int): The maximum number of cached keys
+
+        """
+        self.name = name
+        self._loader = loader
+        self._max_size = max_size if max_size is not None else Config.DIMENSION_CACHE_MAX_SIZE
+        self._cache = OrderedDict()
+        # Keys the loader did not find, so they are not looked up again
+        self._absent = set()
+        self.hits = 0
+        self.misses = 0
+        self.lookups = 0
+
+    def __contains__(self, key):
+        """Return whether the key is cached, counting the hit or miss."""
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def __getitem__(self, key):
+        """Return the id of a cached key."""
+        return self._cache[key]
+
+    def __setitem__(self, key, value):
+        """Cache the id of a key, evicting the least recently used key if full."""
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        self._absent.discard(key)
+        if len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
+    def __len__(self):
+        """Return the number of cached keys."""
+        return len(self._cache)
+
+    def __iter__(self):
+        """Iterate over the cached keys."""
+        return iter(self._cache)
+
+    def get(self, key, default=None):
+        """Return the id of a key if it is cached, else default."""
+        return self._cache.get(key, default)
+
+    def keys(self):
+        """Return the cached keys."""
+        return self._cache.keys()
+
+    def values(self):
+        """Return the cached ids."""
+        return self._cache.values()
+
+    def items(self):
+        """Return the cached keys and ids."""
+        return self._cache.items()
+
+    def update(self, mapping):
+        """Cache the ids of many keys."""
+        for key, value in mapping.items():
+            self[key] = value
+
+    def prefetch(self, keys):
+        """Look up the keys that are not cached in one batch.
+
+        Args:
+            keys (list): Dimension keys that are about to be used
+
+        """
+        if self._loader is None:
+            return
+        missing = [key for key in dict.fromkeys(keys) if key not in self._cache and key not in self._absent]
+        if missing:
+            self.lookups += len(missing)
+            found = self._loader(missing)
+            self.update(found)
+            if len(self._absent) > self._max_size:
+                self._absent.clear()
+            self._absent.update(key for key in missing if key not in found)
+
+    def report(self):
+        """Log the cache counters and add them to the worker metrics."""
+        LOG.info(
+            "Dimension cache %s: %d hits, %d misses, %d keys looked up, %d keys cached.",
+            self.name,
+            self.hits,
+            self.misses,
+            self.lookups,
+            len(self._cache),
+        )
+        DIMENSION_CACHE_HITS_COUNTER.labels(dimension=self.name).inc(self.hits)
+        DIMENSION_CACHE_MISSES_COUNTER.labels(dimension=self.name).inc(self.misses)
+        DIMENSION_CACHE_LOOKUPS_COUNTER.labels(dimension=self.name).inc(self.lookups)
+        self.hits = 0
+        self.misses = 0
+        self.lookups = 0
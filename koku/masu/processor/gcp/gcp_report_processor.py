@@ -2,6 +2,7 @@
 import logging
 from collections import OrderedDict
 from datetime import datetime
+from functools import partial
 from numbers import Number
 from os import remove
 
@@ -71,17 +72,8 @@ class GCPReportProcessor(ReportProcessorBase):
 
         self.line_item_columns = None
 
-    def _get_or_create_cost_entry_bill(self, row, report_db_accessor):
-        """Get or Create a GCP cost entry bill object.
-
-        Args:
-            row (OrderedDict): A dictionary representation of a CSV file row.
-
-        Returns:
-             (string) An id of a GCP Bill.
-
-        """
-        table_name = GCPCostEntryBill
+    def _get_cost_entry_bill_key_and_data(self, row):
+        """Return the bill key and bill data of a row."""
         start_time = row["Start Time"]
 
         report_date_range = utils.month_date_range(parser.parse(start_time))
@@ -97,6 +89,20 @@ class GCPReportProcessor(ReportProcessorBase):
         }
 
         key = (start_date_utc, self._provider_uuid)
+        return key, data
+
+    def _get_or_create_cost_entry_bill(self, row, report_db_accessor):
+        """Get or Create a GCP cost entry bill object.
+
+        Args:
+            row (OrderedDict): A dictionary representation of a CSV file row.
+
+        Returns:
+             (string) An id of a GCP Bill.
+
+        """
+        table_name = GCPCostEntryBill
+        key, data = self._get_cost_entry_bill_key_and_data(row)
         if key in self.processed_report.bills:
             return self.processed_report.bills[key]
 
@@ -107,6 +113,12 @@ class GCPReportProcessor(ReportProcessorBase):
 
         return bill_id
 
+    def _get_gcp_project_data(self, row, report_db_accessor):
+        """Return the cleaned GCP project data of a row."""
+        table_name = GCPProject
+        data = self._get_data_for_table(row, table_name._meta.db_table)
+        return report_db_accessor.clean_data(data, table_name._meta.db_table)
+
     def _get_or_create_gcp_project(self, row, report_db_accessor):
         """Get or Create a GCPProject.
 
@@ -118,8 +130,7 @@ class GCPReportProcessor(ReportProcessorBase):
 
         """
         table_name = GCPProject
-        data = self._get_data_for_table(row, table_name._meta.db_table)
-        data = report_db_accessor.clean_data(data, table_name._meta.db_table)
+        data = self._get_gcp_project_data(row, report_db_accessor)
 
         key = data["project_id"]
         if key in self.processed_report.projects:
@@ -132,6 +143,44 @@ class GCPReportProcessor(ReportProcessorBase):
         self.processed_report.projects[key] = project_id
         return project_id
 
+    def _get_or_create_batch_dimensions(self, first_rows, report_db_accessor):
+        """Get or Create the bills and projects of a batch of row groups.
+
+        The distinct unseen bills and projects of the batch are written with
+        one statement per table.
+
+        Args:
+            first_rows (list): The first row of each group in the batch
+
+        Returns:
+            (list, list): The bill id and project id of each group
+
+        """
+        bills = [self._get_cost_entry_bill_key_and_data(row) for row in first_rows]
+        bill_ids = self._resolve_dimension_batch(
+            GCPCostEntryBill,
+            [key for key, _ in bills],
+            [data for _, data in bills],
+            dict,
+            self.processed_report.bills,
+            {},
+            report_db_accessor,
+            conflict_columns=["billing_period_start", "provider_id"],
+        )
+
+        projects = [self._get_gcp_project_data(row, report_db_accessor) for row in first_rows]
+        project_ids = self._resolve_dimension_batch(
+            GCPProject,
+            [data["project_id"] for data in projects],
+            projects,
+            dict,
+            self.processed_report.projects,
+            {},
+            report_db_accessor,
+            conflict_columns=["project_id"],
+        )
+        return bill_ids, project_ids
+
     def _create_cost_entry_line_item(self, row, bill_id, project_id, report_db_accessor):
         """Create a cost entry line item object.
 
@@ -185,45 +234,40 @@ class GCPReportProcessor(ReportProcessorBase):
         report_csv = pandas.read_csv(self._report_path, chunksize=self._batch_size, compression="infer")
 
         with GCPReportDBAccessor(self._schema) as report_db:
+            # Line items are saved to a temp table that is merged into the line item table.
+            # This is faster than django's bulk_create.
+            open_writer = partial(self._open_staging_writer, self.line_item_table_name)
+            with self._line_item_pipeline(report_db, open_writer) as pipeline:
+                for chunk in report_csv:
 
-            for chunk in report_csv:
-
-                # Group the information in the csv by the start time and the project id
-                report_groups = chunk.groupby(by=["Start Time", "Project ID"])
-                for group, rows in report_groups:
+                    # Group the information in the csv by the start time and the project id
+                    report_groups = [rows for _, rows in chunk.groupby(by=["Start Time", "Project ID"])]
 
                     # Each row in the group contains information that we'll need to create the bill
                     # and the project. Just get the first row to pull this information.
-                    first_row = OrderedDict(zip(rows.columns.tolist(), rows.iloc[0].tolist()))
-
-                    bill_id = self._get_or_create_cost_entry_bill(first_row, report_db)
-
-                    project_id = self._get_or_create_gcp_project(first_row, report_db)
-
-                    for row in rows.values:
-                        processed_row = OrderedDict(zip(rows.columns.tolist(), row.tolist()))
-                        self._create_cost_entry_line_item(processed_row, bill_id, project_id, report_db)
-
-                LOG.info(
-                    "Saving report rows %d to %d for %s",
-                    row_count,
-                    row_count + len(self.processed_report.unique_line_items),
-                    self._report_name,
-                )
-
-                # Create a temp table with all the line items, and merge the temp table to the line item table.
-                # This is faster than django's bulk_create.
-                temp_table = report_db.create_temp_table(self.line_item_table_name, drop_column="id")
-
-                # Have to put values into line_items because the parent class needs it to _save_to_db
-                self.processed_report.line_items = list(self.processed_report.unique_line_items.values())
-                self._save_to_db(temp_table, report_db)
-                report_db.merge_temp_table(
-                    self.line_item_table_name, temp_table, self.line_item_columns, self.line_item_conflict_columns
-                )
-
-                row_count += len(self.processed_report.line_items)
-                self.processed_report.remove_processed_rows()
+                    first_rows = [
+                        OrderedDict(zip(rows.columns.tolist(), rows.iloc[0].tolist())) for rows in report_groups
+                    ]
+                    bill_ids, project_ids = self._get_or_create_batch_dimensions(first_rows, report_db)
+
+                    for rows, bill_id, project_id in zip(report_groups, bill_ids, project_ids):
+                        for row in rows.values:
+                            processed_row = OrderedDict(zip(rows.columns.tolist(), row.tolist()))
+                            self._create_cost_entry_line_item(processed_row, bill_id, project_id, report_db)
+
+                    LOG.info(
+                        "Saving report rows %d to %d for %s",
+                        row_count,
+                        row_count + len(self.processed_report.unique_line_items),
+                        self._report_name,
+                    )
+
+                    self.processed_report.line_items = list(self.processed_report.unique_line_items.values())
+                    if self.processed_report.line_items:
+                        pipeline.submit(self.processed_report.line_items)
+
+                    row_count += len(self.processed_report.line_items)
+                    self.processed_report.remove_processed_rows()
 
             LOG.info("Completed report processing for file: %s and schema: %s", self._report_name, self._schema)
 
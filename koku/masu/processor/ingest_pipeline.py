@@ -0,0 +1,166 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Overlap report parsing with writing line items to the database."""
+import logging
+import queue
+import threading
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from masu.config import Config
+
+LOG = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class PipelineAborted(Exception):
+    """Raised on the writer thread when the parser stage failed."""
+
+
+class IngestPipeline:
+    """Write line item batches on a separate thread while the next batch is parsed.
+
+    Batches are handed to the writer through a queue of at most depth
+    batches, so a parser that outpaces the database blocks instead of
+    holding the whole file in memory. The writer thread opens its own
+    accessor, and so its own database connection. An error on the writer
+    is raised from the next submit, or when the pipeline is closed, which
+    aborts processing of the file.
+
+    With a depth of 0, batches are written on the calling thread with the
+    caller's accessor, as before pipelining.
+    """
+
+    def __init__(self, report_db_accessor, open_writer, depth=None):
+        """Initialize the pipeline.
+
+        Args:
+            report_db_accessor (ReportDBAccessorBase): The accessor of the parser stage
+            open_writer (function): Takes an accessor and returns a context manager
+                that yields a function writing one batch
+            depth (int): The maximum number of batches waiting for the writer
+
+        """
+        self._report_db = report_db_accessor
+        self._open_writer = open_writer
+        self._depth = depth if depth is not None else Config.REPORT_PROCESSING_PIPELINE_DEPTH
+        self._queue = queue.Queue(maxsize=max(self._depth, 1))
+        self._abort = threading.Event()
+        self._error = None
+        self._thread = None
+        self._stack = None
+        self._write = None
+        self.batches = 0
+        self.write_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def __enter__(self):
+        """Start the writer."""
+        if self._depth > 0:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        else:
+            self._stack = ExitStack()
+            self._write = self._stack.enter_context(self._open_writer(self._report_db))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Write the remaining batches and stop the writer."""
+        if self._thread is None:
+            return self._stack.__exit__(exc_type, exc_value, traceback)
+
+        try:
+            if exc_type is None:
+                self._put(_DONE)
+        finally:
+            if exc_type is not None or self._error is not None:
+                self._abort.set()
+            self._thread.join()
+        LOG.info(
+            "Wrote %d batches in %.2fs on the writer thread; the parser waited %.2fs.",
+            self.batches,
+            self.write_seconds,
+            self.wait_seconds,
+        )
+        if exc_type is None:
+            self._raise_writer_error()
+        return False
+
+    def submit(self, batch):
+        """Queue a batch for writing, blocking while the queue is full.
+
+        Args:
+            batch (object): The batch passed to the write function
+
+        """
+        if self._thread is None:
+            self._write(batch)
+            self.batches += 1
+            return
+        self._put(batch)
+
+    def _put(self, item):
+        """Queue an item, raising the writer's error instead of waiting on a dead writer."""
+        start = time.perf_counter()
+        while True:
+            self._raise_writer_error()
+            try:
+                self._queue.put(item, timeout=1)
+                break
+            except queue.Full:
+                continue
+        self.wait_seconds += time.perf_counter() - start
+
+    def _raise_writer_error(self):
+        """Raise the error that stopped the writer thread, if any."""
+        if self._error is not None:
+            raise self._error
+
+    def _next_batch(self):
+        """Return the next queued batch, raising PipelineAborted if the parser failed."""
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted()
+            try:
+                return self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _run(self):
+        """Write batches until the parser is done or either stage fails."""
+        try:
+            accessor_class = type(self._report_db)
+            with accessor_class(self._report_db.schema) as report_db, self._open_writer(report_db) as write:
+                while True:
+                    batch = self._next_batch()
+                    if batch is _DONE:
+                        break
+                    start = time.perf_counter()
+                    write(batch)
+                    self.write_seconds += time.perf_counter() - start
+                    self.batches += 1
+        except PipelineAborted:
+            LOG.info("Stopped writing line items because report parsing failed.")
+        except Exception as err:  # pylint: disable=broad-except
+            LOG.error("Writing line items failed: %s", str(err))
+            self._error = err
+        finally:
+            # The writer thread's connections are not reused by other threads
+            connections.close_all()
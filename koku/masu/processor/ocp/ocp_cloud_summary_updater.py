@@ -20,7 +20,6 @@ import logging
 from decimal import Decimal
 
 from dateutil import parser
-from django.db import connection
 from tenant_schemas.utils import schema_context
 
 from api.provider.models import Provider
@@ -31,6 +30,7 @@ from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.processor.ocp.ocp_cloud_updater_base import OCPCloudUpdaterBase
 from masu.processor.ocp.ocp_cost_model_cost_updater import OCPCostModelCostUpdater
+from masu.processor.view_refresher import ViewRefresher
 from masu.util.aws.common import get_bills_from_provider as aws_get_bills_from_provider
 from masu.util.azure.common import get_bills_from_provider as azure_get_bills_from_provider
 from masu.util.common import date_range_pair
@@ -38,6 +38,7 @@ from masu.util.ocp.common import get_cluster_id_from_provider
 from reporting.models import OCP_ON_AWS_MATERIALIZED_VIEWS
 from reporting.models import OCP_ON_AZURE_MATERIALIZED_VIEWS
 from reporting.models import OCP_ON_INFRASTRUCTURE_MATERIALIZED_VIEWS
+from reporting.models import OCP_UI_SUMMARY_TABLES
 
 LOG = logging.getLogger(__name__)
 
@@ -84,6 +85,12 @@ class OCPCloudReportSummaryUpdater(OCPCloudUpdaterBase):
                 )
 
         if infra_map:
+            # Infrastructure costs were copied to the OpenShift daily summary
+            ViewRefresher(self._schema).populate_ui_summary_tables(
+                OCPReportDBAccessor,
+                [table._meta.db_table for table in OCP_UI_SUMMARY_TABLES],
+                [(start_date, end_date)],
+            )
             self.refresh_openshift_on_infrastructure_views(OCP_ON_INFRASTRUCTURE_MATERIALIZED_VIEWS)
 
     def update_aws_summary_tables(self, openshift_provider_uuid, aws_provider_uuid, start_date, end_date):
@@ -169,10 +176,5 @@ class OCPCloudReportSummaryUpdater(OCPCloudUpdaterBase):
         self.refresh_openshift_on_infrastructure_views(OCP_ON_AZURE_MATERIALIZED_VIEWS)
 
     def refresh_openshift_on_infrastructure_views(self, view_set):
-        """Refresh MATERIALIZED VIEWs."""
-        with schema_context(self._schema):
-            for view in view_set:
-                table_name = view._meta.db_table
-                with connection.cursor() as cursor:
-                    cursor.execute(f"REFRESH MATERIALIZED VIEW {table_name}")
-                    LOG.info(f"Refreshed {table_name}.")
+        """Refresh MATERIALIZED VIEWs, independent views concurrently."""
+        ViewRefresher(self._schema).refresh_materialized_views([view._meta.db_table for view in view_set])
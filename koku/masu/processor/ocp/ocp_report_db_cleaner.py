@@ -20,6 +20,7 @@ from datetime import datetime
 
 from tenant_schemas.utils import schema_context
 
+from masu.database import OCP_REPORT_TABLE_MAP
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
 
 LOG = logging.getLogger(__name__)
@@ -65,6 +66,10 @@ class OCPReportDBCleaner:
                 usage_period_objs = accessor.get_usage_period_on_or_before_date(expired_date, provider_uuid)
             else:
                 usage_period_objs = accessor.get_usage_period_on_or_before_date(expired_date)
+                if not simulate:
+                    # Line items never start before their billing period, so whole months
+                    # on or before the expired date only hold expired line items
+                    accessor.drop_table_partitions(OCP_REPORT_TABLE_MAP["line_item"], expired_date)
             with schema_context(self._schema):
                 for usage_period in usage_period_objs.all():
                     report_period_id = usage_period.id
@@ -109,6 +114,12 @@ class OCPReportDBCleaner:
 
             if expired_date is not None:
                 usage_period_objs = accessor.get_usage_period_on_or_before_date(expired_date)
+                if not simulate:
+                    for table_name in (
+                        OCP_REPORT_TABLE_MAP["line_item"],
+                        OCP_REPORT_TABLE_MAP["line_item_daily_summary"],
+                    ):
+                        accessor.drop_table_partitions(table_name, expired_date)
             else:
                 usage_period_objs = accessor.get_usage_period_query_by_provider(provider_uuid)
             with schema_context(self._schema):
@@ -21,8 +21,10 @@
 import csv
 import json
 import logging
+from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum
+from functools import partial
 from os import path
 from os import remove
 
@@ -195,6 +197,11 @@ class OCPReportProcessorBase(ReportProcessorBase):
             self.existing_report_map = report_db.get_reports()
 
         self.line_item_columns = None
+        # Stage all line items of the file and merge them once, instead of once per batch
+        self._single_merge = Config.OCP_SINGLE_MERGE_PROCESSING
+        # Whether a line item of the file belongs to a report that was already in the database
+        self._has_existing_reports = False
+        self._created_report_keys = set()
 
     def _create_report(self, row, report_period_id, report_db_accessor):
         """Create a report object.
@@ -216,6 +223,8 @@ class OCPReportProcessorBase(ReportProcessorBase):
             return self.processed_report.reports[key]
 
         if key in self.existing_report_map:
+            if key not in self._created_report_keys:
+                self._has_existing_reports = True
             return self.existing_report_map[key]
 
         data = {"report_period_id": report_period_id, "interval_start": start, "interval_end": end}
@@ -224,6 +233,7 @@ class OCPReportProcessorBase(ReportProcessorBase):
         )
 
         self.processed_report.reports[key] = report_id
+        self._created_report_keys.add(key)
 
         return report_id
 
@@ -241,6 +251,7 @@ class OCPReportProcessorBase(ReportProcessorBase):
         table_name = OCPUsageReportPeriod
         start = datetime.strptime(row.get("report_period_start"), Config.OCP_DATETIME_STR_FORMAT)
         end = datetime.strptime(row.get("report_period_end"), Config.OCP_DATETIME_STR_FORMAT)
+        self._create_line_item_partitions(self.table_name._meta.db_table, start, end, report_db_accessor)
 
         key = (cluster_id, start, self._provider_uuid)
         if key in self.processed_report.report_periods:
@@ -289,6 +300,33 @@ class OCPReportProcessorBase(ReportProcessorBase):
 
         return json.dumps(label_dict)
 
+    @contextmanager
+    def _open_file_staging_writer(self, table, report_db_accessor):
+        """Yield a function that appends line item dicts to a temp table merged once per file.
+
+        Batches are only appended while the file is read. The staged rows are
+        merged into the line item table once the whole file has been written.
+        If every report of the file is new, no line item can conflict, and the
+        rows are merged with a plain insert.
+        """
+        staging_table = report_db_accessor.create_temp_table(table, drop_column="id")
+
+        def write(line_items):
+            self._save_to_db(staging_table, report_db_accessor, line_items)
+
+        yield write
+
+        if self.line_item_columns is None:
+            return
+        LOG.info("Merging staged line items of %s into %s", self._report_name, table)
+        report_db_accessor.merge_staging_table(
+            table,
+            staging_table,
+            self.line_item_columns,
+            self.line_item_conflict_columns,
+            insert_only=not self._has_existing_reports,
+        )
+
     def _update_mappings(self):
         """Update cache of database objects for reference."""
         self.existing_report_periods_map.update(self.processed_report.report_periods)
@@ -307,49 +345,43 @@ class OCPReportProcessorBase(ReportProcessorBase):
         opener, mode = self._get_file_opener(self._compression)
         with opener(self._report_path, mode) as f:
             with OCPReportDBAccessor(self._schema) as report_db:
-                temp_table = report_db.create_temp_table(self.table_name._meta.db_table, drop_column="id")
                 LOG.info("File %s opened for processing", str(f))
                 reader = csv.DictReader(f)
-                for row in reader:
-                    report_period_id = self._create_report_period(row, self._cluster_id, report_db)
-                    report_id = self._create_report(row, report_period_id, report_db)
-
-                    self._create_usage_report_line_item(row, report_period_id, report_id, report_db)
-                    if len(self.processed_report.line_items) >= self._batch_size:
-                        self._save_to_db(temp_table, report_db)
-                        report_db.merge_temp_table(
-                            self.table_name._meta.db_table,
-                            temp_table,
-                            self.line_item_columns,
-                            self.line_item_conflict_columns,
-                        )
+                if self._single_merge:
+                    open_writer = partial(self._open_file_staging_writer, self.table_name._meta.db_table)
+                else:
+                    open_writer = partial(self._open_staging_writer, self.table_name._meta.db_table)
+                with self._line_item_pipeline(report_db, open_writer) as pipeline:
+                    for row in reader:
+                        self._usage_days.add(row["interval_start"][:10])
+                        report_period_id = self._create_report_period(row, self._cluster_id, report_db)
+                        report_id = self._create_report(row, report_period_id, report_db)
+
+                        self._create_usage_report_line_item(row, report_period_id, report_id, report_db)
+                        if len(self.processed_report.line_items) >= self._batch_size:
+                            pipeline.submit(self.processed_report.line_items)
+                            LOG.info(
+                                "Saving report rows %d to %d for %s",
+                                row_count,
+                                row_count + len(self.processed_report.line_items),
+                                self._report_name,
+                            )
+                            row_count += len(self.processed_report.line_items)
+
+                            self._update_mappings()
+
+                    if self.processed_report.line_items:
+                        pipeline.submit(self.processed_report.line_items)
                         LOG.info(
                             "Saving report rows %d to %d for %s",
                             row_count,
                             row_count + len(self.processed_report.line_items),
                             self._report_name,
                         )
-                        row_count += len(self.processed_report.line_items)
 
-                        self._update_mappings()
-
-                if self.processed_report.line_items:
-                    self._save_to_db(temp_table, report_db)
-                    report_db.merge_temp_table(
-                        self.table_name._meta.db_table,
-                        temp_table,
-                        self.line_item_columns,
-                        self.line_item_conflict_columns,
-                    )
-                    LOG.info(
-                        "Saving report rows %d to %d for %s",
-                        row_count,
-                        row_count + len(self.processed_report.line_items),
-                        self._report_name,
-                    )
-
-                    row_count += len(self.processed_report.line_items)
+                        row_count += len(self.processed_report.line_items)
 
+        self._save_usage_days()
         LOG.info("Completed report processing for file: %s and schema: %s", self._report_path, self._schema)
 
         if not settings.DEVELOPMENT:
@@ -404,6 +436,7 @@ class OCPCpuMemReportProcessor(OCPReportProcessorBase):
         data["report_period_id"] = report_period_id
         data["report_id"] = report_id
         data["pod_labels"] = self._process_openshift_labels(pod_label_str)
+        data["usage_start"] = datetime.strptime(row.get("interval_start"), Config.OCP_DATETIME_STR_FORMAT)
         # Deduplicate potential repeated rows in data
         key = tuple(data.get(column) for column in self.line_item_conflict_columns)
         if key in self.processed_report.line_item_keys:
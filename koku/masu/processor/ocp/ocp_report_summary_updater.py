@@ -23,7 +23,9 @@ from tenant_schemas.utils import schema_context
 
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
 from masu.external.date_accessor import DateAccessor
+from masu.processor.summary_executor import SummaryExecutor
 from masu.util.common import date_range_pair
+from masu.util.common import month_range_pair
 from masu.util.ocp.common import get_cluster_id_from_provider
 
 LOG = logging.getLogger(__name__)
@@ -57,7 +59,8 @@ class OCPReportSummaryUpdater:
 
         """
         start_date, end_date = self._get_sql_inputs(start_date, end_date)
-        for start, end in date_range_pair(start_date, end_date):
+
+        def populate_daily_window(accessor, start, end):
             LOG.info(
                 "Updating OpenShift report daily tables for \n\tSchema: %s "
                 "\n\tProvider: %s \n\tCluster: %s \n\tDates: %s - %s",
@@ -67,10 +70,15 @@ class OCPReportSummaryUpdater:
                 start,
                 end,
             )
-            with OCPReportDBAccessor(self._schema) as accessor:
-                accessor.populate_node_label_line_item_daily_table(start, end, self._cluster_id)
-                accessor.populate_line_item_daily_table(start, end, self._cluster_id)
-                accessor.populate_storage_line_item_daily_table(start, end, self._cluster_id)
+            accessor.populate_node_label_line_item_daily_table(start, end, self._cluster_id)
+            accessor.populate_line_item_daily_table(start, end, self._cluster_id)
+            accessor.populate_pod_label_index(start, end, self._cluster_id)
+            accessor.populate_storage_line_item_daily_table(start, end, self._cluster_id)
+            accessor.populate_volume_label_index(start, end, self._cluster_id)
+
+        SummaryExecutor(self._schema).run(
+            OCPReportDBAccessor, date_range_pair(start_date, end_date), populate_daily_window
+        )
 
         return start_date, end_date
 
@@ -87,21 +95,28 @@ class OCPReportSummaryUpdater:
         """
         start_date, end_date = self._get_sql_inputs(start_date, end_date)
 
+        def populate_summary_window(accessor, start, end):
+            LOG.info(
+                "Updating OpenShift report summary tables for \n\tSchema: %s "
+                "\n\tProvider: %s \n\tCluster: %s \n\tDates: %s - %s",
+                self._schema,
+                self._provider.uuid,
+                self._cluster_id,
+                start,
+                end,
+            )
+            accessor.populate_line_item_daily_summary_table(start, end, self._cluster_id)
+            accessor.populate_storage_line_item_daily_summary_table(start, end, self._cluster_id)
+
+        # The summary tables are swapped in a month at a time
+        SummaryExecutor(self._schema).run(
+            OCPReportDBAccessor, month_range_pair(start_date, end_date), populate_summary_window
+        )
+
         report_periods = None
         with OCPReportDBAccessor(self._schema) as accessor:
             report_periods = accessor.report_periods_for_provider_uuid(self._provider.uuid, start_date)
-            for start, end in date_range_pair(start_date, end_date):
-                LOG.info(
-                    "Updating OpenShift report summary tables for \n\tSchema: %s "
-                    "\n\tProvider: %s \n\tCluster: %s \n\tDates: %s - %s",
-                    self._schema,
-                    self._provider.uuid,
-                    self._cluster_id,
-                    start,
-                    end,
-                )
-                accessor.populate_line_item_daily_summary_table(start, end, self._cluster_id)
-                accessor.populate_storage_line_item_daily_summary_table(start, end, self._cluster_id)
+            # The label summaries are built from all of the summarized windows
             accessor.populate_pod_label_summary_table()
             accessor.populate_volume_label_summary_table()
 
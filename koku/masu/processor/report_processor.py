@@ -36,7 +36,17 @@ class ReportProcessorError(Exception):
 class ReportProcessor:
     """Interface for masu to use to processor CUR."""
 
-    def __init__(self, schema_name, report_path, compression, provider, provider_uuid, manifest_id):
+    def __init__(
+        self,
+        schema_name,
+        report_path,
+        compression,
+        provider,
+        provider_uuid,
+        manifest_id,
+        skip_line_item_delete=False,
+        stream_source=None,
+    ):
         """Set the processor based on the data provider."""
         self.schema_name = schema_name
         self.report_path = report_path
@@ -44,6 +54,8 @@ class ReportProcessor:
         self.provider_type = provider
         self.provider_uuid = provider_uuid
         self.manifest_id = manifest_id
+        self.skip_line_item_delete = skip_line_item_delete
+        self.stream_source = stream_source
         try:
             self._processor = self._set_processor()
         except Exception as err:
@@ -72,6 +84,8 @@ class ReportProcessor:
                 compression=self.compression,
                 provider_uuid=self.provider_uuid,
                 manifest_id=self.manifest_id,
+                skip_line_item_delete=self.skip_line_item_delete,
+                stream_source=self.stream_source,
             )
 
         if self.provider_type in (Provider.PROVIDER_AZURE, Provider.PROVIDER_AZURE_LOCAL):
@@ -81,6 +95,7 @@ class ReportProcessor:
                 compression=self.compression,
                 provider_uuid=self.provider_uuid,
                 manifest_id=self.manifest_id,
+                skip_line_item_delete=self.skip_line_item_delete,
             )
 
         if self.provider_type in (Provider.PROVIDER_OCP,):
@@ -115,6 +130,22 @@ class ReportProcessor:
         except Exception as err:
             raise ReportProcessorError(str(err))
 
+    def delete_stale_line_items(self):
+        """
+        Delete stale line items for the manifest of the current report.
+
+        Args:
+            None
+
+        Returns:
+            (Boolean) Whether stale line items were deleted.
+
+        """
+        try:
+            return self._processor.delete_stale_line_items()
+        except Exception as err:
+            raise ReportProcessorError(str(err))
+
     def remove_processed_files(self, path):
         """
         Remove temporary cost usage report files..
@@ -15,22 +15,30 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 """Report Processor base class."""
+import calendar
 import csv
+import datetime
 import gzip
 import io
 import logging
+from contextlib import ExitStack
+from contextlib import contextmanager
 
 import ciso8601
 from dateutil.relativedelta import relativedelta
 from tenant_schemas.utils import schema_context
 
 from api.models import Provider
+from masu.config import Config
+from masu.database.dirty_usage_day_accessor import DirtyUsageDayDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
 from masu.exceptions import MasuProcessingError
 from masu.external import GZIP_COMPRESSED
 from masu.external.date_accessor import DateAccessor
 from masu.processor import ALLOWED_COMPRESSIONS
+from masu.processor.dimension_cache import DimensionCache
+from masu.processor.ingest_pipeline import IngestPipeline
 from reporting_common import REPORT_COLUMN_MAP
 
 LOG = logging.getLogger(__name__)
@@ -44,7 +52,17 @@ class ReportProcessorBase:
     Base object class for downloading cost reports from a cloud provider.
     """
 
-    def __init__(self, schema_name, report_path, compression, provider_uuid, manifest_id, processed_report):
+    def __init__(
+        self,
+        schema_name,
+        report_path,
+        compression,
+        provider_uuid,
+        manifest_id,
+        processed_report,
+        skip_line_item_delete=False,
+        stream_source=None,
+    ):
         """Initialize the report processor base class.
 
         Args:
@@ -52,6 +70,10 @@ class ReportProcessorBase:
             report_path (str): Where the report file lives in the file system
             compression (CONST): How the report file is compressed.
                 Accepted values: UNCOMPRESSED, GZIP_COMPRESSED
+            skip_line_item_delete (bool): The stale line items of the manifest
+                were already deleted, so processing must not delete them
+            stream_source (S3StreamSource): Streams the report instead of
+                reading it from report_path
 
         """
         if compression.upper() not in ALLOWED_COMPRESSIONS:
@@ -63,8 +85,17 @@ class ReportProcessorBase:
         self._compression = compression.upper()
         self._provider_uuid = provider_uuid
         self._manifest_id = manifest_id
+        self._skip_line_item_delete = skip_line_item_delete
+        self._stream_source = stream_source
+        # Processors can switch their line item loads between CSV and binary COPY
+        self._binary_copy = Config.BINARY_COPY_PROCESSING
+        self._pipeline_depth = Config.REPORT_PROCESSING_PIPELINE_DEPTH
         self.processed_report = processed_report
         self.date_accessor = DateAccessor()
+        # Billing periods whose line item partitions are known to exist
+        self._partitioned_periods = set()
+        # The "YYYY-MM-DD" usage days written or deleted, recorded for summarization
+        self._usage_days = set()
 
     @property
     def data_cutoff_date(self):
@@ -107,24 +138,230 @@ class ReportProcessorBase:
             return gzip.open, "rt"
         return open, "r"  # assume uncompressed by default
 
-    def _write_processed_rows_to_csv(self):
+    @contextmanager
+    def _open_report(self):
+        """Open the report as text, from its stream source if it has one.
+
+        Yields:
+            (file): The report file
+
+        """
+        if self._stream_source is None:
+            opener, mode = self._get_file_opener(self._compression)
+            with opener(self._report_path, mode) as report_file:
+                yield report_file
+            return
+
+        with ExitStack() as stack:
+            stream = stack.enter_context(self._stream_source.open())
+            if self._compression == GZIP_COMPRESSED:
+                stream = stack.enter_context(gzip.GzipFile(fileobj=stream, mode="rb"))
+            yield stack.enter_context(io.TextIOWrapper(stream, encoding="utf-8"))
+
+    def _write_processed_rows_to_csv(self, line_items=None):
         """Output CSV content to file stream object."""
-        values = [tuple(item.values()) for item in self.processed_report.line_items]
+        if line_items is None:
+            line_items = self.processed_report.line_items
+        values = [tuple(item.values()) for item in line_items]
 
+        return self._write_rows_to_csv(values)
+
+    @staticmethod
+    def _write_rows_to_csv(rows):
+        """Output a sequence of row tuples to a CSV file stream object."""
         file_obj = io.StringIO()
         writer = csv.writer(file_obj, delimiter=",", quoting=csv.QUOTE_MINIMAL, quotechar='"')
-        writer.writerows(values)
+        writer.writerows(rows)
         file_obj.seek(0)
 
         return file_obj
 
-    def _save_to_db(self, temp_table, report_db_accessor):
-        """Save current batch of records to the database."""
-        columns = tuple(self.processed_report.line_items[0].keys())
-        csv_file = self._write_processed_rows_to_csv()
+    def _copy_rows(self, rows, table, columns, report_db_accessor):
+        """Copy row tuples into a table with the processor's COPY format.
+
+        Args:
+            rows (iterable): Sequences of values in the order of columns
+            table (str): The table to copy to
+            columns (list): The columns of the row values
+            report_db_accessor (ReportDBAccessorBase): The accessor to copy with
+
+        """
+        if self._binary_copy:
+            report_db_accessor.bulk_insert_binary_rows(rows, table, columns)
+        else:
+            report_db_accessor.bulk_insert_rows(self._write_rows_to_csv(rows), table, columns)
+
+    def _save_to_db(self, temp_table, report_db_accessor, line_items=None):
+        """Save a batch of records to the database, by default the current batch."""
+        if line_items is None:
+            line_items = self.processed_report.line_items
+        columns = tuple(line_items[0].keys())
+        if self._binary_copy:
+            rows = (item.values() for item in line_items)
+            report_db_accessor.bulk_insert_binary_rows(rows, temp_table, columns)
+            return
+        csv_file = self._write_processed_rows_to_csv(line_items)
 
         report_db_accessor.bulk_insert_rows(csv_file, temp_table, columns)
 
+    def _line_item_pipeline(self, report_db_accessor, open_writer):
+        """Return a pipeline writing line item batches while the next batch is parsed.
+
+        Args:
+            report_db_accessor (ReportDBAccessorBase): The accessor of the parser
+            open_writer (function): Takes an accessor and returns a context manager
+                that yields a function writing one batch
+
+        Returns:
+            (IngestPipeline): The pipeline, to be used as a context manager
+
+        """
+        return IngestPipeline(report_db_accessor, open_writer, depth=self._pipeline_depth)
+
+    @contextmanager
+    def _open_line_item_writer(self, table, report_db_accessor):
+        """Yield a function that saves a list of line item dicts to a table."""
+
+        def write(line_items):
+            self._save_to_db(table, report_db_accessor, line_items)
+
+        yield write
+
+    @contextmanager
+    def _open_staging_writer(self, table, report_db_accessor):
+        """Yield a function that saves line item dicts through a temp table merged into table.
+
+        The temp table is created with the accessor that writes to it, as a
+        temp table is only visible to the connection that created it.
+        """
+        temp_table = report_db_accessor.create_temp_table(table, drop_column="id")
+
+        def write(line_items):
+            self._save_to_db(temp_table, report_db_accessor, line_items)
+            report_db_accessor.merge_temp_table(
+                table, temp_table, self.line_item_columns, self.line_item_conflict_columns
+            )
+
+        yield write
+
+    @contextmanager
+    def _open_row_writer(self, table, columns, report_db_accessor):
+        """Yield a function that copies a list of row tuples to a table."""
+
+        def write(rows):
+            self._copy_rows(rows, table, columns, report_db_accessor)
+
+        yield write
+
+    def _create_line_item_partitions(self, table_name, start_date, end_date, report_db_accessor):
+        """Create the monthly line item partitions of a billing period the first time it is seen.
+
+        Args:
+            table_name (str): The line item table
+            start_date (str or datetime.datetime): The start of the billing period
+            end_date (str or datetime.datetime): The end of the billing period
+            report_db_accessor (ReportDBAccessorBase): The accessor to create the partitions with
+
+        """
+        period = (table_name, start_date, end_date)
+        if not start_date or period in self._partitioned_periods:
+            return
+        dates = [
+            ciso8601.parse_datetime(value) if value and isinstance(value, str) else value
+            for value in (start_date, end_date)
+        ]
+        report_db_accessor.create_table_partitions(table_name, dates[0], dates[1] or dates[0])
+        self._partitioned_periods.add(period)
+
+    def _record_deleted_days(self, start_date, bill_date):
+        """Record the days from start_date to the end of the billing month, up to today, as changed.
+
+        Args:
+            start_date (datetime.date): The first day line items were deleted for
+            bill_date (datetime.date): The start of the billing period
+
+        """
+        month_end = bill_date.replace(day=calendar.monthrange(bill_date.year, bill_date.month)[1])
+        end_date = min(month_end, self.date_accessor.today_with_timezone("UTC").date())
+        day = start_date
+        while day <= end_date:
+            self._usage_days.add(day.strftime("%Y-%m-%d"))
+            day += datetime.timedelta(days=1)
+
+    def _save_usage_days(self):
+        """Record the usage days written or deleted by processing in the ledger read by summarization."""
+        if not self._usage_days:
+            return
+        days = [ciso8601.parse_datetime(day).date() for day in self._usage_days]
+        with DirtyUsageDayDBAccessor() as accessor:
+            accessor.record_days(self._provider_uuid, days)
+        self._usage_days = set()
+
+    @staticmethod
+    def _get_existing_id(existing_map, key):
+        """Return the database id of a dimension key, or None if it is not in the database.
+
+        Args:
+            existing_map (dict): Map of keys to ids already in the database,
+                or a DimensionCache that looks up unknown keys
+            key (tuple): The dimension key
+
+        Returns:
+            (int): The database id of the dimension
+
+        """
+        if key in existing_map:
+            return existing_map[key]
+        if isinstance(existing_map, DimensionCache):
+            existing_map.prefetch([key])
+        return existing_map.get(key)
+
+    # pylint: disable=too-many-arguments
+    def _resolve_dimension_batch(
+        self, table, keys, rows, get_data, processed_map, existing_map, report_db_accessor, conflict_columns=None
+    ):
+        """Resolve the dimension ids of a whole batch of rows.
+
+        Keys not already known are collected once each and written with a
+        single INSERT statement, instead of one INSERT and one SELECT per key.
+
+        Args:
+            table (DjangoModel): The dimension table
+            keys (list): The dimension key of each row in the batch
+            rows (list): The rows of the batch
+            get_data (function): Builds the dimension data from a row, or
+                returns None if the row has no data for this dimension
+            processed_map (dict): Map of keys to ids resolved for this report
+            existing_map (dict): Map of keys to ids already in the database,
+                or a DimensionCache that looks up unknown keys
+            report_db_accessor (ReportDBAccessorBase): A database accessor
+            conflict_columns (list): A list of columns to check conflict on
+
+        Returns:
+            (list): The dimension id of each row
+
+        """
+        unseen = [key for key in dict.fromkeys(keys) if key not in processed_map and key not in existing_map]
+        if unseen and isinstance(existing_map, DimensionCache):
+            existing_map.prefetch(unseen)
+        unseen = {key for key in unseen if existing_map.get(key) is None}
+
+        pending = {}
+        for key, row in zip(keys, rows):
+            if key not in unseen or key in pending:
+                continue
+            data = get_data(row)
+            if data is not None:
+                pending[key] = data
+
+        if pending:
+            ids = report_db_accessor.insert_on_conflict_do_nothing_batch(
+                table, list(pending.values()), conflict_columns=conflict_columns
+            )
+            processed_map.update(zip(pending.keys(), ids))
+
+        return [processed_map[key] if key in processed_map else existing_map.get(key) for key in keys]
+
     def _should_process_row(self, row, date_column, is_full_month, is_finalized=None):
         """Determine if we want to process this row.
 
@@ -202,9 +439,19 @@ class ReportProcessorBase:
 
         return True
 
+    def delete_stale_line_items(self):
+        """Delete stale data for the manifest of the report, if necessary.
+
+        Returns:
+            (bool): Whether stale data was deleted
+
+        """
+        self._save_usage_days()
+        return False
+
     def _delete_line_items(self, db_accessor, is_finalized=None):
         """Delete stale data for the report being processed, if necessary."""
-        if not self._manifest_id:
+        if not self._manifest_id or self._skip_line_item_delete:
             return False
 
         if is_finalized is None:
@@ -225,6 +472,15 @@ class ReportProcessorBase:
             bills = accessor.get_cost_entry_bills_query_by_provider(provider_uuid)
             bills = bills.filter(billing_period_start=bill_date).all()
             with schema_context(self._schema):
+                if (is_finalized or is_full_month) and self._truncate_line_items(accessor, bills, bill_date):
+                    self._record_deleted_days(bill_date, bill_date)
+                    LOG.info(
+                        f"Truncated line items for:\n"
+                        f" schema_name: {self._schema}\n"
+                        f" provider_uuid: {provider_uuid}\n"
+                        f" bill date: {str(bill_date)}"
+                    )
+                    return True
                 for bill in bills:
                     line_item_query = accessor.get_lineitem_query_for_billid(bill.id)
                     delete_date = bill_date
@@ -243,9 +499,27 @@ class ReportProcessorBase:
                     )
                     LOG.info(log_statement)
                     line_item_query.delete()
+                    self._record_deleted_days(delete_date, bill_date)
 
         return True
 
+    def _truncate_line_items(self, report_db_accessor, bills, bill_date):
+        """Remove the line items of a month by truncating their partition.
+
+        Processors with partitioned line item tables override this when the
+        bills can be the only bills with line items in the month.
+
+        Args:
+            report_db_accessor (ReportDBAccessorBase): The accessor of the line items
+            bills (QuerySet): The bills of the provider for the month
+            bill_date (datetime.date): The start of the billing period
+
+        Returns:
+            (bool): Whether the line items were removed
+
+        """
+        return False
+
     def get_date_column_filter(self):
         """Return a filter using the provider-appropriate column."""
         with ProviderDBAccessor(self._provider_uuid) as provider_accessor:
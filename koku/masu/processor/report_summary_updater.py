@@ -20,6 +20,7 @@ import datetime
 import logging
 
 from api.models import Provider
+from masu.database.dirty_usage_day_accessor import DirtyUsageDayDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
 from masu.external.date_accessor import DateAccessor
@@ -27,6 +28,7 @@ from masu.processor.aws.aws_report_summary_updater import AWSReportSummaryUpdate
 from masu.processor.azure.azure_report_summary_updater import AzureReportSummaryUpdater
 from masu.processor.ocp.ocp_cloud_summary_updater import OCPCloudReportSummaryUpdater
 from masu.processor.ocp.ocp_report_summary_updater import OCPReportSummaryUpdater
+from masu.util.common import contiguous_date_ranges
 
 LOG = logging.getLogger(__name__)
 
@@ -57,6 +59,7 @@ class ReportSummaryUpdater:
             with ReportManifestDBAccessor() as manifest_accessor:
                 self._manifest = manifest_accessor.get_manifest_by_id(manifest_id)
         self._date_accessor = DateAccessor()
+        self._dirty_days = []
         with ProviderDBAccessor(self._provider_uuid) as provider_accessor:
             self._provider = provider_accessor.get_provider()
 
@@ -64,7 +67,7 @@ class ReportSummaryUpdater:
             raise ReportSummaryUpdaterError("Provider not found.")
 
         try:
-            self._updater, self._ocp_cloud_updater = self._set_updater()
+            self._updater, self._ocp_cloud_updater = self._set_updater(self._manifest)
         except Exception as err:
             raise ReportSummaryUpdaterError(err)
 
@@ -72,14 +75,14 @@ class ReportSummaryUpdater:
             raise ReportSummaryUpdaterError("Invalid provider type specified.")
         LOG.info("Starting report data summarization for provider uuid: %s.", self._provider.uuid)
 
-    def _set_updater(self):
+    def _set_updater(self, manifest=None):
         """
         Create the report summary updater object.
 
         Object is specific to the report provider.
 
         Args:
-            None
+            manifest (CostUsageReportManifest): The manifest the updaters widen dates for
 
         Returns:
             (Object) : Provider-specific report summary updater
@@ -87,18 +90,18 @@ class ReportSummaryUpdater:
         """
         if self._provider.type in (Provider.PROVIDER_AWS, Provider.PROVIDER_AWS_LOCAL):
             return (
-                AWSReportSummaryUpdater(self._schema, self._provider, self._manifest),
-                OCPCloudReportSummaryUpdater(self._schema, self._provider, self._manifest),
+                AWSReportSummaryUpdater(self._schema, self._provider, manifest),
+                OCPCloudReportSummaryUpdater(self._schema, self._provider, manifest),
             )
         if self._provider.type in (Provider.PROVIDER_AZURE, Provider.PROVIDER_AZURE_LOCAL):
             return (
-                AzureReportSummaryUpdater(self._schema, self._provider, self._manifest),
-                OCPCloudReportSummaryUpdater(self._schema, self._provider, self._manifest),
+                AzureReportSummaryUpdater(self._schema, self._provider, manifest),
+                OCPCloudReportSummaryUpdater(self._schema, self._provider, manifest),
             )
         if self._provider.type in (Provider.PROVIDER_OCP,):
             return (
-                OCPReportSummaryUpdater(self._schema, self._provider, self._manifest),
-                OCPCloudReportSummaryUpdater(self._schema, self._provider, self._manifest),
+                OCPReportSummaryUpdater(self._schema, self._provider, manifest),
+                OCPCloudReportSummaryUpdater(self._schema, self._provider, manifest),
             )
 
         return (None, None)
@@ -127,6 +130,34 @@ class ReportSummaryUpdater:
             )
         return True
 
+    def claim_dirty_date_ranges(self):
+        """
+        Take the days report processing recorded as changed for the provider.
+
+        The recorded days already cover a new or finalized bill, so once days
+        are claimed the updaters summarize the given dates as they are instead
+        of widening them to the full month.
+
+        Returns:
+            (list): The (start, end) date strings of each run of consecutive days
+
+        """
+        with DirtyUsageDayDBAccessor() as accessor:
+            self._dirty_days = accessor.claim_days(self._provider_uuid)
+        if not self._dirty_days:
+            return []
+        self._updater, self._ocp_cloud_updater = self._set_updater()
+        date_ranges = [self._format_dates(start, end) for start, end in contiguous_date_ranges(self._dirty_days)]
+        LOG.info("Summarizing the changed days of provider %s: %s", self._provider_uuid, date_ranges)
+        return date_ranges
+
+    def restore_dirty_days(self):
+        """Record the claimed days as changed again, when summarizing them failed."""
+        if self._dirty_days:
+            with DirtyUsageDayDBAccessor() as accessor:
+                accessor.record_days(self._provider_uuid, self._dirty_days)
+            self._dirty_days = []
+
     def update_daily_tables(self, start_date, end_date):
         """
         Update report daily rollup tables.
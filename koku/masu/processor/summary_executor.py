@@ -0,0 +1,144 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Run the date windows of a summary step concurrently."""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.db import connections
+
+from masu.config import Config
+
+LOG = logging.getLogger(__name__)
+
+# The advisory lock class of the database wide summary window slots
+SLOT_LOCK_NAME = "masu_summary_window_slot"
+
+
+def summary_workers(schema):
+    """Return the number of summary windows a schema may run at once.
+
+    Args:
+        schema (str): The customer schema
+
+    Returns:
+        (int): The number of windows, at least 1
+
+    """
+    workers = Config.SUMMARY_WORKERS
+    for item in Config.SUMMARY_TENANT_WORKERS.split(","):
+        name, _, value = item.strip().partition(":")
+        if name == schema and value:
+            workers = int(value)
+    return max(workers, 1)
+
+
+class SummaryExecutor:
+    """Run a summary step for a list of date windows, several windows at a time.
+
+    Each window runs on a worker thread with its own accessor, and so its own
+    database connection, which commits independently of the others. Windows
+    must not depend on each other. A step ends when all of its windows are
+    done, so steps run one after the other as they did serially.
+
+    The number of windows a schema runs at once is set by SUMMARY_WORKERS and
+    SUMMARY_TENANT_WORKERS. Across every worker using the database, at most
+    SUMMARY_DATABASE_WORKERS windows run at once: a window holds one of that
+    many advisory locks while it runs.
+
+    With a single worker, windows run in order on the calling thread.
+    """
+
+    def __init__(self, schema, workers=None, database_workers=None):
+        """Initialize the executor.
+
+        Args:
+            schema (str): The customer schema
+            workers (int): The number of windows run at once
+            database_workers (int): The number of windows run at once on the database, 0 for no limit
+
+        """
+        self._schema = schema
+        self._workers = workers if workers is not None else summary_workers(schema)
+        self._database_workers = database_workers if database_workers is not None else Config.SUMMARY_DATABASE_WORKERS
+
+    def run(self, accessor_class, windows, step):
+        """Run a step for each window and wait for all of them.
+
+        Args:
+            accessor_class (type): The report DB accessor class opened for the windows
+            windows (iterable): The (start, end) date pairs
+            step (function): Takes an accessor, a start date and an end date
+
+        Returns:
+            (None)
+
+        Raises:
+            (Exception): The error of the first failed window, once all windows are done
+
+        """
+        windows = list(windows)
+        if self._workers == 1 or len(windows) < 2:
+            with accessor_class(self._schema) as accessor:
+                for start, end in windows:
+                    step(accessor, start, end)
+            return
+
+        LOG.info("Running %d summary windows, %d at a time, for schema %s.", len(windows), self._workers, self._schema)
+        with ThreadPoolExecutor(max_workers=min(self._workers, len(windows))) as pool:
+            futures = [pool.submit(self._run_window, accessor_class, step, start, end) for start, end in windows]
+        for future in futures:
+            future.result()
+
+    def _run_window(self, accessor_class, step, start, end):
+        """Run a step for one window on a worker thread."""
+        try:
+            with accessor_class(self._schema) as accessor:
+                slot = self._acquire_slot()
+                try:
+                    started = time.perf_counter()
+                    step(accessor, start, end)
+                    LOG.info("Summary window %s - %s finished in %.2fs.", start, end, time.perf_counter() - started)
+                finally:
+                    self._release_slot(slot)
+        finally:
+            # The worker thread's connections are not reused by other threads
+            connections.close_all()
+
+    def _acquire_slot(self):
+        """Wait for a free database slot and return it, None when slots are not limited."""
+        if self._database_workers < 1:
+            return None
+        waited = False
+        with connection.cursor() as cursor:
+            while True:
+                for slot in range(self._database_workers):
+                    cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s), %s)", [SLOT_LOCK_NAME, slot])
+                    if cursor.fetchone()[0]:
+                        return slot
+                if not waited:
+                    LOG.info("Waiting for one of %d summary window slots.", self._database_workers)
+                    waited = True
+                time.sleep(1)
+
+    def _release_slot(self, slot):
+        """Release a database slot."""
+        if slot is None:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(hashtext(%s), %s)", [SLOT_LOCK_NAME, slot])
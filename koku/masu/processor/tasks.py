@@ -25,12 +25,20 @@ from celery import chain
 from celery.utils.log import get_task_logger
 from dateutil import parser
 from django.db import connection
+from django.utils import timezone
 from tenant_schemas.utils import schema_context
 
 import masu.prometheus_stats as worker_stats
 from api.provider.models import Provider
+from api.report.cache import bump_data_version
 from api.utils import DateHelper
 from koku.celery import app
+from masu.config import Config
+from masu.database.aws_report_db_accessor import AWSReportDBAccessor
+from masu.database.azure_report_db_accessor import AzureReportDBAccessor
+from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
+from masu.database.pending_refresh_accessor import PendingRefreshDBAccessor
+from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
 from masu.database.report_stats_db_accessor import ReportStatsDBAccessor
 from masu.external.accounts_accessor import AccountsAccessor
@@ -38,18 +46,58 @@ from masu.external.accounts_accessor import AccountsAccessorError
 from masu.external.date_accessor import DateAccessor
 from masu.processor._tasks.download import _get_report_files
 from masu.processor._tasks.process import _process_report_file
+from masu.processor._tasks.process import _process_report_files_in_parallel
 from masu.processor._tasks.remove_expired import _remove_expired_data
 from masu.processor.cost_model_cost_updater import CostModelCostUpdater
 from masu.processor.report_processor import ReportProcessorError
 from masu.processor.report_summary_updater import ReportSummaryUpdater
+from masu.processor.view_refresher import ViewRefresher
 from masu.processor.worker_cache import WorkerCache
-from reporting.models import AWS_MATERIALIZED_VIEWS
-from reporting.models import AZURE_MATERIALIZED_VIEWS
-from reporting.models import OCP_MATERIALIZED_VIEWS
+from masu.util.common import merge_date_ranges
+from reporting.models import AWS_UI_SUMMARY_TABLES
+from reporting.models import AZURE_UI_SUMMARY_TABLES
+from reporting.models import OCP_UI_SUMMARY_TABLES
 
 LOG = get_task_logger(__name__)
 
 
+def _is_report_file_started(report_dict):
+    """
+    Check whether a report file is already being processed or was processed.
+
+    Args:
+        report_dict (dict): The report data dict of the file
+
+    Returns:
+        (Boolean): Whether processing of the file should be skipped
+
+    """
+    manifest_id = report_dict.get("manifest_id")
+    file_name = os.path.basename(report_dict.get("file"))
+    with ReportStatsDBAccessor(file_name, manifest_id) as stats:
+        started_date = stats.get_last_started_datetime()
+        completed_date = stats.get_last_completed_datetime()
+
+    # Skip processing if already in progress.
+    if started_date and not completed_date:
+        expired_start_date = started_date + datetime.timedelta(hours=2)
+        if DateAccessor().today_with_timezone("UTC") < expired_start_date:
+            LOG.info("Skipping processing task for %s since it was started at: %s.", file_name, str(started_date))
+            return True
+
+    # Skip processing if complete.
+    if started_date and completed_date:
+        LOG.info(
+            "Skipping processing task for %s. Started on: %s and completed on: %s.",
+            file_name,
+            str(started_date),
+            str(completed_date),
+        )
+        return True
+
+    return False
+
+
 # pylint: disable=too-many-locals
 @app.task(name="masu.processor.tasks.get_report_files", queue_name="download", bind=True)
 def get_report_files(
@@ -95,30 +143,10 @@ def get_report_files(
             stmt += " file: " + str(report["file"]) + "\n"
         LOG.info(stmt[:-1])
         reports_to_summarize = []
+        reports_to_process = []
+        parallel = Config.REPORT_PROCESSING_WORKERS > 1 and len(reports) > 1
         for report_dict in reports:
-            manifest_id = report_dict.get("manifest_id")
-            file_name = os.path.basename(report_dict.get("file"))
-            with ReportStatsDBAccessor(file_name, manifest_id) as stats:
-                started_date = stats.get_last_started_datetime()
-                completed_date = stats.get_last_completed_datetime()
-
-            # Skip processing if already in progress.
-            if started_date and not completed_date:
-                expired_start_date = started_date + datetime.timedelta(hours=2)
-                if DateAccessor().today_with_timezone("UTC") < expired_start_date:
-                    LOG.info(
-                        "Skipping processing task for %s since it was started at: %s.", file_name, str(started_date)
-                    )
-                    continue
-
-            # Skip processing if complete.
-            if started_date and completed_date:
-                LOG.info(
-                    "Skipping processing task for %s. Started on: %s and completed on: %s.",
-                    file_name,
-                    str(started_date),
-                    str(completed_date),
-                )
+            if _is_report_file_started(report_dict):
                 continue
 
             stmt = (
@@ -130,7 +158,10 @@ def get_report_files(
             )
             LOG.info(stmt)
             worker_stats.PROCESS_REPORT_ATTEMPTS_COUNTER.labels(provider_type=provider_type).inc()
-            _process_report_file(schema_name, provider_type, provider_uuid, report_dict)
+            if parallel:
+                reports_to_process.append(report_dict)
+            else:
+                _process_report_file(schema_name, provider_type, provider_uuid, report_dict)
             report_meta = {}
             known_manifest_ids = [report.get("manifest_id") for report in reports_to_summarize]
             if report_dict.get("manifest_id") not in known_manifest_ids:
@@ -139,6 +170,13 @@ def get_report_files(
                 report_meta["provider_uuid"] = provider_uuid
                 report_meta["manifest_id"] = report_dict.get("manifest_id")
                 reports_to_summarize.append(report_meta)
+
+        if reports_to_process:
+            # Every file is processed before returning, so the chained
+            # summarize_reports task still runs once, after the last file.
+            _process_report_files_in_parallel(
+                schema_name, provider_type, provider_uuid, reports_to_process, Config.REPORT_PROCESSING_WORKERS
+            )
     except ReportProcessorError as processing_error:
         worker_stats.PROCESS_REPORT_ERROR_COUNTER.labels(provider_type=provider_type).inc()
         LOG.error(str(processing_error))
@@ -173,7 +211,7 @@ def remove_expired_data(schema_name, provider, simulate, provider_uuid=None, lin
     )
     LOG.info(stmt)
     _remove_expired_data(schema_name, provider, simulate, provider_uuid, line_items_only)
-    refresh_materialized_views.delay(schema_name, provider)
+    request_refresh.delay(schema_name, provider)
 
 
 @app.task(name="masu.processor.tasks.summarize_reports", queue_name="process")
@@ -189,12 +227,11 @@ def summarize_reports(reports_to_summarize):
 
     """
     for report in reports_to_summarize:
-        # For day-to-day summarization we choose a small window to
-        # cover new data from a window of days.
-        # This saves us from re-summarizing unchanged data and cuts down
-        # on processing time. There are override mechanisms in the
-        # Updater classes for when full-month summarization is
-        # required.
+        # Summarization rebuilds the days report processing recorded as
+        # changed. This small window of recent days is only summarized
+        # when no changed days were recorded for the provider. There are
+        # override mechanisms in the Updater classes for when full-month
+        # summarization of that window is required.
         start_date = DateAccessor().today() - datetime.timedelta(days=2)
         start_date = start_date.strftime("%Y-%m-%d")
         end_date = DateAccessor().today().strftime("%Y-%m-%d")
@@ -238,15 +275,32 @@ def update_summary_tables(schema_name, provider, provider_uuid, start_date, end_
     LOG.info(stmt)
 
     updater = ReportSummaryUpdater(schema_name, provider_uuid, manifest_id)
+    date_ranges = [(start_date, end_date)]
+    if manifest_id:
+        # Rebuild exactly the days processing of the manifest changed
+        date_ranges = updater.claim_dirty_date_ranges() or date_ranges
     if updater.manifest_is_ready():
-        start_date, end_date = updater.update_daily_tables(start_date, end_date)
-        updater.update_summary_tables(start_date, end_date)
+        try:
+            date_ranges = [
+                updater.update_daily_tables(range_start, range_end) for range_start, range_end in date_ranges
+            ]
+            for range_start, range_end in date_ranges:
+                updater.update_summary_tables(range_start, range_end)
+        except Exception:
+            updater.restore_dirty_days()
+            raise
+    start_date = min(range_start for range_start, _ in date_ranges)
     if provider_uuid:
         dh = DateHelper(utc=True)
         prev_month_last_day = dh.last_month_end
         start_date_obj = datetime.datetime.strptime(start_date, "%Y-%m-%d")
         prev_month_last_day = prev_month_last_day.replace(tzinfo=None)
         prev_month_last_day = prev_month_last_day.replace(microsecond=0, second=0, minute=0, hour=0, day=1)
+        cost_model_updates = [
+            # The chained refresh rebuilds the UI summary tables once for every range
+            update_cost_model_costs.si(schema_name, provider_uuid, range_start, range_end, refresh=False)
+            for range_start, range_end in date_ranges
+        ]
         if manifest_id and (start_date_obj <= prev_month_last_day):
             # We want make sure that the manifest_id is not none, because
             # we only want to call the delete line items after the summarize_reports
@@ -254,17 +308,16 @@ def update_summary_tables(schema_name, provider, provider_uuid, start_date, end_
             simulate = False
             line_items_only = True
             chain(
-                update_cost_model_costs.s(schema_name, provider_uuid, start_date, end_date),
-                refresh_materialized_views.si(schema_name, provider, manifest_id),
+                *cost_model_updates,
+                request_refresh.si(schema_name, provider, manifest_id, date_ranges),
                 remove_expired_data.si(schema_name, provider, simulate, provider_uuid, line_items_only),
             ).apply_async()
         else:
             chain(
-                update_cost_model_costs.s(schema_name, provider_uuid, start_date, end_date),
-                refresh_materialized_views.si(schema_name, provider, manifest_id),
+                *cost_model_updates, request_refresh.si(schema_name, provider, manifest_id, date_ranges)
             ).apply_async()
     else:
-        refresh_materialized_views.delay(schema_name, provider, manifest_id)
+        request_refresh.delay(schema_name, provider, manifest_id, date_ranges)
 
 
 @app.task(name="masu.processor.tasks.update_all_summary_tables", queue_name="reporting")
@@ -300,7 +353,7 @@ def update_all_summary_tables(start_date, end_date=None):
 
 
 @app.task(name="masu.processor.tasks.update_cost_model_costs", queue_name="reporting")
-def update_cost_model_costs(schema_name, provider_uuid, start_date=None, end_date=None):
+def update_cost_model_costs(schema_name, provider_uuid, start_date=None, end_date=None, refresh=True):
     """Update usage charge information.
 
     Args:
@@ -308,6 +361,7 @@ def update_cost_model_costs(schema_name, provider_uuid, start_date=None, end_dat
         provider_uuid (str) The provider uuid.
         start_date (str, Optional) - Start date of range to update derived cost.
         end_date (str, Optional) - End date of range to update derived cost.
+        refresh (bool, Optional) - Request a refresh of the UI summary tables of the range.
 
     Returns
         None
@@ -325,24 +379,47 @@ def update_cost_model_costs(schema_name, provider_uuid, start_date=None, end_dat
     updater = CostModelCostUpdater(schema_name, provider_uuid)
     if updater:
         updater.update_cost_model_costs(start_date, end_date)
+        with ProviderDBAccessor(provider_uuid) as provider_accessor:
+            provider_type = provider_accessor.get_type()
+        if provider_type:
+            if refresh:
+                # The UI summary tables carry the costs, rebuild the updated days
+                request_refresh(schema_name, provider_type, date_ranges=[(start_date, end_date)])
+            bump_data_version(schema_name, provider_type)
 
 
-@app.task(name="masu.processor.tasks.refresh_materialized_views", queue_name="reporting")
-def refresh_materialized_views(schema_name, provider_type, manifest_id=None):
-    """Refresh the database's materialized views for reporting."""
-    materialized_views = ()
+def _get_ui_summary_tables(provider_type):
+    """Return the report DB accessor class and the UI summary table names of a provider type."""
     if provider_type in (Provider.PROVIDER_AWS, Provider.PROVIDER_AWS_LOCAL):
-        materialized_views = AWS_MATERIALIZED_VIEWS
+        accessor_class, tables = AWSReportDBAccessor, AWS_UI_SUMMARY_TABLES
     elif provider_type in (Provider.PROVIDER_OCP):
-        materialized_views = OCP_MATERIALIZED_VIEWS
+        accessor_class, tables = OCPReportDBAccessor, OCP_UI_SUMMARY_TABLES
     elif provider_type in (Provider.PROVIDER_AZURE, Provider.PROVIDER_AZURE_LOCAL):
-        materialized_views = AZURE_MATERIALIZED_VIEWS
-    with schema_context(schema_name):
-        for view in materialized_views:
-            table_name = view._meta.db_table
-            with connection.cursor() as cursor:
-                cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {table_name}")
-                LOG.info(f"Refreshed {table_name}.")
+        accessor_class, tables = AzureReportDBAccessor, AZURE_UI_SUMMARY_TABLES
+    else:
+        return None, []
+    return accessor_class, [table._meta.db_table for table in tables]
+
+
+@app.task(name="masu.processor.tasks.refresh_materialized_views", queue_name="reporting")
+def refresh_materialized_views(schema_name, provider_type, manifest_id=None, date_ranges=None):
+    """Refresh the reporting UI summary tables of a provider type.
+
+    Args:
+        schema_name (str) The DB schema name.
+        provider_type (str) The provider type.
+        manifest_id (int) The manifest completed by the refresh.
+        date_ranges (list) The (start, end) date pairs to rebuild, all kept days when None.
+
+    Returns
+        None
+
+    """
+    accessor_class, table_names = _get_ui_summary_tables(provider_type)
+    if accessor_class:
+        ViewRefresher(schema_name).populate_ui_summary_tables(accessor_class, table_names, date_ranges)
+        LOG.info(f"Refreshed {', '.join(table_names)}.")
+    bump_data_version(schema_name, provider_type)
 
     if manifest_id:
         # Processing for this monifest should be complete after this step
@@ -351,6 +428,129 @@ def refresh_materialized_views(schema_name, provider_type, manifest_id=None):
             manifest_accessor.mark_manifest_as_completed(manifest)
 
 
+@app.task(name="masu.processor.tasks.request_refresh", queue_name="reporting")
+def request_refresh(schema_name, provider_type, manifest_id=None, date_ranges=None):
+    """Queue a refresh of the reporting summary tables of a provider type.
+
+    Requests of a schema and provider type are coalesced into one refresh,
+    run once no request arrived for REFRESH_QUIET_WINDOW seconds.
+
+    Args:
+        schema_name (str) The DB schema name.
+        provider_type (str) The provider type.
+        manifest_id (int) The manifest completed by the refresh.
+        date_ranges (list) The (start, end) date pairs to rebuild, all kept days when None.
+
+    Returns
+        None
+
+    """
+    with PendingRefreshDBAccessor() as accessor:
+        accessor.add(schema_name, provider_type, manifest_id, date_ranges)
+    if Config.REFRESH_QUIET_WINDOW:
+        run_pending_refreshes.apply_async((schema_name, provider_type), countdown=Config.REFRESH_QUIET_WINDOW)
+    else:
+        run_pending_refreshes(schema_name, provider_type)
+
+
+@app.task(name="masu.processor.tasks.run_pending_refreshes", queue_name="reporting")
+def run_pending_refreshes(schema_name, provider_type):
+    """Run one refresh for the queued refresh requests of a schema and provider type.
+
+    The refresh waits until the requests have been quiet for REFRESH_QUIET_WINDOW
+    seconds, and while another refresh of the schema is running. Every manifest
+    waiting on the requests is marked complete once the refresh finishes.
+
+    Args:
+        schema_name (str) The DB schema name.
+        provider_type (str) The provider type.
+
+    Returns
+        None
+
+    """
+    with PendingRefreshDBAccessor() as accessor:
+        last_requested = accessor.get_last_requested(schema_name, provider_type)
+        if last_requested is None:
+            # An earlier run refreshed the requests
+            return
+        quiet_at = last_requested + datetime.timedelta(seconds=Config.REFRESH_QUIET_WINDOW)
+        if quiet_at > timezone.now():
+            countdown = max(int((quiet_at - timezone.now()).total_seconds()), 1)
+            run_pending_refreshes.apply_async((schema_name, provider_type), countdown=countdown)
+            return
+        if not accessor.try_lock_schema(schema_name):
+            LOG.info(f"Schema {schema_name} is already refreshing, retrying in {Config.REFRESH_RETRY_DELAY}s.")
+            run_pending_refreshes.apply_async((schema_name, provider_type), countdown=Config.REFRESH_RETRY_DELAY)
+            return
+        try:
+            requests = accessor.claim(schema_name, provider_type)
+            try:
+                date_ranges = [(start_date, end_date) for _, start_date, end_date in requests]
+                if any(start_date is None or end_date is None for start_date, end_date in date_ranges):
+                    date_ranges = None
+                else:
+                    date_ranges = list(merge_date_ranges(date_ranges))
+                LOG.info(f"Refreshing {len(requests)} requests of {provider_type} in schema {schema_name}.")
+                refresh_materialized_views(schema_name, provider_type, date_ranges=date_ranges)
+            except Exception:
+                accessor.restore(schema_name, provider_type, requests)
+                raise
+        finally:
+            accessor.unlock_schema(schema_name)
+
+    manifest_ids = sorted({manifest_id for manifest_id, _, _ in requests if manifest_id})
+    with ReportManifestDBAccessor() as manifest_accessor:
+        for manifest_id in manifest_ids:
+            manifest = manifest_accessor.get_manifest_by_id(manifest_id)
+            manifest_accessor.mark_manifest_as_completed(manifest)
+
+
+@app.task(name="masu.processor.tasks.check_ui_summary_tables", queue_name="reporting")
+def check_ui_summary_tables(schema_name, provider_type, repair=False):
+    """Compare the reporting UI summary tables of a provider type with a full recomputation.
+
+    Args:
+        schema_name (str) The DB schema name.
+        provider_type (str) The provider type.
+        repair (bool) Rebuild all kept days of the tables that differ.
+
+    Returns
+        (dict) The number of differing rows, keyed by table name.
+
+    """
+    accessor_class, table_names = _get_ui_summary_tables(provider_type)
+    if not accessor_class:
+        return {}
+    with accessor_class(schema_name) as accessor:
+        differences = accessor.check_ui_summary_tables(table_names)
+        for table_name, count in differences.items():
+            worker_stats.UI_SUMMARY_MISMATCH_COUNTER.labels(table=table_name).inc(count)
+        stale_tables = [table_name for table_name, count in differences.items() if count]
+        if repair and stale_tables:
+            accessor.populate_ui_summary_tables(stale_tables)
+            LOG.info(f"Rebuilt {', '.join(stale_tables)}.")
+    return differences
+
+
+@app.task(name="masu.processor.tasks.update_enabled_pod_labels", queue_name="reporting")
+def update_enabled_pod_labels(schema_name, keys):
+    """Project the enabled pod labels again after the enabled tag keys changed.
+
+    Args:
+        schema_name (str) The DB schema name.
+        keys (list) The pod label keys that were enabled or disabled.
+
+    Returns
+        None
+
+    """
+    with OCPReportDBAccessor(schema_name) as accessor:
+        accessor.update_enabled_pod_labels(keys)
+    bump_data_version(schema_name, Provider.PROVIDER_OCP)
+    LOG.info(f"Updated the enabled pod labels of schema {schema_name} for keys {', '.join(keys)}.")
+
+
 @app.task(name="masu.processor.tasks.vacuum_schema", queue_name="reporting")
 def vacuum_schema(schema_name):
     """Vacuum the reporting tables in the specified schema."""
@@ -0,0 +1,216 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Refresh the views of a view set concurrently, in dependency order."""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from django.db import connection
+from django.db import connections
+from tenant_schemas.utils import schema_context
+
+from masu.config import Config
+from masu.prometheus_stats import VIEW_REFRESH_DURATION_HISTOGRAM
+
+LOG = logging.getLogger(__name__)
+
+
+class ViewRefresher:
+    """Refresh a set of views, several independent views at a time.
+
+    A view is refreshed once the views of the set it selects from are
+    refreshed. Views that do not depend on each other are refreshed on
+    worker threads, each with its own database connection, at most
+    REFRESH_WORKERS at a time. The duration of each refresh is recorded in
+    the view_refresh_duration_seconds histogram.
+
+    With a single worker, views are refreshed in dependency order on the
+    calling thread.
+    """
+
+    def __init__(self, schema, workers=None):
+        """Initialize the refresher.
+
+        Args:
+            schema (str): The customer schema
+            workers (int): The number of views refreshed at once
+
+        """
+        self._schema = schema
+        self._workers = max(workers if workers is not None else Config.REFRESH_WORKERS, 1)
+
+    def get_dependencies(self, names):
+        """Return the views of a set each view of the set selects from.
+
+        Args:
+            names (list): The names of the views, or tables, of the set
+
+        Returns:
+            (dict): The set of names each name depends on
+
+        """
+        dependencies = {name: set() for name in names}
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT DISTINCT v.relname, t.relname
+                FROM pg_depend AS d
+                JOIN pg_rewrite AS r
+                    ON r.oid = d.objid
+                JOIN pg_class AS v
+                    ON v.oid = r.ev_class
+                JOIN pg_class AS t
+                    ON t.oid = d.refobjid
+                JOIN pg_namespace AS n
+                    ON n.oid = v.relnamespace
+                WHERE n.nspname = %s
+                    AND v.relname = ANY(%s)
+                    AND t.relname = ANY(%s)
+                    AND v.oid <> t.oid
+                """,
+                [self._schema, list(names), list(names)],
+            )
+            for name, dependency in cursor.fetchall():
+                dependencies[name].add(dependency)
+        return dependencies
+
+    def refresh_materialized_views(self, names, concurrently=False):
+        """Refresh materialized views of the schema.
+
+        Args:
+            names (list): The names of the materialized views
+            concurrently (bool): Refresh without locking out readers
+
+        Returns:
+            (None)
+
+        """
+        option = "CONCURRENTLY " if concurrently else ""
+
+        def refresh(name):
+            with schema_context(self._schema):
+                with connection.cursor() as cursor:
+                    cursor.execute(f"REFRESH MATERIALIZED VIEW {option}{name}")
+
+        self.run(names, refresh)
+
+    def populate_ui_summary_tables(self, accessor_class, table_names, date_ranges=None):
+        """Rebuild UI summary tables of the schema by date range.
+
+        Args:
+            accessor_class (class): The report DB accessor of the provider type
+            table_names (list): The names of the UI summary tables
+            date_ranges (list): The (start, end) date pairs to rebuild, all kept days when None
+
+        Returns:
+            (None)
+
+        """
+
+        def populate(table_name):
+            with accessor_class(self._schema) as accessor:
+                for start_date, end_date in date_ranges or [(None, None)]:
+                    accessor.populate_ui_summary_tables([table_name], start_date, end_date)
+
+        self.run(table_names, populate)
+
+    def run(self, names, refresh):
+        """Refresh each view of a set once the views it depends on are refreshed.
+
+        Args:
+            names (list): The names of the views, or tables, of the set
+            refresh (function): Takes a name and refreshes it
+
+        Returns:
+            (None)
+
+        Raises:
+            (Exception): The error of the first failed refresh, once running refreshes are done
+
+        """
+        names = list(names)
+        with schema_context(self._schema):
+            dependencies = self.get_dependencies(names)
+        if self._workers == 1 or len(names) < 2:
+            for name in self._ordered(names, dependencies):
+                self._refresh(refresh, name)
+            return
+
+        LOG.info("Refreshing %d views, %d at a time, for schema %s.", len(names), self._workers, self._schema)
+        started = time.perf_counter()
+        self._run_concurrently(names, dependencies, refresh)
+        LOG.info("Refreshed %d views in %.2fs for schema %s.", len(names), time.perf_counter() - started, self._schema)
+
+    def _run_concurrently(self, names, dependencies, refresh):
+        """Refresh each view on the worker pool once the views it depends on are refreshed."""
+        pending = {name: set(dependencies[name]) for name in names}
+        running = {}
+        error = None
+        with ThreadPoolExecutor(max_workers=min(self._workers, len(names))) as pool:
+            while pending or running:
+                if error is None:
+                    for name in [name for name, waiting in pending.items() if not waiting]:
+                        del pending[name]
+                        running[pool.submit(self._run_view, refresh, name)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                        continue
+                    for waiting in pending.values():
+                        waiting.discard(name)
+        if error is not None:
+            raise error
+        if pending:
+            raise ValueError(f"Views {', '.join(sorted(pending))} depend on each other.")
+
+    @staticmethod
+    def _ordered(names, dependencies):
+        """Return the names ordered so each comes after the names it depends on."""
+        ordered = []
+        pending = {name: set(dependencies[name]) for name in names}
+        while pending:
+            ready = [name for name, waiting in pending.items() if not waiting]
+            if not ready:
+                raise ValueError(f"Views {', '.join(sorted(pending))} depend on each other.")
+            for name in ready:
+                del pending[name]
+                ordered.append(name)
+            for waiting in pending.values():
+                waiting.difference_update(ready)
+        return ordered
+
+    def _refresh(self, refresh, name):
+        """Refresh a view and record its duration."""
+        started = time.perf_counter()
+        refresh(name)
+        duration = time.perf_counter() - started
+        VIEW_REFRESH_DURATION_HISTOGRAM.labels(view=name).observe(duration)
+        LOG.info("Refreshed %s in %.2fs.", name, duration)
+
+    def _run_view(self, refresh, name):
+        """Refresh a view on a worker thread."""
+        try:
+            self._refresh(refresh, name)
+        finally:
+            # The worker thread's connections are not reused by other threads
+            connections.close_all()
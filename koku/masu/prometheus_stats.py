@@ -17,6 +17,7 @@
 """Prometheus Stats."""
 from prometheus_client import CollectorRegistry
 from prometheus_client import Counter
+from prometheus_client import Histogram
 from prometheus_client import multiprocess
 
 
@@ -60,3 +61,48 @@ KAFKA_CONNECTION_ERRORS_COUNTER = Counter(
 )
 
 CELERY_ERRORS_COUNTER = Counter("celery_errors", "Number of celery errors", registry=WORKER_REGISTRY)
+
+DIMENSION_CACHE_HITS_COUNTER = Counter(
+    "dimension_cache_hits_count",
+    "Number of report dimension keys found in the processor cache",
+    ["dimension"],
+    registry=WORKER_REGISTRY,
+)
+DIMENSION_CACHE_MISSES_COUNTER = Counter(
+    "dimension_cache_misses_count",
+    "Number of report dimension keys not found in the processor cache",
+    ["dimension"],
+    registry=WORKER_REGISTRY,
+)
+DIMENSION_CACHE_LOOKUPS_COUNTER = Counter(
+    "dimension_cache_lookups_count",
+    "Number of report dimension keys looked up in the database on a cache miss",
+    ["dimension"],
+    registry=WORKER_REGISTRY,
+)
+UI_SUMMARY_MISMATCH_COUNTER = Counter(
+    "ui_summary_mismatch_count",
+    "Number of UI summary table rows found differing from the daily summary",
+    ["table"],
+    registry=WORKER_REGISTRY,
+)
+VIEW_REFRESH_DURATION_HISTOGRAM = Histogram(
+    "view_refresh_duration_seconds",
+    "Duration of the refresh of a reporting view or summary table",
+    ["view"],
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+    registry=WORKER_REGISTRY,
+)
+SQL_TEMPLATE_DURATION_HISTOGRAM = Histogram(
+    "sql_template_duration_seconds",
+    "Duration of the execution of a report database SQL template",
+    ["template"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 600),
+    registry=WORKER_REGISTRY,
+)
+SQL_TEMPLATE_ROWS_COUNTER = Counter(
+    "sql_template_rows_count",
+    "Number of rows written or read by the last statement of a report database SQL template",
+    ["template"],
+    registry=WORKER_REGISTRY,
+)
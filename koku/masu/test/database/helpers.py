@@ -129,6 +129,7 @@ class ReportObjectCreator:
 
         data.update(extra_data)
         with AWSReportDBAccessor(self.schema) as accessor:
+            accessor.create_table_partitions(table_name, cost_entry.interval_start, cost_entry.interval_end)
             return accessor.create_db_object(table_name, data)
 
     def create_ocp_report_period(self, provider_uuid, period_date=None, cluster_id=None):
@@ -191,7 +192,9 @@ class ReportObjectCreator:
             data["namespace"] = namespace
         if node:
             data["node"] = node
+        data["usage_start"] = report.interval_start
         with OCPReportDBAccessor(self.schema) as accessor:
+            accessor.create_table_partitions(table_name, report.interval_start, report.interval_end)
             return accessor.create_db_object(table_name, data)
 
     def create_ocp_storage_line_item(self, report_period, report, pod=None, namespace=None):
@@ -336,7 +339,8 @@ class ReportObjectCreator:
                 "usage_account_id": self.fake.pystr()[:8],
             }
 
-        with OCPReportDBAccessor(self.schema) as accessor:
+        with AWSReportDBAccessor(self.schema) as accessor:
+            accessor.create_table_partitions(table_name, data["usage_start"], data["usage_start"])
             obj = accessor.create_db_object(table_name, data)
         return obj
 
@@ -20,8 +20,10 @@ import decimal
 import random
 import string
 from decimal import Decimal
+from unittest.mock import patch
 
 import django.apps
+import pytz
 from dateutil import relativedelta
 from django.db import connection
 from django.db.models import F
@@ -37,6 +39,9 @@ from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.database.report_db_accessor_base import ReportSchema
+from masu.database.report_db_accessor_base import clean_int
+from masu.database.report_db_accessor_base import clean_value
+from masu.database.report_db_accessor_base import get_report_schema
 from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
 from masu.external.date_accessor import DateAccessor
 from masu.test import MasuTestCase
@@ -44,6 +49,7 @@ from masu.test.database.helpers import map_django_field_type_to_python_type
 from masu.test.database.helpers import ReportObjectCreator
 from reporting.provider.aws.models import AWSCostEntryProduct
 from reporting.provider.aws.models import AWSCostEntryReservation
+from reporting.provider.aws.models import AWSCostSummaryByService
 from reporting_common import REPORT_COLUMN_MAP
 
 
@@ -104,6 +110,34 @@ class ReportSchemaTest(MasuTestCase):
         for table_type in table_types.values():
             self.assertIn(table_type, django_field_types)
 
+    def test_get_report_schema(self):
+        """Test that accessors share the report schema of the process."""
+        other_accessor = OCPReportDBAccessor(schema=self.schema)
+        self.assertIs(self.accessor.report_schema, get_report_schema())
+        self.assertIs(other_accessor.report_schema, self.accessor.report_schema)
+
+    def test_get_conversion_plan(self):
+        """Test that each column gets the converter of its type, once per column order."""
+        report_schema = ReportSchema(django.apps.apps.get_models())
+        table_name = "reporting_gcpcostentrylineitemdaily"
+        columns = ["consumption", "cost", "description", "not_a_column"]
+
+        plan = report_schema.get_conversion_plan(table_name, columns)
+        self.assertEqual(plan, (clean_int, clean_value, clean_value, clean_value))
+        self.assertIs(report_schema.get_conversion_plan(table_name, iter(columns)), plan)
+
+        self.assertEqual(clean_int("42"), 42)
+        self.assertIsNone(clean_int("4.2"))
+        self.assertIsNone(clean_int(""))
+        self.assertEqual(clean_value("4.2"), "4.2")
+        self.assertIsNone(clean_value(""))
+
+    def test_clean_data_conversion_plan(self):
+        """Test that clean_data converts integers and passes other values to the database as is."""
+        data = {"consumption": "42", "cost": "1.500000000", "description": "", "unit": None}
+        cleaned_data = self.accessor.clean_data(data, "reporting_gcpcostentrylineitemdaily")
+        self.assertEqual(cleaned_data, {"consumption": 42, "cost": "1.500000000", "description": None, "unit": None})
+
 
 class AWSReportDBAccessorTest(MasuTestCase):
     """Test Cases for the ReportDBAccessor object."""
@@ -247,6 +281,175 @@ class AWSReportDBAccessorTest(MasuTestCase):
                     data_dict[column] = self.creator.stringify_datetime(data_dict[column])
                 self.assertEqual(value, data_dict[column])
 
+    def test_bulk_insert_binary_rows(self):
+        """Test that the binary bulk insert method inserts line items."""
+        with schema_context(self.schema):
+            table_name = AWS_CUR_TABLE_MAP["line_item"]
+            query = self.accessor._get_db_obj_query(table_name)
+            cost_entry = query.first()
+
+            data_dict = self.creator.create_columns_for_table(table_name)
+            data_dict["cost_entry_bill_id"] = cost_entry.cost_entry_bill_id
+            data_dict["cost_entry_id"] = cost_entry.cost_entry_id
+            data_dict["cost_entry_product_id"] = cost_entry.cost_entry_product_id
+            data_dict["cost_entry_pricing_id"] = cost_entry.cost_entry_pricing_id
+            data_dict["cost_entry_reservation_id"] = cost_entry.cost_entry_reservation_id
+            columns = list(data_dict.keys())
+
+            self.accessor.bulk_insert_binary_rows([list(data_dict.values())], table_name, columns)
+
+            # Temporary tables are encoded with the types of the table they copy
+            temp_table = self.accessor.create_temp_table(table_name, drop_column="id")
+            self.accessor.bulk_insert_binary_rows([list(data_dict.values())], temp_table, columns)
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT count(*) FROM {temp_table}")
+                self.assertEqual(cursor.fetchone()[0], 1)
+
+            new_line_item = self.accessor._get_db_obj_query(table_name).order_by("-id").first()
+            for column in columns:
+                value = getattr(new_line_item, column)
+                if isinstance(value, datetime.datetime):
+                    value = self.creator.stringify_datetime(value)
+                    data_dict[column] = self.creator.stringify_datetime(data_dict[column])
+                self.assertEqual(value, data_dict[column])
+
+    def test_create_table_partitions(self):
+        """Test that missing monthly partitions are created once."""
+        table_name = AWS_CUR_TABLE_MAP["line_item"]
+        start = datetime.datetime(2017, 11, 1, tzinfo=pytz.UTC)
+        end = datetime.datetime(2018, 1, 1, tzinfo=pytz.UTC)
+        created = self.accessor.create_table_partitions(table_name, start, end)
+        self.assertEqual(created, [f"{table_name}_2017_11", f"{table_name}_2017_12"])
+        partitions = self.accessor.get_table_partitions(table_name)
+        self.assertEqual(partitions[datetime.date(2017, 12, 1)], f"{table_name}_2017_12")
+        self.assertEqual(self.accessor.create_table_partitions(table_name, start, end), [])
+        self.assertEqual(self.accessor.create_table_partitions(AWS_CUR_TABLE_MAP["bill"], start, end), [])
+
+    def test_drop_and_truncate_table_partitions(self):
+        """Test that line items are removed a month at a time."""
+        table_name = AWS_CUR_TABLE_MAP["line_item"]
+        bill_date = datetime.datetime(2017, 6, 1, tzinfo=pytz.UTC)
+        bill = self.creator.create_cost_entry_bill(provider_uuid=self.aws_provider_uuid, bill_date=bill_date)
+        cost_entry = self.creator.create_cost_entry(bill, bill_date)
+        product = self.creator.create_cost_entry_product()
+        pricing = self.creator.create_cost_entry_pricing()
+        reservation = self.creator.create_cost_entry_reservation()
+        self.creator.create_cost_entry_line_item(bill, cost_entry, product, pricing, reservation)
+        next_month = bill_date + relativedelta.relativedelta(months=1)
+        self.accessor.create_table_partitions(table_name, next_month, next_month)
+
+        self.assertTrue(self.accessor.truncate_table_partition(table_name, bill_date.date()))
+        with schema_context(self.schema):
+            self.assertEqual(self.accessor.get_lineitem_query_for_billid(bill.id).count(), 0)
+
+        dropped = self.accessor.drop_table_partitions(table_name, bill_date)
+        self.assertIn(f"{table_name}_2017_06", dropped)
+        self.assertNotIn(f"{table_name}_2017_07", dropped)
+        partitions = self.accessor.get_table_partitions(table_name)
+        self.assertNotIn(datetime.date(2017, 6, 1), partitions)
+        self.assertIn(datetime.date(2017, 7, 1), partitions)
+        self.assertFalse(self.accessor.truncate_table_partition(AWS_CUR_TABLE_MAP["bill"], bill_date))
+
+    @patch("masu.database.report_db_accessor_base.Config.PARTITION_SWAP_MIN_SHARE", 0)
+    def test_swap_table_partitions(self):
+        """Test that the filtered rows of a month are replaced with the source rows."""
+        table_name = AWS_CUR_TABLE_MAP["line_item_daily_summary"]
+        usage_date = datetime.datetime(2017, 6, 10, tzinfo=pytz.UTC)
+        bill = self.creator.create_cost_entry_bill(provider_uuid=self.aws_provider_uuid, bill_date=usage_date)
+        other_bill = self.creator.create_cost_entry_bill(provider_uuid=self.aws_provider_uuid, bill_date=usage_date)
+        self.creator.create_awscostentrylineitem_daily_summary(self.customer.account_id, self.schema, bill, usage_date)
+        kept = self.creator.create_awscostentrylineitem_daily_summary(
+            self.customer.account_id, self.schema, other_bill, usage_date
+        )
+
+        with schema_context(self.schema):
+            with connection.cursor() as cursor:
+                cursor.execute(f"CREATE TEMPORARY TABLE swap_source (LIKE {table_name} INCLUDING DEFAULTS)")
+                cursor.execute(
+                    f"INSERT INTO swap_source SELECT * FROM {table_name} WHERE cost_entry_bill_id = %s", [bill.id]
+                )
+                cursor.execute("UPDATE swap_source SET product_code = 'swapped'")
+
+            swapped = self.accessor.swap_table_partitions(
+                table_name, "swap_source", usage_date.date(), usage_date.date(), {"cost_entry_bill_id": [bill.id]}
+            )
+            self.assertEqual(swapped, [f"{table_name}_2017_06"])
+            self.assertIn(datetime.date(2017, 6, 1), self.accessor.get_table_partitions(table_name))
+            query = self.accessor._get_db_obj_query(table_name)
+            self.assertEqual(
+                list(query.filter(cost_entry_bill_id=bill.id).values_list("product_code", flat=True)), ["swapped"]
+            )
+            self.assertEqual(query.get(cost_entry_bill_id=other_bill.id).product_code, kept.product_code)
+
+    @patch("masu.database.report_db_accessor_base.Config.PARTITION_SWAP_MIN_SHARE", 0.75)
+    def test_swap_table_partitions_in_place(self):
+        """Test that a small share of a month is replaced in place without swapping the partition."""
+        table_name = AWS_CUR_TABLE_MAP["line_item_daily_summary"]
+        partition = f"{table_name}_2017_06"
+        usage_date = datetime.datetime(2017, 6, 10, tzinfo=pytz.UTC)
+        bill = self.creator.create_cost_entry_bill(provider_uuid=self.aws_provider_uuid, bill_date=usage_date)
+        other_bill = self.creator.create_cost_entry_bill(provider_uuid=self.aws_provider_uuid, bill_date=usage_date)
+        self.creator.create_awscostentrylineitem_daily_summary(self.customer.account_id, self.schema, bill, usage_date)
+        kept = self.creator.create_awscostentrylineitem_daily_summary(
+            self.customer.account_id, self.schema, other_bill, usage_date
+        )
+
+        with schema_context(self.schema):
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {partition}")
+                cursor.execute("SELECT %s::regclass::oid", [partition])
+                partition_oid = cursor.fetchone()[0]
+                cursor.execute(f"CREATE TEMPORARY TABLE swap_source (LIKE {table_name} INCLUDING DEFAULTS)")
+                cursor.execute(
+                    f"INSERT INTO swap_source SELECT * FROM {table_name} WHERE cost_entry_bill_id = %s", [bill.id]
+                )
+                cursor.execute("UPDATE swap_source SET product_code = 'swapped'")
+
+            replaced = self.accessor.swap_table_partitions(
+                table_name, "swap_source", usage_date.date(), usage_date.date(), {"cost_entry_bill_id": [bill.id]}
+            )
+            self.assertEqual(replaced, [partition])
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT %s::regclass::oid", [partition])
+                self.assertEqual(cursor.fetchone()[0], partition_oid)
+            query = self.accessor._get_db_obj_query(table_name)
+            self.assertEqual(
+                list(query.filter(cost_entry_bill_id=bill.id).values_list("product_code", flat=True)), ["swapped"]
+            )
+            self.assertEqual(query.get(cost_entry_bill_id=other_bill.id).product_code, kept.product_code)
+
+    def test_populate_ui_summary_tables(self):
+        """Test that a date range of a UI summary table is rebuilt and checked against the daily summary."""
+        table_name = AWSCostSummaryByService._meta.db_table
+        usage_date = DateAccessor().today_with_timezone("UTC").replace(hour=0, minute=0, second=0, microsecond=0)
+        bill = self.creator.create_cost_entry_bill(provider_uuid=self.aws_provider_uuid, bill_date=usage_date)
+        line_item = self.creator.create_awscostentrylineitem_daily_summary(
+            self.customer.account_id, self.schema, bill, usage_date
+        )
+
+        with schema_context(self.schema):
+            self.accessor.populate_ui_summary_tables([table_name], usage_date.date(), usage_date.date())
+            rows = AWSCostSummaryByService.objects.filter(usage_start=usage_date.date())
+            self.assertTrue(rows.filter(product_code=line_item.product_code).exists())
+            differences = self.accessor.check_ui_summary_tables([table_name], usage_date.date(), usage_date.date())
+            self.assertEqual(differences, {table_name: 0})
+
+            rows.filter(product_code=line_item.product_code).delete()
+            differences = self.accessor.check_ui_summary_tables([table_name], usage_date.date(), usage_date.date())
+            self.assertEqual(differences, {table_name: 1})
+
+    def test_get_ui_summary_window(self):
+        """Test that date ranges are clamped to this month and last month."""
+        today = DateAccessor().today().date()
+        window_start = (today.replace(day=1) - datetime.timedelta(days=1)).replace(day=1)
+        window_end = (today.replace(day=1) + relativedelta.relativedelta(months=1)) - datetime.timedelta(days=1)
+
+        self.assertEqual(self.accessor.get_ui_summary_window(), (window_start, window_start, window_end))
+        self.assertEqual(
+            self.accessor.get_ui_summary_window(window_start - datetime.timedelta(days=40), str(today)),
+            (window_start, window_start, today),
+        )
+
     def test_insert_on_conflict_do_nothing_with_conflict(self):
         """Test that an INSERT succeeds ignoring the conflicting row."""
         table_name = AWS_CUR_TABLE_MAP["product"]
@@ -289,6 +492,31 @@ class AWSReportDBAccessorTest(MasuTestCase):
                 previous_count = count
                 previous_row_id = row_id
 
+    def test_insert_on_conflict_do_nothing_batch(self):
+        """Test that a batch INSERT returns ids for new, existing and repeated rows."""
+        table_name = AWS_CUR_TABLE_MAP["product"]
+        table = AWSCostEntryProduct
+        conflict_columns = ["sku", "product_name", "region"]
+        existing = self.creator.create_columns_for_table(table_name)
+        new = self.creator.create_columns_for_table(table_name)
+        query = self.accessor._get_db_obj_query(table_name)
+        with schema_context(self.schema):
+            existing_id = self.accessor.insert_on_conflict_do_nothing(table, existing, conflict_columns)
+            initial_count = query.count()
+
+            ids = self.accessor.insert_on_conflict_do_nothing_batch(
+                table, [existing, new, new], conflict_columns=conflict_columns
+            )
+
+            self.assertEqual(query.count(), initial_count + 1)
+            self.assertEqual(ids[0], existing_id)
+            self.assertEqual(ids[1], ids[2])
+            self.assertEqual(ids[1], query.get(sku=new["sku"]).id)
+
+    def test_insert_on_conflict_do_nothing_batch_empty(self):
+        """Test that a batch INSERT of no rows returns no ids."""
+        self.assertEqual(self.accessor.insert_on_conflict_do_nothing_batch(AWSCostEntryProduct, []), [])
+
     def test_insert_on_conflict_do_update_with_conflict(self):
         """Test that an INSERT succeeds ignoring the conflicting row."""
         table_name = AWS_CUR_TABLE_MAP["reservation"]
@@ -483,6 +711,48 @@ class AWSReportDBAccessorTest(MasuTestCase):
             self.assertEqual(len(cost_entries.keys()), count)
             self.assertIn(first_entry.id, cost_entries.values())
 
+    def test_get_cost_entries_for_bills(self):
+        """Test that cost entries can be limited to a list of bills."""
+        table_name = "reporting_awscostentry"
+        with schema_context(self.schema):
+            first_entry = self.accessor._get_db_obj_query(table_name).first()
+            count = self.accessor._get_db_obj_query(table_name).filter(bill_id=first_entry.bill_id).count()
+            cost_entries = self.accessor.get_cost_entries(bill_ids=[first_entry.bill_id])
+            self.assertEqual(len(cost_entries), count)
+            self.assertIn(first_entry.id, cost_entries.values())
+            self.assertEqual(self.accessor.get_cost_entries(bill_ids=[]), {})
+
+    def test_get_cost_entry_ids(self):
+        """Test that cost entry ids are looked up by key."""
+        table_name = "reporting_awscostentry"
+        with schema_context(self.schema):
+            first_entry = self.accessor._get_db_obj_query(table_name).first()
+        key = (first_entry.bill_id, first_entry.interval_start.strftime(self.accessor._datetime_format))
+        missing_key = (first_entry.bill_id, "1970-01-01T00:00:00Z")
+
+        cost_entries = self.accessor.get_cost_entry_ids([key, missing_key])
+        self.assertEqual(cost_entries, {key: first_entry.id})
+
+    def test_get_product_ids(self):
+        """Test that product ids are looked up by key."""
+        table_name = "reporting_awscostentryproduct"
+        with schema_context(self.schema):
+            first_entry = self.accessor._get_db_obj_query(table_name).first()
+        key = (first_entry.sku, first_entry.product_name or "", first_entry.region or "")
+        missing_key = (first_entry.sku, "not-a-product", "")
+
+        products = self.accessor.get_product_ids([key, missing_key])
+        self.assertEqual(products, {key: first_entry.id})
+
+    def test_get_reservation_ids(self):
+        """Test that reservation ids are looked up by ARN."""
+        table_name = "reporting_awscostentryreservation"
+        with schema_context(self.schema):
+            first_entry = self.accessor._get_db_obj_query(table_name).first()
+
+        reservations = self.accessor.get_reservation_ids([first_entry.reservation_arn, "not-an-arn"])
+        self.assertEqual(reservations, {first_entry.reservation_arn: first_entry.id})
+
     def test_get_products(self):
         """Test that a dict of products are returned."""
         table_name = "reporting_awscostentryproduct"
@@ -587,6 +857,38 @@ class AWSReportDBAccessorTest(MasuTestCase):
 
             self.assertNotEqual(getattr(entry, "tags"), {})
 
+    def test_populate_tag_index(self):
+        """Test that the tag index holds the lower-cased tags of the daily line items."""
+        index_table_name = AWS_CUR_TABLE_MAP["tag_index"]
+        daily_table_name = AWS_CUR_TABLE_MAP["line_item_daily"]
+
+        with schema_context(self.schema):
+            bills = self.accessor.get_cost_entry_bills_query_by_provider(self.aws_provider.uuid)
+            bill_ids = [str(bill.id) for bill in bills.all()]
+            daily_query = self.accessor._get_db_obj_query(daily_table_name).filter(cost_entry_bill_id__in=bill_ids)
+            daily_entry = daily_query.aggregate(Min("usage_start"), Max("usage_start"))
+            start_date = daily_entry["usage_start__min"]
+            end_date = daily_entry["usage_start__max"]
+            expected = {
+                (entry.id, key.lower(), value.lower())
+                for entry in daily_query
+                for key, value in (entry.tags or {}).items()
+            }
+            index_query = self.accessor._get_db_obj_query(index_table_name)
+            index_query.filter(cost_entry_bill_id__in=bill_ids).delete()
+
+        self.accessor.populate_tag_index(start_date, end_date, bill_ids)
+        # Rebuilding a range replaces its rows
+        self.accessor.populate_tag_index(start_date, end_date, bill_ids)
+
+        with schema_context(self.schema):
+            rows = list(
+                index_query.filter(cost_entry_bill_id__in=bill_ids).values_list("line_item_id", "key", "value")
+            )
+        self.assertNotEqual(rows, [])
+        self.assertEqual(len(rows), len(expected))
+        self.assertEqual(set(rows), expected)
+
     def test_populate_line_item_daily_table_no_bill_ids(self):
         """Test that the daily table is populated."""
         ce_table_name = AWS_CUR_TABLE_MAP["cost_entry"]
@@ -866,6 +1168,7 @@ class AWSReportDBAccessorTest(MasuTestCase):
                 )
 
         self.accessor.populate_line_item_daily_table(last_month, today, bill_ids)
+        self.accessor.populate_tag_index(last_month, today, bill_ids)
 
         li_table_name = AWS_CUR_TABLE_MAP["line_item"]
         with schema_context(self.schema):
@@ -899,6 +1202,7 @@ class AWSReportDBAccessorTest(MasuTestCase):
 
             ocp_accessor.populate_node_label_line_item_daily_table(start_date, end_date, cluster_id)
             ocp_accessor.populate_line_item_daily_table(start_date, end_date, cluster_id)
+            ocp_accessor.populate_pod_label_index(start_date, end_date, cluster_id)
             ocp_accessor.populate_line_item_daily_summary_table(start_date, end_date, cluster_id)
         with schema_context(self.schema):
             query = self.accessor._get_db_obj_query(summary_table_name)
@@ -96,6 +96,17 @@ class AzureReportDBAccessorTest(MasuTestCase):
             )
             self.assertIn(expected_key, products)
 
+    def test_get_product_ids(self):
+        """Test that Azure product ids are looked up by key."""
+        table_name = AZURE_REPORT_TABLE_MAP["product"]
+        with schema_context(self.schema):
+            first_entry = self.accessor._get_db_obj_query(table_name).first()
+        key = (first_entry.instance_id, first_entry.instance_type, first_entry.service_tier, first_entry.service_name)
+        missing_key = (first_entry.instance_id, "not-a-type", None, None)
+
+        products = self.accessor.get_product_ids([key, missing_key])
+        self.assertEqual(products, {key: first_entry.id})
+
     def test_get_meters(self):
         """Test that a dict of Azure meters are returned."""
         table_name = AZURE_REPORT_TABLE_MAP["meter"]
@@ -0,0 +1,96 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the binary COPY writer."""
+import datetime
+import struct
+import uuid
+from decimal import Decimal
+from unittest import TestCase
+
+from masu.database.binary_copy import BinaryCopyWriter
+from masu.database.binary_copy import COPY_HEADER
+from masu.database.binary_copy import COPY_TRAILER
+from masu.database.binary_copy import ENCODERS
+
+
+def decode_numeric(data):
+    """Decode a binary numeric field back to a Decimal."""
+    length, ndigits, weight, sign, dscale = struct.unpack("!ihhHh", data[:12])
+    groups = struct.unpack(f"!{ndigits}H", data[12:])
+    value = sum(Decimal(group) * Decimal(10000) ** (weight - idx) for idx, group in enumerate(groups))
+    if sign == 0x4000:
+        value = -value
+    return length, value.quantize(Decimal(1).scaleb(-dscale)) if dscale else value
+
+
+class BinaryCopyWriterTest(TestCase):
+    """Test cases for the binary COPY writer."""
+
+    def test_encode_numeric(self):
+        """Test that numerics are encoded as base 10000 digits."""
+        encode = ENCODERS["DecimalField"]
+        values = ["12345.678", "0.00012", "-1.5", "100000000", "0", "-0.000000001", "3.000000000", "1E+5"]
+        for value in values:
+            with self.subTest(value=value):
+                data = encode(value)
+                length, decoded = decode_numeric(data)
+                self.assertEqual(length, len(data) - 4)
+                self.assertEqual(decoded, Decimal(value))
+        self.assertEqual(decode_numeric(encode(0.1))[1], Decimal("0.1"))
+        self.assertEqual(encode("1.5"), struct.pack("!ihhHhHH", 12, 2, 0, 0, 1, 1, 5000))
+
+    def test_encode_timestamps(self):
+        """Test that timestamps and dates are encoded from the Postgres epoch."""
+        encode_timestamp = ENCODERS["DateTimeField"]
+        encode_date = ENCODERS["DateField"]
+        day = 24 * 60 * 60 * 1000000
+        self.assertEqual(encode_timestamp("2000-01-02T00:00:00Z"), struct.pack("!iq", 8, day))
+        self.assertEqual(encode_timestamp("2000-01-02 00:00:00"), struct.pack("!iq", 8, day))
+        self.assertEqual(encode_timestamp("2000-01-02 01:00:00 +0100 UTC"), struct.pack("!iq", 8, day))
+        self.assertEqual(encode_timestamp(datetime.date(1999, 12, 31)), struct.pack("!iq", 8, -day))
+        self.assertEqual(encode_date("2000-01-11"), struct.pack("!ii", 4, 10))
+        self.assertEqual(encode_date(datetime.datetime(2000, 1, 11, 5)), struct.pack("!ii", 4, 10))
+
+    def test_encode_other_types(self):
+        """Test the encoding of text, integer, float, json and uuid fields."""
+        value = uuid.uuid4()
+        self.assertEqual(ENCODERS["CharField"]("é"), b"\x00\x00\x00\x02\xc3\xa9")
+        self.assertEqual(ENCODERS["IntegerField"]("7"), struct.pack("!ii", 4, 7))
+        self.assertEqual(ENCODERS["BigAutoField"](7), struct.pack("!iq", 8, 7))
+        self.assertEqual(ENCODERS["FloatField"]("1.5"), struct.pack("!id", 8, 1.5))
+        self.assertEqual(ENCODERS["JSONField"]('{"a": 1}'), b"\x00\x00\x00\x09\x01" + b'{"a": 1}')
+        self.assertEqual(ENCODERS["JSONField"]({}), b"\x00\x00\x00\x03\x01{}")
+        self.assertEqual(ENCODERS["UUIDField"](str(value)), b"\x00\x00\x00\x10" + value.bytes)
+
+    def test_write(self):
+        """Test that rows are framed with the COPY header, field counts and trailer."""
+        writer = BinaryCopyWriter(["IntegerField", "TextField"])
+        data = writer.write([(1, "a"), (None, "")]).read()
+        expected = (
+            COPY_HEADER
+            + struct.pack("!hii", 2, 4, 1)
+            + struct.pack("!i", 1)
+            + b"a"
+            + struct.pack("!hii", 2, -1, -1)
+            + COPY_TRAILER
+        )
+        self.assertEqual(data, expected)
+
+    def test_unsupported_type(self):
+        """Test that a column type without an encoder is rejected."""
+        with self.assertRaises(ValueError):
+            BinaryCopyWriter(["IntegerField", "ArrayField"])
@@ -0,0 +1,38 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the DirtyUsageDayDBAccessor object."""
+import datetime
+
+from masu.database.dirty_usage_day_accessor import DirtyUsageDayDBAccessor
+from masu.test import MasuTestCase
+
+
+class DirtyUsageDayDBAccessorTest(MasuTestCase):
+    """Test Cases for the DirtyUsageDayDBAccessor object."""
+
+    def test_record_and_claim_days(self):
+        """Test that recorded days are claimed once per provider."""
+        days = [datetime.date(2020, 3, 2), datetime.date(2020, 3, 1)]
+        with DirtyUsageDayDBAccessor() as accessor:
+            accessor.record_days(self.aws_provider_uuid, days)
+            accessor.record_days(self.aws_provider_uuid, days[:1])
+            accessor.record_days(self.ocp_provider_uuid, days[:1])
+            accessor.record_days(self.aws_provider_uuid, [])
+
+            self.assertEqual(accessor.claim_days(self.aws_provider_uuid), sorted(days))
+            self.assertEqual(accessor.claim_days(self.aws_provider_uuid), [])
+            self.assertEqual(accessor.claim_days(self.ocp_provider_uuid), days[:1])
@@ -17,6 +17,7 @@
 """Test the OCPReportDBAccessor utility object."""
 import random
 import string
+from unittest.mock import patch
 
 from dateutil import relativedelta
 from django.db import connection
@@ -34,6 +35,7 @@ from masu.external.date_accessor import DateAccessor
 from masu.test import MasuTestCase
 from masu.test.database.helpers import ReportObjectCreator
 from masu.util.common import month_date_range_tuple
+from reporting.models import OCPEnabledTagKeys
 from reporting.models import OCPUsageLineItem
 from reporting.models import OCPUsageLineItemDailySummary
 from reporting.models import OCPUsageReport
@@ -123,6 +125,30 @@ class OCPReportDBAccessorTest(MasuTestCase):
         self.accessor.populate_line_item_daily_summary_table(start_date, end_date, cluster_id)
         return (start_date, end_date)
 
+    def test_merge_staging_table_insert_only_conflict(self):
+        """Test that an insert only merge falls back to an upsert when staged rows conflict."""
+        table_name = OCP_REPORT_TABLE_MAP["line_item"]
+        table = getattr(self.accessor.report_schema, table_name)
+        columns = [field.column for field in table._meta.concrete_fields if not field.primary_key]
+        conflict_columns = ["report_id", "namespace", "pod", "node"]
+        column_str = ",".join(columns)
+        with schema_context(self.schema):
+            initial_count = table.objects.count()
+            staging_table = self.accessor.create_temp_table(table_name, drop_column="id")
+            with connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {staging_table} ({column_str}) SELECT {column_str} FROM {table_name}")
+                # A duplicate staged row is merged once
+                cursor.execute(
+                    f"INSERT INTO {staging_table} ({column_str}) SELECT {column_str} FROM {table_name} LIMIT 1"
+                )
+
+            self.accessor.merge_staging_table(table_name, staging_table, columns, conflict_columns, insert_only=True)
+
+            self.assertEqual(table.objects.count(), initial_count)
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT count(*) FROM {staging_table}")
+                self.assertEqual(cursor.fetchone()[0], 0)
+
     def test_initializer(self):
         """Test initializer."""
         self.assertIsNotNone(self.report_schema)
@@ -318,6 +344,87 @@ class OCPReportDBAccessorTest(MasuTestCase):
             for column in summary_columns:
                 self.assertIsNotNone(getattr(entry, column))
 
+    def test_populate_pod_label_index(self):
+        """Test that the pod label index holds all labels of the daily line items, enabled or not."""
+        report_table_name = OCP_REPORT_TABLE_MAP["report"]
+        daily_table_name = OCP_REPORT_TABLE_MAP["line_item_daily"]
+        index_table_name = OCP_REPORT_TABLE_MAP["pod_label_index"]
+
+        report_table = getattr(self.accessor.report_schema, report_table_name)
+
+        for _ in range(5):
+            self.creator.create_ocp_usage_line_item(self.reporting_period, self.report)
+        self.creator.create_ocp_node_label_line_item(self.reporting_period, self.report)
+
+        with schema_context(self.schema):
+            report_entry = report_table.objects.all().aggregate(Min("interval_start"), Max("interval_start"))
+        start_date = report_entry["interval_start__min"].date()
+        end_date = report_entry["interval_start__max"].date()
+
+        self.accessor.populate_node_label_line_item_daily_table(start_date, end_date, self.cluster_id)
+        self.accessor.populate_line_item_daily_table(start_date, end_date, self.cluster_id)
+        with schema_context(self.schema):
+            # Labels enabled later must match without rebuilding the index
+            OCPEnabledTagKeys.objects.all().delete()
+        self.accessor.populate_pod_label_index(start_date, end_date, self.cluster_id)
+
+        with schema_context(self.schema):
+            daily_query = self.accessor._get_db_obj_query(daily_table_name).filter(
+                cluster_id=self.cluster_id, usage_start__gte=start_date, usage_start__lte=end_date
+            )
+            expected = {
+                (entry.id, key.lower(), value.lower())
+                for entry in daily_query
+                for key, value in (entry.pod_labels or {}).items()
+            }
+            rows = set(
+                self.accessor._get_db_obj_query(index_table_name)
+                .filter(cluster_id=self.cluster_id)
+                .values_list("line_item_id", "key", "value")
+            )
+        self.assertTrue(rows)
+        self.assertEqual(rows, expected)
+
+    def test_update_enabled_pod_labels(self):
+        """Test that the enabled pod labels are projected when built and when the enabled keys change."""
+        report_table_name = OCP_REPORT_TABLE_MAP["report"]
+        daily_table_name = OCP_REPORT_TABLE_MAP["line_item_daily"]
+
+        report_table = getattr(self.accessor.report_schema, report_table_name)
+
+        for _ in range(5):
+            self.creator.create_ocp_usage_line_item(self.reporting_period, self.report)
+        self.creator.create_ocp_node_label_line_item(self.reporting_period, self.report)
+
+        with schema_context(self.schema):
+            report_entry = report_table.objects.all().aggregate(Min("interval_start"), Max("interval_start"))
+        start_date = report_entry["interval_start__min"].date()
+        end_date = report_entry["interval_start__max"].date()
+
+        self.accessor.populate_node_label_line_item_daily_table(start_date, end_date, self.cluster_id)
+        self.accessor.populate_line_item_daily_table(start_date, end_date, self.cluster_id)
+
+        def assert_projected():
+            with schema_context(self.schema):
+                enabled_keys = set(OCPEnabledTagKeys.objects.values_list("key", flat=True))
+                daily_query = self.accessor._get_db_obj_query(daily_table_name).filter(cluster_id=self.cluster_id)
+                for entry in daily_query:
+                    expected = {key: value for key, value in (entry.pod_labels or {}).items() if key in enabled_keys}
+                    self.assertEqual(entry.enabled_pod_labels, expected)
+                    self.assertIsNotNone(entry.enabled_pod_labels_hash)
+
+        assert_projected()
+
+        with schema_context(self.schema):
+            entry = self.accessor._get_db_obj_query(daily_table_name).exclude(pod_labels={}).first()
+            changed_key = list(entry.pod_labels)[0]
+            enabled_key, created = OCPEnabledTagKeys.objects.get_or_create(key=changed_key)
+            if not created:
+                enabled_key.delete()
+
+        self.accessor.update_enabled_pod_labels([changed_key])
+        assert_projected()
+
     def test_populate_line_item_daily_summary_table(self):
         """Test that the line item daily summary table populates."""
         report_table_name = OCP_REPORT_TABLE_MAP["report"]
@@ -403,6 +510,12 @@ class OCPReportDBAccessorTest(MasuTestCase):
 
             self.assertEqual(sorted(tag_keys), sorted(expected_tag_keys))
 
+    @patch("masu.database.ocp_report_db_accessor.invalidate_tag_key_catalog")
+    def test_populate_pod_label_summary_table_invalidates_tag_keys(self, mock_invalidate):
+        """Test that the cached tag keys of the pod label summary table are read again after it is populated."""
+        self.accessor.populate_pod_label_summary_table()
+        mock_invalidate.assert_called_with(self.schema, OCP_REPORT_TABLE_MAP["pod_label_summary"])
+
     def test_populate_volume_label_summary_table(self):
         """Test that the volume label summary table is populated."""
         report_table_name = OCP_REPORT_TABLE_MAP["report"]
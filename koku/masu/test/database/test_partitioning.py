@@ -0,0 +1,106 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the monthly partition helpers."""
+import datetime
+from unittest import TestCase
+
+import pytz
+
+from masu.database import AWS_CUR_TABLE_MAP
+from masu.database import OCP_REPORT_TABLE_MAP
+from masu.database.partitioning import create_partition_sql
+from masu.database.partitioning import is_partitioned
+from masu.database.partitioning import partition_bounds
+from masu.database.partitioning import partition_month
+from masu.database.partitioning import partition_months
+from masu.database.partitioning import partition_name
+from masu.database.partitioning import swap_partition_sql
+
+
+class PartitioningTest(TestCase):
+    """Test cases for the monthly partition helpers."""
+
+    def test_partition_months(self):
+        """Test that every month with dates in the range is returned."""
+        start = datetime.datetime(2019, 11, 3, tzinfo=pytz.UTC)
+        end = datetime.datetime(2020, 2, 1, tzinfo=pytz.UTC)
+        expected = [datetime.date(2019, 11, 1), datetime.date(2019, 12, 1), datetime.date(2020, 1, 1)]
+        self.assertEqual(partition_months(start, end), expected)
+        self.assertEqual(partition_months(start, datetime.date(2020, 2, 2))[-1], datetime.date(2020, 2, 1))
+        # A range that ends where it starts still covers its month
+        self.assertEqual(partition_months(start, start), [datetime.date(2019, 11, 1)])
+
+    def test_partition_name(self):
+        """Test that partition names round trip to their month."""
+        table = AWS_CUR_TABLE_MAP["line_item"]
+        name = partition_name(table, datetime.date(2020, 3, 1))
+        self.assertEqual(name, "reporting_awscostentrylineitem_2020_03")
+        self.assertEqual(partition_month(table, name), datetime.date(2020, 3, 1))
+        self.assertIsNone(partition_month(table, AWS_CUR_TABLE_MAP["line_item_daily"]))
+        self.assertIsNone(partition_month(OCP_REPORT_TABLE_MAP["line_item"], name))
+
+    def test_partition_bounds(self):
+        """Test that a partition holds its month in UTC."""
+        self.assertEqual(
+            partition_bounds(datetime.date(2019, 12, 1)), ("2019-12-01 00:00:00+00", "2020-01-01 00:00:00+00")
+        )
+
+    def test_create_partition_sql(self):
+        """Test that partitions are created with their keys and indexes."""
+        table = OCP_REPORT_TABLE_MAP["line_item"]
+        statements = create_partition_sql(table, datetime.date(2020, 1, 1))
+        self.assertEqual(
+            statements[0],
+            "CREATE TABLE reporting_ocpusagelineitem_2020_01 PARTITION OF reporting_ocpusagelineitem "
+            "FOR VALUES FROM ('2020-01-01 00:00:00+00') TO ('2020-02-01 00:00:00+00')",
+        )
+        self.assertTrue(any("PRIMARY KEY (id)" in statement for statement in statements))
+        self.assertTrue(any("UNIQUE (report_id, namespace, pod, node)" in statement for statement in statements))
+        self.assertTrue(all("reporting_ocpusagelineitem_2020_01" in statement for statement in statements))
+
+    def test_create_partition_sql_foreign_keys(self):
+        """Test that partitions are created with the foreign keys of their model."""
+        statements = create_partition_sql(AWS_CUR_TABLE_MAP["line_item"], datetime.date(2020, 1, 1))
+        foreign_keys = [statement for statement in statements if "FOREIGN KEY" in statement]
+        self.assertEqual(len(foreign_keys), 5)
+        self.assertIn(
+            "ALTER TABLE reporting_awscostentrylineitem_2020_01 ADD CONSTRAINT "
+            "reporting_awscostentrylineitem_2020_01_bill_fk FOREIGN KEY (cost_entry_bill_id) "
+            "REFERENCES reporting_awscostentrybill (id) DEFERRABLE INITIALLY DEFERRED",
+            foreign_keys,
+        )
+        statements = create_partition_sql(OCP_REPORT_TABLE_MAP["line_item"], datetime.date(2020, 1, 1))
+        self.assertEqual(len([statement for statement in statements if "FOREIGN KEY" in statement]), 2)
+
+    def test_swap_partition_sql_renames_foreign_keys(self):
+        """Test that the foreign keys of a swapped in staging table are renamed as constraints."""
+        table = OCP_REPORT_TABLE_MAP["line_item_daily_summary"]
+        statements = swap_partition_sql(table, datetime.date(2020, 1, 1), "staging")
+        self.assertIn(
+            "ALTER TABLE reporting_ocpusagelineitem_daily_summary_2020_01 "
+            "RENAME CONSTRAINT ocp_summary_2020_01_period_fk_new TO ocp_summary_2020_01_period_fk",
+            statements,
+        )
+        self.assertIn(
+            "ALTER INDEX ocp_summary_2020_01_period_idx_new RENAME TO ocp_summary_2020_01_period_idx", statements
+        )
+
+    def test_is_partitioned(self):
+        """Test which tables are partitioned."""
+        self.assertTrue(is_partitioned(AWS_CUR_TABLE_MAP["line_item"]))
+        self.assertTrue(is_partitioned(OCP_REPORT_TABLE_MAP["line_item"]))
+        self.assertFalse(is_partitioned(OCP_REPORT_TABLE_MAP["storage_line_item"]))
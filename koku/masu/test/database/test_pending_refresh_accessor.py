@@ -0,0 +1,57 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the PendingRefreshDBAccessor object."""
+import datetime
+
+from api.models import Provider
+from masu.database.pending_refresh_accessor import PendingRefreshDBAccessor
+from masu.test import MasuTestCase
+
+
+class PendingRefreshDBAccessorTest(MasuTestCase):
+    """Test Cases for the PendingRefreshDBAccessor object."""
+
+    def test_add_and_claim(self):
+        """Test that queued requests are claimed once per schema and provider type."""
+        date_ranges = [("2020-03-01", "2020-03-02"), ("2020-03-05", "2020-03-05")]
+        with PendingRefreshDBAccessor() as accessor:
+            accessor.add(self.schema, Provider.PROVIDER_AWS, date_ranges=date_ranges)
+            accessor.add(self.schema, Provider.PROVIDER_OCP)
+            self.assertIsNotNone(accessor.get_last_requested(self.schema, Provider.PROVIDER_AWS))
+
+            requests = accessor.claim(self.schema, Provider.PROVIDER_AWS)
+            self.assertEqual(
+                sorted(requests),
+                [
+                    (None, datetime.date(2020, 3, 1), datetime.date(2020, 3, 2)),
+                    (None, datetime.date(2020, 3, 5), datetime.date(2020, 3, 5)),
+                ],
+            )
+            self.assertEqual(accessor.claim(self.schema, Provider.PROVIDER_AWS), [])
+            self.assertIsNone(accessor.get_last_requested(self.schema, Provider.PROVIDER_AWS))
+
+            accessor.restore(self.schema, Provider.PROVIDER_AWS, requests)
+            self.assertEqual(sorted(accessor.claim(self.schema, Provider.PROVIDER_AWS)), sorted(requests))
+            self.assertEqual(accessor.claim(self.schema, Provider.PROVIDER_OCP), [(None, None, None)])
+
+    def test_lock_schema(self):
+        """Test that the refresh lock of a schema is taken and released."""
+        with PendingRefreshDBAccessor() as accessor:
+            self.assertTrue(accessor.try_lock_schema(self.schema))
+            accessor.unlock_schema(self.schema)
+            self.assertTrue(accessor.try_lock_schema(self.schema))
+            accessor.unlock_schema(self.schema)
@@ -87,6 +87,17 @@ class ReportManifestDBAccessorTest(IamTestCase):
             self.manifest_accessor.mark_manifest_as_updated(manifest)
             self.assertGreater(manifest.manifest_updated_datetime, now)
 
+    def test_increment_num_processed_files(self):
+        """Test that the processed file count is incremented in the database."""
+        with schema_context(self.schema):
+            manifest = self.manifest_accessor.add(**self.manifest_dict)
+            stale_manifest = self.manifest_accessor.get_manifest_by_id(manifest.id)
+            self.manifest_accessor.increment_num_processed_files(manifest)
+            self.manifest_accessor.increment_num_processed_files(stale_manifest)
+            self.assertEqual(stale_manifest.num_processed_files, 2)
+            manifest = self.manifest_accessor.get_manifest_by_id(manifest.id)
+            self.assertEqual(manifest.num_processed_files, 2)
+
     def test_mark_manifest_as_updated_none_manifest(self):
         """Test that a none manifest doesn't update failure."""
         try:
@@ -0,0 +1,118 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the SQL template registry."""
+import os
+import pkgutil
+from unittest.mock import patch
+
+from django.db import connection
+from jinjasql import JinjaSql
+from tenant_schemas.utils import schema_context
+
+from masu.database.aws_report_db_accessor import AWSReportDBAccessor
+from masu.database.sql_templates import SQLTemplateRegistry
+from masu.database.sql_templates import SQL_TEMPLATES
+from masu.database.sql_templates import numbered_placeholders
+from masu.external.date_accessor import DateAccessor
+from masu.test import MasuTestCase
+from masu.test.database.helpers import ReportObjectCreator
+from reporting.provider.aws.models import AWSCostSummaryByService
+
+
+class SQLTemplateRegistryTest(MasuTestCase):
+    """Test Cases for the SQL template registry."""
+
+    def test_loads_every_template(self):
+        """Test that each SQL file of the directory is registered."""
+        sql_path = os.path.join(os.path.dirname(pkgutil.get_loader("masu.database").get_filename()), "sql")
+        for file_name in os.listdir(sql_path):
+            self.assertIn(os.path.splitext(file_name)[0], SQL_TEMPLATES)
+
+        with self.assertRaises(KeyError):
+            SQL_TEMPLATES.get("reporting_missing_template")
+
+    def test_static_templates(self):
+        """Test that only single statements varying with the schema and table are static."""
+        self.assertTrue(SQL_TEMPLATES.get("reporting_aws_cost_summary_by_service").static)
+        self.assertTrue(SQL_TEMPLATES.get("reporting_ocpusagepodlabel_summary").static)
+        # More than one statement
+        self.assertFalse(SQL_TEMPLATES.get("reporting_awstag_index").static)
+        # Temporary table names
+        self.assertFalse(SQL_TEMPLATES.get("reporting_ocp_storage_charge").static)
+        # Text varying with the parameters
+        self.assertFalse(SQL_TEMPLATES.get("reporting_ocpusagelineitem_daily_enabled_labels").static)
+
+    def test_prepare_query(self):
+        """Test that a registered template renders as JinjaSql renders its source."""
+        name = "reporting_ocpusagelineitem_daily_enabled_labels"
+        params = {"schema": self.schema, "keys": ["app", "environment"]}
+        source = pkgutil.get_data("masu.database", f"sql/{name}.sql").decode("utf-8")
+        expected_sql, expected_params = JinjaSql().prepare_query(source, params)
+
+        sql, bind_params = SQL_TEMPLATES.prepare_query(name, params)
+        self.assertEqual(sql, expected_sql)
+        self.assertEqual(bind_params, list(expected_params))
+
+    def test_numbered_placeholders(self):
+        """Test that placeholders are numbered and escaped percent signs kept."""
+        sql = "SELECT * FROM t WHERE a = %s AND b LIKE 'x%%' AND c = %s"
+        self.assertEqual(numbered_placeholders(sql), "SELECT * FROM t WHERE a = $1 AND b LIKE 'x%' AND c = $2")
+
+    @patch("masu.database.sql_templates.SQL_TEMPLATE_ROWS_COUNTER")
+    @patch("masu.database.sql_templates.SQL_TEMPLATE_DURATION_HISTOGRAM")
+    def test_execute_records_metrics(self, mock_histogram, mock_rows):
+        """Test that the duration and row count of a template are recorded."""
+        name = "reporting_ocpinfrastructure_provider_map"
+        params = {
+            "uuid": "test",
+            "start_date": "2020-01-01",
+            "end_date": "2020-01-31",
+            "schema": self.schema,
+            "aws_provider_uuid": None,
+            "ocp_provider_uuid": None,
+            "azure_provider_uuid": None,
+        }
+        with connection.cursor() as cursor:
+            cursor.db.set_schema(self.schema)
+            rowcount = SQL_TEMPLATES.execute(cursor, name, params)
+
+        mock_histogram.labels.assert_called_with(template=name)
+        mock_histogram.labels.return_value.observe.assert_called()
+        if rowcount > 0:
+            mock_rows.labels.return_value.inc.assert_called_with(rowcount)
+
+    @patch("masu.database.sql_templates.Config.SQL_PREPARED_STATEMENTS", True)
+    def test_execute_prepared(self):
+        """Test that a static template is prepared once per connection and gives the unprepared result."""
+        registry = SQLTemplateRegistry()
+        table_name = AWSCostSummaryByService._meta.db_table
+        usage_date = DateAccessor().today_with_timezone("UTC").replace(hour=0, minute=0, second=0, microsecond=0)
+        creator = ReportObjectCreator(self.schema)
+        bill = creator.create_cost_entry_bill(provider_uuid=self.aws_provider_uuid, bill_date=usage_date)
+        creator.create_awscostentrylineitem_daily_summary(self.customer.account_id, self.schema, bill, usage_date)
+
+        with patch("masu.database.report_db_accessor_base.SQL_TEMPLATES", registry):
+            with AWSReportDBAccessor(self.schema) as accessor:
+                for _ in range(2):
+                    accessor.populate_ui_summary_tables([table_name], usage_date.date(), usage_date.date())
+                    differences = accessor.check_ui_summary_tables([table_name], usage_date.date(), usage_date.date())
+                    self.assertEqual(differences, {table_name: 0})
+
+        with schema_context(self.schema):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT count(*) FROM pg_prepared_statements WHERE name LIKE 'sqlt_%%'")
+                self.assertEqual(cursor.fetchone()[0], 1)
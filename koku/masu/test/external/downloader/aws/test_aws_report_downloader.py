@@ -422,6 +422,43 @@ class AWSReportDownloaderTest(MasuTestCase):
         with self.assertRaises(AWSReportDownloaderNoFileError):
             downloader.download_file(self.fake.file_path())
 
+    @patch("masu.util.aws.common.get_assume_role_session", return_value=FakeSession)
+    def test_get_file_stream(self, fake_session):
+        """Test that a file stream source is returned without downloading the file."""
+        fake_client = Mock()
+        fake_client.head_object.return_value = {"ETag": "etag"}
+
+        auth_credential = fake_arn(service="iam", generate_account_id=True)
+        downloader = AWSReportDownloader(
+            self.mock_task, self.fake_customer_name, auth_credential, self.fake_bucket_name
+        )
+        downloader.s3_client = fake_client
+
+        key = self.fake.file_path(depth=random.randint(1, 5), extension="csv.gz")
+        file_name, etag, source = downloader.get_file_stream(key)
+        self.assertTrue(file_name.endswith(key.split("/")[-1]))
+        self.assertFalse(os.path.exists(file_name))
+        self.assertEqual(etag, "etag")
+        self.assertEqual(source.key, key)
+        self.assertEqual(source.etag, "etag")
+        self.assertEqual(source.role_arn, auth_credential)
+        fake_client.get_object.assert_not_called()
+
+    @patch("masu.util.aws.common.get_assume_role_session", return_value=FakeSession)
+    def test_get_file_stream_raise_nofile_err(self, fake_session):
+        """Test that streaming a nonexistent file fails with AWSReportDownloaderNoFileError."""
+        fake_client = Mock()
+        fake_client.head_object.side_effect = ClientError({"Error": {"Code": "404"}}, "masu-test")
+
+        auth_credential = fake_arn(service="iam", generate_account_id=True)
+        downloader = AWSReportDownloader(
+            self.mock_task, self.fake_customer_name, auth_credential, self.fake_bucket_name
+        )
+        downloader.s3_client = fake_client
+
+        with self.assertRaises(AWSReportDownloaderNoFileError):
+            downloader.get_file_stream(self.fake.file_path())
+
     @patch(
         "masu.external.downloader.aws.aws_report_downloader.AWSReportDownloader.check_if_manifest_should_be_downloaded"
     )
@@ -16,9 +16,11 @@
 #
 """Test the Kafka msg handler."""
 import asyncio
+import io
 import json
 import os
 import shutil
+import tarfile
 import tempfile
 from unittest.mock import patch
 
@@ -94,9 +96,49 @@ class KafkaMsgHandlerTest(MasuTestCase):
                         Config.INSIGHTS_LOCAL_REPORT_DIR, self.cluster_id, self.date_range
                     )
                     self.assertTrue(os.path.isdir(expected_path))
+                    self.assertEqual(
+                        sorted(os.listdir(expected_path)),
+                        sorted(
+                            [
+                                "manifest.json",
+                                "e6b3701e-1e91-433b-b238-a31e49937558_February-2019-my-ocp-cluster-1.csv",
+                                "e6b3701e-1e91-433b-b238-a31e49937558_storage.csv",
+                            ]
+                        ),
+                    )
                     shutil.rmtree(fake_dir)
                     shutil.rmtree(fake_pvc_dir)
 
+    def test_extract_payload_manifest_first(self):
+        """Test that report files following the manifest are written straight to the report directory."""
+        payload_url = "http://insights-upload.com/quarnantine/file_to_validate"
+        data_dir = "./koku/masu/test/data/ocp"
+        with open(f"{data_dir}/manifest.json") as manifest_file:
+            report_files = json.load(manifest_file)["files"]
+
+        payload = io.BytesIO()
+        with tarfile.open(fileobj=payload, mode="w:gz") as payload_tar:
+            for file_name in ["manifest.json"] + report_files:
+                payload_tar.add(f"{data_dir}/{file_name}", arcname=f"payload/{file_name}")
+
+        with requests_mock.mock() as m:
+            m.get(payload_url, content=payload.getvalue())
+
+            fake_dir = tempfile.mkdtemp()
+            with patch.object(Config, "INSIGHTS_LOCAL_REPORT_DIR", fake_dir):
+                with patch("masu.external.kafka_msg_handler.shutil.move", wraps=shutil.move) as mock_move:
+                    report_meta = msg_handler.extract_payload(payload_url)
+            expected_path = "{}/{}/{}".format(fake_dir, self.cluster_id, self.date_range)
+            # Only the manifest is staged before it is moved into place
+            mock_move.assert_called_once()
+            self.assertEqual(report_meta["manifest_path"], f"{expected_path}/manifest.json")
+            for file_name in report_files:
+                with open(f"{data_dir}/{file_name}", "rb") as source, open(
+                    f"{expected_path}/{file_name}", "rb"
+                ) as dest:
+                    self.assertEqual(source.read(), dest.read())
+            shutil.rmtree(fake_dir)
+
     def test_extract_bad_payload(self):
         """Test to verify extracting payload missing report files is not successful."""
         payload_url = "http://insights-upload.com/quarnantine/file_to_validate"
@@ -127,8 +169,8 @@ class KafkaMsgHandlerTest(MasuTestCase):
                     shutil.rmtree(fake_dir)
                     shutil.rmtree(fake_pvc_dir)
 
-    @patch("masu.external.kafka_msg_handler.TarFile.extractall", side_effect=raise_OSError)
-    def test_extract_bad_payload_not_tar(self, mock_extractall):
+    @patch("masu.external.kafka_msg_handler.TarFile.extractfile", side_effect=raise_OSError)
+    def test_extract_bad_payload_not_tar(self, mock_extractfile):
         """Test to verify extracting payload missing report files is not successful."""
         payload_url = "http://insights-upload.com/quarnantine/file_to_validate"
         with requests_mock.mock() as m:
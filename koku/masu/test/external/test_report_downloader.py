@@ -22,6 +22,8 @@ from uuid import uuid4
 from faker import Faker
 
 from api.models import Provider
+from masu.config import Config
+from masu.external.date_accessor import DateAccessor
 from masu.external.downloader.aws.aws_report_downloader import AWSReportDownloader
 from masu.external.downloader.aws.aws_report_downloader import AWSReportDownloaderError
 from masu.external.downloader.aws_local.aws_local_report_downloader import AWSLocalReportDownloader
@@ -136,6 +138,24 @@ class ReportDownloaderTest(MasuTestCase):
         with self.assertRaises(ReportDownloaderError):
             self.create_downloader(FAKE.slug())
 
+    @patch("masu.external.downloader.aws.aws_report_downloader.AWSReportDownloader.__init__", return_value=None)
+    def test_download_report_stream(self, mock_downloader_init):
+        """Assert AWS reports are streamed instead of downloaded when streaming is enabled."""
+        downloader = self.create_downloader(Provider.PROVIDER_AWS)
+        source = Mock()
+        report_context = {"manifest_id": None, "compression": "GZIP", "files": ["/path/to/report.csv.gz"]}
+        with patch.object(Config, "AWS_STREAMING_INGEST", True):
+            with patch.object(AWSReportDownloader, "get_report_context_for_date", return_value=report_context):
+                with patch.object(AWSReportDownloader, "get_local_file_for_report", return_value="report.csv.gz"):
+                    with patch.object(
+                        AWSReportDownloader, "get_file_stream", return_value=("/tmp/report.csv.gz", "etag", source)
+                    ):
+                        with patch.object(AWSReportDownloader, "download_file") as mock_download:
+                            reports = downloader.download_report(DateAccessor().today())
+        mock_download.assert_not_called()
+        self.assertEqual(reports[0]["file"], "/tmp/report.csv.gz")
+        self.assertEqual(reports[0]["stream"], source)
+
     @patch("masu.external.downloader.aws.aws_report_downloader.AWSReportDownloader.__init__", return_value=None)
     def test_get_reports_error(self, mock_downloader_init):
         """Assert ReportDownloaderError is raised when get_reports raises an exception."""
@@ -0,0 +1,99 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the AWSReportBatchParser."""
+import csv
+import json
+
+from masu.database import AWS_CUR_TABLE_MAP
+from masu.database.aws_report_db_accessor import AWSReportDBAccessor
+from masu.processor.aws.aws_report_parser import AWSReportBatchParser
+from masu.test import MasuTestCase
+from reporting_common import REPORT_COLUMN_MAP
+
+
+class AWSReportBatchParserTest(MasuTestCase):
+    """Test Cases for the AWSReportBatchParser object."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test class with required objects."""
+        super().setUpClass()
+        cls.test_report_test_path = "./koku/masu/test/data/test_cur.csv"
+        with open(cls.test_report_test_path, "r") as f:
+            cls.rows = list(csv.reader(f))
+        with open(cls.test_report_test_path, "r") as f:
+            cls.dict_rows = list(csv.DictReader(f))
+
+    def setUp(self):
+        """Set up shared variables."""
+        super().setUp()
+        self.accessor = AWSReportDBAccessor(self.schema)
+        self.parser = AWSReportBatchParser(self.rows[0], self.accessor)
+
+    def test_line_item_columns(self):
+        """Test that only mapped line item columns are projected, in file order."""
+        column_map = REPORT_COLUMN_MAP[AWS_CUR_TABLE_MAP["line_item"]]
+        expected = [column_map[key] for key in self.dict_rows[0] if key in column_map]
+        self.assertEqual(self.parser.line_item_columns, expected)
+
+    def test_parse_line_items_matches_clean_data(self):
+        """Test that column conversion matches per row clean_data."""
+        table_name = AWS_CUR_TABLE_MAP["line_item"]
+        column_map = REPORT_COLUMN_MAP[table_name]
+        expected = []
+        for row in self.dict_rows:
+            data = {column_map[key]: value for key, value in row.items() if key in column_map}
+            expected.append(tuple(self.accessor.clean_data(data, table_name).values()))
+
+        columns = self.parser.parse_line_items([list(row) for row in self.rows[1:]])
+        self.assertEqual(list(zip(*columns)), expected)
+
+    def test_parse_line_items_empty_batch(self):
+        """Test that an empty batch returns empty columns."""
+        columns = self.parser.parse_line_items([])
+        self.assertEqual(len(columns), len(self.parser.line_item_columns))
+        self.assertTrue(all(column == [] for column in columns))
+
+    def test_read_batch(self):
+        """Test that batches are bounded, skip blank rows and pad short rows."""
+        header = ["a", "b", "c"]
+        parser = AWSReportBatchParser(header, self.accessor)
+        reader = iter([["1", "2", "3"], [], ["4"], ["5", "6", "7"]])
+
+        self.assertEqual(parser.read_batch(reader, 2), [["1", "2", "3"], ["4", "", ""]])
+        self.assertEqual(parser.read_batch(reader, 2), [["5", "6", "7"]])
+        self.assertEqual(parser.read_batch(reader, 2), [])
+
+    def test_getter_missing_column(self):
+        """Test that a missing column is returned as None."""
+        getter = self.parser.getter("product/sku", "not/AColumn")
+        row = self.rows[1]
+        self.assertEqual(getter(row), (self.dict_rows[0]["product/sku"], None))
+
+    def test_parse_tags(self):
+        """Test that tags are packaged like AWSReportProcessor._process_tags."""
+        header = ["resourceTags/user:environment", "notATag", "resourceTags/System", "resourceTags/system:system_key"]
+        parser = AWSReportBatchParser(header, self.accessor)
+        batch = [["prod", "value", "value", "system_value"], ["", "value", "value", ""]]
+
+        tags = parser.parse_tags(batch)
+        self.assertEqual(json.loads(tags[0]), {"environment": "prod", "system_key": "system_value"})
+        self.assertEqual(json.loads(tags[1]), {})
+
+    def test_as_dict(self):
+        """Test that a row list is converted to its DictReader form."""
+        self.assertEqual(self.parser.as_dict(self.rows[1]), dict(self.dict_rows[0]))
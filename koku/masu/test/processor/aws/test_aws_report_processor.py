@@ -29,6 +29,7 @@ from unittest.mock import Mock
 from unittest.mock import patch
 
 from dateutil.relativedelta import relativedelta
+from django.db import DataError
 from django.db.models import Max
 from tenant_schemas.utils import schema_context
 
@@ -36,6 +37,7 @@ from api.utils import DateHelper
 from masu.config import Config
 from masu.database import AWS_CUR_TABLE_MAP
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
+from masu.database.dirty_usage_day_accessor import DirtyUsageDayDBAccessor
 from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
 from masu.exceptions import MasuProcessingError
 from masu.external import GZIP_COMPRESSED
@@ -44,6 +46,7 @@ from masu.external.date_accessor import DateAccessor
 from masu.processor.aws.aws_report_processor import AWSReportProcessor
 from masu.processor.aws.aws_report_processor import ProcessedReport
 from masu.test import MasuTestCase
+from masu.util.aws.stream import LocalStreamSource
 from reporting_common import REPORT_COLUMN_MAP
 from reporting_common.models import CostUsageReportManifest
 
@@ -239,6 +242,19 @@ class AWSReportProcessorTest(MasuTestCase):
             processor.process()
             self.assertIn(expected, logger.output)
 
+    def test_process_records_usage_days(self):
+        """Test that the usage days of the processed rows are recorded for summarization."""
+        with open(self.test_report) as report_file:
+            expected = sorted(
+                {
+                    datetime.datetime.strptime(row["lineItem/UsageStartDate"][:10], "%Y-%m-%d").date()
+                    for row in csv.DictReader(report_file)
+                }
+            )
+        self.processor.process()
+        with DirtyUsageDayDBAccessor() as accessor:
+            self.assertEqual(accessor.claim_days(self.aws_provider_uuid), expected)
+
     def test_process_gzip(self):
         """Test the processing of a gzip compressed file."""
         counts = {}
@@ -322,6 +338,94 @@ class AWSReportProcessorTest(MasuTestCase):
                 count = table.objects.count()
             self.assertTrue(count == counts[table_name])
 
+    def test_process_columnar_matches_row_processing(self):
+        """Test that columnar processing writes the same line items as row processing."""
+        table_name = AWS_CUR_TABLE_MAP["line_item"]
+        table = getattr(self.report_schema, table_name)
+        results = []
+        for columnar in (False, True):
+            with schema_context(self.schema):
+                table.objects.all().delete()
+            shutil.copy2(self.test_report_test_path, self.test_report)
+            processor = AWSReportProcessor(
+                schema_name=self.schema,
+                report_path=self.test_report,
+                compression=UNCOMPRESSED,
+                provider_uuid=self.aws_provider_uuid,
+            )
+            processor._columnar = columnar
+            processor._batch_size = 7
+            processor.process()
+            with schema_context(self.schema):
+                line_items = table.objects.order_by("id").values()
+                results.append([{key: value for key, value in item.items() if key != "id"} for item in line_items])
+
+        self.assertNotEqual(results[0], [])
+        self.assertEqual(results[0], results[1])
+
+    def test_process_binary_copy_matches_csv_copy(self):
+        """Test that binary COPY writes the same line items as CSV COPY."""
+        table_name = AWS_CUR_TABLE_MAP["line_item"]
+        table = getattr(self.report_schema, table_name)
+        results = []
+        for columnar, binary_copy in ((False, False), (False, True), (True, True)):
+            with schema_context(self.schema):
+                table.objects.all().delete()
+            shutil.copy2(self.test_report_test_path, self.test_report)
+            processor = AWSReportProcessor(
+                schema_name=self.schema,
+                report_path=self.test_report,
+                compression=UNCOMPRESSED,
+                provider_uuid=self.aws_provider_uuid,
+            )
+            processor._columnar = columnar
+            processor._binary_copy = binary_copy
+            processor.process()
+            with schema_context(self.schema):
+                line_items = table.objects.order_by("id").values()
+                results.append([{key: value for key, value in item.items() if key != "id"} for item in line_items])
+
+        self.assertNotEqual(results[0], [])
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+
+    def test_process_pipelined_copy_error(self):
+        """Test that a failed COPY on the writer thread aborts processing of the file."""
+        processor = AWSReportProcessor(
+            schema_name=self.schema,
+            report_path=self.test_report,
+            compression=UNCOMPRESSED,
+            provider_uuid=self.aws_provider_uuid,
+        )
+        processor._pipeline_depth = 1
+        processor._batch_size = 2
+        with patch.object(AWSReportDBAccessor, "bulk_insert_rows", side_effect=DataError("bad value")):
+            with self.assertRaises(DataError):
+                processor.process()
+
+    def test_process_columnar_finalized(self):
+        """Test that a finalized bill is marked when processing by column."""
+        with open(self.test_report, "r") as f:
+            data = list(csv.DictReader(f))
+        for row in data:
+            row["bill/InvoiceId"] = "12345"
+        with open(self.test_report, "w") as f:
+            writer = csv.DictWriter(f, fieldnames=data[0].keys())
+            writer.writeheader()
+            writer.writerows(data)
+
+        processor = AWSReportProcessor(
+            schema_name=self.schema,
+            report_path=self.test_report,
+            compression=UNCOMPRESSED,
+            provider_uuid=self.aws_provider_uuid,
+        )
+        processor._columnar = True
+        with patch.object(AWSReportDBAccessor, "mark_bill_as_finalized") as mock_mark:
+            processor.process()
+            mock_mark.assert_called()
+            self.assertIsNotNone(mock_mark.call_args[0][0])
+
     def test_process_finalized_rows(self):
         """Test that a finalized bill is processed properly."""
         data = []
@@ -689,6 +793,28 @@ class AWSReportProcessorTest(MasuTestCase):
         cost_entry_id = self.processor._create_cost_entry(self.row, bill_id, self.accessor)
         self.assertEqual(cost_entry_id, expected_id)
 
+    def test_create_cost_entry_existing_not_cached(self):
+        """Test that an existing cost entry missing from the cache is looked up, not duplicated."""
+        table_name = AWS_CUR_TABLE_MAP["cost_entry"]
+        bill_id = self.processor._create_cost_entry_bill(self.row, self.accessor)
+        expected_id = self.processor._create_cost_entry(self.row, bill_id, self.accessor)
+        self.processor.processed_report.remove_processed_rows()
+
+        processor = AWSReportProcessor(
+            schema_name=self.schema,
+            report_path=self.test_report,
+            compression=UNCOMPRESSED,
+            provider_uuid=self.aws_provider_uuid,
+        )
+        self.assertEqual(len(processor.existing_cost_entry_map), 0)
+
+        cost_entry_id = processor._create_cost_entry(self.row, bill_id, self.accessor)
+        self.assertEqual(cost_entry_id, expected_id)
+        with schema_context(self.schema):
+            count = self.accessor._get_db_obj_query(table_name).filter(bill_id=bill_id).count()
+        self.assertEqual(count, 1)
+        self.assertEqual(processor.existing_cost_entry_map.lookups, 1)
+
     def test_create_cost_entry_line_item(self):
         """Test that line item data is returned properly."""
         bill_id = self.processor._create_cost_entry_bill(self.row, self.accessor)
@@ -901,6 +1027,41 @@ class AWSReportProcessorTest(MasuTestCase):
 
         self.assertFalse(result)
 
+    def test_peek_finalized_bill_keeps_lines(self):
+        """Test that the lines read to check finalization are processed too."""
+        with open(self.test_report, "r") as f:
+            expected = f.readlines()
+        with open(self.test_report, "r") as f:
+            is_finalized, lines = AWSReportProcessor._peek_finalized_bill(f)
+            self.assertFalse(is_finalized)
+            self.assertEqual(list(lines), expected)
+
+    def test_process_stream(self):
+        """Test that a streamed report is processed without reading it from report_path."""
+        table_name = AWS_CUR_TABLE_MAP["line_item"]
+        report_path = f"{self.temp_dir}/streamed_cur.csv.gz"
+        with open(self.test_report, "rb") as f:
+            with gzip.open(report_path, "wb") as gz_file:
+                shutil.copyfileobj(f, gz_file)
+
+        processor = AWSReportProcessor(
+            schema_name=self.schema,
+            report_path=f"{self.temp_dir}/not_downloaded.csv.gz",
+            compression=GZIP_COMPRESSED,
+            provider_uuid=self.aws_provider_uuid,
+            stream_source=LocalStreamSource(report_path),
+        )
+        with schema_context(self.schema):
+            before_count = self.accessor._get_db_obj_query(table_name).count()
+        processor.process()
+
+        with schema_context(self.schema):
+            count = self.accessor._get_db_obj_query(table_name).count()
+        with open(self.test_report, "r") as f:
+            expected_count = len(list(csv.DictReader(f)))
+        self.assertEqual(count - before_count, expected_count)
+        self.assertTrue(os.path.exists(report_path))
+
     def test_check_for_finalized_bill_empty_bill(self):
         """Verify that an empty file is not marked as finalzed."""
         tmp_file = "/tmp/test_process_finalized_rows.csv"
@@ -947,6 +1108,29 @@ class AWSReportProcessorTest(MasuTestCase):
                 self.assertTrue(result)
                 self.assertLess(line_item_query.count(), before_count)
 
+    def test_delete_stale_line_items_records_usage_days(self):
+        """Test that the days of deleted line items are recorded when files are processed in parallel."""
+        manifest = CostUsageReportManifest.objects.filter(
+            provider__uuid=self.aws_provider_uuid, billing_period_start_datetime=DateHelper().this_month_start
+        ).first()
+        manifest.num_processed_files = 0
+        manifest.save()
+        processor = AWSReportProcessor(
+            schema_name=self.schema,
+            report_path=self.test_report,
+            compression=UNCOMPRESSED,
+            provider_uuid=self.aws_provider_uuid,
+            manifest_id=manifest.id,
+        )
+        with DirtyUsageDayDBAccessor() as accessor:
+            accessor.claim_days(self.aws_provider_uuid)
+
+        self.assertTrue(processor.delete_stale_line_items())
+
+        today = self.date_accessor.today_with_timezone("UTC").date()
+        with DirtyUsageDayDBAccessor() as accessor:
+            self.assertIn(today, accessor.claim_days(self.aws_provider_uuid))
+
     def test_delete_line_items_not_first_file_in_manifest(self):
         """Test that data is not deleted once a file has been processed."""
         self.manifest.num_processed_files = 1
@@ -967,6 +1151,24 @@ class AWSReportProcessorTest(MasuTestCase):
                 self.assertFalse(result)
                 self.assertNotEqual(line_item_query.count(), 0)
 
+    def test_delete_line_items_skipped(self):
+        """Test that no data is deleted when the manifest was already cleaned up."""
+        manifest = CostUsageReportManifest.objects.filter(
+            provider__uuid=self.aws_provider_uuid, billing_period_start_datetime=DateHelper().this_month_start
+        ).first()
+        manifest.num_processed_files = 0
+        manifest.save()
+        processor = AWSReportProcessor(
+            schema_name=self.schema,
+            report_path=self.test_report,
+            compression=UNCOMPRESSED,
+            provider_uuid=self.aws_provider_uuid,
+            manifest_id=manifest.id,
+            skip_line_item_delete=True,
+        )
+        self.assertFalse(processor._delete_line_items(AWSReportDBAccessor))
+        self.assertFalse(processor.delete_stale_line_items())
+
     def test_delete_line_items_no_manifest(self):
         """Test that no data is deleted without a manifest id."""
         processor = AWSReportProcessor(
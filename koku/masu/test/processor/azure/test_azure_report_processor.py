@@ -301,6 +301,28 @@ class AzureReportProcessorTest(MasuTestCase):
 
         self.assertIsNotNone(self.processor.line_item_columns)
 
+    def test_azure_create_cost_entry_objects_for_batch(self):
+        """Test that a batch resolves the same ids as creating objects row by row."""
+        with open(self.test_report_path, "r", encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+
+        self.processor.create_cost_entry_objects_for_batch(rows, self.accessor)
+        line_items = self.processor.processed_report.line_items
+        self.assertEqual(len(line_items), len(rows))
+
+        processor = AzureReportProcessor(
+            schema_name=self.schema,
+            report_path=self.test_report,
+            compression=UNCOMPRESSED,
+            provider_uuid=self.azure_provider_uuid,
+        )
+        for row, line_item in zip(rows, line_items):
+            self.assertEqual(line_item["cost_entry_bill_id"], processor._create_cost_entry_bill(row, self.accessor))
+            self.assertEqual(
+                line_item["cost_entry_product_id"], processor._create_cost_entry_product(row, self.accessor)
+            )
+            self.assertEqual(line_item["meter_id"], processor._create_meter(row, self.accessor))
+
     def test_should_process_row_within_cuttoff_date(self):
         """Test that we correctly determine a row should be processed."""
         today = self.date_accessor.today_with_timezone("UTC")
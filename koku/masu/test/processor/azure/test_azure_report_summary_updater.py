@@ -149,7 +149,10 @@ class AzureReportSummaryUpdaterTest(MasuTestCase):
         mock_summary.assert_not_called()
 
         self.updater.update_summary_tables(start_date_str, end_date_str)
-        self.assertEqual(mock_summary.call_args_list, expected_calls)
+        expected_summary_calls = [
+            call(expected_end_date.replace(day=1).date(), expected_end_date.date(), [str(bill.id)])
+        ]
+        self.assertEqual(mock_summary.call_args_list, expected_summary_calls)
 
         with AzureReportDBAccessor(self.schema) as accessor:
             bill = accessor.get_cost_entry_bills_by_date(bill_date)[0]
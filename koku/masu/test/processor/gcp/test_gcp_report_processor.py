@@ -164,6 +164,36 @@ class GCPReportProcessorTest(MasuTestCase):
             gcp_project = GCPProject.objects.get(id=project.id)
             self.assertEquals(gcp_project.account_id, account_id)
 
+    def test_get_or_create_batch_dimensions(self):
+        """Test that bills and projects of a batch are created once and existing ones are fetched."""
+        existing_project_id = fake.word()
+        with schema_context(self.schema):
+            project = GCPProject.objects.create(
+                project_id=existing_project_id,
+                account_id=fake.word(),
+                project_number=fake.pyint(),
+                project_name=fake.word(),
+            )
+        new_project_id = fake.word() + "-new"
+        rows = [
+            {
+                "Start Time": "2019-09-17T00:00:00-07:00",
+                "Project ID": project_id,
+                "Account ID": fake.word(),
+                "Project Number": fake.pyint(),
+                "Project Name": fake.word(),
+            }
+            for project_id in (existing_project_id, new_project_id, new_project_id)
+        ]
+        bill_ids, project_ids = self.processor._get_or_create_batch_dimensions(rows, self.accessor)
+
+        self.assertEqual(len(set(bill_ids)), 1)
+        self.assertEqual(project_ids[0], project.id)
+        self.assertEqual(project_ids[1], project_ids[2])
+        with schema_context(self.schema):
+            self.assertEqual(GCPProject.objects.filter(project_id=new_project_id).count(), 1)
+            self.assertTrue(GCPCostEntryBill.objects.filter(id=bill_ids[0]).exists())
+
     def test_gcp_process_twice(self):
         """Test the processing of an GCP file again, results in the same amount of objects."""
         self.processor.process()
@@ -314,6 +314,63 @@ class OCPReportProcessorTest(MasuTestCase):
             count = table.objects.count()
         self.assertEqual(count, initial_count + expected_new_count)
 
+    def test_process_single_merge_matches_batch_merge(self):
+        """Test that merging once per file writes the same line items as merging per batch."""
+        table_name = OCP_REPORT_TABLE_MAP["line_item"]
+        table = getattr(self.accessor.report_schema, table_name)
+        results = []
+        for single_merge in (False, True):
+            with schema_context(self.schema):
+                table.objects.all().delete()
+            shutil.copy2(self.test_report_path, self.test_report)
+            processor = OCPReportProcessor(
+                schema_name=self.schema,
+                report_path=self.test_report,
+                compression=UNCOMPRESSED,
+                provider_uuid=self.ocp_provider_uuid,
+            )
+            processor._processor._single_merge = single_merge
+            processor._processor._batch_size = 5
+            processor.process()
+            with schema_context(self.schema):
+                line_items = table.objects.order_by("report_id", "namespace", "pod", "node").values()
+                results.append([{key: value for key, value in item.items() if key != "id"} for item in line_items])
+
+        self.assertNotEqual(results[0], [])
+        self.assertEqual(results[0], results[1])
+
+    def test_process_single_merge_insert_only(self):
+        """Test that staged line items are inserted without an upsert only when all their reports are new."""
+        table_name = OCP_REPORT_TABLE_MAP["line_item"]
+        table = getattr(self.accessor.report_schema, table_name)
+        report_table = getattr(self.accessor.report_schema, OCP_REPORT_TABLE_MAP["report"])
+        with schema_context(self.schema):
+            report_table.objects.filter(report_period__cluster_id="my-ocp-cluster-1").delete()
+        counts = []
+        insert_only = []
+        for _ in range(2):
+            shutil.copy2(self.test_report_path, self.test_report)
+            processor = OCPReportProcessor(
+                schema_name=self.schema,
+                report_path=self.test_report,
+                compression=UNCOMPRESSED,
+                provider_uuid=self.ocp_provider_uuid,
+            )
+            processor._processor._single_merge = True
+            with patch.object(
+                OCPReportDBAccessor,
+                "merge_staging_table",
+                autospec=True,
+                side_effect=OCPReportDBAccessor.merge_staging_table,
+            ) as mock_merge:
+                processor.process()
+            insert_only.append(mock_merge.call_args[1]["insert_only"])
+            with schema_context(self.schema):
+                counts.append(table.objects.count())
+
+        self.assertEqual(insert_only, [True, False])
+        self.assertEqual(counts[0], counts[1])
+
     def test_get_file_opener_default(self):
         """Test that the default file opener is returned."""
         opener, mode = self.ocp_processor._processor._get_file_opener(UNCOMPRESSED)
@@ -191,9 +191,12 @@ class OCPReportSummaryUpdaterTest(MasuTestCase):
         mock_storage_summary.assert_not_called()
 
         self.updater.update_summary_tables(start_date_str, end_date_str)
+        expected_summary_calls = [
+            call(expected_end_date.replace(day=1).date(), expected_end_date.date(), self.cluster_id)
+        ]
 
-        self.assertEqual(mock_sum.call_args_list, expected_calls)
-        self.assertEqual(mock_storage_summary.call_args_list, expected_calls)
+        self.assertEqual(mock_sum.call_args_list, expected_summary_calls)
+        self.assertEqual(mock_storage_summary.call_args_list, expected_summary_calls)
 
         with OCPReportDBAccessor(self.schema) as accessor:
             period = accessor.get_usage_periods_by_date(bill_date).filter(provider_id=self.ocp_provider_uuid)[0]
@@ -274,8 +277,11 @@ class OCPReportSummaryUpdaterTest(MasuTestCase):
         mock_storage_summary.assert_not_called()
 
         self.updater.update_summary_tables(start_date_str, end_date_str)
-        self.assertEqual(mock_sum.call_args_list, expected_calls)
-        self.assertEqual(mock_storage_summary.call_args_list, expected_calls)
+        expected_summary_calls = [
+            call(expected_end_date.replace(day=1).date(), expected_end_date.date(), self.cluster_id)
+        ]
+        self.assertEqual(mock_sum.call_args_list, expected_summary_calls)
+        self.assertEqual(mock_storage_summary.call_args_list, expected_summary_calls)
 
         with OCPReportDBAccessor(self.schema) as accessor:
             period = accessor.get_usage_periods_by_date(bill_date)[0]
@@ -0,0 +1,77 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the DimensionCache."""
+from unittest.mock import Mock
+
+from masu.processor.dimension_cache import DimensionCache
+from masu.test import MasuTestCase
+
+
+class DimensionCacheTest(MasuTestCase):
+    """Test cases for the DimensionCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the cache is bounded and evicts the oldest keys."""
+        cache = DimensionCache("test", max_size=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        self.assertIn("a", cache)
+        cache["c"] = 3
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache["c"], 3)
+
+    def test_prefetch(self):
+        """Test that only uncached keys are looked up, once."""
+        loader = Mock(return_value={"b": 2})
+        cache = DimensionCache("test", loader=loader)
+        cache.update({"a": 1})
+
+        cache.prefetch(["a", "b", "c", "b"])
+        cache.prefetch(["b", "c"])
+
+        loader.assert_called_once_with(["b", "c"])
+        self.assertEqual(cache.get("b"), 2)
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual(cache.lookups, 2)
+
+        cache["c"] = 3
+        cache.prefetch(["c"])
+        loader.assert_called_once()
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_prefetch_without_loader(self):
+        """Test that a cache without a loader does not look anything up."""
+        cache = DimensionCache("test")
+        cache.prefetch(["a"])
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.lookups, 0)
+
+    def test_report(self):
+        """Test that the counters are logged and reset."""
+        cache = DimensionCache("test")
+        cache["a"] = 1
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        with self.assertLogs("masu.processor.dimension_cache", level="INFO") as logger:
+            cache.report()
+            self.assertIn("1 hits, 1 misses", logger.output[0])
+        self.assertEqual((cache.hits, cache.misses, cache.lookups), (0, 0, 0))
@@ -0,0 +1,143 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the IngestPipeline object."""
+import threading
+from contextlib import contextmanager
+
+from masu.processor.ingest_pipeline import IngestPipeline
+from masu.test import MasuTestCase
+
+
+class FakeAccessor:
+    """An accessor that records the thread it was used on."""
+
+    def __init__(self, schema):
+        """Initialize the accessor."""
+        self.schema = schema
+        self.thread = None
+
+    def __enter__(self):
+        """Enter the accessor context."""
+        self.thread = threading.current_thread()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit the accessor context."""
+
+
+class IngestPipelineTest(MasuTestCase):
+    """Test Cases for the IngestPipeline object."""
+
+    def setUp(self):
+        """Set up the writer."""
+        super().setUp()
+        self.written = []
+        self.writer_closed = threading.Event()
+        self.accessors = []
+
+    @contextmanager
+    def open_writer(self, report_db_accessor, fail_on=None):
+        """Yield a writer that records batches, failing on the batch fail_on."""
+        self.accessors.append(report_db_accessor)
+
+        def write(batch):
+            if batch == fail_on:
+                raise ValueError("copy failed")
+            self.written.append((batch, threading.current_thread()))
+
+        try:
+            yield write
+        finally:
+            self.writer_closed.set()
+
+    def test_inline(self):
+        """Test that a depth of 0 writes each batch on the calling thread with its accessor."""
+        accessor = FakeAccessor(self.schema)
+        with IngestPipeline(accessor, self.open_writer, depth=0) as pipeline:
+            pipeline.submit(1)
+            self.assertEqual(self.written, [(1, threading.current_thread())])
+            pipeline.submit(2)
+        self.assertEqual([batch for batch, _ in self.written], [1, 2])
+        self.assertEqual(self.accessors, [accessor])
+        self.assertTrue(self.writer_closed.is_set())
+
+    def test_threaded(self):
+        """Test that batches are written in order on a writer thread with its own accessor."""
+        accessor = FakeAccessor(self.schema)
+        with IngestPipeline(accessor, self.open_writer, depth=1) as pipeline:
+            for batch in range(5):
+                pipeline.submit(batch)
+        self.assertEqual([batch for batch, _ in self.written], list(range(5)))
+        writer_thread = self.written[0][1]
+        self.assertNotEqual(writer_thread, threading.current_thread())
+        self.assertIsNot(self.accessors[0], accessor)
+        self.assertEqual(self.accessors[0].schema, self.schema)
+        self.assertEqual(self.accessors[0].thread, writer_thread)
+        self.assertEqual(pipeline.batches, 5)
+
+    def test_backpressure(self):
+        """Test that submit blocks while the writer is busy and the queue is full."""
+        release = threading.Event()
+
+        @contextmanager
+        def open_slow_writer(report_db_accessor):
+            def write(batch):
+                release.wait(5)
+                self.written.append(batch)
+
+            yield write
+
+        submitted = []
+
+        def parse():
+            with IngestPipeline(FakeAccessor(self.schema), open_slow_writer, depth=1) as pipeline:
+                for batch in range(3):
+                    pipeline.submit(batch)
+                    submitted.append(batch)
+
+        parser = threading.Thread(target=parse)
+        parser.start()
+        # One batch is being written and one is queued, so the third waits
+        parser.join(1.5)
+        self.assertTrue(parser.is_alive())
+        self.assertEqual(submitted, [0, 1])
+        release.set()
+        parser.join(5)
+        self.assertEqual(self.written, [0, 1, 2])
+
+    def test_writer_error_aborts(self):
+        """Test that a failed write is raised to the parser stage."""
+        accessor = FakeAccessor(self.schema)
+
+        def open_writer(report_db_accessor):
+            return self.open_writer(report_db_accessor, fail_on=1)
+
+        with self.assertRaises(ValueError):
+            with IngestPipeline(accessor, open_writer, depth=1) as pipeline:
+                for batch in range(10):
+                    pipeline.submit(batch)
+        self.assertEqual([batch for batch, _ in self.written], [0])
+
+    def test_parser_error_stops_writer(self):
+        """Test that a parser failure stops the writer without writing the queued batches."""
+        accessor = FakeAccessor(self.schema)
+        with self.assertRaises(KeyError):
+            with IngestPipeline(accessor, self.open_writer, depth=1) as pipeline:
+                pipeline.submit(0)
+                raise KeyError("bad row")
+        self.assertTrue(self.writer_closed.is_set())
+        self.assertLessEqual(len(self.written), 1)
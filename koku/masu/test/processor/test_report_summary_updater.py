@@ -22,6 +22,7 @@ from uuid import uuid4
 from api.provider.models import Provider
 from api.provider.models import ProviderAuthentication
 from api.provider.models import ProviderBillingSource
+from masu.database.dirty_usage_day_accessor import DirtyUsageDayDBAccessor
 from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
 from masu.external.date_accessor import DateAccessor
 from masu.processor.aws.aws_report_summary_updater import AWSReportSummaryUpdater
@@ -223,3 +224,30 @@ class ReportSummaryUpdaterTest(MasuTestCase):
         manifest_id = manifest.id
         with self.assertRaises(ReportSummaryUpdaterError):
             ReportSummaryUpdater(self.schema, no_provider_uuid, manifest_id)
+
+    def test_claim_dirty_date_ranges(self):
+        """Test that the recorded days are summarized as runs of days without the manifest."""
+        billing_start = DateAccessor().today_with_timezone("UTC").replace(day=1)
+        manifest_dict = {
+            "assembly_id": "1234",
+            "billing_period_start_datetime": billing_start,
+            "num_total_files": 1,
+            "num_processed_files": 1,
+            "provider_uuid": self.ocp_provider_uuid,
+        }
+        with ReportManifestDBAccessor() as accessor:
+            manifest = accessor.add(**manifest_dict)
+        updater = ReportSummaryUpdater(self.schema, self.ocp_test_provider_uuid, manifest.id)
+        self.assertEqual(updater.claim_dirty_date_ranges(), [])
+        self.assertIsNotNone(updater._updater._manifest)
+
+        days = [datetime.date(2020, 3, 1), datetime.date(2020, 3, 2), datetime.date(2020, 3, 9)]
+        with DirtyUsageDayDBAccessor() as accessor:
+            accessor.record_days(self.ocp_provider_uuid, days)
+        expected = [("2020-03-01", "2020-03-02"), ("2020-03-09", "2020-03-09")]
+        self.assertEqual(updater.claim_dirty_date_ranges(), expected)
+        self.assertIsNone(updater._updater._manifest)
+
+        updater.restore_dirty_days()
+        with DirtyUsageDayDBAccessor() as accessor:
+            self.assertEqual(accessor.claim_days(self.ocp_provider_uuid), days)
@@ -0,0 +1,95 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the SummaryExecutor object."""
+import threading
+from unittest.mock import patch
+
+from masu.processor.summary_executor import SummaryExecutor
+from masu.processor.summary_executor import summary_workers
+from masu.test import MasuTestCase
+
+
+class FakeAccessor:
+    """An accessor that records the thread it was opened on."""
+
+    opened = []
+
+    def __init__(self, schema):
+        """Initialize the accessor."""
+        self.schema = schema
+
+    def __enter__(self):
+        """Enter the accessor context."""
+        self.opened.append(threading.current_thread())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit the accessor context."""
+
+
+class SummaryExecutorTest(MasuTestCase):
+    """Test Cases for the SummaryExecutor object."""
+
+    def setUp(self):
+        """Set up the windows."""
+        super().setUp()
+        FakeAccessor.opened = []
+        self.windows = [("2020-03-01", "2020-03-05"), ("2020-03-06", "2020-03-10"), ("2020-03-11", "2020-03-15")]
+        self.ran = []
+        self.lock = threading.Lock()
+
+    def step(self, accessor, start, end):
+        """Record a window and the thread it ran on."""
+        with self.lock:
+            self.ran.append((start, end, threading.current_thread()))
+
+    def test_summary_workers(self):
+        """Test that the workers of a schema default to SUMMARY_WORKERS."""
+        with patch("masu.processor.summary_executor.Config") as mock_config:
+            mock_config.SUMMARY_WORKERS = 2
+            mock_config.SUMMARY_TENANT_WORKERS = f"other:8, {self.schema}:4"
+            self.assertEqual(summary_workers(self.schema), 4)
+            self.assertEqual(summary_workers("acct1"), 2)
+            mock_config.SUMMARY_WORKERS = 0
+            mock_config.SUMMARY_TENANT_WORKERS = ""
+            self.assertEqual(summary_workers(self.schema), 1)
+
+    def test_run_inline(self):
+        """Test that a single worker runs the windows in order on the calling thread."""
+        SummaryExecutor(self.schema, workers=1).run(FakeAccessor, self.windows, self.step)
+        self.assertEqual([(start, end) for start, end, _ in self.ran], self.windows)
+        self.assertTrue(all(thread is threading.current_thread() for _, _, thread in self.ran))
+        self.assertEqual(len(FakeAccessor.opened), 1)
+
+    def test_run_concurrently(self):
+        """Test that windows run on worker threads with an accessor each."""
+        SummaryExecutor(self.schema, workers=3, database_workers=0).run(FakeAccessor, self.windows, self.step)
+        self.assertEqual(sorted((start, end) for start, end, _ in self.ran), self.windows)
+        self.assertTrue(all(thread is not threading.current_thread() for _, _, thread in self.ran))
+        self.assertEqual(len(FakeAccessor.opened), 3)
+
+    def test_run_concurrently_error(self):
+        """Test that a failed window is raised once all windows are done."""
+
+        def step(accessor, start, end):
+            if start == "2020-03-01":
+                raise ValueError("summary failed")
+            self.step(accessor, start, end)
+
+        with self.assertRaises(ValueError):
+            SummaryExecutor(self.schema, workers=2, database_workers=0).run(FakeAccessor, self.windows, step)
+        self.assertEqual(len(self.ran), 2)
@@ -39,6 +39,7 @@ from masu.database import AWS_CUR_TABLE_MAP
 from masu.database import OCP_REPORT_TABLE_MAP
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.database.ocp_report_db_accessor import OCPReportDBAccessor
+from masu.database.pending_refresh_accessor import PendingRefreshDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.database.provider_status_accessor import ProviderStatusCode
 from masu.database.report_manifest_db_accessor import ReportManifestDBAccessor
@@ -46,20 +47,25 @@ from masu.database.report_stats_db_accessor import ReportStatsDBAccessor
 from masu.external.report_downloader import ReportDownloaderError
 from masu.processor._tasks.download import _get_report_files
 from masu.processor._tasks.process import _process_report_file
+from masu.processor._tasks.process import _process_report_files_in_parallel
 from masu.processor.expired_data_remover import ExpiredDataRemover
 from masu.processor.report_processor import ReportProcessorError
+from masu.processor.tasks import check_ui_summary_tables
 from masu.processor.tasks import get_report_files
 from masu.processor.tasks import refresh_materialized_views
 from masu.processor.tasks import remove_expired_data
+from masu.processor.tasks import request_refresh
+from masu.processor.tasks import run_pending_refreshes
 from masu.processor.tasks import summarize_reports
 from masu.processor.tasks import update_all_summary_tables
 from masu.processor.tasks import update_cost_model_costs
+from masu.processor.tasks import update_enabled_pod_labels
 from masu.processor.tasks import update_summary_tables
 from masu.processor.tasks import vacuum_schema
 from masu.test import MasuTestCase
 from masu.test.database.helpers import ReportObjectCreator
 from masu.test.external.downloader.aws import fake_arn
-from reporting.models import AWS_MATERIALIZED_VIEWS
+from reporting.models import AWS_UI_SUMMARY_TABLES
 
 
 class FakeDownloader(Mock):
@@ -320,6 +326,35 @@ class ProcessReportFileTests(MasuTestCase):
         mock_manifest_acc.mark_manifest_as_updated.assert_not_called()
         shutil.rmtree(report_dir)
 
+    @patch("masu.processor._tasks.process.Pool")
+    @patch("masu.processor._tasks.process.ReportProcessor")
+    def test_process_report_files_in_parallel(self, mock_processor, mock_pool):
+        """Test that stale line items are deleted once per manifest before files are processed."""
+        provider = Provider.PROVIDER_AWS
+        report_dicts = [
+            {"file": "/tmp/file1.csv", "compression": "gzip", "manifest_id": 1},
+            {"file": "/tmp/file2.csv", "compression": "gzip", "manifest_id": 1},
+            {"file": "/tmp/file3.csv", "compression": "gzip", "manifest_id": 2},
+        ]
+        pool = mock_pool.return_value
+
+        _process_report_files_in_parallel(self.schema, provider, self.aws_provider_uuid, report_dicts, 2)
+
+        self.assertEqual(mock_processor.return_value.delete_stale_line_items.call_count, 2)
+        mock_pool.assert_called_with(processes=2)
+        self.assertEqual(pool.apply_async.call_count, 3)
+        for call, report_dict in zip(pool.apply_async.call_args_list, report_dicts):
+            self.assertEqual(
+                call[0],
+                (
+                    _process_report_file,
+                    (self.schema, provider, self.aws_provider_uuid, report_dict),
+                    {"skip_line_item_delete": True},
+                ),
+            )
+        pool.apply_async.return_value.get.assert_called()
+        pool.join.assert_called()
+
     @patch("masu.processor.tasks.update_summary_tables")
     def test_summarize_reports_empty_list(self, mock_update_summary):
         """Test that the summarize_reports task is called when empty processing list is provided."""
@@ -525,6 +560,33 @@ class TestProcessorTasks(MasuTestCase):
         reports = get_report_files(**self.get_report_args)
         self.assertIsNotNone(reports)
 
+    @patch("masu.processor.tasks.ReportStatsDBAccessor.get_last_completed_datetime")
+    @patch("masu.processor.tasks.ReportStatsDBAccessor.get_last_started_datetime")
+    @patch("masu.processor.tasks._get_report_files")
+    @patch("masu.processor.tasks._process_report_files_in_parallel")
+    @patch("masu.processor.tasks._process_report_file")
+    def test_get_report_files_parallel(
+        self, mock_process_file, mock_process_parallel, mock_get_files, mock_started, mock_completed
+    ):
+        """Test that files are processed in parallel and summarized once per manifest."""
+        reports = [
+            {"file": self.fake.word(), "compression": "GZIP", "manifest_id": 1},
+            {"file": self.fake.word(), "compression": "GZIP", "manifest_id": 1},
+        ]
+        mock_get_files.return_value = reports
+        mock_started.return_value = None
+        mock_completed.return_value = None
+
+        with patch.object(Config, "REPORT_PROCESSING_WORKERS", 4):
+            reports_to_summarize = get_report_files(**self.get_report_args)
+
+        mock_process_file.assert_not_called()
+        mock_process_parallel.assert_called_once_with(
+            self.schema, Provider.PROVIDER_AWS_LOCAL, self.aws_provider_uuid, reports, 4
+        )
+        self.assertEqual(len(reports_to_summarize), 1)
+        self.assertEqual(reports_to_summarize[0]["manifest_id"], 1)
+
     @patch("masu.processor.tasks.ReportStatsDBAccessor.get_last_completed_datetime")
     @patch("masu.processor.tasks.ReportStatsDBAccessor.get_last_started_datetime")
     @patch("masu.processor.tasks._process_report_file")
@@ -542,7 +604,7 @@ class TestRemoveExpiredDataTasks(MasuTestCase):
     """Test cases for Processor Celery tasks."""
 
     @patch.object(ExpiredDataRemover, "remove")
-    @patch("masu.processor.tasks.refresh_materialized_views.delay")
+    @patch("masu.processor.tasks.request_refresh.delay")
     def test_remove_expired_data(self, fake_view, fake_remover):
         """Test task."""
         expected_results = [{"account_payer_id": "999999999", "billing_period_start": "2018-06-24 15:47:33.052509"}]
@@ -557,7 +619,7 @@ class TestRemoveExpiredDataTasks(MasuTestCase):
             self.assertIn(expected.format(str(expected_results)), logger.output)
 
     @patch.object(ExpiredDataRemover, "remove")
-    @patch("masu.processor.tasks.refresh_materialized_views.delay")
+    @patch("masu.processor.tasks.request_refresh.delay")
     def test_remove_expired_line_items_only(self, fake_view, fake_remover):
         """Test task."""
         expected_results = [{"account_payer_id": "999999999", "billing_period_start": "2018-06-24 15:47:33.052509"}]
@@ -598,7 +660,7 @@ class TestUpdateSummaryTablesTask(MasuTestCase):
         self.start_date = DateHelper().today.replace(day=1)
 
     @patch("masu.processor.tasks.chain")
-    @patch("masu.processor.tasks.refresh_materialized_views")
+    @patch("masu.processor.tasks.request_refresh")
     @patch("masu.processor.tasks.update_cost_model_costs")
     def test_update_summary_tables_aws(self, mock_charge_info, mock_views, mock_chain):
         """Test that the summary table task runs."""
@@ -628,6 +690,10 @@ class TestUpdateSummaryTablesTask(MasuTestCase):
             self.assertNotEqual(summary_query.count(), initial_summary_count)
 
         mock_chain.return_value.apply_async.assert_called()
+        # Only the chained request_refresh rebuilds the UI summary tables
+        mock_charge_info.si.assert_called()
+        for call in mock_charge_info.si.call_args_list:
+            self.assertFalse(call[1]["refresh"])
 
     @patch("masu.processor.tasks.update_cost_model_costs")
     def test_update_summary_tables_aws_end_date(self, mock_charge_info):
@@ -680,7 +746,7 @@ class TestUpdateSummaryTablesTask(MasuTestCase):
         self.assertEqual(result_end_date, expected_end_date.date())
 
     @patch("masu.processor.tasks.chain")
-    @patch("masu.processor.tasks.refresh_materialized_views")
+    @patch("masu.processor.tasks.request_refresh")
     @patch("masu.processor.tasks.update_cost_model_costs")
     @patch("masu.processor.ocp.ocp_cost_model_cost_updater.CostModelDBAccessor")
     def test_update_summary_tables_ocp(self, mock_cost_model, mock_charge_info, mock_view, mock_chain):
@@ -815,7 +881,7 @@ class TestUpdateSummaryTablesTask(MasuTestCase):
 
         refresh_materialized_views(self.schema, Provider.PROVIDER_AWS, manifest_id=manifest.id)
 
-        views_to_check = [view for view in AWS_MATERIALIZED_VIEWS if "Cost" in view._meta.db_table]
+        views_to_check = [view for view in AWS_UI_SUMMARY_TABLES if "Cost" in view._meta.db_table]
 
         with schema_context(self.schema):
             for view in views_to_check:
@@ -825,6 +891,151 @@ class TestUpdateSummaryTablesTask(MasuTestCase):
             manifest = manifest_accessor.get_manifest_by_id(manifest.id)
             self.assertIsNotNone(manifest.manifest_completed_datetime)
 
+    @patch("masu.processor.tasks.AWSReportDBAccessor.populate_ui_summary_tables")
+    def test_refresh_materialized_views_date_ranges(self, mock_populate):
+        """Test that the UI summary tables are rebuilt for each date range."""
+        date_ranges = [("2020-03-01", "2020-03-02"), ("2020-03-05", "2020-03-05")]
+        table_names = [table._meta.db_table for table in AWS_UI_SUMMARY_TABLES]
+
+        refresh_materialized_views(self.schema, Provider.PROVIDER_AWS, date_ranges=date_ranges)
+
+        called = [args for args, _ in mock_populate.call_args_list]
+        expected = [([table_name], start, end) for table_name in table_names for start, end in date_ranges]
+        self.assertEqual(called, expected)
+
+    @patch("masu.processor.tasks.request_refresh")
+    @patch("masu.processor.tasks.bump_data_version")
+    @patch("masu.processor.tasks.CostModelCostUpdater")
+    def test_update_cost_model_costs_bumps_data_version(self, mock_updater, mock_bump, mock_refresh):
+        """Test that the cached reports of a provider type are invalidated by a cost model update."""
+        update_cost_model_costs(self.schema, self.ocp_provider_uuid)
+        mock_bump.assert_called_with(self.schema, Provider.PROVIDER_OCP)
+
+    @patch("masu.processor.tasks.request_refresh")
+    @patch("masu.processor.tasks.CostModelCostUpdater")
+    def test_update_cost_model_costs_requests_refresh(self, mock_updater, mock_refresh):
+        """Test that the UI summary tables of the updated days are rebuilt after a cost model update."""
+        start_date = DateHelper().this_month_start
+        end_date = DateHelper().today
+        update_cost_model_costs(self.schema, self.ocp_provider_uuid, start_date, end_date)
+        mock_updater.return_value.update_cost_model_costs.assert_called_with(start_date, end_date)
+        mock_refresh.assert_called_with(self.schema, Provider.PROVIDER_OCP, date_ranges=[(start_date, end_date)])
+
+    @patch("masu.processor.tasks.request_refresh")
+    @patch("masu.processor.tasks.CostModelCostUpdater")
+    def test_update_cost_model_costs_without_refresh(self, mock_updater, mock_refresh):
+        """Test that cost model updates chained before a summary refresh do not request their own."""
+        start_date = DateHelper().this_month_start
+        end_date = DateHelper().today
+        update_cost_model_costs(self.schema, self.ocp_provider_uuid, start_date, end_date, refresh=False)
+        mock_updater.return_value.update_cost_model_costs.assert_called_with(start_date, end_date)
+        mock_refresh.assert_not_called()
+
+    @patch("masu.processor.tasks.bump_data_version")
+    def test_refresh_materialized_views_bumps_data_version(self, mock_bump):
+        """Test that the cached reports of a provider type are invalidated by a refresh."""
+        refresh_materialized_views(self.schema, Provider.PROVIDER_AWS)
+        mock_bump.assert_called_with(self.schema, Provider.PROVIDER_AWS)
+
+    def test_check_ui_summary_tables(self):
+        """Test that refreshed UI summary tables match the daily summary."""
+        refresh_materialized_views(self.schema, Provider.PROVIDER_AWS)
+
+        differences = check_ui_summary_tables(self.schema, Provider.PROVIDER_AWS)
+
+        self.assertEqual(set(differences), {table._meta.db_table for table in AWS_UI_SUMMARY_TABLES})
+        self.assertFalse(any(differences.values()))
+
+    @patch("masu.processor.tasks.AWSReportDBAccessor.populate_ui_summary_tables")
+    @patch("masu.processor.tasks.AWSReportDBAccessor.check_ui_summary_tables")
+    def test_check_ui_summary_tables_repair(self, mock_check, mock_populate):
+        """Test that UI summary tables differing from the daily summary are rebuilt."""
+        mock_check.return_value = {"reporting_aws_cost_summary": 2, "reporting_aws_compute_summary": 0}
+
+        check_ui_summary_tables(self.schema, Provider.PROVIDER_AWS)
+        mock_populate.assert_not_called()
+
+        check_ui_summary_tables(self.schema, Provider.PROVIDER_AWS, repair=True)
+        mock_populate.assert_called_once_with(["reporting_aws_cost_summary"])
+
+    def _add_manifest(self):
+        """Add a manifest waiting on a refresh."""
+        manifest_dict = {
+            "assembly_id": str(uuid4()),
+            "billing_period_start_datetime": DateHelper().today,
+            "num_total_files": 2,
+            "provider_uuid": self.aws_provider_uuid,
+            "task": "170653c0-3e66-4b7e-a764-336496d7ca5a",
+        }
+        with ReportManifestDBAccessor() as manifest_accessor:
+            manifest = manifest_accessor.add(**manifest_dict)
+            manifest.save()
+        return manifest.id
+
+    @patch("masu.processor.tasks.refresh_materialized_views")
+    @patch("masu.processor.tasks.run_pending_refreshes.apply_async")
+    def test_request_refresh_coalesced(self, mock_schedule, mock_refresh):
+        """Test that the requests of a quiet window are refreshed once and complete every manifest."""
+        manifest_ids = [self._add_manifest(), self._add_manifest()]
+        with patch("masu.processor.tasks.Config.REFRESH_QUIET_WINDOW", 60):
+            request_refresh(self.schema, Provider.PROVIDER_AWS, manifest_ids[0], [("2020-03-01", "2020-03-03")])
+            request_refresh(self.schema, Provider.PROVIDER_AWS, manifest_ids[1], [("2020-03-02", "2020-03-06")])
+            self.assertEqual(mock_schedule.call_count, 2)
+            mock_schedule.assert_called_with((self.schema, Provider.PROVIDER_AWS), countdown=60)
+
+            run_pending_refreshes(self.schema, Provider.PROVIDER_AWS)
+            mock_refresh.assert_not_called()
+            self.assertEqual(mock_schedule.call_count, 3)
+
+        run_pending_refreshes(self.schema, Provider.PROVIDER_AWS)
+        mock_refresh.assert_called_once_with(
+            self.schema, Provider.PROVIDER_AWS, date_ranges=[(date(2020, 3, 1), date(2020, 3, 6))]
+        )
+        with ReportManifestDBAccessor() as manifest_accessor:
+            for manifest_id in manifest_ids:
+                manifest = manifest_accessor.get_manifest_by_id(manifest_id)
+                self.assertIsNotNone(manifest.manifest_completed_datetime)
+
+        run_pending_refreshes(self.schema, Provider.PROVIDER_AWS)
+        mock_refresh.assert_called_once()
+
+    @patch("masu.processor.tasks.refresh_materialized_views")
+    def test_request_refresh_all_days(self, mock_refresh):
+        """Test that a request without dates refreshes all kept days."""
+        with patch("masu.processor.tasks.run_pending_refreshes.apply_async"):
+            with patch("masu.processor.tasks.Config.REFRESH_QUIET_WINDOW", 60):
+                request_refresh(self.schema, Provider.PROVIDER_OCP, date_ranges=[("2020-03-01", "2020-03-03")])
+                request_refresh(self.schema, Provider.PROVIDER_OCP)
+        request_refresh(self.schema, Provider.PROVIDER_OCP)
+        mock_refresh.assert_called_once_with(self.schema, Provider.PROVIDER_OCP, date_ranges=None)
+
+    @patch("masu.processor.tasks.refresh_materialized_views")
+    @patch("masu.processor.tasks.run_pending_refreshes.apply_async")
+    @patch("masu.processor.tasks.PendingRefreshDBAccessor.try_lock_schema", return_value=False)
+    def test_run_pending_refreshes_schema_locked(self, _, mock_schedule, mock_refresh):
+        """Test that a refresh waits while its schema is refreshing."""
+        request_refresh(self.schema, Provider.PROVIDER_AWS)
+        mock_refresh.assert_not_called()
+        mock_schedule.assert_called_once_with(
+            (self.schema, Provider.PROVIDER_AWS), countdown=Config.REFRESH_RETRY_DELAY
+        )
+
+    @patch("masu.processor.tasks.refresh_materialized_views", side_effect=ValueError("refresh failed"))
+    def test_run_pending_refreshes_failed(self, _):
+        """Test that the requests of a failed refresh are queued again."""
+        with self.assertRaises(ValueError):
+            request_refresh(self.schema, Provider.PROVIDER_AWS, date_ranges=[("2020-03-01", "2020-03-03")])
+        with PendingRefreshDBAccessor() as accessor:
+            self.assertEqual(
+                accessor.claim(self.schema, Provider.PROVIDER_AWS), [(None, date(2020, 3, 1), date(2020, 3, 3))]
+            )
+
+    @patch("masu.processor.tasks.OCPReportDBAccessor.update_enabled_pod_labels")
+    def test_update_enabled_pod_labels(self, mock_update):
+        """Test that the enabled pod labels are projected again for the changed keys."""
+        update_enabled_pod_labels(self.schema, ["app"])
+        mock_update.assert_called_with(["app"])
+
     @patch("masu.processor.tasks.connection")
     def test_vacuum_schema(self, mock_conn):
         """Test that the vacuum schema task runs."""
@@ -0,0 +1,93 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the ViewRefresher object."""
+import threading
+from unittest.mock import patch
+
+from masu.processor.view_refresher import ViewRefresher
+from masu.test import MasuTestCase
+from reporting.models import OCPAllCostLineItemDailySummary
+from reporting.models import OCP_ON_INFRASTRUCTURE_MATERIALIZED_VIEWS
+
+
+class ViewRefresherTest(MasuTestCase):
+    """Test Cases for the ViewRefresher object."""
+
+    def setUp(self):
+        """Set up the view set."""
+        super().setUp()
+        self.names = [view._meta.db_table for view in OCP_ON_INFRASTRUCTURE_MATERIALIZED_VIEWS]
+        self.daily_summary = OCPAllCostLineItemDailySummary._meta.db_table
+        self.refreshed = []
+        self.lock = threading.Lock()
+
+    def refresh(self, name):
+        """Record a refreshed view."""
+        with self.lock:
+            self.refreshed.append(name)
+
+    def test_get_dependencies(self):
+        """Test that the OCP on All summaries depend on the OCP on All daily summary."""
+        dependencies = ViewRefresher(self.schema).get_dependencies(self.names)
+
+        self.assertEqual(set(dependencies), set(self.names))
+        self.assertEqual(dependencies[self.daily_summary], set())
+        self.assertIn(self.daily_summary, dependencies["reporting_ocpall_cost_summary"])
+
+    def test_run_in_dependency_order(self):
+        """Test that views are refreshed after the views they select from."""
+        for workers in (1, 4):
+            self.refreshed = []
+            ViewRefresher(self.schema, workers=workers).run(reversed(self.names), self.refresh)
+
+            self.assertEqual(sorted(self.refreshed), sorted(self.names))
+            self.assertEqual(self.refreshed[0], self.daily_summary)
+
+    @patch("masu.processor.view_refresher.VIEW_REFRESH_DURATION_HISTOGRAM")
+    def test_run_records_duration(self, mock_histogram):
+        """Test that the duration of each refresh is recorded."""
+        ViewRefresher(self.schema, workers=2).run(self.names, self.refresh)
+
+        labels = [kwargs["view"] for _, kwargs in mock_histogram.labels.call_args_list]
+        self.assertEqual(sorted(labels), sorted(self.names))
+
+    def test_run_failed(self):
+        """Test that a failed refresh is raised and its dependents are not refreshed."""
+
+        def refresh(name):
+            if name == self.daily_summary:
+                raise ValueError("refresh failed")
+            self.refresh(name)
+
+        for workers in (1, 4):
+            self.refreshed = []
+            with self.assertRaises(ValueError):
+                ViewRefresher(self.schema, workers=workers).run(self.names, refresh)
+            self.assertNotIn("reporting_ocpall_cost_summary", self.refreshed)
+
+    @patch("masu.processor.view_refresher.ViewRefresher.get_dependencies")
+    def test_run_cycle(self, mock_dependencies):
+        """Test that views depending on each other are refused."""
+        mock_dependencies.return_value = {"a": {"b"}, "b": {"a"}, "c": set()}
+
+        for workers in (1, 4):
+            with self.assertRaises(ValueError):
+                ViewRefresher(self.schema, workers=workers).run(["a", "b", "c"], self.refresh)
+
+    def test_refresh_materialized_views(self):
+        """Test that materialized views are refreshed."""
+        ViewRefresher(self.schema).refresh_materialized_views(self.names)
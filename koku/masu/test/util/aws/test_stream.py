@@ -0,0 +1,98 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test the AWS report streams."""
+import gzip
+import io
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from masu.util.aws.stream import LocalStreamSource
+from masu.util.aws.stream import ReadAheadReader
+from masu.util.aws.stream import S3ObjectReader
+
+DATA = b"".join(f"{i},value-{i}\n".encode() for i in range(1000))
+
+
+class FakeBody:
+    """A streaming body that fails once a number of bytes were read."""
+
+    def __init__(self, data, fail_after=None):
+        """Initialize the body."""
+        self._stream = io.BytesIO(data)
+        self._fail_after = fail_after
+
+    def read(self, size):
+        """Read from the body, failing once fail_after bytes were read."""
+        if self._fail_after is not None and self._stream.tell() >= self._fail_after:
+            raise ConnectionResetError("Connection reset by peer")
+        return self._stream.read(size)
+
+    def close(self):
+        """Close the body."""
+
+
+class StreamTest(TestCase):
+    """Test cases for the report streams."""
+
+    @patch("masu.util.aws.stream.time.sleep")
+    def test_s3_object_reader_resumes(self, mock_sleep):
+        """Test that a failed read resumes with a byte range from the last byte read."""
+        bodies = [FakeBody(DATA, fail_after=100), FakeBody(DATA[100:])]
+        client = Mock()
+        client.get_object.side_effect = [{"ETag": "etag", "Body": body} for body in bodies]
+
+        with io.BufferedReader(S3ObjectReader(client, "bucket", "key", max_retries=1), buffer_size=10) as stream:
+            self.assertEqual(stream.read(), DATA)
+
+        first_call, second_call = client.get_object.call_args_list
+        self.assertEqual(first_call[1], {"Bucket": "bucket", "Key": "key"})
+        self.assertEqual(second_call[1], {"Bucket": "bucket", "Key": "key", "Range": "bytes=100-", "IfMatch": "etag"})
+
+    @patch("masu.util.aws.stream.time.sleep")
+    def test_s3_object_reader_gives_up(self, mock_sleep):
+        """Test that reads are not retried forever."""
+        client = Mock()
+        client.get_object.side_effect = lambda **kwargs: {"ETag": "etag", "Body": FakeBody(DATA, fail_after=0)}
+
+        reader = S3ObjectReader(client, "bucket", "key", max_retries=2)
+        with self.assertRaises(ConnectionResetError):
+            reader.read(10)
+        self.assertEqual(client.get_object.call_count, 3)
+
+    def test_read_ahead_reader(self):
+        """Test that read ahead returns the whole stream and raises stream errors."""
+        with ReadAheadReader(io.BytesIO(DATA), chunk_size=7, max_chunks=2) as reader:
+            self.assertEqual(reader.readall(), DATA)
+
+        failing = Mock()
+        failing.read.side_effect = OSError("failed")
+        reader = ReadAheadReader(failing, chunk_size=7, max_chunks=2)
+        with self.assertRaises(OSError):
+            reader.read(7)
+        reader.close()
+
+    def test_local_stream_source(self):
+        """Test that a local gzip file is streamed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "report.csv.gz")
+            with gzip.open(path, "wb") as report_file:
+                report_file.write(DATA)
+            with LocalStreamSource(path).open() as stream:
+                self.assertEqual(gzip.GzipFile(fileobj=stream).read(), DATA)
@@ -173,6 +173,40 @@ class CommonUtilTests(MasuTestCase):
         with self.assertRaises(StopIteration):
             next(date_generator)
 
+    def test_month_range_pair(self):
+        """Test that date ranges are split at month boundaries."""
+        date_generator = common_utils.month_range_pair("2020-01-15", "2020-03-02")
+
+        self.assertIsInstance(date_generator, types.GeneratorType)
+        expected = [
+            (date(2020, 1, 15), date(2020, 1, 31)),
+            (date(2020, 2, 1), date(2020, 2, 29)),
+            (date(2020, 3, 1), date(2020, 3, 2)),
+        ]
+        self.assertEqual(list(date_generator), expected)
+
+        one_day = date(2020, 1, 1)
+        self.assertEqual(list(common_utils.month_range_pair(one_day, one_day)), [(one_day, one_day)])
+
+    def test_contiguous_date_ranges(self):
+        """Test that days are grouped into runs of consecutive days."""
+        days = [date(2020, 3, 2), date(2020, 2, 29), date(2020, 3, 1), date(2020, 3, 5), date(2020, 3, 1)]
+        expected = [(date(2020, 2, 29), date(2020, 3, 2)), (date(2020, 3, 5), date(2020, 3, 5))]
+        self.assertEqual(list(common_utils.contiguous_date_ranges(days)), expected)
+        self.assertEqual(list(common_utils.contiguous_date_ranges([])), [])
+
+    def test_merge_date_ranges(self):
+        """Test that overlapping and adjacent date ranges are merged."""
+        date_ranges = [
+            (date(2020, 3, 5), date(2020, 3, 6)),
+            (date(2020, 3, 1), date(2020, 3, 3)),
+            (date(2020, 3, 2), date(2020, 3, 4)),
+            (date(2020, 3, 10), date(2020, 3, 10)),
+        ]
+        expected = [(date(2020, 3, 1), date(2020, 3, 6)), (date(2020, 3, 10), date(2020, 3, 10))]
+        self.assertEqual(list(common_utils.merge_date_ranges(date_ranges)), expected)
+        self.assertEqual(list(common_utils.merge_date_ranges([])), [])
+
 
 class NamedTemporaryGZipTests(TestCase):
     """Tests for NamedTemporaryGZip."""
@@ -0,0 +1,244 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Stream Cost Usage Report objects without storing them on disk."""
+import io
+import logging
+import queue
+import threading
+import time
+
+import boto3
+from botocore.exceptions import BotoCoreError
+from urllib3.exceptions import HTTPError
+
+from masu.config import Config
+from masu.util.aws import common as utils
+
+LOG = logging.getLogger(__name__)
+
+
+class S3ObjectReader(io.RawIOBase):
+    """Read an S3 object, resuming from the last byte read after a failure.
+
+    A failed read re-requests the rest of the object as a byte range. The
+    ETag of the first response is required on every range request, so a
+    report replaced in the middle of a read fails instead of being mixed.
+    """
+
+    def __init__(self, s3_client, bucket, key, etag=None, max_retries=None):
+        """Initialize the reader.
+
+        Args:
+            s3_client (botocore.client.S3): The S3 client
+            bucket (str): The S3 bucket
+            key (str): The S3 object key
+            etag (str): The expected ETag of the object
+            max_retries (int): Number of consecutive failed reads to retry
+
+        """
+        super().__init__()
+        self._client = s3_client
+        self._bucket = bucket
+        self._key = key
+        self._etag = etag
+        self._max_retries = max_retries if max_retries is not None else Config.S3_STREAM_MAX_RETRIES
+        self._body = None
+        self.position = 0
+
+    def readable(self):
+        """Return that the stream is readable."""
+        return True
+
+    def _open_body(self):
+        """Request the object from the current position on."""
+        kwargs = {"Bucket": self._bucket, "Key": self._key}
+        if self.position:
+            kwargs["Range"] = f"bytes={self.position}-"
+        if self._etag:
+            kwargs["IfMatch"] = self._etag
+        response = self._client.get_object(**kwargs)
+        self._etag = response.get("ETag")
+        self._body = response["Body"]
+
+    def _close_body(self):
+        """Release the current response."""
+        if self._body is not None:
+            self._body.close()
+            self._body = None
+
+    def readinto(self, b):
+        """Read up to len(b) bytes into b, retrying from the current position on failure."""
+        failures = 0
+        while True:
+            try:
+                if self._body is None:
+                    self._open_body()
+                data = self._body.read(len(b))
+                break
+            except (BotoCoreError, HTTPError, OSError) as err:
+                self._close_body()
+                failures += 1
+                if failures > self._max_retries:
+                    raise
+                LOG.warning(
+                    "Reading s3://%s/%s failed at byte %d, retrying (%d/%d): %s",
+                    self._bucket,
+                    self._key,
+                    self.position,
+                    failures,
+                    self._max_retries,
+                    str(err),
+                )
+                time.sleep(min(2**failures, 30))
+        size = len(data)
+        b[:size] = data
+        self.position += size
+        return size
+
+    def close(self):
+        """Close the stream."""
+        self._close_body()
+        super().close()
+
+
+class ReadAheadReader(io.RawIOBase):
+    """Read a stream ahead of the consumer in a background thread.
+
+    At most max_chunks chunks are buffered, which bounds memory use while
+    network reads overlap with parsing.
+    """
+
+    def __init__(self, raw, chunk_size=None, max_chunks=None):
+        """Initialize the reader and start reading ahead.
+
+        Args:
+            raw (io.RawIOBase): The stream to read from
+            chunk_size (int): The size of each read from the stream
+            max_chunks (int): The maximum number of chunks buffered
+
+        """
+        super().__init__()
+        self._raw = raw
+        self._chunk_size = chunk_size or Config.S3_STREAM_CHUNK_SIZE
+        self._chunks = queue.Queue(maxsize=max_chunks or Config.S3_STREAM_READ_AHEAD_CHUNKS)
+        self._chunk = memoryview(b"")
+        self._eof = False
+        self._error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._read_ahead, daemon=True)
+        self._thread.start()
+
+    def readable(self):
+        """Return that the stream is readable."""
+        return True
+
+    def _put(self, item):
+        """Buffer a chunk, waiting for space unless the reader is closed."""
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read_ahead(self):
+        """Read chunks until the end of the stream, an error or close."""
+        try:
+            while True:
+                chunk = self._raw.read(self._chunk_size)
+                if not self._put(chunk) or not chunk:
+                    return
+        except Exception as err:  # pylint: disable=broad-except
+            self._put(err)
+
+    def readinto(self, b):
+        """Read up to len(b) bytes of buffered data into b."""
+        if not self._chunk:
+            if self._error:
+                raise self._error
+            if self._eof:
+                return 0
+            item = self._chunks.get()
+            if isinstance(item, Exception):
+                self._error = item
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._chunk = memoryview(item)
+        size = min(len(b), len(self._chunk))
+        b[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+    def close(self):
+        """Stop reading ahead and close the stream."""
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._raw.close()
+        super().close()
+
+
+class S3StreamSource:
+    """An S3 report object that is streamed instead of downloaded.
+
+    Only the location of the object is stored, so the source can be passed
+    to another process before it is opened.
+    """
+
+    def __init__(self, bucket, key, role_arn=None, etag=None):
+        """Initialize the source.
+
+        Args:
+            bucket (str): The S3 bucket
+            key (str): The S3 object key
+            role_arn (str): The role assumed to read the bucket
+            etag (str): The ETag of the object when its report was listed
+
+        """
+        self.bucket = bucket
+        self.key = key
+        self.role_arn = role_arn
+        self.etag = etag
+
+    def open(self):
+        """Return a buffered binary stream of the object."""
+        if self.role_arn:
+            session = utils.get_assume_role_session(utils.AwsArn(self.role_arn), "MasuProcessorSession")
+        else:
+            session = boto3.Session()
+        reader = S3ObjectReader(session.client("s3"), self.bucket, self.key, etag=self.etag)
+        return io.BufferedReader(ReadAheadReader(reader), buffer_size=Config.S3_STREAM_CHUNK_SIZE)
+
+
+class LocalStreamSource:
+    """A local report file that is streamed in place instead of copied."""
+
+    def __init__(self, path):
+        """Initialize the source.
+
+        Args:
+            path (str): The path of the report file
+
+        """
+        self.path = path
+
+    def open(self):
+        """Return a buffered binary stream of the file."""
+        return io.BufferedReader(ReadAheadReader(io.FileIO(self.path, "rb")), buffer_size=Config.S3_STREAM_CHUNK_SIZE)
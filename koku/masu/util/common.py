@@ -19,6 +19,7 @@ import calendar
 import gzip
 import logging
 import re
+from datetime import datetime
 from datetime import timedelta
 from os import remove
 from tempfile import gettempdir
@@ -200,3 +201,62 @@ def date_range_pair(start_date, end_date, step=5):
         start_date = date + timedelta(days=1)
     if len(dates) != 1 and end_date not in dates:
         yield start_date.date(), end_date.date()
+
+
+def month_range_pair(start_date, end_date):
+    """Create a range generator for the months of a date range.
+
+    Given a start date and end date make a generator that returns a start
+    and end date for each month of the interval.
+
+    """
+    if isinstance(start_date, str):
+        start_date = parser.parse(start_date)
+    if isinstance(end_date, str):
+        end_date = parser.parse(end_date)
+    if isinstance(start_date, datetime):
+        start_date = start_date.date()
+    if isinstance(end_date, datetime):
+        end_date = end_date.date()
+    while start_date <= end_date:
+        month_end = start_date.replace(day=calendar.monthrange(start_date.year, start_date.month)[1])
+        yield start_date, min(month_end, end_date)
+        start_date = month_end + timedelta(days=1)
+
+
+def contiguous_date_ranges(days):
+    """Create a range generator for the runs of consecutive days in a collection of days.
+
+    Given a collection of dates make a generator that returns a start and
+    end date for each run of consecutive dates, in order.
+
+    """
+    start_date = end_date = None
+    for day in sorted(set(days)):
+        if end_date is not None and day == end_date + timedelta(days=1):
+            end_date = day
+            continue
+        if start_date is not None:
+            yield start_date, end_date
+        start_date = end_date = day
+    if start_date is not None:
+        yield start_date, end_date
+
+
+def merge_date_ranges(date_ranges):
+    """Merge overlapping and adjacent date ranges.
+
+    Given a collection of (start, end) date pairs make a generator that
+    returns a start and end date for each run of days they cover, in order.
+
+    """
+    start_date = end_date = None
+    for range_start, range_end in sorted(date_ranges):
+        if end_date is not None and range_start <= end_date + timedelta(days=1):
+            end_date = max(end_date, range_end)
+            continue
+        if start_date is not None:
+            yield start_date, end_date
+        start_date, end_date = range_start, range_end
+    if start_date is not None:
+        yield start_date, end_date
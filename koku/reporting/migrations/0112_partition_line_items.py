@@ -0,0 +1,79 @@
+# Generated by Django 2.2.11 on 2020-04-20 14:02
+import datetime
+
+from dateutil.relativedelta import relativedelta
+from django.db import migrations
+from django.db import models
+
+from masu.database.partitioning import create_partition_sql
+from masu.database.partitioning import partition_months
+
+# Empty partitions are created for this many months before the current month
+PRECREATED_MONTHS = 3
+
+
+def partition_table(cursor, table_name, create_sql, select_sql):
+    """Rebuild a table as a table partitioned by month and copy its rows into the partitions."""
+    old_table = f"{table_name}_unpartitioned"
+    cursor.execute(f"ALTER TABLE {table_name} RENAME TO {old_table}")
+    cursor.execute(create_sql.format(table=table_name, old_table=old_table))
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [old_table])
+    sequence = cursor.fetchone()[0]
+    cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table_name}.id")
+
+    select_sql = select_sql.format(old_table=old_table)
+    cursor.execute(
+        f"SELECT DISTINCT date_trunc('month', src.usage_start AT TIME ZONE 'UTC')::date FROM ({select_sql}) AS src"
+    )
+    months = {row[0] for row in cursor.fetchall()}
+    this_month = datetime.date.today().replace(day=1)
+    months.update(
+        partition_months(this_month - relativedelta(months=PRECREATED_MONTHS), this_month + relativedelta(months=2))
+    )
+    for month in sorted(months):
+        for statement in create_partition_sql(table_name, month):
+            cursor.execute(statement)
+
+    cursor.execute(f"INSERT INTO {table_name} {select_sql}")
+    cursor.execute(f"DROP TABLE {old_table}")
+
+
+def partition_line_items(apps, schema_editor):
+    """Partition the AWS and OCP line item tables by the month of their usage start."""
+    with schema_editor.connection.cursor() as cursor:
+        partition_table(
+            cursor,
+            "reporting_awscostentrylineitem",
+            "CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS) PARTITION BY RANGE (usage_start)",
+            "SELECT * FROM {old_table}",
+        )
+        partition_table(
+            cursor,
+            "reporting_ocpusagelineitem",
+            """
+            CREATE TABLE {table} (
+                LIKE {old_table} INCLUDING DEFAULTS,
+                usage_start timestamp with time zone NOT NULL
+            ) PARTITION BY RANGE (usage_start)
+            """,
+            """
+            SELECT li.*, ur.interval_start AS usage_start
+            FROM {old_table} AS li
+            JOIN reporting_ocpusagereport AS ur
+                ON ur.id = li.report_id
+            """,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0111_drop_azure_service_not_null")]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(model_name="ocpusagelineitem", name="usage_start", field=models.DateTimeField())
+            ]
+        ),
+        migrations.RunPython(partition_line_items),
+    ]
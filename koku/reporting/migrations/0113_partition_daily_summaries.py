@@ -0,0 +1,88 @@
+# Generated by Django 2.2.11 on 2020-04-22 09:41
+import datetime
+
+from dateutil.relativedelta import relativedelta
+from django.db import migrations
+
+from masu.database.partitioning import create_partition_sql
+from masu.database.partitioning import partition_months
+
+# Empty partitions are created for this many months before the current month
+PRECREATED_MONTHS = 3
+
+SUMMARY_TABLES = (
+    "reporting_awscostentrylineitem_daily_summary",
+    "reporting_ocpusagelineitem_daily_summary",
+    "reporting_azurecostentrylineitem_daily_summary",
+)
+
+
+def get_dependent_views(cursor, table_name):
+    """Return the name, kind, definition and index definitions of the views selecting from a table."""
+    cursor.execute(
+        """
+        SELECT DISTINCT v.oid, v.relname, v.relkind, pg_get_viewdef(v.oid)
+        FROM pg_depend AS d
+        JOIN pg_rewrite AS r
+            ON r.oid = d.objid
+        JOIN pg_class AS v
+            ON v.oid = r.ev_class
+        WHERE d.refobjid = %s::regclass
+            AND v.oid <> d.refobjid
+        ORDER BY v.oid
+        """,
+        [table_name],
+    )
+    views = []
+    for _, name, kind, definition in cursor.fetchall():
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s", [name]
+        )
+        views.append((name, kind, definition, [row[0] for row in cursor.fetchall()]))
+    return views
+
+
+def partition_table(cursor, table_name):
+    """Rebuild a table as a table partitioned by month, keeping its rows and the views selecting from it."""
+    views = get_dependent_views(cursor, table_name)
+    for name, kind, _, _ in reversed(views):
+        cursor.execute(f"DROP {'MATERIALIZED VIEW' if kind == 'm' else 'VIEW'} {name}")
+
+    old_table = f"{table_name}_unpartitioned"
+    cursor.execute(f"ALTER TABLE {table_name} RENAME TO {old_table}")
+    cursor.execute(f"CREATE TABLE {table_name} (LIKE {old_table} INCLUDING DEFAULTS) PARTITION BY RANGE (usage_start)")
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [old_table])
+    sequence = cursor.fetchone()[0]
+    cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table_name}.id")
+
+    cursor.execute(f"SELECT DISTINCT date_trunc('month', usage_start)::date FROM {old_table}")
+    months = {row[0] for row in cursor.fetchall()}
+    this_month = datetime.date.today().replace(day=1)
+    months.update(
+        partition_months(this_month - relativedelta(months=PRECREATED_MONTHS), this_month + relativedelta(months=2))
+    )
+    for month in sorted(months):
+        for statement in create_partition_sql(table_name, month):
+            cursor.execute(statement)
+
+    cursor.execute(f"INSERT INTO {table_name} SELECT * FROM {old_table}")
+    cursor.execute(f"DROP TABLE {old_table}")
+
+    for name, kind, definition, index_definitions in views:
+        cursor.execute(f"CREATE {'MATERIALIZED VIEW' if kind == 'm' else 'VIEW'} {name} AS {definition}")
+        for index_definition in index_definitions:
+            cursor.execute(index_definition)
+
+
+def partition_daily_summaries(apps, schema_editor):
+    """Partition the AWS, OCP and Azure daily summary tables by the month of their usage start."""
+    with schema_editor.connection.cursor() as cursor:
+        for table_name in SUMMARY_TABLES:
+            partition_table(cursor, table_name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0112_partition_line_items")]
+
+    operations = [migrations.RunPython(partition_daily_summaries)]
@@ -0,0 +1,84 @@
+# Generated by Django 2.2.11 on 2020-04-24 14:12
+from django.db import migrations
+
+UI_SUMMARY_TABLES = (
+    "reporting_aws_compute_summary",
+    "reporting_aws_compute_summary_by_account",
+    "reporting_aws_compute_summary_by_region",
+    "reporting_aws_compute_summary_by_service",
+    "reporting_aws_cost_summary",
+    "reporting_aws_cost_summary_by_account",
+    "reporting_aws_cost_summary_by_region",
+    "reporting_aws_cost_summary_by_service",
+    "reporting_aws_database_summary",
+    "reporting_aws_network_summary",
+    "reporting_aws_storage_summary",
+    "reporting_aws_storage_summary_by_account",
+    "reporting_aws_storage_summary_by_region",
+    "reporting_aws_storage_summary_by_service",
+    "reporting_azure_compute_summary",
+    "reporting_azure_cost_summary",
+    "reporting_azure_cost_summary_by_account",
+    "reporting_azure_cost_summary_by_location",
+    "reporting_azure_cost_summary_by_service",
+    "reporting_azure_database_summary",
+    "reporting_azure_network_summary",
+    "reporting_azure_storage_summary",
+    "reporting_ocp_cost_summary",
+    "reporting_ocp_cost_summary_by_node",
+    "reporting_ocp_cost_summary_by_project",
+    "reporting_ocp_pod_summary",
+    "reporting_ocp_pod_summary_by_project",
+    "reporting_ocp_volume_summary",
+    "reporting_ocp_volume_summary_by_project",
+)
+
+
+def convert_view(cursor, view_name):
+    """Replace a materialized view by a table holding its rows, with the same columns and indexes."""
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s", [view_name]
+    )
+    index_definitions = [row[0] for row in cursor.fetchall()]
+
+    new_table = f"{view_name}_table"
+    cursor.execute(f"CREATE TABLE {new_table} AS SELECT * FROM {view_name}")
+    cursor.execute(f"DROP MATERIALIZED VIEW {view_name}")
+    cursor.execute(f"ALTER TABLE {new_table} RENAME TO {view_name}")
+
+    cursor.execute(f"ALTER TABLE {view_name} ALTER COLUMN id SET NOT NULL")
+    cursor.execute(f"ALTER TABLE {view_name} ADD PRIMARY KEY (id)")
+    cursor.execute(f"CREATE SEQUENCE {view_name}_id_seq OWNED BY {view_name}.id")
+    cursor.execute(f"SELECT setval('{view_name}_id_seq', coalesce(max(id), 0) + 1, false) FROM {view_name}")
+    cursor.execute(f"ALTER TABLE {view_name} ALTER COLUMN id SET DEFAULT nextval('{view_name}_id_seq')")
+
+    # The rollups are compared with EXCEPT, which json values do not support
+    cursor.execute(
+        """
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+            AND table_name = %s
+            AND data_type = 'json'
+        """,
+        [view_name],
+    )
+    for (column,) in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE {view_name} ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb")
+
+    for index_definition in index_definitions:
+        cursor.execute(index_definition)
+
+
+def convert_ui_summary_views(apps, schema_editor):
+    """Replace the AWS, Azure and OCP UI summary materialized views by incrementally maintained tables."""
+    with schema_editor.connection.cursor() as cursor:
+        for view_name in UI_SUMMARY_TABLES:
+            convert_view(cursor, view_name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0113_partition_daily_summaries")]
+
+    operations = [migrations.RunPython(convert_ui_summary_views)]
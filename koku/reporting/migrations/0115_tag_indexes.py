@@ -0,0 +1,154 @@
+# Generated by Django 2.2.11 on 2020-04-28 09:47
+import django.db.models.deletion
+from django.db import migrations
+from django.db import models
+
+BACKFILL_SQL = """
+INSERT INTO reporting_awstag_index (cost_entry_bill_id, line_item_id, usage_start, key, value)
+SELECT aws.cost_entry_bill_id,
+    aws.id,
+    aws.usage_start,
+    LOWER(labels.key),
+    LOWER(labels.value)
+FROM reporting_awscostentrylineitem_daily AS aws,
+    jsonb_each_text(aws.tags) AS labels
+WHERE aws.cost_entry_bill_id IS NOT NULL
+;
+
+INSERT INTO reporting_azuretag_index (cost_entry_bill_id, line_item_id, usage_date, key, value)
+SELECT azure.cost_entry_bill_id,
+    azure.id,
+    azure.usage_date,
+    LOWER(labels.key),
+    LOWER(labels.value)
+FROM reporting_azurecostentrylineitem_daily AS azure,
+    jsonb_each_text(azure.tags) AS labels
+;
+
+INSERT INTO reporting_ocpusagepodlabel_index (report_period_id, cluster_id, line_item_id, usage_start, key, value)
+SELECT ocp.report_period_id,
+    ocp.cluster_id,
+    ocp.id,
+    ocp.usage_start,
+    LOWER(labels.key),
+    LOWER(labels.value)
+FROM reporting_ocpusagelineitem_daily AS ocp
+JOIN LATERAL jsonb_each_text(ocp.pod_labels) AS labels
+    ON true
+JOIN reporting_ocpenabledtagkeys AS enabled_tags
+    ON LOWER(enabled_tags.key) = LOWER(labels.key)
+;
+
+INSERT INTO reporting_ocpstoragevolumelabel_index (report_period_id, cluster_id, line_item_id, usage_start, key, value)
+SELECT ocp.report_period_id,
+    ocp.cluster_id,
+    ocp.id,
+    ocp.usage_start,
+    LOWER(labels.key),
+    LOWER(labels.value)
+FROM reporting_ocpstoragelineitem_daily AS ocp
+JOIN LATERAL (
+    SELECT key, value FROM jsonb_each_text(ocp.persistentvolume_labels)
+    UNION ALL
+    SELECT key, value FROM jsonb_each_text(ocp.persistentvolumeclaim_labels)
+) AS labels
+    ON true
+JOIN reporting_ocpenabledtagkeys AS enabled_tags
+    ON LOWER(enabled_tags.key) = LOWER(labels.key)
+;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0114_ui_summary_tables")]
+
+    operations = [
+        migrations.CreateModel(
+            name="AWSTagIndex",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("line_item_id", models.BigIntegerField()),
+                ("usage_start", models.DateField()),
+                ("key", models.TextField()),
+                ("value", models.TextField()),
+                (
+                    "cost_entry_bill",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="reporting.AWSCostEntryBill"),
+                ),
+            ],
+            options={"db_table": "reporting_awstag_index"},
+        ),
+        migrations.CreateModel(
+            name="AzureTagIndex",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("line_item_id", models.BigIntegerField()),
+                ("usage_date", models.DateField()),
+                ("key", models.TextField()),
+                ("value", models.TextField()),
+                (
+                    "cost_entry_bill",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="reporting.AzureCostEntryBill"),
+                ),
+            ],
+            options={"db_table": "reporting_azuretag_index"},
+        ),
+        migrations.CreateModel(
+            name="OCPUsagePodLabelIndex",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("cluster_id", models.CharField(max_length=50, null=True)),
+                ("line_item_id", models.BigIntegerField()),
+                ("usage_start", models.DateField()),
+                ("key", models.TextField()),
+                ("value", models.TextField()),
+                (
+                    "report_period",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="reporting.OCPUsageReportPeriod",
+                    ),
+                ),
+            ],
+            options={"db_table": "reporting_ocpusagepodlabel_index"},
+        ),
+        migrations.CreateModel(
+            name="OCPStorageVolumeLabelIndex",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("cluster_id", models.CharField(max_length=50, null=True)),
+                ("line_item_id", models.BigIntegerField()),
+                ("usage_start", models.DateField()),
+                ("key", models.TextField()),
+                ("value", models.TextField()),
+                (
+                    "report_period",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="reporting.OCPUsageReportPeriod",
+                    ),
+                ),
+            ],
+            options={"db_table": "reporting_ocpstoragevolumelabel_index"},
+        ),
+        migrations.AddIndex(
+            model_name="awstagindex",
+            index=models.Index(fields=["usage_start", "key", "value"], name="aws_tag_index_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="azuretagindex",
+            index=models.Index(fields=["usage_date", "key", "value"], name="azure_tag_index_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="ocpusagepodlabelindex",
+            index=models.Index(fields=["usage_start", "key", "value"], name="ocp_pod_label_index_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="ocpstoragevolumelabelindex",
+            index=models.Index(fields=["usage_start", "key", "value"], name="ocp_volume_label_index_idx"),
+        ),
+        migrations.RunSQL(BACKFILL_SQL),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 2.2.11 on 2020-04-30 14:12
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations
+from django.db import models
+
+BACKFILL_SQL = """
+UPDATE reporting_ocpusagelineitem_daily AS li
+SET enabled_pod_labels = epl.enabled_pod_labels,
+    enabled_pod_labels_hash = md5(epl.enabled_pod_labels::text)::uuid
+FROM (
+    SELECT lid.id,
+        coalesce(
+            jsonb_object_agg(labels.key, labels.value) FILTER (WHERE enabled_tags.key IS NOT NULL),
+            '{}'::jsonb
+        ) AS enabled_pod_labels
+    FROM reporting_ocpusagelineitem_daily AS lid
+    LEFT JOIN LATERAL jsonb_each_text(lid.pod_labels) AS labels
+        ON true
+    LEFT JOIN reporting_ocpenabledtagkeys AS enabled_tags
+        ON enabled_tags.key = labels.key
+    GROUP BY lid.id
+) AS epl
+WHERE li.id = epl.id
+;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0115_tag_indexes")]
+
+    operations = [
+        migrations.AddField(
+            model_name="ocpusagelineitemdaily",
+            name="enabled_pod_labels",
+            field=django.contrib.postgres.fields.jsonb.JSONField(null=True),
+        ),
+        migrations.AddField(
+            model_name="ocpusagelineitemdaily",
+            name="enabled_pod_labels_hash",
+            field=models.UUIDField(null=True),
+        ),
+        migrations.RunSQL(BACKFILL_SQL),
+    ]
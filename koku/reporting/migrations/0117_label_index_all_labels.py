@@ -0,0 +1,46 @@
+# Generated by Django 2.2.11 on 2020-05-01 10:21
+from django.db import migrations
+
+# The label indexes hold every label, the tag matching keeps those with an enabled key
+REBUILD_SQL = """
+TRUNCATE reporting_ocpusagepodlabel_index
+;
+
+INSERT INTO reporting_ocpusagepodlabel_index (report_period_id, cluster_id, line_item_id, usage_start, key, value)
+SELECT ocp.report_period_id,
+    ocp.cluster_id,
+    ocp.id,
+    ocp.usage_start,
+    LOWER(labels.key),
+    LOWER(labels.value)
+FROM reporting_ocpusagelineitem_daily AS ocp
+JOIN LATERAL jsonb_each_text(ocp.pod_labels) AS labels
+    ON true
+;
+
+TRUNCATE reporting_ocpstoragevolumelabel_index
+;
+
+INSERT INTO reporting_ocpstoragevolumelabel_index (report_period_id, cluster_id, line_item_id, usage_start, key, value)
+SELECT ocp.report_period_id,
+    ocp.cluster_id,
+    ocp.id,
+    ocp.usage_start,
+    LOWER(labels.key),
+    LOWER(labels.value)
+FROM reporting_ocpstoragelineitem_daily AS ocp
+JOIN LATERAL (
+    SELECT key, value FROM jsonb_each_text(ocp.persistentvolume_labels)
+    UNION ALL
+    SELECT key, value FROM jsonb_each_text(ocp.persistentvolumeclaim_labels)
+) AS labels
+    ON true
+;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0116_enabled_pod_labels")]
+
+    operations = [migrations.RunSQL(REBUILD_SQL)]
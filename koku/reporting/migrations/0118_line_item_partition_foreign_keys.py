@@ -0,0 +1,65 @@
+# Generated by Django 2.2.11 on 2020-05-02 09:12
+from django.db import migrations
+
+from masu.database.partitioning import PARTITIONED_TABLES
+from masu.database.partitioning import partition_index_name
+from masu.database.partitioning import partition_month
+
+# Rows whose referenced row is gone are handled as their model's on_delete would
+DELETE_ORPHANS_SQL = "DELETE FROM {table} AS li WHERE NOT EXISTS (SELECT 1 FROM {ref} AS r WHERE r.id = li.{column})"
+NULL_ORPHANS_SQL = """
+UPDATE {table} AS li SET {column} = NULL
+WHERE li.{column} IS NOT NULL
+    AND NOT EXISTS (SELECT 1 FROM {ref} AS r WHERE r.id = li.{column})
+"""
+ORPHANS = {
+    "reporting_awscostentrylineitem": [
+        (DELETE_ORPHANS_SQL, "cost_entry_bill_id", "reporting_awscostentrybill"),
+        (DELETE_ORPHANS_SQL, "cost_entry_id", "reporting_awscostentry"),
+        (NULL_ORPHANS_SQL, "cost_entry_product_id", "reporting_awscostentryproduct"),
+        (NULL_ORPHANS_SQL, "cost_entry_pricing_id", "reporting_awscostentrypricing"),
+        (NULL_ORPHANS_SQL, "cost_entry_reservation_id", "reporting_awscostentryreservation"),
+    ],
+    "reporting_ocpusagelineitem": [
+        (DELETE_ORPHANS_SQL, "report_period_id", "reporting_ocpusagereportperiod"),
+        (DELETE_ORPHANS_SQL, "report_id", "reporting_ocpusagereport"),
+    ],
+}
+
+
+def add_partition_foreign_keys(apps, schema_editor):
+    """Declare the foreign keys of the line item models on the existing partitions."""
+    with schema_editor.connection.cursor() as cursor:
+        for table_name, orphans in ORPHANS.items():
+            cursor.execute(
+                """
+                SELECT c.relname
+                FROM pg_inherits AS i
+                JOIN pg_class AS c
+                    ON c.oid = i.inhrelid
+                WHERE i.inhparent = %s::regclass
+                """,
+                [table_name],
+            )
+            partitions = [row[0] for row in cursor.fetchall()]
+            for partition in partitions:
+                month = partition_month(table_name, partition)
+                if month is None:
+                    continue
+                cursor.execute(
+                    "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'", [partition]
+                )
+                existing = {row[0] for row in cursor.fetchall()}
+                for sql, column, ref in orphans:
+                    cursor.execute(sql.format(table=partition, column=column, ref=ref))
+                for suffix, sql in PARTITIONED_TABLES[table_name]["indexes"]:
+                    name = partition_index_name(table_name, month, suffix)
+                    if "FOREIGN KEY" in sql and name not in existing:
+                        cursor.execute(sql.format(table=partition, name=name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting", "0117_label_index_all_labels")]
+
+    operations = [migrations.RunPython(add_partition_foreign_keys)]
@@ -50,6 +50,7 @@ from reporting.provider.aws.models import AWSStorageSummary
 from reporting.provider.aws.models import AWSStorageSummaryByAccount
 from reporting.provider.aws.models import AWSStorageSummaryByRegion
 from reporting.provider.aws.models import AWSStorageSummaryByService
+from reporting.provider.aws.models import AWSTagIndex
 from reporting.provider.aws.models import AWSTagsSummary
 from reporting.provider.azure.models import AzureComputeSummary
 from reporting.provider.azure.models import AzureCostEntryBill
@@ -64,6 +65,7 @@ from reporting.provider.azure.models import AzureDatabaseSummary
 from reporting.provider.azure.models import AzureMeter
 from reporting.provider.azure.models import AzureNetworkSummary
 from reporting.provider.azure.models import AzureStorageSummary
+from reporting.provider.azure.models import AzureTagIndex
 from reporting.provider.azure.models import AzureTagsSummary
 from reporting.provider.azure.openshift.models import OCPAzureComputeSummary
 from reporting.provider.azure.openshift.models import OCPAzureCostLineItemDailySummary
@@ -87,10 +89,12 @@ from reporting.provider.ocp.models import OCPPodSummary
 from reporting.provider.ocp.models import OCPPodSummaryByProject
 from reporting.provider.ocp.models import OCPStorageLineItem
 from reporting.provider.ocp.models import OCPStorageLineItemDaily
+from reporting.provider.ocp.models import OCPStorageVolumeLabelIndex
 from reporting.provider.ocp.models import OCPStorageVolumeLabelSummary
 from reporting.provider.ocp.models import OCPUsageLineItem
 from reporting.provider.ocp.models import OCPUsageLineItemDaily
 from reporting.provider.ocp.models import OCPUsageLineItemDailySummary
+from reporting.provider.ocp.models import OCPUsagePodLabelIndex
 from reporting.provider.ocp.models import OCPUsagePodLabelSummary
 from reporting.provider.ocp.models import OCPUsageReport
 from reporting.provider.ocp.models import OCPUsageReportPeriod
@@ -109,7 +113,8 @@ from reporting.provider.ocp_aws.models import OCPAWSStorageSummary
 from reporting.provider.ocp_aws.models import OCPAWSTagsSummary
 
 
-AWS_MATERIALIZED_VIEWS = (
+# Rollups of the daily summary tables read by the UI, maintained by date range
+AWS_UI_SUMMARY_TABLES = (
     AWSComputeSummary,
     AWSComputeSummaryByAccount,
     AWSComputeSummaryByRegion,
@@ -126,7 +131,7 @@ AWS_MATERIALIZED_VIEWS = (
     AWSStorageSummaryByService,
 )
 
-AZURE_MATERIALIZED_VIEWS = (
+AZURE_UI_SUMMARY_TABLES = (
     AzureCostSummary,
     AzureCostSummaryByAccount,
     AzureCostSummaryByLocation,
@@ -137,7 +142,7 @@ AZURE_MATERIALIZED_VIEWS = (
     AzureDatabaseSummary,
 )
 
-OCP_MATERIALIZED_VIEWS = (
+OCP_UI_SUMMARY_TABLES = (
     OCPPodSummary,
     OCPPodSummaryByProject,
     OCPVolumeSummary,
@@ -180,7 +185,4 @@ OCP_ON_INFRASTRUCTURE_MATERIALIZED_VIEWS = (
     OCPAllNetworkSummary,
     OCPAllStorageSummary,
     OCPAllCostLineItemProjectDailySummary,
-    OCPCostSummary,
-    OCPCostSummaryByProject,
-    OCPCostSummaryByNode,
 )
@@ -68,6 +68,7 @@ class AWSCostEntryLineItem(models.Model):
     """A line item in a cost entry.
 
     This identifies specific costs and usage of AWS resources.
+    The table is partitioned by the month of usage_start.
 
     """
 
@@ -161,13 +162,38 @@ class AWSCostEntryLineItemDaily(models.Model):
     tags = JSONField(null=True)
 
 
+class AWSTagIndex(models.Model):
+    """The tags of the daily line items, one row per lower-cased tag.
+
+    OpenShift on AWS matches line items to OpenShift usage on these rows.
+    The rows of a day are rebuilt along with its daily line items.
+
+    """
+
+    class Meta:
+        """Meta for AWSTagIndex."""
+
+        db_table = "reporting_awstag_index"
+
+        indexes = [models.Index(fields=["usage_start", "key", "value"], name="aws_tag_index_idx")]
+
+    id = models.BigAutoField(primary_key=True)
+
+    cost_entry_bill = models.ForeignKey("AWSCostEntryBill", on_delete=models.CASCADE)
+    line_item_id = models.BigIntegerField(null=False)
+    usage_start = models.DateField(null=False)
+    key = models.TextField(null=False)
+    value = models.TextField(null=False)
+
+
 class AWSCostEntryLineItemDailySummary(models.Model):
     """A daily aggregation of line items.
 
     This table is aggregated by service, and does not
     have a breakdown by resource or tags. The contents of this table
     should be considered ephemeral. It will be regularly deleted from
-    and repopulated.
+    and repopulated. The table is partitioned by the month of usage_start,
+    and each month is replaced as a whole when it is summarized.
 
     """
 
@@ -292,9 +318,9 @@ class AWSTagsSummary(models.Model):
     accounts = ArrayField(models.CharField(max_length=63))
 
 
-# Materialized Views for UI Reporting
+# Summary tables for UI Reporting
 class AWSCostSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost.
 
@@ -320,7 +346,7 @@ class AWSCostSummary(models.Model):
 
 
 class AWSCostSummaryByService(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by service.
 
@@ -350,7 +376,7 @@ class AWSCostSummaryByService(models.Model):
 
 
 class AWSCostSummaryByAccount(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by account.
 
@@ -380,7 +406,7 @@ class AWSCostSummaryByAccount(models.Model):
 
 
 class AWSCostSummaryByRegion(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by region.
 
@@ -410,7 +436,7 @@ class AWSCostSummaryByRegion(models.Model):
 
 
 class AWSComputeSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -446,7 +472,7 @@ class AWSComputeSummary(models.Model):
 
 
 class AWSComputeSummaryByService(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage by service and instance type.
 
@@ -486,7 +512,7 @@ class AWSComputeSummaryByService(models.Model):
 
 
 class AWSComputeSummaryByAccount(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by service and instance type.
 
@@ -526,7 +552,7 @@ class AWSComputeSummaryByAccount(models.Model):
 
 
 class AWSComputeSummaryByRegion(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by service and instance type.
 
@@ -566,7 +592,7 @@ class AWSComputeSummaryByRegion(models.Model):
 
 
 class AWSStorageSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of storage usage.
 
@@ -598,7 +624,7 @@ class AWSStorageSummary(models.Model):
 
 
 class AWSStorageSummaryByService(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of storage usage by service.
 
@@ -632,7 +658,7 @@ class AWSStorageSummaryByService(models.Model):
 
 
 class AWSStorageSummaryByAccount(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of storage by account.
 
@@ -668,7 +694,7 @@ class AWSStorageSummaryByAccount(models.Model):
 
 
 class AWSStorageSummaryByRegion(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by service and instance type.
 
@@ -704,7 +730,7 @@ class AWSStorageSummaryByRegion(models.Model):
 
 
 class AWSNetworkSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of network usage.
 
@@ -736,7 +762,7 @@ class AWSNetworkSummary(models.Model):
 
 
 class AWSDatabaseSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of database usage.
 
@@ -104,10 +104,36 @@ class AzureCostEntryLineItemDaily(models.Model):
     offer_id = models.PositiveIntegerField(null=True)
 
 
+class AzureTagIndex(models.Model):
+    """The tags of the daily line items, one row per lower-cased tag.
+
+    OpenShift on Azure matches line items to OpenShift usage on these rows.
+    The rows of a day are rebuilt when the daily tables are updated.
+
+    """
+
+    class Meta:
+        """Meta for AzureTagIndex."""
+
+        db_table = "reporting_azuretag_index"
+
+        indexes = [models.Index(fields=["usage_date", "key", "value"], name="azure_tag_index_idx")]
+
+    id = models.BigAutoField(primary_key=True)
+
+    cost_entry_bill = models.ForeignKey("AzureCostEntryBill", on_delete=models.CASCADE)
+    line_item_id = models.BigIntegerField(null=False)
+    usage_date = models.DateField(null=False)
+    key = models.TextField(null=False)
+    value = models.TextField(null=False)
+
+
 class AzureCostEntryLineItemDailySummary(models.Model):
     """A line item in a cost entry.
 
     This identifies specific costs and usage of Azure resources.
+    The table is partitioned by the month of usage_start, and each month
+    is replaced as a whole when it is summarized.
 
     """
 
@@ -157,9 +183,9 @@ class AzureTagsSummary(models.Model):
     subscription_guid = ArrayField(models.CharField(max_length=50))
 
 
-# Materialized Views for UI Reporting
+# Summary tables for UI Reporting
 class AzureCostSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost.
 
@@ -180,7 +206,7 @@ class AzureCostSummary(models.Model):
 
 
 class AzureCostSummaryByAccount(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by account.
 
@@ -202,7 +228,7 @@ class AzureCostSummaryByAccount(models.Model):
 
 
 class AzureCostSummaryByLocation(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by location.
 
@@ -224,7 +250,7 @@ class AzureCostSummaryByLocation(models.Model):
 
 
 class AzureCostSummaryByService(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of total cost by service.
 
@@ -246,7 +272,7 @@ class AzureCostSummaryByService(models.Model):
 
 
 class AzureComputeSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -272,7 +298,7 @@ class AzureComputeSummary(models.Model):
 
 
 class AzureStorageSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of storage usage.
 
@@ -296,7 +322,7 @@ class AzureStorageSummary(models.Model):
 
 
 class AzureNetworkSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of network usage.
 
@@ -320,7 +346,7 @@ class AzureNetworkSummary(models.Model):
 
 
 class AzureDatabaseSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of database usage.
 
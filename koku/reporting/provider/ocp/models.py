@@ -65,7 +65,11 @@ class OCPUsageReport(models.Model):
 
 
 class OCPUsageLineItem(models.Model):
-    """Raw report data for OpenShift pods."""
+    """Raw report data for OpenShift pods.
+
+    The table is partitioned by the month of usage_start.
+
+    """
 
     class Meta:
         """Meta for OCPUsageLineItem."""
@@ -110,6 +114,9 @@ class OCPUsageLineItem(models.Model):
 
     pod_labels = JSONField(null=True)
 
+    # The start of the line item's report, the key the table is partitioned by month on
+    usage_start = models.DateTimeField(null=False)
+
 
 class OCPUsageLineItemDaily(models.Model):
     """A daily aggregation of line items.
@@ -184,11 +191,45 @@ class OCPUsageLineItemDaily(models.Model):
 
     pod_labels = JSONField(null=True)
 
+    # The pod labels with enabled keys, projected when the daily rows are built
+    # and again when the enabled keys change
+    enabled_pod_labels = JSONField(null=True)
+
+    # A hash of the enabled pod labels the daily summary groups by
+    enabled_pod_labels_hash = models.UUIDField(null=True)
+
+
+class OCPUsagePodLabelIndex(models.Model):
+    """The pod labels of the daily usage line items, one row per lower-cased label.
+
+    OpenShift on cloud matches pods to cloud line items on the rows with an
+    enabled key. The rows of a day are rebuilt along with its daily line items.
+
+    """
+
+    class Meta:
+        """Meta for OCPUsagePodLabelIndex."""
+
+        db_table = "reporting_ocpusagepodlabel_index"
+
+        indexes = [models.Index(fields=["usage_start", "key", "value"], name="ocp_pod_label_index_idx")]
+
+    id = models.BigAutoField(primary_key=True)
+
+    report_period = models.ForeignKey("OCPUsageReportPeriod", on_delete=models.CASCADE, null=True)
+    cluster_id = models.CharField(max_length=50, null=True)
+    line_item_id = models.BigIntegerField(null=False)
+    usage_start = models.DateField(null=False)
+    key = models.TextField(null=False)
+    value = models.TextField(null=False)
+
 
 class OCPUsageLineItemDailySummary(models.Model):
     """A daily aggregation of line items from pod and volume sources.
 
-    This table is aggregated by OCP resource.
+    This table is aggregated by OCP resource. The table is partitioned by
+    the month of usage_start, and each month is replaced as a whole when it
+    is summarized.
 
     """
 
@@ -407,6 +448,32 @@ class OCPStorageLineItemDaily(models.Model):
     persistentvolumeclaim_labels = JSONField(null=True)
 
 
+class OCPStorageVolumeLabelIndex(models.Model):
+    """The volume and volume claim labels of the daily storage line items.
+
+    There is one row per lower-cased label. OpenShift on cloud matches
+    volumes to cloud line items on the rows with an enabled key. The rows
+    of a day are rebuilt along with its daily line items.
+
+    """
+
+    class Meta:
+        """Meta for OCPStorageVolumeLabelIndex."""
+
+        db_table = "reporting_ocpstoragevolumelabel_index"
+
+        indexes = [models.Index(fields=["usage_start", "key", "value"], name="ocp_volume_label_index_idx")]
+
+    id = models.BigAutoField(primary_key=True)
+
+    report_period = models.ForeignKey("OCPUsageReportPeriod", on_delete=models.CASCADE, null=True)
+    cluster_id = models.CharField(max_length=50, null=True)
+    line_item_id = models.BigIntegerField(null=False)
+    usage_start = models.DateField(null=False)
+    key = models.TextField(null=False)
+    value = models.TextField(null=False)
+
+
 class OCPStorageVolumeLabelSummary(models.Model):
     """A collection of all current existing tag key and values."""
 
@@ -510,7 +577,7 @@ class OCPEnabledTagKeys(models.Model):
 
 
 class OCPCostSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -546,7 +613,7 @@ class OCPCostSummary(models.Model):
 
 
 class OCPCostSummaryByProject(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -585,7 +652,7 @@ class OCPCostSummaryByProject(models.Model):
 
 
 class OCPCostSummaryByNode(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -623,7 +690,7 @@ class OCPCostSummaryByNode(models.Model):
 
 
 class OCPPodSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -681,7 +748,7 @@ class OCPPodSummary(models.Model):
 
 
 class OCPPodSummaryByProject(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -741,7 +808,7 @@ class OCPPodSummaryByProject(models.Model):
 
 
 class OCPVolumeSummary(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -785,7 +852,7 @@ class OCPVolumeSummary(models.Model):
 
 
 class OCPVolumeSummaryByProject(models.Model):
-    """A MATERIALIZED VIEW specifically for UI API queries.
+    """A summary table specifically for UI API queries.
 
     This table gives a daily breakdown of compute usage.
 
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.11 on 2020-04-24 10:12
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("api", "0020_sources_out_of_order_delete"), ("reporting_common", "0021_delete_reportcolumnmap")]
+
+    operations = [
+        migrations.CreateModel(
+            name="DirtyUsageDay",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("usage_date", models.DateField()),
+                ("recorded_datetime", models.DateTimeField(default=django.utils.timezone.now)),
+                ("provider", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="api.Provider")),
+            ],
+            options={"db_table": "dirty_usage_day", "unique_together": {("provider", "usage_date")}},
+        )
+    ]
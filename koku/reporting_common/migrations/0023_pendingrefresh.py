@@ -0,0 +1,33 @@
+# Generated by Django 2.2.11 on 2020-04-27 09:31
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("reporting_common", "0022_dirtyusageday")]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingRefresh",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("schema_name", models.CharField(max_length=128)),
+                ("provider_type", models.CharField(max_length=50)),
+                ("start_date", models.DateField(null=True)),
+                ("end_date", models.DateField(null=True)),
+                ("requested_datetime", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "manifest",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="reporting_common.CostUsageReportManifest",
+                    ),
+                ),
+            ],
+            options={"db_table": "pending_refresh", "index_together": {("schema_name", "provider_type")}},
+        )
+    ]
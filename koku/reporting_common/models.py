@@ -83,3 +83,34 @@ class RegionMapping(models.Model):
 
     region = models.CharField(max_length=32, null=False, unique=True)
     region_name = models.CharField(max_length=64, null=False, unique=True)
+
+
+class DirtyUsageDay(models.Model):
+    """A day of usage written by report processing that has not been summarized yet."""
+
+    class Meta:
+        """Meta for DirtyUsageDay."""
+
+        db_table = "dirty_usage_day"
+        unique_together = ("provider", "usage_date")
+
+    provider = models.ForeignKey("api.Provider", on_delete=models.CASCADE)
+    usage_date = models.DateField()
+    recorded_datetime = models.DateTimeField(default=timezone.now)
+
+
+class PendingRefresh(models.Model):
+    """A request to refresh the reporting summary tables of a provider type in a customer schema."""
+
+    class Meta:
+        """Meta for PendingRefresh."""
+
+        db_table = "pending_refresh"
+        index_together = ("schema_name", "provider_type")
+
+    schema_name = models.CharField(max_length=128)
+    provider_type = models.CharField(max_length=50)
+    manifest = models.ForeignKey("CostUsageReportManifest", null=True, on_delete=models.CASCADE)
+    start_date = models.DateField(null=True)
+    end_date = models.DateField(null=True)
+    requested_datetime = models.DateTimeField(default=timezone.now)
@@ -0,0 +1,110 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Compare AWS CUR row and columnar processing throughput.
+
+Requires a migrated database with an AWS provider in the target schema, e.g.
+the test customer created by scripts/create_test_customer.py:
+
+    DJANGO_SETTINGS_MODULE=koku.settings python scripts/benchmark_aws_report_processor.py \
+        --schema acct10001 --provider-uuid <uuid> --rows 200000
+
+Each run is rolled back, so no data is left behind.
+"""
+import argparse
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+KOKU_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "koku")
+TEST_CUR = os.path.join(KOKU_DIR, "masu/test/data/test_cur.csv")
+
+
+def build_report(path, num_rows):
+    """Write a CUR of num_rows rows by repeating the test CUR."""
+    with open(TEST_CUR) as in_file:
+        reader = csv.reader(in_file)
+        header = next(reader)
+        sample = list(reader)
+    line_item_idx = header.index("identity/LineItemId")
+    with open(path, "w") as out_file:
+        writer = csv.writer(out_file)
+        writer.writerow(header)
+        for i in range(num_rows):
+            row = list(sample[i % len(sample)])
+            row[line_item_idx] = f"benchmark-{i}"
+            writer.writerow(row)
+
+
+def run(schema, provider_uuid, report, columnar, batch_size):
+    """Process the report once and return the elapsed seconds."""
+    from django.db import transaction
+
+    from masu.external import UNCOMPRESSED
+    from masu.processor.aws.aws_report_processor import AWSReportProcessor
+
+    work_file = f"{report}.work"
+    shutil.copy2(report, work_file)
+    with transaction.atomic():
+        processor = AWSReportProcessor(
+            schema_name=schema, report_path=work_file, compression=UNCOMPRESSED, provider_uuid=provider_uuid
+        )
+        processor._columnar = columnar
+        processor._batch_size = batch_size
+        start = time.perf_counter()
+        processor.process()
+        elapsed = time.perf_counter() - start
+        transaction.set_rollback(True)
+    if os.path.exists(work_file):
+        os.remove(work_file)
+    return elapsed
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schema", required=True, help="Tenant schema to process into")
+    parser.add_argument("--provider-uuid", required=True, help="UUID of an AWS provider in the schema")
+    parser.add_argument("--rows", type=int, default=100000, help="Number of CUR rows to generate")
+    parser.add_argument("--batch-size", type=int, default=100000, help="Rows per processing batch")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode; the best run is reported")
+    args = parser.parse_args()
+
+    sys.path.insert(0, KOKU_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+    import django
+
+    django.setup()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report = os.path.join(temp_dir, "benchmark_cur.csv")
+        build_report(report, args.rows)
+        results = {}
+        for columnar in (False, True):
+            best = min(
+                run(args.schema, args.provider_uuid, report, columnar, args.batch_size) for _ in range(args.repeat)
+            )
+            results[columnar] = best
+            mode = "columnar" if columnar else "row"
+            print(f"{mode:>8}: {best:8.2f}s  {args.rows / best:12,.0f} rows/sec")
+        print(f" speedup: {results[False] / results[True]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Measure the throughput of ReportDBAccessorBase.clean_data.
+
+Cleans synthetic line item rows, shaped like the dicts the report
+processors build from CSV rows, with the per table conversion plans and
+with the per cell type dispatch they replaced:
+
+    DJANGO_SETTINGS_MODULE=koku.settings python scripts/benchmark_clean_data.py --rows 1000000
+
+Also times building an accessor's report schema per accessor, as each
+accessor did before the schema was shared by the process.
+"""
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal
+
+KOKU_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "koku")
+
+TABLES = {
+    "AWS": "reporting_awscostentrylineitem",
+    "Azure": "reporting_azurecostentrylineitem_daily",
+    "GCP": "reporting_gcpcostentrylineitemdaily",
+    "OCP": "reporting_ocpusagelineitem",
+}
+SAMPLE_VALUES = {
+    "BigIntegerField": lambda idx: str(idx % 100000 + 1),
+    "DateTimeField": lambda idx: f"2020-01-{idx % 28 + 1:02d}T{idx % 24:02d}:00:00Z",
+    "DateField": lambda idx: f"2020-01-{idx % 28 + 1:02d}",
+    "DecimalField": lambda idx: f"{idx % 977}.{idx % 1000003:09d}" if idx % 10 else "",
+    "FloatField": lambda idx: str(idx % 97 / 7),
+}
+
+
+def build_rows(report_schema, table, num_rows):
+    """Build line item dicts of CSV strings keyed by column."""
+    column_types = report_schema.column_types[table]
+    makers = {
+        column: SAMPLE_VALUES.get(column_type, lambda idx: f"value-{idx % 1000}")
+        for column, column_type in column_types.items()
+    }
+    return [{column: make(idx) for column, make in makers.items()} for idx in range(num_rows)]
+
+
+def legacy_clean_data(accessor, data, table_name):
+    """Clean a row with the per cell type dispatch clean_data used to run."""
+    column_types = accessor.report_schema.column_types[table_name]
+    for key, value in data.items():
+        if value is None or value == "":
+            data[key] = None
+            continue
+        if column_types.get(key) == int or column_types.get(key) == "BigIntegerField":
+            data[key] = accessor._convert_value(value, int)
+        elif column_types.get(key) == float:
+            data[key] = accessor._convert_value(value, float)
+        elif column_types.get(key) == Decimal:
+            data[key] = accessor._convert_value(value, Decimal)
+    return data
+
+
+def timed(func, rows):
+    """Clean copies of rows and return the elapsed seconds."""
+    rows = [dict(row) for row in rows]
+    start = time.perf_counter()
+    for row in rows:
+        func(row)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="Line items per table")
+    parser.add_argument("--accessors", type=int, default=100, help="Report schemas built per accessor")
+    args = parser.parse_args()
+
+    sys.path.insert(0, KOKU_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+    import django
+
+    django.setup()
+    import django.apps
+
+    from masu.database.report_db_accessor_base import ReportDBAccessorBase
+    from masu.database.report_db_accessor_base import ReportSchema
+    from masu.database.report_db_accessor_base import get_report_schema
+
+    accessor = ReportDBAccessorBase("public")
+    for provider, table in TABLES.items():
+        rows = build_rows(accessor.report_schema, table, args.rows)
+        legacy_seconds = timed(lambda row: legacy_clean_data(accessor, row, table), rows)
+        plan_seconds = timed(lambda row: accessor.clean_data(row, table), rows)
+        print(f"{provider} {args.rows:,} rows x {len(rows[0]) if rows else 0} columns")
+        print(f"  per cell dispatch: {legacy_seconds:8.2f}s  {args.rows / legacy_seconds:12,.0f} rows/sec")
+        print(f"  conversion plan:   {plan_seconds:8.2f}s  {args.rows / plan_seconds:12,.0f} rows/sec")
+
+    start = time.perf_counter()
+    for _ in range(args.accessors):
+        ReportSchema(django.apps.apps.get_models())
+    per_accessor = (time.perf_counter() - start) / args.accessors
+    start = time.perf_counter()
+    for _ in range(args.accessors):
+        get_report_schema()
+    shared = (time.perf_counter() - start) / args.accessors
+    print(f"Report schema per accessor: {per_accessor * 1000:8.3f}ms built, {shared * 1000:8.3f}ms shared")
+
+
+if __name__ == "__main__":
+    main()
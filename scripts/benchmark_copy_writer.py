@@ -0,0 +1,121 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Compare the CSV and binary COPY line item writers.
+
+Encodes a batch of synthetic AWS and OCP line items, shaped like the rows
+the report processors build, with both writers:
+
+    DJANGO_SETTINGS_MODULE=koku.settings python scripts/benchmark_copy_writer.py --rows 1000000
+
+With --schema, each batch is also copied into a temporary copy of its line
+item table in that schema, so server side parsing is included. Each copy is
+rolled back.
+"""
+import argparse
+import os
+import sys
+import time
+
+KOKU_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "koku")
+
+TABLES = {"AWS": "reporting_awscostentrylineitem", "OCP": "reporting_ocpusagelineitem"}
+SAMPLE_VALUES = {
+    "CharField": lambda idx: f"value-{idx % 1000}",
+    "TextField": lambda idx: f"value-{idx % 1000}",
+    "DateTimeField": lambda idx: f"2020-01-{idx % 28 + 1:02d}T{idx % 24:02d}:00:00Z",
+    "DateField": lambda idx: f"2020-01-{idx % 28 + 1:02d}",
+    "DecimalField": lambda idx: f"{idx % 977}.{idx % 1000003:09d}",
+    "FloatField": lambda idx: str(idx % 97 / 7),
+    "JSONField": lambda idx: f'{{"app": "app-{idx % 50}", "environment": "prod"}}',
+}
+
+
+def build_rows(report_schema, table, num_rows):
+    """Build line item tuples with the value types the processors produce."""
+    model = getattr(report_schema, table)
+    columns = [field.column for field in model._meta.concrete_fields if not field.primary_key]
+    column_types = report_schema.get_column_types(table, columns)
+    makers = [SAMPLE_VALUES.get(column_type, lambda idx: idx % 100000 + 1) for column_type in column_types]
+    rows = [tuple(make(idx) for make in makers) for idx in range(num_rows)]
+    return columns, column_types, rows
+
+
+def timed(func, *args):
+    """Return the result of a call and its elapsed seconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def copy(schema, table, columns, file_obj, binary):
+    """Copy an encoded batch into a temporary copy of table and return the elapsed seconds."""
+    from django.db import connection
+    from django.db import transaction
+
+    column_str = ", ".join(columns)
+    copy_format = "(FORMAT binary)" if binary else "CSV"
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL search_path TO {schema}, public")
+            cursor.execute(f"CREATE TEMPORARY TABLE benchmark_copy (LIKE {table}) ON COMMIT DROP")
+            start = time.perf_counter()
+            cursor.copy_expert(f"COPY benchmark_copy ({column_str}) FROM STDIN WITH {copy_format}", file_obj)
+            elapsed = time.perf_counter() - start
+        transaction.set_rollback(True)
+    return elapsed
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="Line items per batch")
+    parser.add_argument("--schema", help="Tenant schema to also COPY into")
+    args = parser.parse_args()
+
+    sys.path.insert(0, KOKU_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+    import django
+
+    django.setup()
+    import django.apps
+
+    from masu.database.binary_copy import BinaryCopyWriter
+    from masu.database.report_db_accessor_base import ReportSchema
+    from masu.processor.report_processor_base import ReportProcessorBase
+
+    report_schema = ReportSchema(django.apps.apps.get_models())
+    for provider, table in TABLES.items():
+        columns, column_types, rows = build_rows(report_schema, table, args.rows)
+        csv_file, csv_seconds = timed(ReportProcessorBase._write_rows_to_csv, rows)
+        binary_file, binary_seconds = timed(BinaryCopyWriter(column_types).write, rows)
+        csv_size = len(csv_file.getvalue().encode("utf-8"))
+        binary_size = len(binary_file.getvalue())
+        print(f"{provider} {args.rows:,} rows x {len(columns)} columns")
+        print(f"  csv encode:    {csv_seconds:8.2f}s  {args.rows / csv_seconds:12,.0f} rows/sec  {csv_size:,} bytes")
+        print(
+            f"  binary encode: {binary_seconds:8.2f}s  {args.rows / binary_seconds:12,.0f} rows/sec  "
+            f"{binary_size:,} bytes"
+        )
+        if args.schema:
+            csv_copy = copy(args.schema, table, columns, csv_file, binary=False)
+            binary_copy = copy(args.schema, table, columns, binary_file, binary=True)
+            print(f"  csv copy:      {csv_copy:8.2f}s  total {csv_seconds + csv_copy:8.2f}s")
+            print(f"  binary copy:   {binary_copy:8.2f}s  total {binary_seconds + binary_copy:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Measure the building and rendering of a report response.
+
+Builds the nested report data of synthetic OpenShift cost rows, shaped
+like the rows of a report grouped by cluster and project, with the one
+pass builder and with the grouping and transformation it replaced. The
+two responses must render to the same bytes. Then renders the response
+with the standard and the ujson renderer:
+
+    DJANGO_SETTINGS_MODULE=koku.settings python scripts/benchmark_report_response.py --projects 5000 --days 30
+"""
+import argparse
+import copy
+import datetime
+import json
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+KOKU_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "koku")
+COST_COLUMNS = [
+    "infra_raw",
+    "infra_markup",
+    "infra_usage",
+    "infra_total",
+    "sup_raw",
+    "sup_markup",
+    "sup_usage",
+    "sup_total",
+    "cost_raw",
+    "cost_markup",
+    "cost_usage",
+    "cost_total",
+]
+
+
+def build_rows(dates, num_projects, num_clusters):
+    """Build report rows grouped by date, cluster and project, ordered by cost as the handlers order them."""
+    rows = []
+    for date in dates:
+        for idx in range(num_projects):
+            row = {
+                "date": date,
+                "cluster": f"cluster-{idx % num_clusters}",
+                "project": f"project-{idx}" if idx % 50 else None,
+                "cost_units": "USD",
+            }
+            row.update({column: Decimal(random.randint(0, 10**8)) / 10**6 for column in COST_COLUMNS})
+            rows.append(row)
+    return sorted(rows, key=lambda row: (row["date"], -row["cost_total"]))
+
+
+def legacy_build(handler, rows, query_group_by):
+    """Build the report data as the handlers did before the one pass builder."""
+    groups = copy.deepcopy(query_group_by)
+    groups.remove("date")
+    data = handler._apply_group_by(rows, groups)
+    return handler._transform_data(query_group_by, 0, data)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=5000, help="Projects of each day")
+    parser.add_argument("--clusters", type=int, default=5, help="Clusters the projects run on")
+    parser.add_argument("--days", type=int, default=30, help="Days of the report")
+    args = parser.parse_args()
+
+    sys.path.insert(0, KOKU_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+    import django
+
+    django.setup()
+    from rest_framework.renderers import JSONRenderer
+
+    from api.common.renderers import UJSONRenderer
+    from api.models import Provider
+    from api.report.ocp.provider_map import OCPProviderMap
+    from api.report.ocp.query_handler import OCPReportQueryHandler
+
+    handler = OCPReportQueryHandler.__new__(OCPReportQueryHandler)
+    handler._mapper = OCPProviderMap(provider=Provider.PROVIDER_OCP, report_type="costs")
+    handler._limit = None
+    handler.date_to_string = lambda dt: dt.strftime("%Y-%m-%d")
+    start = datetime.datetime(2020, 4, 1)
+    handler.time_interval = [start + datetime.timedelta(days=day) for day in range(args.days)]
+    dates = [handler.date_to_string(item) for item in handler.time_interval]
+    query_group_by = ["date", "cluster", "project"]
+    rows = build_rows(dates, args.projects, args.clusters)
+
+    legacy_rows = copy.deepcopy(rows)
+    started = time.perf_counter()
+    legacy = legacy_build(handler, legacy_rows, query_group_by)
+    legacy_seconds = time.perf_counter() - started
+
+    built_rows = copy.deepcopy(rows)
+    started = time.perf_counter()
+    built = handler._build_report_data(built_rows, query_group_by)
+    built_seconds = time.perf_counter() - started
+
+    response = {"meta": {"count": len(built)}, "data": built}
+    started = time.perf_counter()
+    rendered = JSONRenderer().render(response)
+    json_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    fast_rendered = UJSONRenderer().render(response)
+    ujson_seconds = time.perf_counter() - started
+
+    if rendered != JSONRenderer().render({"meta": {"count": len(legacy)}, "data": legacy}):
+        raise SystemExit("The built report data differs from the legacy report data.")
+    if json.loads(fast_rendered) != json.loads(rendered):
+        raise SystemExit("The ujson rendering differs from the standard rendering.")
+
+    print(f"{len(rows):,} rows, {len(rendered) / 2 ** 20:.1f} MiB of JSON, identical bytes")
+    print(f"  group and transform: {legacy_seconds:8.3f}s")
+    print(f"  one pass builder:    {built_seconds:8.3f}s")
+    print(f"  JSONRenderer:        {json_seconds:8.3f}s")
+    print(f"  UJSONRenderer:       {ujson_seconds:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
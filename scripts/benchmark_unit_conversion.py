@@ -0,0 +1,139 @@
+#
+# Copyright 2020 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Measure the unit conversion of a report requested with units=.
+
+Converts a synthetic storage report, shaped like the output of the AWS
+storage query handler, from GB-Mo to TB-Mo with the cached conversion
+factors and with a pint quantity per value and a registry per request,
+as the report view converted before:
+
+    DJANGO_SETTINGS_MODULE=koku.settings python scripts/benchmark_unit_conversion.py --rows 10000
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+
+KOKU_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "koku")
+
+
+def build_report(num_rows):
+    """Build a storage report grouped by day and account with a row per value."""
+    days = 30
+    data = []
+    for day in range(days):
+        values = [
+            {
+                "date": f"2020-04-{day + 1:02d}",
+                "account": f"{idx:012d}",
+                "total": idx % 1000 + 0.5,
+                "units": "GB-Mo" if idx % 10 else "",
+            }
+            for idx in range(day, num_rows, days)
+        ]
+        data.append({"date": f"2020-04-{day + 1:02d}", "accounts": [{"account": "all", "values": values}]})
+    return {"data": data, "total": {"value": float(num_rows), "units": "GB-Mo"}}
+
+
+def legacy_fill_in_missing_units(data, unit):
+    """Fill in empty units in a walk of their own, as the report view used to."""
+    if isinstance(data, list):
+        for entry in data:
+            legacy_fill_in_missing_units(entry, unit)
+    elif isinstance(data, dict):
+        for key in data:
+            if key == "units":
+                if not data[key]:
+                    data[key] = unit
+            else:
+                legacy_fill_in_missing_units(data[key], unit)
+    return data
+
+
+def legacy_convert_units(converter, data, to_unit):
+    """Convert a report with a pint quantity per value, as the report view used to."""
+    suffix = None
+    if isinstance(data, list):
+        for entry in data:
+            legacy_convert_units(converter, entry, to_unit)
+    elif isinstance(data, dict):
+        for key in data:
+            if key == "total" and isinstance(data[key], dict):
+                total = data[key]
+                from_unit = total.get("units", "")
+                if "-Mo" in from_unit:
+                    from_unit, suffix = from_unit.split("-")
+                total["value"] = converter.convert_quantity(total.get("value"), from_unit, to_unit).magnitude
+                total["units"] = to_unit + "-" + suffix if suffix else to_unit
+            elif key == "total" and not isinstance(data[key], dict):
+                from_unit = data.get("units", "")
+                if "-Mo" in from_unit:
+                    from_unit, suffix = from_unit.split("-")
+                data["total"] = converter.convert_quantity(data[key], from_unit, to_unit).magnitude
+                data["units"] = to_unit + "-" + suffix if suffix else to_unit
+            else:
+                legacy_convert_units(converter, data[key], to_unit)
+    return data
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="Values of the storage report")
+    parser.add_argument("--repeat", type=int, default=10, help="Conversions of the report per method")
+    args = parser.parse_args()
+
+    sys.path.insert(0, KOKU_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+    import django
+
+    django.setup()
+    import pint
+
+    from api.report.view import _convert_units
+    from api.report.view import _find_unit
+    from api.utils import UnitConverter
+
+    report = build_report(args.rows)
+    reports = [copy.deepcopy(report) for _ in range(args.repeat)]
+    start = time.perf_counter()
+    for output in reports:
+        converter = UnitConverter()
+        converter.unit_registry = pint.UnitRegistry()
+        converter.Quantity = converter.unit_registry.Quantity
+        from_unit = _find_unit()(output["data"])
+        output = legacy_fill_in_missing_units(output, from_unit)
+        legacy = legacy_convert_units(converter, output, "TB")
+    legacy_seconds = (time.perf_counter() - start) / args.repeat
+
+    reports = [copy.deepcopy(report) for _ in range(args.repeat)]
+    start = time.perf_counter()
+    for output in reports:
+        from_unit = _find_unit()(output["data"])
+        converted = _convert_units(UnitConverter(), output, "TB", missing_unit=from_unit)
+    cached_seconds = (time.perf_counter() - start) / args.repeat
+
+    if converted != legacy:
+        raise SystemExit("The converted reports differ.")
+    print(f"Storage report of {args.rows:,} values, GB-Mo to TB-Mo")
+    print(f"  registry and quantity per value: {legacy_seconds * 1000:10.2f}ms per request")
+    print(f"  shared registry, cached factors: {cached_seconds * 1000:10.2f}ms per request")
+
+
+if __name__ == "__main__":
+    main()